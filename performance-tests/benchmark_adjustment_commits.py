@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Measure commits (one fsync each on a file-backed SQLite database) and latency per balance adjustment.
+
+Runs both adjustment paths against a throwaway database file:
+  manual    ManualBalanceAdjustmentService.create_adjustment
+  balance   TransactionService.perform_balance_adjustment
+
+Usage: python performance-tests/benchmark_adjustment_commits.py [--iterations N]
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from time import perf_counter
+from typing import Callable
+from uuid import UUID
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from sdd_cash_manager.models.account import Account
+from sdd_cash_manager.models.base import Base
+from sdd_cash_manager.models.enums import AccountingCategory
+from sdd_cash_manager.schemas.adjustment import ManualBalanceAdjustmentCreate
+from sdd_cash_manager.services.account_service import AccountService
+from sdd_cash_manager.services.adjustment_service import ManualBalanceAdjustmentService
+from sdd_cash_manager.services.transaction_service import TransactionService
+
+ACCOUNT_ID = str(UUID(int=1))
+
+
+def _manual_adjustment(session: Session, index: int) -> None:
+    payload = ManualBalanceAdjustmentCreate(
+        target_balance=Decimal(100 + index),
+        effective_date=date(2026, 1, 1) + timedelta(days=index),
+        submitted_by_user_id="benchmark",
+    )
+    ManualBalanceAdjustmentService(session).create_adjustment(UUID(ACCOUNT_ID), payload)
+
+
+def _balance_adjustment(session: Session, index: int) -> None:
+    transaction_service = TransactionService(db_session=session)
+    transaction_service.set_account_service(AccountService(session))
+    transaction_service.perform_balance_adjustment(
+        ACCOUNT_ID,
+        Decimal(100 + index),
+        datetime.now(timezone.utc),
+        "Benchmark adjustment",
+        "Adjustment",
+    )
+
+
+def _run(label: str, operation: Callable[[Session, int], None], iterations: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{Path(directory) / 'benchmark.db'}")
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(bind=engine)
+        with factory() as session:
+            session.add(Account(name="Checking", currency="USD", accounting_category=AccountingCategory.ASSET, id=ACCOUNT_ID))
+            session.commit()
+
+        commits: list[int] = []
+        event.listen(engine, "commit", lambda _conn: commits.append(1))
+        timings: list[float] = []
+        for index in range(iterations):
+            with factory() as session:
+                start = perf_counter()
+                operation(session, index)
+                timings.append((perf_counter() - start) * 1000)
+        engine.dispose()
+
+    print(
+        f"{label:<8} commits/adjustment={len(commits) / iterations:.2f} "
+        f"mean={statistics.mean(timings):.2f}ms p95={sorted(timings)[int(len(timings) * 0.95) - 1]:.2f}ms"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    iterations = max(args.iterations, 1)
+    _run("manual", _manual_adjustment, iterations)
+    _run("balance", _balance_adjustment, iterations)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
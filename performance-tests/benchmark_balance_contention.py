@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Hammer one account from several threads and report throughput and lost updates.
+
+Two write patterns run against a throwaway file-backed SQLite database:
+  atomic    TransactionService.create_transaction (UPDATE ... SET balance = balance + :delta)
+  versioned load the account, add to available_balance in Python and commit; the version check
+            rejects stale writes and retry_on_version_conflict re-runs them up to the configured limit
+
+Usage: python performance-tests/benchmark_balance_contention.py [--workers N] [--operations N]
+"""
+
+import argparse
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from time import perf_counter
+from typing import Callable
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm.exc import StaleDataError
+
+from sdd_cash_manager.models.account import Account
+from sdd_cash_manager.models.base import Base
+from sdd_cash_manager.models.enums import AccountingCategory
+from sdd_cash_manager.services.account_service import AccountService
+from sdd_cash_manager.services.balance_updates import retry_on_version_conflict
+from sdd_cash_manager.services.transaction_service import TransactionService
+
+AMOUNT = Decimal("1.00")
+
+
+def _atomic(factory: Callable[[], Session]) -> Callable[[int], None]:
+    service = TransactionService(session_factory=factory)
+    service.set_account_service(AccountService(session_factory=factory))
+
+    def _post(index: int) -> None:
+        now = datetime.now(timezone.utc)
+        service.create_transaction(
+            effective_date=now,
+            booking_date=now,
+            description=f"Contention {index}",
+            amount=AMOUNT,
+            debit_account_id="source",
+            credit_account_id="hot",
+            action_type="Transfer",
+        )
+
+    return _post
+
+
+def _versioned(factory: Callable[[], Session]) -> Callable[[int], None]:
+    def _post(_index: int) -> None:
+        with factory() as session:
+
+            def _increment() -> None:
+                account = session.get(Account, "hot")
+                assert account is not None
+                account.available_balance += AMOUNT
+                session.commit()
+
+            retry_on_version_conflict(session, _increment, description="contention benchmark")
+
+    return _post
+
+
+def _run(label: str, build: Callable[[Callable[[], Session]], Callable[[int], None]], workers: int, operations: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{Path(directory) / 'contention.db'}", connect_args={"timeout": 30})
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(bind=engine, autoflush=False)
+        with factory() as session:
+            session.add_all(
+                [
+                    Account(name="Hot", currency="USD", accounting_category=AccountingCategory.ASSET, id="hot"),
+                    Account(name="Source", currency="USD", accounting_category=AccountingCategory.EQUITY, id="source"),
+                ]
+            )
+            session.commit()
+
+        post = build(factory)
+        failures = 0
+
+        def _worker(worker: int) -> int:
+            failed = 0
+            for index in range(operations):
+                try:
+                    post(worker * operations + index)
+                except (RuntimeError, StaleDataError):
+                    failed += 1
+            return failed
+
+        start = perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            failures = sum(pool.map(_worker, range(workers)))
+        elapsed = perf_counter() - start
+
+        with factory() as session:
+            hot = session.get(Account, "hot")
+            assert hot is not None
+            balance = hot.available_balance
+        engine.dispose()
+
+    total = workers * operations
+    succeeded = total - failures
+    lost = succeeded * AMOUNT - balance
+    print(
+        f"{label:<9} ops={total} ok={succeeded} failed={failures} lost_updates={lost / AMOUNT:.0f} "
+        f"throughput={total / elapsed:.1f}/s"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--operations", type=int, default=50)
+    args = parser.parse_args()
+    workers, operations = max(args.workers, 1), max(args.operations, 1)
+    _run("atomic", _atomic, workers, operations)
+    _run("versioned", _versioned, workers, operations)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""Benchmark for account-group duplicate scans across a wide account subtree."""
+
+from __future__ import annotations
+
+import argparse
+import random
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from time import perf_counter
+from uuid import uuid4
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from sdd_cash_manager.models.account import Account
+from sdd_cash_manager.models.base import Base
+from sdd_cash_manager.models.enums import AccountingCategory, ProcessingStatus, ReconciliationStatus
+from sdd_cash_manager.models.transaction import Transaction
+from sdd_cash_manager.services.transaction_service import TransactionService
+
+ENGINE = create_engine("sqlite:///:memory:")
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=ENGINE)
+
+MERCHANTS = ["Coffee House", "Grocer Market", "Airline Ticket", "Fuel Station", "Book Store", "Pharmacy"]
+INSERT_BATCH_SIZE = 5000
+
+
+def _seed(account_count: int, transactions_per_account: int, duplicate_rate: float) -> str:
+    """Create a parent account with card children and synthetic transactions; return the parent id."""
+    rng = random.Random(42)
+    start_date = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    with SessionLocal() as session:
+        parent = Account(name="Cards", currency="USD", accounting_category=AccountingCategory.LIABILITY)
+        expenses = Account(name="Expenses", currency="USD", accounting_category=AccountingCategory.EXPENSE)
+        session.add_all([parent, expenses])
+        session.flush()
+        children = [
+            Account(
+                name=f"Card {index}",
+                currency="USD",
+                accounting_category=AccountingCategory.LIABILITY,
+                parent_account_id=parent.id,
+            )
+            for index in range(account_count)
+        ]
+        session.add_all(children)
+        session.commit()
+
+        rows: list[dict[str, object]] = []
+        for child in children:
+            for index in range(transactions_per_account):
+                effective_date = start_date + timedelta(days=rng.randint(0, 365), minutes=index)
+                description = f"{rng.choice(MERCHANTS)} {rng.randint(1000, 9999)}"
+                amount = Decimal(rng.randint(100, 50000)) / Decimal(100)
+                copies = 2 if rng.random() < duplicate_rate else 1
+                for copy in range(copies):
+                    rows.append(
+                        {
+                            "id": str(uuid4()),
+                            "effective_date": effective_date + timedelta(days=copy),
+                            "booking_date": effective_date + timedelta(days=copy),
+                            "description": description,
+                            "amount": amount,
+                            "debit_account_id": expenses.id,
+                            "credit_account_id": child.id,
+                            "action_type": "Expense",
+                            "processing_status": ProcessingStatus.POSTED,
+                            "reconciliation_status": ReconciliationStatus.UNCLEARED,
+                        }
+                    )
+                if len(rows) >= INSERT_BATCH_SIZE:
+                    session.execute(insert(Transaction), rows)
+                    rows.clear()
+        if rows:
+            session.execute(insert(Transaction), rows)
+        session.commit()
+        return parent.id
+
+
+def run_benchmarks(
+    account_count: int = 50,
+    transactions_per_account: int = 10_000,
+    duplicate_rate: float = 0.02,
+) -> None:
+    """Seed the in-memory database and time an account-group duplicate scan."""
+    Base.metadata.drop_all(bind=ENGINE)
+    Base.metadata.create_all(bind=ENGINE)
+
+    seed_start = perf_counter()
+    parent_id = _seed(account_count, transactions_per_account, duplicate_rate)
+    seed_duration = perf_counter() - seed_start
+
+    service = TransactionService(session_factory=SessionLocal)
+    scan_start = perf_counter()
+    result = service.run_duplicate_scan(account_id=parent_id, scope="account_group", limit=1_000_000)
+    passes = 1
+    while not result.complete:
+        result = service.run_duplicate_scan(
+            account_id=parent_id,
+            scope="account_group",
+            limit=1_000_000,
+            cursor=result.next_cursor,
+        )
+        passes += 1
+    scan_duration = perf_counter() - scan_start
+
+    print("--- Duplicate Scan Benchmark ---")
+    print(f"Accounts: {account_count}, transactions per account: {transactions_per_account}")
+    print(f"Seeding duration: {seed_duration:.3f}s")
+    print(f"Account-group scan duration: {scan_duration:.3f}s")
+    print(f"Time-budgeted passes: {passes}")
+    print(f"Candidates persisted: {len(result.candidates)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--accounts", type=int, default=50)
+    parser.add_argument("--transactions", type=int, default=10_000)
+    parser.add_argument("--duplicate-rate", type=float, default=0.02)
+    args = parser.parse_args()
+    run_benchmarks(args.accounts, args.transactions, args.duplicate_rate)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Time turning ORM accounts and transactions into JSON response bodies, per 10k rows.
+
+Each path builds the response models and then does what FastAPI does with a list return
+value: validate it against the cached response TypeAdapter and dump it to JSON bytes.
+  legacy  copy ``__dict__``, convert Decimals to float, build nested models one by one
+  mapped  the helpers in ``sdd_cash_manager.api.accounts``: direct column mapping, one validation
+
+No database is involved; the rows are transient ORM instances.
+
+Usage: python performance-tests/benchmark_response_serialization.py [--rows N] [--repeat N]
+"""
+
+import argparse
+import sys
+from datetime import datetime, timezone
+from decimal import Decimal
+from time import perf_counter
+from typing import Any, Callable
+
+from sdd_cash_manager.api.accounts import _account_response_from_model, _transaction_response_from_model
+from sdd_cash_manager.lib.streaming import list_adapter
+from sdd_cash_manager.models.account import Account
+from sdd_cash_manager.models.enums import AccountingCategory, ProcessingStatus, ReconciliationStatus
+from sdd_cash_manager.models.transaction import Entry, Transaction
+from sdd_cash_manager.schemas.account_schema import AccountResponse
+from sdd_cash_manager.schemas.transaction_schema import TransactionEntryResponse, TransactionResponse
+
+ROWS_PER_REPORT = 10_000
+
+
+class _FixedBalances:
+    """Stands in for AccountService so only serialization is measured."""
+
+    def get_account_hierarchy_balance(self, account_id: str) -> Decimal:
+        return Decimal("125.50")
+
+    def decrypt_notes(self, value: str | None) -> str | None:
+        return value
+
+
+def _accounts(rows: int) -> list[Account]:
+    return [
+        Account(
+            id=f"account-{index}",
+            name=f"Account {index}",
+            currency="USD",
+            accounting_category=AccountingCategory.ASSET,
+            available_balance=Decimal(index) / 100,
+            credit_limit=Decimal("500.00"),
+            notes="Benchmark account",
+        )
+        for index in range(rows)
+    ]
+
+
+def _transactions(rows: int) -> list[Transaction]:
+    now = datetime.now(timezone.utc)
+    transactions = []
+    for index in range(rows):
+        amount = Decimal(index + 1) / 100
+        transaction = Transaction(
+            id=f"txn-{index}",
+            effective_date=now,
+            booking_date=now,
+            description=f"Benchmark {index}",
+            amount=amount,
+            debit_account_id="checking",
+            credit_account_id="income",
+            action_type="Transfer",
+            processing_status=ProcessingStatus.POSTED,
+            reconciliation_status=ReconciliationStatus.UNCLEARED,
+        )
+        transaction.entries = [
+            Entry(id=f"txn-{index}-d", account_id="checking", debit_amount=amount, credit_amount=Decimal("0.00")),
+            Entry(id=f"txn-{index}-c", account_id="income", debit_amount=Decimal("0.00"), credit_amount=amount),
+        ]
+        transactions.append(transaction)
+    return transactions
+
+
+def _legacy_account(account: Account, service: _FixedBalances) -> AccountResponse:
+    payload = account.__dict__.copy()
+    payload["notes"] = service.decrypt_notes(getattr(account, "notes", None))
+    for name in ("available_balance", "credit_limit"):
+        if isinstance(payload.get(name), Decimal):
+            payload[name] = float(payload[name])
+    payload["hierarchy_balance"] = float(service.get_account_hierarchy_balance(account.id))
+    return AccountResponse(**payload)
+
+
+def _legacy_transaction(transaction: Transaction, currency: str) -> TransactionResponse:
+    entries = [
+        TransactionEntryResponse(
+            entry_id=entry.id,
+            account_id=entry.account_id,
+            debit_amount=entry.debit_amount,
+            credit_amount=entry.credit_amount,
+            notes=entry.notes,
+        )
+        for entry in transaction.entries
+    ]
+    return TransactionResponse(
+        transaction_id=transaction.id,
+        effective_date=transaction.effective_date,
+        booking_date=transaction.booking_date,
+        description=transaction.description,
+        action_type=transaction.action_type,
+        action=transaction.action_type,
+        amount=transaction.amount.quantize(Decimal("0.01")),
+        currency=currency,
+        transfer_from_account_id=transaction.debit_account_id,
+        transfer_to_account_id=transaction.credit_account_id,
+        debit_account_id=transaction.debit_account_id,
+        credit_account_id=transaction.credit_account_id,
+        processing_status=str(transaction.processing_status),
+        reconciliation_status=str(transaction.reconciliation_status),
+        notes=transaction.notes,
+        memo=transaction.notes,
+        entries=entries,
+    )
+
+
+def _time(label: str, model: type, build: Callable[[], list[Any]], rows: int, repeat: int) -> None:
+    adapter = list_adapter(model)
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        adapter.dump_json(adapter.validate_python(build()))
+        best = min(best, perf_counter() - start)
+    per_report = best / rows * ROWS_PER_REPORT
+    print(f"{label:<20} rows={rows} best={best * 1000:.1f}ms per_10k={per_report * 1000:.1f}ms rows/s={rows / best:,.0f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=ROWS_PER_REPORT)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    rows, repeat = max(args.rows, 1), max(args.repeat, 1)
+    service = _FixedBalances()
+    accounts = _accounts(rows)
+    transactions = _transactions(rows)
+
+    _time("accounts legacy", AccountResponse, lambda: [_legacy_account(a, service) for a in accounts], rows, repeat)
+    _time(
+        "accounts mapped",
+        AccountResponse,
+        lambda: [_account_response_from_model(a, service) for a in accounts],  # type: ignore[arg-type]
+        rows,
+        repeat,
+    )
+    _time(
+        "transactions legacy",
+        TransactionResponse,
+        lambda: [_legacy_transaction(t, "USD") for t in transactions],
+        rows,
+        repeat,
+    )
+    _time(
+        "transactions mapped",
+        TransactionResponse,
+        lambda: [_transaction_response_from_model(t, "USD") for t in transactions],
+        rows,
+        repeat,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Time importing the application and starting it, each in a fresh interpreter.
+
+Every step runs in a new ``python`` process (best of ``--repeat``) against a throwaway
+SQLite file, so module caches from earlier steps do not hide import costs:
+  import main      ``import sdd_cash_manager.main`` (what uvicorn workers and test collection pay)
+  import database  ``import sdd_cash_manager.database``
+  import cli       ``import sdd_cash_manager.cli``
+  create_app       import plus ``create_app()``: routers, schemas and services
+  first request    create_app plus one ``GET /health`` through the ASGI app
+  create-schema    ``database.create_tables()``: the engine, mappers and ``create_all``
+
+Usage: python performance-tests/benchmark_startup.py [--repeat N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+STEPS = {
+    "import main": "import sdd_cash_manager.main",
+    "import database": "import sdd_cash_manager.database",
+    "import cli": "import sdd_cash_manager.cli",
+    "create_app": "from sdd_cash_manager.main import create_app; create_app()",
+    "first request": (
+        "import asyncio, httpx\n"
+        "from sdd_cash_manager.main import create_app\n"
+        "async def _get():\n"
+        "    transport = httpx.ASGITransport(app=create_app())\n"
+        "    async with httpx.AsyncClient(transport=transport, base_url='http://benchmark') as client:\n"
+        "        assert (await client.get('/health')).status_code == 200\n"
+        "asyncio.run(_get())"
+    ),
+    "create-schema": "from sdd_cash_manager import database; database.create_tables()",
+}
+
+# Times the step inside the child so interpreter start-up is left out.
+_HARNESS = """
+from time import perf_counter
+start = perf_counter()
+exec(compile({code!r}, "<step>", "exec"))
+print(perf_counter() - start)
+"""
+
+
+def _run(code: str, env: dict[str, str]) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", _HARNESS.format(code=code)], env=env, check=True, capture_output=True, text=True
+    )
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    repeat = max(args.repeat, 1)
+    src = str(Path(__file__).resolve().parents[1] / "src")
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [src, env.get("PYTHONPATH")]))
+        env["SDD_CASH_MANAGER_DATABASE_URL"] = f"sqlite:///{Path(directory) / 'benchmark.db'}"
+        env["SDD_CASH_MANAGER_SECURITY_LOG_FILE"] = str(Path(directory) / "security.log")
+        for label, code in STEPS.items():
+            best = min(_run(code, env) for _ in range(repeat))
+            print(f"{label:<16} best={best * 1000:.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
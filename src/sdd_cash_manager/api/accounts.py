@@ -2,18 +2,19 @@ import re
 from datetime import date, datetime, timezone
 from decimal import Decimal
 from enum import Enum
-from typing import Annotated, TypedDict, cast
+from typing import Annotated, Any, TypedDict, cast
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, ConfigDict, condecimal, constr, field_validator
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, TypeAdapter, condecimal, constr, field_validator
 from sqlalchemy.orm import Session
 
 from sdd_cash_manager.database import get_db
 from sdd_cash_manager.lib.auth import Role, TokenPayload, require_role
 from sdd_cash_manager.lib.logging_config import get_logger
+from sdd_cash_manager.lib.streaming import StreamFormat, encode_stream
 from sdd_cash_manager.models.account import Account
 from sdd_cash_manager.models.account_merge_plan import AccountMergePlan
 from sdd_cash_manager.models.duplicate_candidate import DuplicateCandidate
@@ -28,8 +29,8 @@ from sdd_cash_manager.schemas.transaction_schema import (
     DuplicateCandidateResponse,
     DuplicateMergeRequest,
     DuplicateMergeResponse,
+    DuplicateScanResponse,
     QuickFillTemplateResponse,
-    TransactionEntryResponse,
     TransactionRequest,
     TransactionResponse,
 )
@@ -255,54 +256,91 @@ def _build_account_creation_kwargs(
         "id": str(account_data.id) if account_data.id is not None else None,
     }
 
-def _account_response_from_model(account: Account, account_service: AccountService) -> AccountResponse:
-    """Return an AccountResponse while decrypting sensitive fields."""
-    payload = account.__dict__.copy()
+# Account columns copied verbatim onto AccountResponse; notes and hierarchy_balance are derived.
+_ACCOUNT_RESPONSE_COLUMNS = (
+    "id",
+    "name",
+    "currency",
+    "accounting_category",
+    "account_number",
+    "banking_product_type",
+    "available_balance",
+    "credit_limit",
+    "parent_account_id",
+    "hidden",
+    "placeholder",
+    "notes",
+)
+_TRANSACTION_RESPONSE_COLUMNS = (
+    "id",
+    "effective_date",
+    "booking_date",
+    "description",
+    "action_type",
+    "amount",
+    "debit_account_id",
+    "credit_account_id",
+    "processing_status",
+    "reconciliation_status",
+    "notes",
+)
+_ENTRY_RESPONSE_COLUMNS = ("id", "account_id", "debit_amount", "credit_amount", "notes")
+
+# Built once at import; validate_python on these skips the per-call overhead of model construction.
+_ACCOUNT_RESPONSE_ADAPTER = TypeAdapter(AccountResponse)
+_TRANSACTION_RESPONSE_ADAPTER = TypeAdapter(TransactionResponse)
+
+def _column_values(instance: object, names: tuple[str, ...]) -> dict[str, Any]:
+    """Read ``names`` from the instance state, going through the ORM only for expired or unloaded attributes."""
+    loaded = vars(instance)
+    return {name: loaded[name] if name in loaded else getattr(instance, name, None) for name in names}
+
+def _enum_value(value: Any) -> Any:
+    """Return an enum member's value and leave other values alone."""
+    return value.value if isinstance(value, Enum) else value
+
+def _account_response_payload(account: Account, account_service: AccountService) -> dict[str, Any]:
+    """Map an account's columns straight onto ``AccountResponse`` fields, decrypting notes."""
+    payload = _column_values(account, _ACCOUNT_RESPONSE_COLUMNS)
+    payload["accounting_category"] = _enum_value(payload["accounting_category"])
+    payload["banking_product_type"] = _enum_value(payload["banking_product_type"])
     decrypt_notes = getattr(account_service, "decrypt_notes", lambda value: value)
-    payload["notes"] = decrypt_notes(getattr(account, "notes", None))
+    payload["notes"] = decrypt_notes(payload["notes"])
+    payload["hierarchy_balance"] = account_service.get_account_hierarchy_balance(account.id)
+    return payload
 
-    available_balance = getattr(account, "available_balance", None)
-    if isinstance(available_balance, Decimal):
-        payload["available_balance"] = float(available_balance)
-
-    credit_limit = getattr(account, "credit_limit", None)
-    if isinstance(credit_limit, Decimal):
-        payload["credit_limit"] = float(credit_limit)
-
-    hierarchy_balance = account_service.get_account_hierarchy_balance(account.id)
-    payload["hierarchy_balance"] = float(hierarchy_balance)
-    return AccountResponse(**payload)
+def _account_response_from_model(account: Account, account_service: AccountService) -> AccountResponse:
+    """Return an AccountResponse validated once from the account's columns."""
+    return _ACCOUNT_RESPONSE_ADAPTER.validate_python(_account_response_payload(account, account_service))
 
 def _transaction_response_from_model(transaction: Transaction, currency: str) -> TransactionResponse:
-    """Build a TransactionResponse that includes all ledger entries."""
-    entries = [
-        TransactionEntryResponse(
-            entry_id=entry.id,
-            account_id=entry.account_id,
-            debit_amount=entry.debit_amount,
-            credit_amount=entry.credit_amount,
-            notes=entry.notes,
-        )
-        for entry in transaction.entries
-    ]
-    return TransactionResponse(
-        transaction_id=transaction.id,
-        effective_date=transaction.effective_date,
-        booking_date=transaction.booking_date,
-        description=transaction.description,
-        action_type=transaction.action_type,
-        action=transaction.action_type,
-        amount=_quantize_amount(transaction.amount),
-        currency=currency,
-        transfer_from_account_id=transaction.debit_account_id,
-        transfer_to_account_id=transaction.credit_account_id,
-        debit_account_id=transaction.debit_account_id,
-        credit_account_id=transaction.credit_account_id,
-        processing_status=str(transaction.processing_status),
-        reconciliation_status=str(transaction.reconciliation_status),
-        notes=transaction.notes,
-        memo=transaction.notes,
-        entries=entries,
+    """Build a TransactionResponse that includes all ledger entries, validating it and its entries in one pass."""
+    values = _column_values(transaction, _TRANSACTION_RESPONSE_COLUMNS)
+    entries = []
+    for entry in transaction.entries:
+        entry_values = _column_values(entry, _ENTRY_RESPONSE_COLUMNS)
+        entry_values["entry_id"] = entry_values.pop("id")
+        entries.append(entry_values)
+    return _TRANSACTION_RESPONSE_ADAPTER.validate_python(
+        {
+            "transaction_id": values["id"],
+            "effective_date": values["effective_date"],
+            "booking_date": values["booking_date"],
+            "description": values["description"],
+            "action_type": values["action_type"],
+            "action": values["action_type"],
+            "amount": _quantize_amount(values["amount"]),
+            "currency": currency,
+            "transfer_from_account_id": values["debit_account_id"],
+            "transfer_to_account_id": values["credit_account_id"],
+            "debit_account_id": values["debit_account_id"],
+            "credit_account_id": values["credit_account_id"],
+            "processing_status": str(_enum_value(values["processing_status"])),
+            "reconciliation_status": str(_enum_value(values["reconciliation_status"])),
+            "notes": values["notes"],
+            "memo": values["notes"],
+            "entries": entries,
+        }
     )
 
 def _quickfill_template_response_from_model(template: QuickFillTemplate) -> QuickFillTemplateResponse:
@@ -447,6 +485,9 @@ def _account_merge_plan_response(plan: AccountMergePlan) -> AccountMergePlanResp
         target_account_id=plan.target_account_id,
         reparenting_map=plan.reparenting_map,
         affected_entries_count=plan.affected_entries_count,
+        affected_transactions_count=plan.affected_transactions_count,
+        total_entries_count=plan.total_entries_count,
+        progress_phase=plan.progress_phase,
         status=plan.status,
         depth_validation_error=plan.depth_validation_error,
         audit_notes=plan.audit_notes,
@@ -491,6 +532,28 @@ def _apply_account_filters(
         filtered = [acc for acc in filtered if term in acc.name.lower()]
     return filtered
 
+def _ledger_etag(version: tuple[int, ...] | None) -> str | None:
+    """Quote a ledger version stamp as a strong ETag, or return ``None`` when there is no stamp."""
+    if version is None:
+        return None
+    return '"' + "-".join(str(part) for part in version) + '"'
+
+def _etag_matches(if_none_match: str | None, etag: str | None) -> bool:
+    """Return whether an ``If-None-Match`` header lists ``etag``, comparing weakly as RFC 9110 requires."""
+    if not if_none_match or etag is None:
+        return False
+    return etag in {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+
+def _conditional_get(response: Response, if_none_match: str | None, etag: str | None) -> Response | None:
+    """Return a 304 response when the client's copy is current; otherwise tag ``response`` with ``etag``."""
+    if etag is None:
+        return None
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
 # --- API Router ---
 router = APIRouter(prefix="/accounts", tags=["Accounts"])
 transactions_router = APIRouter(tags=["Transactions"])
@@ -557,12 +620,16 @@ def create_account(
 
 @router.get(
     "/",
+    response_model=list[AccountResponse],
     responses={
+        304: {"description": "The ledger has not changed since the ETag sent in If-None-Match."},
         400: {"description": "Search term exceeds the allowed length or contains invalid characters."},
         401: {"description": "Authentication required."},
     },
 )
 def get_accounts(
+    response: Response,
+    if_none_match: Annotated[str | None, Header()] = None,
     search_term: str | None = None,
     hidden: bool | None = None,
     placeholder: bool | None = None,
@@ -570,12 +637,20 @@ def get_accounts(
     include_placeholder: str | None = None,
     account_service: AccountService = account_service_dependency,
     _current_user: TokenPayload = _viewer_dependency
-) -> list[AccountResponse]:
-    """Retrieve a filtered list of accounts, respecting legacy query params."""
+) -> list[AccountResponse] | Response:
+    """Retrieve a filtered list of accounts, respecting legacy query params.
+
+    The ``ETag`` is the ledger-wide version stamp; a matching ``If-None-Match`` gets a 304
+    before any account is loaded.
+    """
     hidden_filter = _resolve_visibility_filter(hidden, include_hidden, default_value=False)
     placeholder_filter = _resolve_visibility_filter(placeholder, include_placeholder, default_value=False)
 
     sanitized_search = _sanitize_search_term(search_term)
+    get_ledger_version = getattr(account_service, "get_ledger_version", lambda: None)
+    not_modified = _conditional_get(response, if_none_match, _ledger_etag(get_ledger_version()))
+    if not_modified is not None:
+        return not_modified
     all_accounts = account_service.get_all_accounts()
     current_user = _resolve_current_user(_current_user)
     logger.debug(
@@ -595,21 +670,74 @@ def get_accounts(
 
     return [_account_response_from_model(acc, account_service) for acc in filtered_accounts]
 
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    responses={
+        400: {"description": "Search term exceeds the allowed length or contains invalid characters."},
+        401: {"description": "Authentication required."},
+    },
+)
+def stream_accounts(
+    search_term: str | None = None,
+    hidden: bool | None = None,
+    placeholder: bool | None = None,
+    include_hidden: str | None = None,
+    include_placeholder: str | None = None,
+    format: StreamFormat = StreamFormat.NDJSON,
+    account_service: AccountService = account_service_dependency,
+    _current_user: TokenPayload = _viewer_dependency
+) -> StreamingResponse:
+    """Stream the same accounts as ``GET /accounts/`` without building the whole list first.
+
+    ``format=ndjson`` (the default) writes one account per line; ``format=json`` writes a JSON array.
+    """
+    hidden_filter = _resolve_visibility_filter(hidden, include_hidden, default_value=False)
+    placeholder_filter = _resolve_visibility_filter(placeholder, include_placeholder, default_value=False)
+    sanitized_search = _sanitize_search_term(search_term)
+    current_user = _resolve_current_user(_current_user)
+    logger.debug(
+        "Streaming accounts hidden=%s placeholder=%s search=%s format=%s user=%s",
+        hidden_filter,
+        placeholder_filter,
+        sanitized_search,
+        format.value,
+        current_user.subject,
+    )
+
+    accounts = account_service.stream_accounts(
+        hidden=hidden_filter, placeholder=placeholder_filter, search_term=sanitized_search
+    )
+    responses = (_account_response_from_model(acc, account_service) for acc in accounts)
+    return StreamingResponse(encode_stream(responses, format), media_type=format.media_type)
+
 @router.get(
     "/{account_id}",
+    response_model=AccountResponse,
     responses={
+        304: {"description": "The account has not changed since the ETag sent in If-None-Match."},
         401: {"description": "Authentication required."},
         404: {"description": ACCOUNT_NOT_FOUND_DETAIL},
     },
 )
 def get_account_by_id(
     account_id: UUID,
+    response: Response,
+    if_none_match: Annotated[str | None, Header()] = None,
     account_service: AccountService = account_service_dependency,
     _current_user: TokenPayload = _viewer_dependency
-) -> AccountResponse:
-    """Retrieve a specific account by its identifier."""
+) -> AccountResponse | Response:
+    """Retrieve a specific account by its identifier.
+
+    The ``ETag`` is the account's version stamp, which also changes with its descendants;
+    a matching ``If-None-Match`` gets a 304 before the account or its hierarchy balance is loaded.
+    """
     current_user = _resolve_current_user(_current_user)
     logger.debug("Retrieving account id=%s user=%s", account_id, current_user.subject)
+    get_ledger_version = getattr(account_service, "get_ledger_version", lambda _account_id: None)
+    not_modified = _conditional_get(response, if_none_match, _ledger_etag(get_ledger_version(str(account_id))))
+    if not_modified is not None:
+        return not_modified
     account = account_service.get_account(str(account_id))
     if account is None:
         logger.warning("Account id=%s not found", account_id)
@@ -674,19 +802,28 @@ def update_account(
     "/{account_id}",
     status_code=204,
     responses={
+        202: {"description": "Account marked for deletion; dependents are purged in the background."},
+        400: {"description": "Account cannot be deleted while it has placeholder children."},
         401: {"description": "Authentication required."},
         404: {"description": ACCOUNT_NOT_FOUND_DETAIL},
     },
 )
 def delete_account(
     account_id: UUID,
+    background: bool = False,
     account_service: AccountService = account_service_dependency,
     _current_user: TokenPayload = _operator_dependency
-) -> None:
-    """Delete an account by its ID."""
+) -> Response:
+    """Delete an account by its ID, or mark it for background purging when ``background`` is set."""
     current_user = _resolve_current_user(_current_user)
-    logger.info("Deleting account id=%s user=%s", account_id, current_user.subject)
-    success = account_service.delete_account(str(account_id))
+    logger.info("Deleting account id=%s user=%s background=%s", account_id, current_user.subject, background)
+    try:
+        if background:
+            success = account_service.mark_account_for_deletion(str(account_id))
+        else:
+            success = account_service.delete_account(str(account_id))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     if not success:
         logger.warning(
             "Attempted to delete missing account id=%s user=%s",
@@ -694,6 +831,7 @@ def delete_account(
             current_user.subject,
         )
         raise HTTPException(status_code=404, detail=ACCOUNT_NOT_FOUND_DETAIL)
+    return Response(status_code=202 if background else 204)
 
 @router.post(
     "/transactions/",
@@ -826,17 +964,53 @@ def adjust_account_balance_alias(
 )
 def list_duplicate_candidates(
     account_id: UUID,
+    scope: str = "account",
     limit: int = 25,
     transaction_service: TransactionService = transaction_service_dependency,
     _current_user: TokenPayload = _viewer_dependency,
 ) -> list[DuplicateCandidateResponse]:
-    """List detected duplicates for a given account."""
+    """List detected duplicates for a given account or for the account group rooted at it."""
     try:
-        candidates = transaction_service.list_duplicate_candidates(account_id=str(account_id), limit=limit)
+        candidates = transaction_service.list_duplicate_candidates(
+            account_id=str(account_id),
+            scope=scope,
+            limit=limit,
+        )
         return [_duplicate_candidate_to_response(candidate) for candidate in candidates]
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
+@router.get(
+    "/duplicates/scan",
+    responses={
+        400: {"description": "Missing required account_id, invalid scope or invalid cursor."},
+        401: {"description": "Authentication required."},
+    },
+)
+def scan_duplicate_candidates(
+    account_id: UUID,
+    scope: str = "account",
+    limit: int = 25,
+    cursor: str | None = None,
+    transaction_service: TransactionService = transaction_service_dependency,
+    _current_user: TokenPayload = _viewer_dependency,
+) -> DuplicateScanResponse:
+    """Run one time-budgeted duplicate scan pass; pass ``next_cursor`` back to continue a partial scan."""
+    try:
+        result = transaction_service.run_duplicate_scan(
+            account_id=str(account_id),
+            scope=scope,
+            limit=limit,
+            cursor=cursor,
+        )
+        return DuplicateScanResponse(
+            candidates=[_duplicate_candidate_to_response(candidate) for candidate in result.candidates],
+            next_cursor=result.next_cursor,
+            complete=result.complete,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
 @router.post(
     "/duplicates/merge",
     responses={
@@ -886,6 +1060,44 @@ def merge_accounts(
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
+@router.get(
+    "/merge/{plan_id}",
+    responses={
+        401: {"description": "Authentication required."},
+        404: {"description": "Merge plan not found."},
+    },
+)
+def get_account_merge_plan(
+    plan_id: str,
+    account_service: AccountService = account_service_dependency,
+    _current_user: TokenPayload = _viewer_dependency,
+) -> AccountMergePlanResponse:
+    """Report the status and progress counters of an account merge."""
+    plan = account_service.get_merge_plan(plan_id)
+    if plan is None:
+        raise HTTPException(status_code=404, detail="Merge plan not found")
+    return _account_merge_plan_response(plan)
+
+@router.post(
+    "/merge/{plan_id}/resume",
+    responses={
+        400: {"description": "Merge plan cannot be resumed."},
+        401: {"description": "Authentication required."},
+    },
+)
+def resume_account_merge(
+    plan_id: str,
+    account_service: AccountService = account_service_dependency,
+    _current_user: TokenPayload = _operator_dependency,
+) -> AccountMergePlanResponse:
+    """Continue an interrupted account merge from its recorded progress."""
+    current_user = _resolve_current_user(_current_user)
+    try:
+        plan = account_service.resume_account_merge(plan_id, executed_by=current_user.subject)
+        return _account_merge_plan_response(plan)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
 # --- QuickFill Endpoints ---
 # Ensure quickfill_router is correctly defined and routes are added to it.
 # The previous logs indicated redefinition warnings, so consolidating is key.
@@ -893,7 +1105,9 @@ def merge_accounts(
 
 @quickfill_router.get(
     "/",
+    response_model=list[QuickFillTemplateResponse],
     responses={
+        304: {"description": "The ledger has not changed since the ETag sent in If-None-Match."},
         400: {"description": "Missing or invalid QuickFill filters."},
         401: {"description": "Authentication required."},
         403: {"description": "Insufficient privileges to view pending templates."},
@@ -901,15 +1115,22 @@ def merge_accounts(
     },
 )
 def get_quickfill_templates(
+    response: Response,
     action: ActionField,
     currency: CurrencyField,
     query: str | None = None,
     limit: int | None = 1,
     include_unapproved: bool = False,
+    if_none_match: Annotated[str | None, Header()] = None,
     transaction_service: TransactionService = transaction_service_dependency,
     _current_user: TokenPayload = _viewer_dependency,
-) -> list[QuickFillTemplateResponse]:
-    """Return QuickFill templates filtered by action/currency + optional memo query."""
+) -> list[QuickFillTemplateResponse] | Response:
+    """Return QuickFill templates filtered by action/currency + optional memo query.
+
+    The ``ETag`` is the ledger-wide version stamp. It reflects only usage that the periodic or
+    threshold flush has already written, since reads never flush the buffer; a matching
+    ``If-None-Match`` gets a 304 before templates are ranked or loaded.
+    """
     current_user = _resolve_current_user(_current_user)
     if include_unapproved and Role.ADMIN not in current_user.roles:
         raise HTTPException(status_code=403, detail="Only administrators can inspect pending templates.")
@@ -917,6 +1138,11 @@ def get_quickfill_templates(
     normalized_limit = max(1, min(limit or 1, 25))
 
     try:
+        version = transaction_service.get_quickfill_ledger_version(action, currency)
+        etag = _ledger_etag(None if version is None else (version,))
+        not_modified = _conditional_get(response, if_none_match, etag)
+        if not_modified is not None:
+            return not_modified
         candidates = transaction_service.rank_quickfill_candidates(
             action_type=action,
             currency=currency,
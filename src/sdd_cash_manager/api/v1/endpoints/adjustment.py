@@ -8,10 +8,13 @@ from sdd_cash_manager.database import get_db
 from sdd_cash_manager.lib.auth import Role, TokenPayload, require_role
 from sdd_cash_manager.models.adjustment import ManualBalanceAdjustment as ManualBalanceAdjustmentModel
 from sdd_cash_manager.schemas.adjustment import (
-    ManualBalanceAdjustment as ManualBalanceAdjustmentSchema,
+    BulkBalanceAdjustmentCreate,
+    BulkBalanceAdjustmentResponse,
+    BulkBalanceAdjustmentResult,
+    ManualBalanceAdjustmentCreate,
 )
 from sdd_cash_manager.schemas.adjustment import (
-    ManualBalanceAdjustmentCreate,
+    ManualBalanceAdjustment as ManualBalanceAdjustmentSchema,
 )
 from sdd_cash_manager.services.adjustment_service import ManualBalanceAdjustmentService
 
@@ -21,6 +24,45 @@ _adjustment_operator_dependency = Depends(require_role(Role.OPERATOR))
 _get_db_dependency = Depends(get_db)
 
 
+@router.post(
+    "/accounts/adjust-balance/bulk",
+    response_model=BulkBalanceAdjustmentResponse,
+    summary="Manually adjust many accounts' balances in one request",
+)
+async def create_bulk_balance_adjustments(
+    adjustment_data: BulkBalanceAdjustmentCreate,
+    db: Session = _get_db_dependency,
+    current_user: TokenPayload = _adjustment_operator_dependency,
+) -> BulkBalanceAdjustmentResponse:
+    """
+    Adjust every listed account to its target balance and commit once.
+
+    Returns one result per account in request order, including zero-difference
+    adjustments and accounts that were not found.
+    """
+    submitted_by_user_id = current_user.subject or adjustment_data.submitted_by_user_id
+    logger.info(
+        "Received bulk adjustment of %d accounts (requested by %s)",
+        len(adjustment_data.adjustments),
+        submitted_by_user_id,
+    )
+
+    try:
+        outcomes = ManualBalanceAdjustmentService(db).create_bulk_adjustments(
+            adjustment_data.adjustments,
+            submitted_by_user_id,
+        )
+    except ValueError as exc:
+        logger.warning("Bulk adjustment request failed: %s", exc)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except RuntimeError as exc:
+        logger.error("Runtime failure applying bulk balance adjustments: %s", exc, exc_info=True)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)) from exc
+    return BulkBalanceAdjustmentResponse(
+        results=[BulkBalanceAdjustmentResult.model_validate(outcome) for outcome in outcomes]
+    )
+
+
 @router.post(
     "/accounts/{account_id}/adjust-balance",
     response_model=ManualBalanceAdjustmentSchema,
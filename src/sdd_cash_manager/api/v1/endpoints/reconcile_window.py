@@ -1,18 +1,26 @@
 import logging
+from typing import Iterator
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from sdd_cash_manager.database import get_db
+from sdd_cash_manager.lib.statement_matching import StatementLine
+from sdd_cash_manager.lib.streaming import StreamFormat, encode_stream
 from sdd_cash_manager.schemas.reconciliation_schema import (
+    AcceptMatchesRequest,
     DifferenceResponse,
     ReconciliationSessionRequest,
     ReconciliationSessionResponse,
+    StatementMatchProposalResponse,
+    StatementMatchRequest,
+    StatementMatchResponse,
     TransactionSelectionRequest,
     TransactionSummary,
     UnreconciledTransactionsResponse,
 )
-from sdd_cash_manager.services.reconciliation_service import ReconciliationService
+from sdd_cash_manager.services.reconciliation_service import ReconciliationService, UnreconciledTransaction
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/reconciliation", tags=["reconciliation"])
@@ -29,6 +37,7 @@ async def create_reconciliation_session(
         db,
         statement_date=payload.statement_date,
         ending_balance=payload.ending_balance,
+        account_id=payload.account_id,
     )
     service.create_bank_statement_snapshot(
         db,
@@ -38,6 +47,7 @@ async def create_reconciliation_session(
     return ReconciliationSessionResponse(
         id=session_obj.id,
         statement_date=session_obj.statement_date,
+        account_id=session_obj.account_id,
         ending_balance=session_obj.ending_balance,
         difference=session_obj.difference,
         state=session_obj.state,
@@ -46,39 +56,63 @@ async def create_reconciliation_session(
     )
 
 
-@router.get("/sessions/unreconciled")
+def _transaction_summary(tx: UnreconciledTransaction) -> TransactionSummary:
+    return TransactionSummary(
+        id=tx.id,
+        amount=tx.amount,
+        date=tx.effective_date.date(),
+        description=tx.description,
+        processing_status=tx.processing_status.value if hasattr(
+            tx.processing_status, "value") else str(tx.processing_status),
+        reconciliation_status=tx.reconciliation_status.value if hasattr(
+            tx.reconciliation_status, "value") else str(tx.reconciliation_status),
+    )
+
+
+@router.get(
+    "/sessions/unreconciled",
+    responses={400: {"description": "Invalid cursor."}},
+)
 async def list_unreconciled_transactions(
+    account_id: str | None = None,
+    limit: int = 100,
+    cursor: str | None = None,
     db: Session = _get_db_dependency,
 ) -> UnreconciledTransactionsResponse:
+    """Return one keyset page of open transactions; pass ``next_cursor`` back for the next page."""
     service = ReconciliationService(db)
     cutoff = service.get_latest_statement_cutoff(db)
-    transactions = service.get_unreconciled_transactions(db, cutoff)
-    payload = [
-        TransactionSummary(
-            id=tx.id,
-            amount=tx.amount,
-            date=tx.effective_date.date(),
-            description=tx.description,
-            processing_status=tx.processing_status.value if hasattr(
-                tx.processing_status, "value") else str(tx.processing_status),
-            reconciliation_status=tx.reconciliation_status.value if hasattr(
-                tx.reconciliation_status, "value") else str(tx.reconciliation_status),
-        )
-        for tx in transactions
-    ]
-    return UnreconciledTransactionsResponse(transactions=payload)
+    try:
+        page = service.get_unreconciled_page(db, cutoff, account_id=account_id, limit=limit, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return UnreconciledTransactionsResponse(
+        transactions=[_transaction_summary(tx) for tx in page.transactions],
+        next_cursor=page.next_cursor,
+    )
 
 
-@router.post("/sessions/{session_id}/transactions")
-async def apply_reconciliation_transactions(
-    session_id: str,
-    payload: TransactionSelectionRequest,
+@router.get("/sessions/unreconciled/stream", response_class=StreamingResponse)
+async def stream_unreconciled_transactions(
+    account_id: str | None = None,
+    format: StreamFormat = StreamFormat.NDJSON,
     db: Session = _get_db_dependency,
-) -> DifferenceResponse:
+) -> StreamingResponse:
+    """Stream every open transaction as NDJSON, one ``TransactionSummary`` per line, or as a JSON array."""
+    service = ReconciliationService(db)
+    cutoff = service.get_latest_statement_cutoff(db)
+
+    def summaries() -> Iterator[TransactionSummary]:
+        for tx in service.stream_unreconciled_transactions(db, cutoff, account_id=account_id):
+            yield _transaction_summary(tx)
+
+    return StreamingResponse(encode_stream(summaries(), format), media_type=format.media_type)
+
+
+def _apply_selection(db: Session, session_id: str, transaction_ids: list[str]) -> DifferenceResponse:
     service = ReconciliationService(db)
     try:
-        _, response_payload = service.add_transactions_to_session(
-            db, session_id, payload.transaction_ids)
+        _, response_payload = service.add_transactions_to_session(db, session_id, transaction_ids)
         return DifferenceResponse(**response_payload)
     except ValueError as exc:
         raise HTTPException(
@@ -90,3 +124,76 @@ async def apply_reconciliation_transactions(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Could not update reconciliation session",
         ) from exc
+
+
+@router.post("/sessions/{session_id}/transactions")
+async def apply_reconciliation_transactions(
+    session_id: str,
+    payload: TransactionSelectionRequest,
+    db: Session = _get_db_dependency,
+) -> DifferenceResponse:
+    return _apply_selection(db, session_id, payload.transaction_ids)
+
+
+@router.post(
+    "/sessions/{session_id}/matches",
+    responses={404: {"description": "Reconciliation session not found."}},
+)
+async def propose_statement_matches(
+    session_id: str,
+    payload: StatementMatchRequest,
+    db: Session = _get_db_dependency,
+) -> StatementMatchProposalResponse:
+    """Propose matches between imported statement lines and open transactions without applying them."""
+    lines = [
+        StatementLine(
+            line_id=line.line_id or str(index),
+            amount=line.amount,
+            date=line.date,
+            description=line.description,
+        )
+        for index, line in enumerate(payload.lines)
+    ]
+    service = ReconciliationService(db)
+    try:
+        proposal = service.propose_statement_matches(
+            db, session_id, lines, date_tolerance_days=payload.date_tolerance_days
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    return StatementMatchProposalResponse(
+        matches=[
+            StatementMatchResponse(
+                line_id=match.line_id,
+                transaction_id=match.transaction_id,
+                score=match.score,
+                strategy=match.strategy,
+            )
+            for match in proposal.matches
+        ],
+        unmatched_line_ids=proposal.unmatched_line_ids,
+        residual_difference=proposal.residual_difference,
+        difference_explanation=proposal.difference_explanation,
+    )
+
+
+@router.post(
+    "/sessions/{session_id}/matches/accept",
+    responses={
+        400: {"description": "A transaction was accepted for more than one statement line."},
+        404: {"description": "Reconciliation session not found."},
+    },
+)
+async def accept_statement_matches(
+    session_id: str,
+    payload: AcceptMatchesRequest,
+    db: Session = _get_db_dependency,
+) -> DifferenceResponse:
+    """Select the transactions of every accepted match for the session in one bulk update."""
+    transaction_ids = [match.transaction_id for match in payload.matches]
+    if len(set(transaction_ids)) != len(transaction_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Each transaction can only be matched to one statement line.",
+        )
+    return _apply_selection(db, session_id, transaction_ids)
@@ -1,40 +1,108 @@
+from datetime import date
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from sdd_cash_manager.database import get_db
+from sdd_cash_manager.lib.streaming import StreamFormat, encode_stream
+from sdd_cash_manager.models.enums import ReconciliationStatus
+from sdd_cash_manager.schemas.reconciliation import ReconciliationStatusTotal, ReconciliationSummary
 from sdd_cash_manager.schemas.reconciliation import ReconciliationViewEntry as ReconciliationViewEntrySchema
 from sdd_cash_manager.services.reconciliation_service import ReconciliationService
 
 router = APIRouter()
 _get_db_dependency = Depends(get_db)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
 
 @router.get(
     "/accounts/{account_id}/reconciliation",
     summary="Get reconciliation view entries for an account",
+    responses={400: {"description": "Invalid cursor."}},
 )
 async def get_reconciliation_view(
     account_id: UUID,
+    response: Response,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    reconciled_status: ReconciliationStatus | None = None,
+    limit: int = 100,
+    cursor: str | None = None,
     db: Session = _get_db_dependency,
 ) -> List[ReconciliationViewEntrySchema]:
     """
-    Retrieve reconciliation entries for a specific account.
+    Retrieve one page of reconciliation entries for a specific account.
 
-    This endpoint returns a list of entries that are visible in the reconciliation view,
-    including both standard transactions and manual adjustments.
+    This endpoint returns entries that are visible in the reconciliation view, including
+    both standard transactions and manual adjustments, ordered by entry date. When more
+    entries remain, the ``X-Next-Cursor`` response header carries the cursor for the next page.
     """
     try:
         reconciliation_service = ReconciliationService(db)
-        reconciliation_models = reconciliation_service.get_reconciliation_entries_for_account(account_id)
-        return [
-            ReconciliationViewEntrySchema.model_validate(model)
-            for model in reconciliation_models
-        ]
+        page = reconciliation_service.get_reconciliation_view_page(
+            account_id,
+            start_date=start_date,
+            end_date=end_date,
+            reconciled_status=reconciled_status,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
     except Exception as e:
         print(f"Error fetching reconciliation view for account {account_id}: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An internal error occurred while fetching reconciliation data."
         ) from e
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return [ReconciliationViewEntrySchema.model_validate(model) for model in page.entries]
+
+
+@router.get(
+    "/accounts/{account_id}/reconciliation/stream",
+    response_class=StreamingResponse,
+    summary="Stream every reconciliation view entry for an account",
+)
+async def stream_reconciliation_view(
+    account_id: UUID,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    reconciled_status: ReconciliationStatus | None = None,
+    format: StreamFormat = StreamFormat.NDJSON,
+    db: Session = _get_db_dependency,
+) -> StreamingResponse:
+    """Stream all matching entries, unpaginated, as NDJSON (the default) or a JSON array."""
+    entries = ReconciliationService(db).stream_reconciliation_view(
+        account_id, start_date=start_date, end_date=end_date, reconciled_status=reconciled_status
+    )
+    schemas = (ReconciliationViewEntrySchema.model_validate(model) for model in entries)
+    return StreamingResponse(encode_stream(schemas, format), media_type=format.media_type)
+
+
+@router.get(
+    "/accounts/{account_id}/reconciliation/summary",
+    summary="Get reconciliation totals by status for an account",
+)
+async def get_reconciliation_summary(
+    account_id: UUID,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    db: Session = _get_db_dependency,
+) -> ReconciliationSummary:
+    """Return the count and amount of the account's reconciliation entries per status."""
+    totals = ReconciliationService(db).summarize_reconciliation_view(
+        account_id, start_date=start_date, end_date=end_date
+    )
+    return ReconciliationSummary(
+        account_id=account_id,
+        start_date=start_date,
+        end_date=end_date,
+        totals=[
+            ReconciliationStatusTotal(reconciled_status=total.status, count=total.count, total_amount=total.total_amount)
+            for total in totals
+        ],
+    )
@@ -0,0 +1,157 @@
+"""Maintenance command line for sdd-cash-manager: ``python -m sdd_cash_manager.cli <command>``.
+
+Each command imports the services it needs when it runs, so ``--help`` and quick commands
+do not pay for pyarrow or the whole service layer.
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import Callable, Sequence
+
+from sdd_cash_manager import database
+
+
+def _create_schema(_args: argparse.Namespace) -> int:
+    database.create_tables()
+    print(f"Created any missing tables in {database.DATABASE_URL}.")
+    return 0
+
+
+def _recover_quickfill(_args: argparse.Namespace) -> int:
+    from sdd_cash_manager.services.quickfill_aggregator import rebuild_quickfill_templates
+
+    with database.SessionLocal() as session:
+        rebuilt = rebuild_quickfill_templates(session)
+    print(f"Rebuilt {rebuilt} QuickFill templates from the transactions table.")
+    return 0
+
+
+def _decay_quickfill(_args: argparse.Namespace) -> int:
+    from sdd_cash_manager.services.maintenance import run_quickfill_decay
+
+    result = run_quickfill_decay()
+    print(
+        f"Updated {result.updated} and pruned {result.pruned} QuickFill templates "
+        f"in {result.duration_seconds * 1000:.2f}ms."
+    )
+    return 0
+
+
+def _rebuild_reconciliation_counters(_args: argparse.Namespace) -> int:
+    from sdd_cash_manager.services.reconciliation_counters import rebuild_reconciliation_counters
+
+    with database.SessionLocal() as session:
+        rebuilt = rebuild_reconciliation_counters(session)
+    print(f"Rebuilt reconciliation counters for {rebuilt} accounts (including the ledger total).")
+    return 0
+
+
+def _snapshot_ledger(_args: argparse.Namespace) -> int:
+    from sdd_cash_manager.services.maintenance import run_ledger_snapshot
+
+    sequence = run_ledger_snapshot()
+    print(f"Ledger snapshot covers the journal up to sequence {sequence}.")
+    return 0
+
+
+def _replay_ledger(args: argparse.Namespace) -> int:
+    from sdd_cash_manager.services.ledger_journal import replay_ledger
+
+    with database.SessionLocal() as session:
+        state = replay_ledger(session, args.sequence)
+    start = "the start of the journal" if state.snapshot_sequence is None else f"snapshot {state.snapshot_sequence}"
+    print(f"Balances as of sequence {state.sequence} (replayed from {start}):")
+    for account_id in sorted(state.balances):
+        print(f"{account_id} {state.balances[account_id]}")
+    return 0
+
+
+def _restore_balances(_args: argparse.Namespace) -> int:
+    from sdd_cash_manager.services.ledger_journal import restore_account_balances
+
+    with database.SessionLocal() as session:
+        changed = restore_account_balances(session)
+    print(f"Restored the balance of {changed} accounts from the ledger journal.")
+    return 0
+
+
+def _export_ledger(args: argparse.Namespace) -> int:
+    from sdd_cash_manager.services.ledger_export import export_ledger
+
+    with database.SessionLocal() as session:
+        result = export_ledger(session, args.output, batch_size=args.batch_size)
+    print(
+        f"Exported {result.transactions} transactions, {result.entries} entries and {result.accounts} accounts "
+        f"to {len(result.files)} Parquet files under {args.output}."
+    )
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the argument parser with one sub-command per maintenance job."""
+    parser = argparse.ArgumentParser(prog="sdd_cash_manager.cli", description="sdd-cash-manager maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    schema = subparsers.add_parser(
+        "create-schema",
+        help="Create any missing tables; run before the first start of the API.",
+    )
+    schema.set_defaults(handler=_create_schema)
+
+    recover = subparsers.add_parser(
+        "recover-quickfill",
+        help="Rebuild QuickFill template counters from the transactions table after a crash; stop the API workers first.",
+    )
+    recover.set_defaults(handler=_recover_quickfill)
+
+    decay = subparsers.add_parser(
+        "decay-quickfill",
+        help="Recompute QuickFill confidence for every template and prune templates outside the history window.",
+    )
+    decay.set_defaults(handler=_decay_quickfill)
+
+    counters = subparsers.add_parser(
+        "rebuild-reconciliation-counters",
+        help="Recompute the per-account uncleared/cleared/reconciled counters from the transactions table.",
+    )
+    counters.set_defaults(handler=_rebuild_reconciliation_counters)
+
+    snapshot = subparsers.add_parser(
+        "snapshot-ledger",
+        help="Snapshot every account balance at the newest ledger journal sequence.",
+    )
+    snapshot.set_defaults(handler=_snapshot_ledger)
+
+    replay = subparsers.add_parser(
+        "replay-ledger",
+        help="Print every non-zero account balance as of a ledger journal sequence.",
+    )
+    replay.add_argument("--sequence", type=int, default=None, help="Journal sequence to stop at (default: newest).")
+    replay.set_defaults(handler=_replay_ledger)
+
+    restore = subparsers.add_parser(
+        "restore-balances",
+        help="Overwrite account balances with the balances replayed from the ledger journal.",
+    )
+    restore.set_defaults(handler=_restore_balances)
+
+    export = subparsers.add_parser(
+        "export-ledger",
+        help="Export transactions and entries changed since the last run, and all accounts, to monthly Parquet files.",
+    )
+    export.add_argument("--output", required=True, help="Export directory; reuse it so runs stay incremental.")
+    export.add_argument("--batch-size", type=int, default=None, help="Rows per keyset batch (default: settings).")
+    export.set_defaults(handler=_export_ledger)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Parse ``argv`` and run the selected command, returning its exit code."""
+    args = build_parser().parse_args(argv)
+    handler: Callable[[argparse.Namespace], int] = args.handler
+    return handler(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
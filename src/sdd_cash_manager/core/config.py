@@ -92,12 +92,54 @@ class AppSettings:
     quickfill_history_days: int = field(
         default_factory=lambda: _coerce_int("SDD_CASH_MANAGER_QUICKFILL_HISTORY_DAYS", 30)
     )
+    quickfill_index_ttl_seconds: int = field(
+        default_factory=lambda: _coerce_int("SDD_CASH_MANAGER_QUICKFILL_INDEX_TTL_SECONDS", 300)
+    )
+    quickfill_flush_interval_seconds: int = field(
+        default_factory=lambda: _coerce_int("SDD_CASH_MANAGER_QUICKFILL_FLUSH_INTERVAL_SECONDS", 5)
+    )
+    quickfill_flush_max_pending: int = field(
+        default_factory=lambda: _coerce_int("SDD_CASH_MANAGER_QUICKFILL_FLUSH_MAX_PENDING", 1000)
+    )
+    quickfill_decay_interval_seconds: int = field(
+        default_factory=lambda: _coerce_int("SDD_CASH_MANAGER_QUICKFILL_DECAY_INTERVAL_SECONDS", 3600)
+    )
+    account_merge_chunk_size: int = field(
+        default_factory=lambda: _coerce_int("SDD_CASH_MANAGER_ACCOUNT_MERGE_CHUNK_SIZE", 1000)
+    )
+    account_purge_chunk_size: int = field(
+        default_factory=lambda: _coerce_int("SDD_CASH_MANAGER_ACCOUNT_PURGE_CHUNK_SIZE", 500)
+    )
+    account_purge_interval_seconds: int = field(
+        default_factory=lambda: _coerce_int("SDD_CASH_MANAGER_ACCOUNT_PURGE_INTERVAL_SECONDS", 10)
+    )
+    reconciliation_stream_batch_size: int = field(
+        default_factory=lambda: _coerce_int("SDD_CASH_MANAGER_RECONCILIATION_STREAM_BATCH_SIZE", 1000)
+    )
+    account_stream_batch_size: int = field(
+        default_factory=lambda: _coerce_int("SDD_CASH_MANAGER_ACCOUNT_STREAM_BATCH_SIZE", 500)
+    )
+    balance_update_max_attempts: int = field(
+        default_factory=lambda: _coerce_int("SDD_CASH_MANAGER_BALANCE_UPDATE_MAX_ATTEMPTS", 3)
+    )
+    balance_shard_count: int = field(
+        default_factory=lambda: _coerce_int("SDD_CASH_MANAGER_BALANCE_SHARD_COUNT", 8)
+    )
+    export_batch_size: int = field(
+        default_factory=lambda: _coerce_int("SDD_CASH_MANAGER_EXPORT_BATCH_SIZE", 5000)
+    )
+    ledger_snapshot_interval_seconds: int = field(
+        default_factory=lambda: _coerce_int("SDD_CASH_MANAGER_LEDGER_SNAPSHOT_INTERVAL_SECONDS", 3600)
+    )
     duplicate_scan_batch_size: int = field(
         default_factory=lambda: _coerce_int("SDD_CASH_MANAGER_DUPLICATE_SCAN_BATCH_SIZE", 1000)
     )
     duplicate_scan_timeout_seconds: int = field(
         default_factory=lambda: _coerce_int("SDD_CASH_MANAGER_DUPLICATE_SCAN_TIMEOUT_SECONDS", 3)
     )
+    duplicate_scan_workers: int = field(
+        default_factory=lambda: _coerce_int("SDD_CASH_MANAGER_DUPLICATE_SCAN_WORKERS", 4)
+    )
 
 
 settings: Final[AppSettings] = AppSettings()
@@ -1,20 +1,53 @@
+"""Database engine and session factory, created on first use rather than at import.
+
+Importing this module neither imports the models, connects nor configures the ORM mappers,
+so test collection, the CLI and worker processes only pay for them once they open a session. The schema
+is created by ``python -m sdd_cash_manager.cli create-schema``, not by the application.
+"""
+
 import logging
+import threading
+from typing import Any
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import configure_mappers, sessionmaker
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.orm import Session, configure_mappers, sessionmaker
 
 from sdd_cash_manager.core.config import settings
-from sdd_cash_manager.models.base import Base
 
-# Configure mappers after models are defined and imported
-configure_mappers()
 DATABASE_URL = settings.database_url
 
-engine = create_engine(DATABASE_URL, echo=settings.database_echo)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Set by ``get_engine`` on first use; assign an engine here to point the application elsewhere.
+engine: Engine | None = None
+_engine_lock = threading.Lock()
 logger = logging.getLogger(__name__)
 
 
+def get_engine() -> Engine:
+    """Return the application engine, creating it (and configuring the mappers) on first call."""
+    global engine
+    if engine is None:
+        with _engine_lock:
+            if engine is None:
+                # Register every model, then configure the mappers before the first session.
+                import sdd_cash_manager.models  # noqa: F401
+
+                configure_mappers()
+                engine = create_engine(DATABASE_URL, echo=settings.database_echo)
+    return engine
+
+
+class _LazySessionMaker(sessionmaker[Session]):
+    """A ``sessionmaker`` that binds its sessions to ``get_engine()`` unless given a bind."""
+
+    def __call__(self, **local_kw: Any) -> Session:
+        if "bind" not in local_kw and self.kw.get("bind") is None:
+            local_kw["bind"] = get_engine()
+        return super().__call__(**local_kw)
+
+
+SessionLocal = _LazySessionMaker(autocommit=False, autoflush=False)
+
+
 def get_db():
     """Yield a database session for request handling and log lifecycle events."""
     db = SessionLocal()
@@ -28,5 +61,7 @@ def get_db():
 
 def create_tables():
     """Create database tables from the registered models."""
-    logger.info("Creating database tables using %s", settings.database_url)
-    Base.metadata.create_all(bind=engine)
+    from sdd_cash_manager.models.base import Base
+
+    logger.info("Creating database tables using %s", DATABASE_URL)
+    Base.metadata.create_all(bind=get_engine())
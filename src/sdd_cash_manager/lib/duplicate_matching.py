@@ -0,0 +1,248 @@
+"""
+Fuzzy duplicate detection for ledger transactions.
+
+Matching runs in three steps so the cost stays close to linear in the number of
+transactions scanned:
+
+1. Blocking: only transactions with the same amount whose effective dates fall
+   inside a small window are compared, and each transaction is compared with a
+   bounded number of neighbours.
+2. Scoring: descriptions are reduced to hashed character n-grams and compared
+   with the Sørensen–Dice coefficient. Candidate pairs are scored in vectorized
+   NumPy batches, which release the GIL while they run.
+3. Grading: pair scores are discounted by the distance between the dates and
+   linked pairs are clustered into groups whose confidence is the weakest link.
+"""
+
+from __future__ import annotations
+
+import re
+import zlib
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Iterable, Mapping, Sequence
+
+import numpy as np
+
+NGRAM_SIZE = 3
+FEATURE_BUCKETS = 1024
+DEFAULT_DATE_WINDOW_DAYS = 2
+DEFAULT_SIMILARITY_THRESHOLD = 0.65
+DATE_DISTANCE_PENALTY = 0.1
+MAX_BLOCK_NEIGHBOURS = 32
+SCORING_BATCH_SIZE = 4096
+
+_TOKEN_SPLIT_PATTERN = re.compile(r"[^a-z0-9]+")
+_DIGIT_PATTERN = re.compile(r"\d")
+_CONFIDENCE_QUANTUM = Decimal("0.0001")
+
+
+@dataclass(frozen=True)
+class MatchRecord:
+    """Minimal transaction view consumed by the matcher."""
+
+    transaction_id: str
+    amount: Decimal
+    effective_date: datetime
+    description: str
+
+
+@dataclass(frozen=True)
+class DuplicateGroup:
+    """A cluster of transactions that look like the same real-world posting."""
+
+    transaction_ids: list[str]
+    amount: Decimal
+    date: date
+    description: str
+    confidence: Decimal
+
+
+def normalize_description(value: str | None) -> str:
+    """Lower-case the description and drop trailing reference tokens (anything containing digits)."""
+    tokens = [token for token in _TOKEN_SPLIT_PATTERN.split((value or "").lower()) if token]
+    while tokens and _DIGIT_PATTERN.search(tokens[-1]):
+        tokens.pop()
+    return " ".join(tokens)
+
+
+def description_features(value: str | None) -> frozenset[int]:
+    """Return the hashed character n-gram buckets for a description.
+
+    A description that is nothing but reference tokens normalizes to nothing, so it is
+    compared by its lower-cased tokens instead; otherwise every such pair would match.
+    """
+    normalized = normalize_description(value) or " ".join(_TOKEN_SPLIT_PATTERN.split((value or "").lower())).strip()
+    if not normalized:
+        return frozenset()
+    padded = f" {normalized} "
+    return frozenset(
+        zlib.crc32(padded[index:index + NGRAM_SIZE].encode("utf-8")) % FEATURE_BUCKETS
+        for index in range(max(len(padded) - NGRAM_SIZE + 1, 1))
+    )
+
+
+def _candidate_pairs(records: Sequence[MatchRecord], date_window_days: int) -> tuple[list[int], list[int], list[int]]:
+    """Block records by amount and pair neighbours whose dates fall inside the window."""
+    blocks: dict[Decimal, list[int]] = {}
+    for index, record in enumerate(records):
+        blocks.setdefault(record.amount, []).append(index)
+
+    left: list[int] = []
+    right: list[int] = []
+    day_gaps: list[int] = []
+    for indexes in blocks.values():
+        if len(indexes) < 2:
+            continue
+        indexes.sort(key=lambda idx: records[idx].effective_date)
+        for position, first in enumerate(indexes):
+            first_day = records[first].effective_date.date()
+            stop = min(len(indexes), position + 1 + MAX_BLOCK_NEIGHBOURS)
+            for second in indexes[position + 1:stop]:
+                gap = (records[second].effective_date.date() - first_day).days
+                if gap > date_window_days:
+                    break
+                left.append(first)
+                right.append(second)
+                day_gaps.append(gap)
+    return left, right, day_gaps
+
+
+def _score_pairs(
+    features: Sequence[frozenset[int]],
+    left: Sequence[int],
+    right: Sequence[int],
+) -> list[float]:
+    matrix = np.zeros((len(features), FEATURE_BUCKETS), dtype=bool)
+    for row, buckets in enumerate(features):
+        if buckets:
+            matrix[row, list(buckets)] = True
+    sizes = matrix.sum(axis=1)
+
+    scores: list[float] = []
+    for start in range(0, len(left), SCORING_BATCH_SIZE):
+        left_idx = np.asarray(left[start:start + SCORING_BATCH_SIZE])
+        right_idx = np.asarray(right[start:start + SCORING_BATCH_SIZE])
+        overlap = np.count_nonzero(matrix[left_idx] & matrix[right_idx], axis=1)
+        total = sizes[left_idx] + sizes[right_idx]
+        # Two empty descriptions share nothing, so they score 0 rather than a perfect match.
+        dice = np.divide(2.0 * overlap, total, out=np.zeros(len(left_idx)), where=total > 0)
+        scores.extend(dice.tolist())
+    return scores
+
+
+def score_description_pairs(
+    descriptions: Sequence[str | None],
+    left: Sequence[int],
+    right: Sequence[int],
+) -> list[float]:
+    """Return the Dice similarity of each (left[i], right[i]) description pair."""
+    if not left:
+        return []
+    return _score_pairs([description_features(value) for value in descriptions], left, right)
+
+
+def _find(parents: list[int], index: int) -> int:
+    while parents[index] != index:
+        parents[index] = parents[parents[index]]
+        index = parents[index]
+    return index
+
+
+def find_duplicate_groups(
+    records: Iterable[MatchRecord],
+    *,
+    date_window_days: int = DEFAULT_DATE_WINDOW_DAYS,
+    threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+) -> list[DuplicateGroup]:
+    """Cluster likely duplicates and grade each cluster with a confidence in [0, 1]."""
+    unique: dict[str, MatchRecord] = {}
+    for record in records:
+        unique.setdefault(record.transaction_id, record)
+    items = list(unique.values())
+
+    left, right, day_gaps = _candidate_pairs(items, max(date_window_days, 0))
+    similarities = score_description_pairs([item.description for item in items], left, right)
+
+    parents = list(range(len(items)))
+    weakest_link: dict[int, float] = {}
+    for first, second, gap, similarity in zip(left, right, day_gaps, similarities, strict=True):
+        score = similarity * max(0.0, 1.0 - DATE_DISTANCE_PENALTY * gap)
+        if score < threshold:
+            continue
+        root_first, root_second = _find(parents, first), _find(parents, second)
+        link = min(score, weakest_link.get(root_first, 1.0), weakest_link.get(root_second, 1.0))
+        if root_first != root_second:
+            parents[root_second] = root_first
+            weakest_link.pop(root_second, None)
+        weakest_link[root_first] = link
+
+    clusters: dict[int, list[MatchRecord]] = {}
+    for index, item in enumerate(items):
+        clusters.setdefault(_find(parents, index), []).append(item)
+
+    groups: list[DuplicateGroup] = []
+    for root, members in clusters.items():
+        if len(members) < 2:
+            continue
+        members.sort(key=lambda item: (item.effective_date, item.transaction_id), reverse=True)
+        canonical = members[0]
+        confidence = Decimal(str(weakest_link.get(root, 0.0))).quantize(_CONFIDENCE_QUANTUM, rounding=ROUND_HALF_UP)
+        groups.append(
+            DuplicateGroup(
+                transaction_ids=[member.transaction_id for member in members],
+                amount=canonical.amount,
+                date=canonical.effective_date.date(),
+                description=(canonical.description or "").strip()[:255],
+                confidence=min(Decimal("1.0000"), confidence),
+            )
+        )
+    groups.sort(key=lambda group: (group.confidence, group.date), reverse=True)
+    return groups
+
+
+def merge_overlapping_groups(
+    groups: Iterable[DuplicateGroup],
+    records: Mapping[str, MatchRecord],
+) -> list[DuplicateGroup]:
+    """Combine groups that share transactions, keeping the weakest confidence of the merged groups."""
+    group_list = list(groups)
+    parents = list(range(len(group_list)))
+    owner: dict[str, int] = {}
+    for index, group in enumerate(group_list):
+        for transaction_id in group.transaction_ids:
+            if transaction_id in owner:
+                root_first, root_second = _find(parents, owner[transaction_id]), _find(parents, index)
+                if root_first != root_second:
+                    parents[root_second] = root_first
+            else:
+                owner[transaction_id] = index
+
+    clusters: dict[int, list[DuplicateGroup]] = {}
+    for index, group in enumerate(group_list):
+        clusters.setdefault(_find(parents, index), []).append(group)
+
+    merged: list[DuplicateGroup] = []
+    for members in clusters.values():
+        if len(members) == 1:
+            merged.append(members[0])
+            continue
+        transaction_ids = {transaction_id for group in members for transaction_id in group.transaction_ids}
+        ordered = sorted(
+            (records[transaction_id] for transaction_id in transaction_ids),
+            key=lambda item: (item.effective_date, item.transaction_id),
+            reverse=True,
+        )
+        canonical = ordered[0]
+        merged.append(
+            DuplicateGroup(
+                transaction_ids=[item.transaction_id for item in ordered],
+                amount=canonical.amount,
+                date=canonical.effective_date.date(),
+                description=(canonical.description or "").strip()[:255],
+                confidence=min(group.confidence for group in members),
+            )
+        )
+    merged.sort(key=lambda group: (group.confidence, group.date), reverse=True)
+    return merged
@@ -0,0 +1,87 @@
+"""In-process timing metrics and counters for background jobs and other hot spots."""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator
+
+
+@dataclass(frozen=True)
+class TimingSnapshot:
+    """Aggregated runtimes recorded under one metric name, in seconds."""
+
+    count: int
+    total_seconds: float
+    last_seconds: float
+    max_seconds: float
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.count if self.count else 0.0
+
+
+_TIMINGS: dict[str, TimingSnapshot] = {}
+_COUNTERS: dict[str, int] = {}
+_LOCK = threading.Lock()
+
+
+def record_duration(name: str, seconds: float) -> None:
+    """Add one observed runtime to the metric ``name``."""
+    with _LOCK:
+        current = _TIMINGS.get(name)
+        if current is None:
+            _TIMINGS[name] = TimingSnapshot(1, seconds, seconds, seconds)
+        else:
+            _TIMINGS[name] = TimingSnapshot(
+                count=current.count + 1,
+                total_seconds=current.total_seconds + seconds,
+                last_seconds=seconds,
+                max_seconds=max(current.max_seconds, seconds),
+            )
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Record the runtime of the enclosed block, including runs that raise."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_duration(name, time.perf_counter() - started)
+
+
+def get_timing(name: str) -> TimingSnapshot | None:
+    with _LOCK:
+        return _TIMINGS.get(name)
+
+
+def timings_snapshot() -> dict[str, TimingSnapshot]:
+    """Return a copy of every recorded metric."""
+    with _LOCK:
+        return dict(_TIMINGS)
+
+
+def increment_counter(name: str, amount: int = 1) -> None:
+    """Add ``amount`` to the counter ``name``."""
+    with _LOCK:
+        _COUNTERS[name] = _COUNTERS.get(name, 0) + amount
+
+
+def get_counter(name: str) -> int:
+    with _LOCK:
+        return _COUNTERS.get(name, 0)
+
+
+def counters_snapshot() -> dict[str, int]:
+    """Return a copy of every counter."""
+    with _LOCK:
+        return dict(_COUNTERS)
+
+
+def reset_metrics() -> None:
+    with _LOCK:
+        _TIMINGS.clear()
+        _COUNTERS.clear()
@@ -0,0 +1,26 @@
+"""Opaque cursor helpers for keyset-paginated and resumable operations."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from typing import Any
+
+
+def encode_cursor(position: dict[str, Any]) -> str:
+    """Serialize a keyset position into a URL-safe opaque token."""
+    payload = json.dumps(position, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> dict[str, Any]:
+    """Decode a token produced by :func:`encode_cursor`, raising ``ValueError`` when it is malformed."""
+    padded = token + "=" * (-len(token) % 4)
+    try:
+        position = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise ValueError("Invalid cursor.") from exc
+    if not isinstance(position, dict):
+        raise ValueError("Invalid cursor.")
+    return position
@@ -0,0 +1,51 @@
+"""Minimal background scheduler for periodic maintenance jobs."""
+
+from __future__ import annotations
+
+import threading
+from typing import Callable
+
+from sdd_cash_manager.lib.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class PeriodicTask:
+    """Run a callable on a daemon thread every ``interval_seconds`` until stopped."""
+
+    def __init__(self, name: str, interval_seconds: float, func: Callable[[], object]) -> None:
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self._func = func
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the worker thread; calling start on a running task is a no-op."""
+        if self.running or self.interval_seconds <= 0:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=f"periodic-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """Signal the worker thread to exit and wait for the current run to finish."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_once(self) -> None:
+        """Invoke the job, logging failures so one bad run does not stop the schedule."""
+        try:
+            self._func()
+        except Exception:
+            logger.exception("Periodic task %s failed", self.name)
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval_seconds):
+            self.run_once()
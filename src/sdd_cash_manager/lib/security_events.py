@@ -1,4 +1,5 @@
 import logging
+import threading
 from collections.abc import Sequence
 from datetime import datetime, timezone
 from decimal import Decimal
@@ -9,20 +10,37 @@ from sdd_cash_manager.core.config import settings
 
 # Initialize a specific logger for security events
 security_logger = logging.getLogger("security_events")
-security_logger.setLevel(settings.security_log_level)
+_security_logger_configured = False
+_configure_lock = threading.Lock()
 
-# Configure handler if not already configured by logging_config
-if not security_logger.handlers:
-    # Use a separate file handler for security events
-    security_file_handler = logging.FileHandler(settings.security_log_file)
-    security_file_handler.setFormatter(logging.Formatter(settings.log_format))
-    security_logger.addHandler(security_file_handler)
 
-    # Optionally add a console handler for critical security events
-    if settings.security_console_log_enabled:
-        security_console_handler = logging.StreamHandler()
-        security_console_handler.setFormatter(logging.Formatter(settings.log_format))
-        security_logger.addHandler(security_console_handler)
+def configure_security_logger() -> None:
+    """Apply the security log level and open its handlers, once per process.
+
+    Called by the logging functions below on first use, so importing this module does not
+    open the security log file.
+    """
+    global _security_logger_configured
+    if _security_logger_configured:
+        return
+    with _configure_lock:
+        if not _security_logger_configured:
+            security_logger.setLevel(settings.security_log_level)
+
+            # Configure handler if not already configured by logging_config
+            if not security_logger.handlers:
+                # Use a separate file handler for security events
+                security_file_handler = logging.FileHandler(settings.security_log_file)
+                security_file_handler.setFormatter(logging.Formatter(settings.log_format))
+                security_logger.addHandler(security_file_handler)
+
+                # Optionally add a console handler for critical security events
+                if settings.security_console_log_enabled:
+                    security_console_handler = logging.StreamHandler()
+                    security_console_handler.setFormatter(logging.Formatter(settings.log_format))
+                    security_logger.addHandler(security_console_handler)
+            _security_logger_configured = True
+
 
 class SecurityEvent(str, Enum):
     AUTHENTICATION_FAILURE = "AUTHENTICATION_FAILURE"
@@ -65,6 +83,7 @@ def log_security_event(
         "account_id": account_id,
         "metadata": metadata or {}
     }
+    configure_security_logger()
     security_logger.log(level, event_data)
 
     # Placeholder for alerting mechanism
@@ -235,6 +254,7 @@ def log_critical_application_error(
         "account_id": account_id,
         "metadata": metadata or {}
     }
+    configure_security_logger()
     security_logger.error(
         "Critical application error recorded",
         exc_info=exc_info,
@@ -0,0 +1,85 @@
+"""Share one in-flight computation between identical concurrent calls.
+
+While a call for a key is running, further calls for the same key wait for its result (or
+exception) instead of repeating the work. Nothing is cached: once the call finishes, the
+next call for the key computes afresh. Threads call ``SingleFlight.do``; coroutines call
+``SingleFlight.do_async``, which runs the computation in a worker thread. Both kinds of caller
+share the same flights.
+
+Each group counts ``single_flight.<name>.calls`` and ``single_flight.<name>.coalesced`` in
+``sdd_cash_manager.lib.metrics``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Callable, Generic, Hashable, TypeVar
+
+from sdd_cash_manager.lib.metrics import increment_counter
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """A named group of in-flight calls keyed by their arguments."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._flights: dict[Hashable, Future[T]] = {}
+
+    @property
+    def calls_metric(self) -> str:
+        return f"single_flight.{self.name}.calls"
+
+    @property
+    def coalesced_metric(self) -> str:
+        return f"single_flight.{self.name}.coalesced"
+
+    def _join(self, key: Hashable) -> tuple[Future[T], bool]:
+        """Return the flight for ``key`` and whether the caller must run it."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._flights[key] = Future()
+        increment_counter(self.calls_metric)
+        if not leader:
+            increment_counter(self.coalesced_metric)
+        return flight, leader
+
+    def _run(self, key: Hashable, flight: Future[T], fn: Callable[[], T]) -> T:
+        try:
+            result = fn()
+        except BaseException as exc:
+            self._land(key)
+            flight.set_exception(exc)
+            raise
+        self._land(key)
+        flight.set_result(result)
+        return result
+
+    def _land(self, key: Hashable) -> None:
+        # Removed before the result is published, so no later call can join a finished flight.
+        with self._lock:
+            self._flights.pop(key, None)
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Return ``fn()``, or the result of the identical call already running for ``key``."""
+        flight, leader = self._join(key)
+        if leader:
+            return self._run(key, flight, fn)
+        return flight.result()
+
+    async def do_async(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Like ``do``, but waits without blocking the event loop; ``fn`` runs in a worker thread."""
+        flight, leader = self._join(key)
+        if leader:
+            return await asyncio.to_thread(self._run, key, flight, fn)
+        return await asyncio.wrap_future(flight)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
@@ -0,0 +1,198 @@
+"""
+Automatic matching of imported bank statement lines to open ledger transactions.
+
+Matching runs in three passes, cheapest first, and each pass only sees what the
+previous ones left unmatched:
+
+1. Exact: a hash join on ``(amount, date)`` pairs lines and transactions that agree
+   on both, in O(lines + transactions).
+2. Date tolerance: the remaining lines and transactions are sorted by ``(amount, date)``
+   and walked with two pointers, pairing equal amounts whose dates differ by at most
+   the tolerance. Scores fall with the distance between the dates.
+3. Difference explanation: a bounded subset-sum search over the still-unmatched
+   transactions looks for a combination whose amounts add up to the reconciliation
+   difference that remains once the proposed matches are applied.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Sequence
+
+DEFAULT_DATE_TOLERANCE_DAYS = 3
+MAX_SUBSET_CANDIDATES = 40
+MAX_SUBSET_STATES = 200_000
+
+EXACT_STRATEGY = "exact"
+DATE_TOLERANCE_STRATEGY = "date_tolerance"
+
+_SCORE_QUANTUM = Decimal("0.0001")
+_CENT = Decimal("0.01")
+
+
+@dataclass(frozen=True)
+class StatementLine:
+    """One line of an imported bank statement."""
+
+    line_id: str
+    amount: Decimal
+    date: date
+    description: str | None = None
+
+
+@dataclass(frozen=True)
+class LedgerCandidate:
+    """Minimal view of an open transaction consumed by the matcher."""
+
+    transaction_id: str
+    amount: Decimal
+    date: date
+
+
+@dataclass(frozen=True)
+class StatementMatch:
+    """A proposed pairing of a statement line with a ledger transaction."""
+
+    line_id: str
+    transaction_id: str
+    score: Decimal
+    strategy: str
+
+
+@dataclass(frozen=True)
+class MatchingResult:
+    matches: list[StatementMatch]
+    unmatched_lines: list[StatementLine]
+    unmatched_candidates: list[LedgerCandidate]
+
+
+def _amount_key(value: Decimal) -> Decimal:
+    return value.quantize(_CENT, rounding=ROUND_HALF_UP)
+
+
+def _tolerance_score(day_gap: int, tolerance_days: int) -> Decimal:
+    """Score in ``(0.5, 1.0)`` that decreases linearly with the gap between the dates."""
+    score = Decimal(1) - Decimal(day_gap) / Decimal(2 * (tolerance_days + 1))
+    return score.quantize(_SCORE_QUANTUM, rounding=ROUND_HALF_UP)
+
+
+def _exact_pass(
+    lines: Sequence[StatementLine],
+    candidates: Sequence[LedgerCandidate],
+) -> tuple[list[StatementMatch], list[StatementLine], list[LedgerCandidate]]:
+    by_key: dict[tuple[Decimal, date], deque[LedgerCandidate]] = defaultdict(deque)
+    for candidate in sorted(candidates, key=lambda item: item.transaction_id):
+        by_key[(_amount_key(candidate.amount), candidate.date)].append(candidate)
+
+    matches: list[StatementMatch] = []
+    unmatched_lines: list[StatementLine] = []
+    for line in lines:
+        bucket = by_key.get((_amount_key(line.amount), line.date))
+        if bucket:
+            candidate = bucket.popleft()
+            matches.append(StatementMatch(line.line_id, candidate.transaction_id, Decimal("1.0000"), EXACT_STRATEGY))
+        else:
+            unmatched_lines.append(line)
+    remaining = [candidate for bucket in by_key.values() for candidate in bucket]
+    return matches, unmatched_lines, remaining
+
+
+def _tolerance_pass(
+    lines: Sequence[StatementLine],
+    candidates: Sequence[LedgerCandidate],
+    tolerance_days: int,
+) -> tuple[list[StatementMatch], list[StatementLine], list[LedgerCandidate]]:
+    ordered_lines = sorted(lines, key=lambda line: (_amount_key(line.amount), line.date, line.line_id))
+    ordered_candidates = sorted(
+        candidates, key=lambda item: (_amount_key(item.amount), item.date, item.transaction_id)
+    )
+    matches: list[StatementMatch] = []
+    unmatched_lines: list[StatementLine] = []
+    unmatched_candidates: list[LedgerCandidate] = []
+    line_index = candidate_index = 0
+    while line_index < len(ordered_lines) and candidate_index < len(ordered_candidates):
+        line = ordered_lines[line_index]
+        candidate = ordered_candidates[candidate_index]
+        line_amount, candidate_amount = _amount_key(line.amount), _amount_key(candidate.amount)
+        day_gap = (line.date - candidate.date).days
+        if candidate_amount < line_amount or (candidate_amount == line_amount and day_gap > tolerance_days):
+            unmatched_candidates.append(candidate)
+            candidate_index += 1
+        elif candidate_amount > line_amount or day_gap < -tolerance_days:
+            unmatched_lines.append(line)
+            line_index += 1
+        else:
+            score = _tolerance_score(abs(day_gap), tolerance_days)
+            matches.append(StatementMatch(line.line_id, candidate.transaction_id, score, DATE_TOLERANCE_STRATEGY))
+            line_index += 1
+            candidate_index += 1
+    unmatched_lines.extend(ordered_lines[line_index:])
+    unmatched_candidates.extend(ordered_candidates[candidate_index:])
+    return matches, unmatched_lines, unmatched_candidates
+
+
+def match_statement_lines(
+    lines: Sequence[StatementLine],
+    candidates: Sequence[LedgerCandidate],
+    *,
+    date_tolerance_days: int = DEFAULT_DATE_TOLERANCE_DAYS,
+) -> MatchingResult:
+    """Pair statement lines with open transactions; each side is used at most once."""
+    exact, lines_left, candidates_left = _exact_pass(lines, candidates)
+    tolerant, lines_left, candidates_left = _tolerance_pass(lines_left, candidates_left, max(date_tolerance_days, 0))
+    return MatchingResult(exact + tolerant, lines_left, candidates_left)
+
+
+def explain_difference(
+    candidates: Sequence[LedgerCandidate],
+    difference: Decimal,
+    *,
+    max_candidates: int = MAX_SUBSET_CANDIDATES,
+    max_states: int = MAX_SUBSET_STATES,
+) -> list[str] | None:
+    """Return transaction IDs whose amounts sum exactly to ``difference``, or ``None``.
+
+    Runs a 0/1 subset-sum over integer cents, limited to the ``max_candidates`` amounts
+    closest to the difference and to ``max_states`` reachable sums, so the search stays
+    bounded and may miss combinations that exist beyond those limits.
+    """
+    target = int(_amount_key(difference) / _CENT)
+    if target == 0:
+        return []
+    pool = sorted(candidates, key=lambda item: (abs(_amount_key(item.amount) - abs(difference)), item.transaction_id))
+    pool = pool[:max_candidates]
+    values = [int(_amount_key(candidate.amount) / _CENT) for candidate in pool]
+    # With only positive amounts, sums past the target can never come back down to it.
+    bounded_above = all(value > 0 for value in values)
+    if bounded_above and target < 0:
+        return None
+
+    parents: dict[int, tuple[int, int] | None] = {0: None}
+    for index, value in enumerate(values):
+        for total in list(parents):
+            reached = total + value
+            if reached in parents or (bounded_above and reached > target):
+                continue
+            parents[reached] = (total, index)
+            if reached == target:
+                return _backtrack(parents, pool, target)
+            if len(parents) >= max_states:
+                return None
+    return None
+
+
+def _backtrack(
+    parents: dict[int, tuple[int, int] | None],
+    pool: Sequence[LedgerCandidate],
+    target: int,
+) -> list[str]:
+    transaction_ids: list[str] = []
+    link = parents[target]
+    while link is not None:
+        total, index = link
+        transaction_ids.append(pool[index].transaction_id)
+        link = parents[total]
+    return sorted(transaction_ids)
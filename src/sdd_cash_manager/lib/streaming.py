@@ -0,0 +1,78 @@
+"""Helpers for streaming large result sets as newline-delimited JSON (NDJSON) or a JSON array."""
+
+from __future__ import annotations
+
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Iterable, Iterator
+
+from pydantic import BaseModel, TypeAdapter
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+JSON_MEDIA_TYPE = "application/json"
+
+
+class StreamFormat(str, Enum):
+    """Body encodings offered by the streaming list endpoints."""
+
+    NDJSON = "ndjson"
+    JSON = "json"
+
+    @property
+    def media_type(self) -> str:
+        return NDJSON_MEDIA_TYPE if self is StreamFormat.NDJSON else JSON_MEDIA_TYPE
+
+
+def ndjson_lines(items: Iterable[BaseModel], *, lines_per_chunk: int = 200) -> Iterator[bytes]:
+    """Encode each model as one JSON line, yielding chunks of ``lines_per_chunk`` lines.
+
+    Chunks are produced as ``items`` is consumed, so memory stays bounded by one chunk no
+    matter how many rows the source yields.
+    """
+    buffer: list[bytes] = []
+    for item in items:
+        buffer.append(item.model_dump_json().encode("utf-8"))
+        if len(buffer) >= lines_per_chunk:
+            yield b"\n".join(buffer) + b"\n"
+            buffer.clear()
+    if buffer:
+        yield b"\n".join(buffer) + b"\n"
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model: type[BaseModel]) -> TypeAdapter[list[Any]]:
+    """Return a cached ``TypeAdapter`` that serializes a list of ``model`` in one call."""
+    return TypeAdapter(list[model])  # type: ignore[valid-type]
+
+
+def json_array_chunks(items: Iterable[BaseModel], *, items_per_chunk: int = 200) -> Iterator[bytes]:
+    """Encode the models as one JSON array, yielding it ``items_per_chunk`` elements at a time.
+
+    Each chunk is dumped with one call to a cached list ``TypeAdapter`` rather than one call
+    per model. The concatenated chunks are byte-for-byte a JSON array, so clients that do not
+    read incrementally can parse the body as the usual list response.
+    """
+    yield b"["
+    buffer: list[BaseModel] = []
+    first = True
+    for item in items:
+        buffer.append(item)
+        if len(buffer) >= items_per_chunk:
+            yield (b"" if first else b",") + _dump_elements(buffer)
+            buffer.clear()
+            first = False
+    if buffer:
+        yield (b"" if first else b",") + _dump_elements(buffer)
+    yield b"]"
+
+
+def _dump_elements(models: list[BaseModel]) -> bytes:
+    """Return ``models`` as comma-separated JSON values, without the enclosing brackets."""
+    return list_adapter(type(models[0])).dump_json(models)[1:-1]
+
+
+def encode_stream(items: Iterable[BaseModel], stream_format: StreamFormat) -> Iterator[bytes]:
+    """Return the chunk iterator for ``stream_format``; pair it with ``stream_format.media_type``."""
+    if stream_format is StreamFormat.JSON:
+        return json_array_chunks(items)
+    return ndjson_lines(items)
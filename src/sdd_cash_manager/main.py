@@ -1,53 +1,97 @@
-"""FastAPI application entry point for sdd-cash-manager."""
-
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-
-from sdd_cash_manager.api.accounts import quickfill_router, transactions_router
-from sdd_cash_manager.api.accounts import router as accounts_router
-from sdd_cash_manager.api.v1.endpoints.adjustment import router as adjustment_router
-from sdd_cash_manager.api.v1.endpoints.reconcile_window import router as reconcile_window_router
-from sdd_cash_manager.api.v1.endpoints.reconciliation import router as reconciliation_router
-from sdd_cash_manager.database import create_tables
-
-# Initialize database on startup
-create_tables()
-
-app = FastAPI(
-    title="SDD Cash Manager API",
-    description="API for managing accounts and transactions",
-    version="0.1.0",
-)
-
-# Add CORS middleware for development
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include routers (routers already define their own prefixes)
-app.include_router(accounts_router)
-app.include_router(transactions_router)
-app.include_router(quickfill_router)
-app.include_router(adjustment_router)
-app.include_router(reconciliation_router)
-app.include_router(reconcile_window_router)
-
-
-@app.get("/health")
+"""FastAPI application entry point for sdd-cash-manager.
+
+``create_app()`` builds the application; serve it with
+``uvicorn sdd_cash_manager.main:create_app --factory``. ``sdd_cash_manager.main:app`` still
+works and builds the application on first access. Nothing here touches the database:
+create the schema beforehand with ``python -m sdd_cash_manager.cli create-schema``.
+"""
+
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator
+
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+
+_app: FastAPI | None = None
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """Run background maintenance while serving and flush write-behind buffers on shutdown."""
+    from sdd_cash_manager.services.maintenance import start_maintenance, stop_maintenance
+
+    start_maintenance()
+    try:
+        yield
+    finally:
+        stop_maintenance()
+
+
 async def health() -> dict[str, str]:
     """Health check endpoint."""
     return {"status": "ok"}
 
 
+def create_app() -> FastAPI:
+    """Build the API application; routers and services are imported here, not at module import."""
+    from fastapi import FastAPI
+    from fastapi.middleware.cors import CORSMiddleware
+
+    from sdd_cash_manager.api.accounts import quickfill_router, transactions_router
+    from sdd_cash_manager.api.accounts import router as accounts_router
+    from sdd_cash_manager.api.v1.endpoints.adjustment import router as adjustment_router
+    from sdd_cash_manager.api.v1.endpoints.reconcile_window import router as reconcile_window_router
+    from sdd_cash_manager.api.v1.endpoints.reconciliation import router as reconciliation_router
+
+    application = FastAPI(
+        title="SDD Cash Manager API",
+        description="API for managing accounts and transactions",
+        version="0.1.0",
+        lifespan=lifespan,
+    )
+
+    # Add CORS middleware for development
+    application.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Include routers (routers already define their own prefixes)
+    application.include_router(accounts_router)
+    application.include_router(transactions_router)
+    application.include_router(quickfill_router)
+    application.include_router(adjustment_router)
+    application.include_router(reconciliation_router)
+    application.include_router(reconcile_window_router)
+    application.add_api_route("/health", health, methods=["GET"])
+    return application
+
+
+def __getattr__(name: str) -> Any:
+    # ``app`` is built on first access, so importing this module stays cheap.
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 if __name__ == "__main__":
     import uvicorn
 
+    from sdd_cash_manager import database
+
+    # Development convenience: create the schema before serving with reload.
+    database.create_tables()
     uvicorn.run(
-        "sdd_cash_manager.main:app",
+        "sdd_cash_manager.main:create_app",
+        factory=True,
         host="127.0.0.1",
         port=8000,
         reload=True,
@@ -1,13 +1,18 @@
 # src/sdd_cash_manager/models/__init__.py
 from .account import Account as Account
 from .account_merge_plan import AccountMergePlan as AccountMergePlan
+from .balance_shard import AccountBalanceShard as AccountBalanceShard
 from .base import Base as Base
 from .duplicate_candidate import DuplicateCandidate as DuplicateCandidate
 from .enums import AccountingCategory as AccountingCategory
 from .enums import BankingProductType as BankingProductType
 from .enums import ProcessingStatus as ProcessingStatus
 from .enums import ReconciliationStatus as ReconciliationStatus
+from .ledger_journal import LedgerJournalEntry as LedgerJournalEntry
+from .ledger_journal import LedgerSnapshot as LedgerSnapshot
+from .ledger_version import LedgerVersion as LedgerVersion
 from .quickfill_template import QuickFillTemplate as QuickFillTemplate
+from .reconciliation_counter import ReconciliationCounter as ReconciliationCounter
 from .reconciliation_session import (
     BankStatementSnapshot as BankStatementSnapshot,
 )
@@ -4,8 +4,8 @@ import uuid
 from decimal import Decimal  # New import
 from typing import TYPE_CHECKING, List
 
-from sqlalchemy import Boolean, Index, Numeric, String  # Changed Float to Numeric
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Boolean, Connection, Index, Integer, Numeric, String, event, select  # Changed Float to Numeric
+from sqlalchemy.orm import Mapped, Mapper, mapped_column, object_session, relationship
 
 from sdd_cash_manager.models.adjustment import AdjustmentTransaction, ManualBalanceAdjustment
 from sdd_cash_manager.models.base import Base
@@ -14,6 +14,18 @@ from sdd_cash_manager.models.reconciliation import ReconciliationViewEntry
 if TYPE_CHECKING:
     from sdd_cash_manager.models.transaction import Entry
 
+HIERARCHY_PATH_SEPARATOR = "/"
+
+
+def hierarchy_path_for(parent_path: str | None, account_id: str) -> str:
+    """Return the materialized path of an account placed under ``parent_path`` (``None`` for a root)."""
+    return f"{parent_path or HIERARCHY_PATH_SEPARATOR}{account_id}{HIERARCHY_PATH_SEPARATOR}"
+
+
+def hierarchy_depth(path: str) -> int:
+    """Return the depth encoded in a materialized path; roots have depth 1."""
+    return path.count(HIERARCHY_PATH_SEPARATOR) - 1
+
 
 class Account(Base):
     """Persistent model representing a financial account."""
@@ -21,6 +33,7 @@ class Account(Base):
     __table_args__ = (
         Index("ix_accounts_parent_account_id", "parent_account_id"),
         Index("ix_accounts_name", "name"),
+        Index("ix_accounts_hierarchy_path", "hierarchy_path"),
     )
 
     # Define attributes with explicit types that align with SQLAlchemy Columns
@@ -37,6 +50,18 @@ class Account(Base):
     parent_account_id: Mapped[str | None] = mapped_column(String, nullable=True)
     hidden: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     placeholder: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    # Set by background deletion; the purge worker removes the account and its dependents later.
+    pending_deletion: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    # Materialized path ("/root-id/.../own-id/") and depth, assigned on insert and kept in sync by
+    # services.account_hierarchy so subtree and depth queries are index range scans.
+    hierarchy_path: Mapped[str] = mapped_column(String, nullable=False)
+    depth: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    # Optimistic concurrency token: ORM updates check and bump it, and the atomic balance
+    # statements in services.balance_updates bump it too, so stale read-modify-writes fail.
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    # Number of models.balance_shard rows that take this account's postings; 0 means postings
+    # update available_balance directly.
+    balance_shards: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 
     # Relationships
     entries: Mapped[List["Entry"]] = relationship(back_populates="account")
@@ -44,6 +69,8 @@ class Account(Base):
     manual_balance_adjustments: Mapped[List["ManualBalanceAdjustment"]] = relationship(back_populates="account")
     adjustment_transactions: Mapped[List["AdjustmentTransaction"]] = relationship(back_populates="account")
 
+    __mapper_args__ = {"version_id_col": version}
+
     def __init__(
         self,
         name: str,
@@ -96,3 +123,35 @@ class Account(Base):
         self.parent_account_id = parent_account_id
         self.hidden = hidden
         self.placeholder = placeholder
+        self.pending_deletion = False
+        self.balance_shards = 0
+
+
+def _pending_parent(target: Account) -> Account | None:
+    session = object_session(target)
+    if session is None:
+        return None
+    for candidate in session.new:
+        if isinstance(candidate, Account) and candidate.id == target.parent_account_id:
+            return candidate
+    return None
+
+
+def _resolve_hierarchy_path(connection: Connection, target: Account, visiting: set[str]) -> str:
+    """Compute the path from the persisted parent, or from a parent inserted in the same flush."""
+    parent_id = target.parent_account_id
+    parent_path: str | None = None
+    if parent_id is not None and parent_id not in visiting:
+        parent_path = connection.scalar(select(Account.hierarchy_path).where(Account.id == parent_id))
+        if parent_path is None:
+            parent = _pending_parent(target)
+            if parent is not None:
+                parent_path = _resolve_hierarchy_path(connection, parent, visiting | {target.id})
+    return hierarchy_path_for(parent_path, target.id)
+
+
+@event.listens_for(Account, "before_insert")
+def _assign_hierarchy_path(_mapper: Mapper[Account], connection: Connection, target: Account) -> None:
+    path = _resolve_hierarchy_path(connection, target, set())
+    target.hierarchy_path = path
+    target.depth = hierarchy_depth(path)
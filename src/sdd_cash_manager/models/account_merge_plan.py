@@ -28,6 +28,10 @@ class AccountMergePlan(Base):
     target_account_id: Mapped[str] = mapped_column(ForeignKey(ACCOUNTS_ID_FOREIGN_KEY), nullable=False)
     reparenting_map: Mapped[dict[str, str]] = mapped_column(JSON, nullable=False, default=dict)
     affected_entries_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    affected_transactions_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_entries_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Chunked execution step ("entries", "debits", "credits") while status is "running".
+    progress_phase: Mapped[str | None] = mapped_column(String(32), nullable=True)
     audit_notes: Mapped[str | None] = mapped_column(Text, nullable=True)
     initiated_by: Mapped[str | None] = mapped_column(String(150), nullable=True)
     status: Mapped[str] = mapped_column(String(32), nullable=False, default="pending")
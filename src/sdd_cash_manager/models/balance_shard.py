@@ -0,0 +1,26 @@
+"""Sharded balance counters for write-hot accounts.
+
+An account with ``balance_shards > 0`` takes its postings on one of that many
+``AccountBalanceShard`` rows instead of its own row, so concurrent postings lock different
+rows. Its balance is ``accounts.available_balance`` plus the sum of its shards;
+``sdd_cash_manager.services.balance_updates`` writes the shards and folds them into reads.
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+from sqlalchemy import Integer, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from sdd_cash_manager.models.base import Base
+
+
+class AccountBalanceShard(Base):
+    """One slice of a hot account's accumulated postings."""
+
+    __tablename__ = "account_balance_shards"
+
+    account_id: Mapped[str] = mapped_column(String, primary_key=True)
+    shard: Mapped[int] = mapped_column(Integer, primary_key=True)
+    balance: Mapped[Decimal] = mapped_column(Numeric(18, 2), nullable=False, default=Decimal("0.0"))
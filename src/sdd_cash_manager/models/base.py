@@ -1,5 +1,20 @@
+from sqlalchemy import Dialect
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import DeclarativeBase
 
 
 class Base(DeclarativeBase):
     pass
+
+
+def upsert(dialect: Dialect, model: type[Base]) -> sqlite.Insert | postgresql.Insert:
+    """Start an ``INSERT`` into ``model`` that can be finished with ``on_conflict_do_update``.
+
+    Counter rows are created by whichever writer touches them first; an upsert lets two
+    concurrent first writers both land instead of one failing on the primary key.
+    """
+    if dialect.name == "sqlite":
+        return sqlite.insert(model)
+    if dialect.name == "postgresql":
+        return postgresql.insert(model)
+    raise NotImplementedError(f"Upserts are not supported on the {dialect.name} dialect.")
@@ -0,0 +1,111 @@
+"""Append-only journal of account balance changes and periodic snapshots of every balance.
+
+Each change to an account's balance appends one ``LedgerJournalEntry`` whose ``sequence``
+only ever grows. ORM inserts, balance overwrites and deletes of accounts are journaled when
+the session flushes; the atomic statements in ``sdd_cash_manager.services.balance_updates``
+call ``append_journal_entries`` themselves. ``sdd_cash_manager.services.ledger_journal``
+writes snapshots and replays the journal.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Mapping
+
+from sqlalchemy import JSON, Connection, DateTime, Index, Integer, Numeric, String, event, func, insert, inspect, select
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from sdd_cash_manager.models.account import Account
+from sdd_cash_manager.models.balance_shard import AccountBalanceShard
+from sdd_cash_manager.models.base import Base
+
+
+class LedgerJournalEntry(Base):
+    """One change to one account's balance."""
+
+    __tablename__ = "ledger_journal"
+    __table_args__ = (
+        Index("ix_ledger_journal_recorded_at", "recorded_at"),
+        {"sqlite_autoincrement": True},
+    )
+
+    sequence: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    account_id: Mapped[str] = mapped_column(String, nullable=False)
+    delta: Mapped[Decimal] = mapped_column(Numeric(18, 2), nullable=False)
+    transaction_id: Mapped[str | None] = mapped_column(String, nullable=True)
+    recorded_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
+
+
+class LedgerSnapshot(Base):
+    """Every non-zero account balance after applying the journal up to ``sequence``."""
+
+    __tablename__ = "ledger_snapshots"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    sequence: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    # Account ID -> balance as a decimal string, so snapshots round-trip exactly.
+    balances: Mapped[dict[str, str]] = mapped_column(JSON, nullable=False, default=dict)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
+
+
+def append_journal_entries(
+    connection: Connection,
+    deltas: Mapping[str, Decimal],
+    *,
+    transaction_id: str | None = None,
+) -> None:
+    """Journal one entry per non-zero delta, in account ID order."""
+    recorded_at = datetime.now(timezone.utc)
+    rows = [
+        {"account_id": account_id, "delta": deltas[account_id], "transaction_id": transaction_id, "recorded_at": recorded_at}
+        for account_id in sorted(deltas)
+        if deltas[account_id] != 0
+    ]
+    if rows:
+        connection.execute(insert(LedgerJournalEntry), rows)
+
+
+def _stored_balance(connection: Connection, account_id: str) -> Decimal:
+    shard_total = (
+        select(func.coalesce(func.sum(AccountBalanceShard.balance), 0))
+        .where(AccountBalanceShard.account_id == account_id)
+        .scalar_subquery()
+    )
+    balance = connection.scalar(select(Account.available_balance + shard_total).where(Account.id == account_id))
+    return Decimal(str(balance or 0))
+
+
+def _loaded_balance(account: Account) -> Decimal | None:
+    """Return the balance the session last read for ``account``, or ``None`` if it was not loaded."""
+    history = inspect(account).attrs.available_balance.history
+    previous = history.deleted or history.unchanged
+    return Decimal(str(previous[0])) if previous else None
+
+
+@event.listens_for(Session, "before_flush")
+def _journal_flushed_accounts(session: Session, _flush_context: Any, _instances: Any) -> None:
+    deltas: dict[str, Decimal] = {}
+    for account in session.new:
+        if isinstance(account, Account) and account.available_balance:
+            deltas[account.id] = deltas.get(account.id, Decimal(0)) + Decimal(str(account.available_balance))
+    for account in session.dirty:
+        if not isinstance(account, Account) or not inspect(account).attrs.available_balance.history.has_changes():
+            continue
+        previous = _loaded_balance(account)
+        if previous is None:
+            previous = _stored_balance(session.connection(), account.id)
+        deltas[account.id] = deltas.get(account.id, Decimal(0)) + Decimal(str(account.available_balance)) - previous
+    for account in session.deleted:
+        if not isinstance(account, Account):
+            continue
+        previous = _loaded_balance(account)
+        if previous is None:
+            previous = _stored_balance(session.connection(), account.id)
+        deltas[account.id] = deltas.get(account.id, Decimal(0)) - previous
+    if any(deltas.values()):
+        append_journal_entries(session.connection(), deltas)
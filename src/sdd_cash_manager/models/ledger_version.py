@@ -0,0 +1,153 @@
+"""Version stamps that change whenever the ledger does, for ETags on polled GET endpoints.
+
+``ledger_versions`` holds one row per account plus two sets of ``LEDGER_VERSION_SHARDS``
+ledger-wide rows. Every write to an account, balance shard, transaction, entry or QuickFill
+template bumps one randomly chosen ``LEDGER_VERSION_KEY`` row, and the ledger-wide version is
+the sum of those rows, so concurrent writers rarely bump the same row. An account's row is
+bumped when it or any account beneath it changes, since its hierarchy balance includes
+theirs. Account writes that do not say which accounts they touch bump one
+``ACCOUNTS_VERSION_KEY`` row instead, whose sum is part of every account's stamp. Rows are
+upserted, so concurrent first writers of a key both land.
+
+ORM inserts, updates and deletes are stamped when the session flushes. Statements run
+through ``Session.execute`` are stamped at the next flush or commit; pass the account IDs an
+account or shard statement touches as the ``LEDGER_ACCOUNT_IDS_OPTION`` execution option so
+it does not invalidate every account.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Any, Iterable
+
+from sqlalchemy import Connection, Integer, String, event, inspect, select
+from sqlalchemy.orm import Mapped, ORMExecuteState, Session, mapped_column
+
+from sdd_cash_manager.models.account import HIERARCHY_PATH_SEPARATOR, Account
+from sdd_cash_manager.models.base import Base, upsert
+from sdd_cash_manager.models.quickfill_template import QuickFillTemplate
+from sdd_cash_manager.models.transaction import Entry, Transaction
+
+LEDGER_VERSION_KEY = "*"
+ACCOUNTS_VERSION_KEY = "*accounts"
+LEDGER_VERSION_SHARDS = 16
+LEDGER_ACCOUNT_IDS_OPTION = "ledger_account_ids"
+
+_ACCOUNT_TABLES = frozenset({"accounts", "account_balance_shards"})
+_LEDGER_TABLES = _ACCOUNT_TABLES | {"transactions", "entries", "quickfill_templates"}
+_PENDING_INFO_KEY = "ledger_version_pending"
+_WROTE_INFO_KEY = "ledger_version_wrote"
+
+
+class LedgerVersion(Base):
+    """How many committed writes have changed one account, or the whole ledger."""
+
+    __tablename__ = "ledger_versions"
+
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+@dataclass
+class _PendingStamp:
+    account_ids: set[str] = field(default_factory=set)
+    all_accounts: bool = False
+
+
+def ledger_version_keys(prefix: str) -> list[str]:
+    """Return the keys of the ledger-wide rows for ``LEDGER_VERSION_KEY`` or ``ACCOUNTS_VERSION_KEY``."""
+    return [f"{prefix}{shard}" for shard in range(LEDGER_VERSION_SHARDS)]
+
+
+def _with_ancestors(connection: Connection, account_ids: set[str]) -> set[str]:
+    if not account_ids:
+        return set()
+    keys = set(account_ids)
+    for path in connection.scalars(select(Account.hierarchy_path).where(Account.id.in_(account_ids))):
+        keys.update(segment for segment in path.split(HIERARCHY_PATH_SEPARATOR) if segment)
+    return keys
+
+
+def stamp_ledger_versions(connection: Connection, account_ids: Iterable[str] = (), *, all_accounts: bool = False) -> None:
+    """Bump the ledger-wide version and those of ``account_ids`` and their ancestors."""
+    shard = random.randrange(LEDGER_VERSION_SHARDS)
+    keys = {f"{LEDGER_VERSION_KEY}{shard}"} | _with_ancestors(connection, set(account_ids))
+    if all_accounts:
+        keys.add(f"{ACCOUNTS_VERSION_KEY}{shard}")
+    statement = upsert(connection.dialect, LedgerVersion)
+    connection.execute(
+        statement.on_conflict_do_update(
+            index_elements=[LedgerVersion.key], set_={"version": LedgerVersion.version + 1}
+        ),
+        [{"key": key, "version": 1} for key in sorted(keys)],
+    )
+
+
+def _changed(session: Session, obj: object) -> bool:
+    return obj not in session.dirty or session.is_modified(obj, include_collections=False)
+
+
+@event.listens_for(Session, "before_flush")
+def _stamp_flushed_changes(session: Session, _flush_context: Any, _instances: Any) -> None:
+    pending: _PendingStamp | None = session.info.pop(_PENDING_INFO_KEY, None)
+    stamp = pending or _PendingStamp()
+    touched = pending is not None
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Account) and _changed(session, obj):
+            touched = True
+            stamp.account_ids.add(obj.id)
+            # A new or moved account also changes the hierarchy balance of its (old and new) parents.
+            stamp.account_ids.update(parent for parent in inspect(obj).attrs.parent_account_id.history.sum() if parent)
+        elif isinstance(obj, (Transaction, Entry, QuickFillTemplate)) and _changed(session, obj):
+            touched = True
+    if touched:
+        session.info[_WROTE_INFO_KEY] = True
+        stamp_ledger_versions(session.connection(), stamp.account_ids, all_accounts=stamp.all_accounts)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_ledger_statement(state: ORMExecuteState) -> None:
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return
+    table_name = getattr(getattr(state.statement, "table", None), "name", None)
+    if table_name not in _LEDGER_TABLES:
+        return
+    state.session.info[_WROTE_INFO_KEY] = True
+    pending = state.session.info.setdefault(_PENDING_INFO_KEY, _PendingStamp())
+    if table_name in _ACCOUNT_TABLES:
+        account_ids = state.execution_options.get(LEDGER_ACCOUNT_IDS_OPTION)
+        if account_ids is None:
+            pending.all_accounts = True
+        else:
+            pending.account_ids.update(account_ids)
+
+
+@event.listens_for(Session, "before_commit")
+def _stamp_executed_statements(session: Session) -> None:
+    pending: _PendingStamp | None = session.info.pop(_PENDING_INFO_KEY, None)
+    if pending is not None:
+        stamp_ledger_versions(session.connection(), pending.account_ids, all_accounts=pending.all_accounts)
+
+
+@event.listens_for(Session, "after_commit")
+def _forget_committed_writes(session: Session) -> None:
+    session.info.pop(_WROTE_INFO_KEY, None)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_stamp(session: Session, _previous_transaction: Any) -> None:
+    session.info.pop(_PENDING_INFO_KEY, None)
+    session.info.pop(_WROTE_INFO_KEY, None)
+
+
+def has_uncommitted_ledger_writes(session: Session) -> bool:
+    """Return whether ``session`` has written to the ledger since it last committed or rolled back.
+
+    Such a session can see rows no other session can, so its reads must not be shared.
+    """
+    return bool(session.info.get(_WROTE_INFO_KEY)) or any(
+        isinstance(obj, (Account, Transaction, Entry, QuickFillTemplate))
+        for obj in chain(session.new, session.dirty, session.deleted)
+    )
@@ -1,8 +1,9 @@
 import uuid
+from datetime import date
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, Date, ForeignKey, Numeric, String
+from sqlalchemy import Boolean, Date, ForeignKey, Index, Numeric, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from sdd_cash_manager.models.base import Base
@@ -15,10 +16,14 @@ class ReconciliationViewEntry(Base):
     """SQLAlchemy model representing an entry in the reconciliation view."""
 
     __tablename__ = "reconciliation_view_entries"
+    __table_args__ = (
+        # Serves account-scoped date ranges and the (entry_date, entry_id) keyset order.
+        Index("ix_reconciliation_view_entries_account_id_entry_date", "account_id", "entry_date", "entry_id"),
+    )
 
     entry_id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     account_id: Mapped[str] = mapped_column(ForeignKey("accounts.id"), nullable=False)
-    entry_date: Mapped[Date] = mapped_column(Date, nullable=False)
+    entry_date: Mapped[date] = mapped_column(Date, nullable=False)
     amount: Mapped[Decimal] = mapped_column(Numeric(18, 2), nullable=False)
     description: Mapped[str] = mapped_column(String, nullable=False)
     is_adjustment: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
@@ -0,0 +1,139 @@
+"""Per-account tallies of transactions by reconciliation status.
+
+Each transaction counts once towards its debit account, once towards its credit account
+(once in total for a self-transfer) and once towards one of ``LEDGER_COUNTER_SHARDS``
+ledger-wide rows, picked from the debit account so the ledger totals do not funnel every
+writer through one row. The ledger-wide counts are the sum of those rows. ORM inserts, status changes and deletes are folded into the
+counters when the session flushes; bulk statements that bypass the ORM adjust them through
+``sdd_cash_manager.services.reconciliation_counters``.
+"""
+
+from __future__ import annotations
+
+import zlib
+from collections import defaultdict
+from typing import Any, Iterable, Mapping
+
+from sqlalchemy import Connection, Integer, String, event, inspect
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from sdd_cash_manager.models.base import Base, upsert
+from sdd_cash_manager.models.enums import ReconciliationStatus
+from sdd_cash_manager.models.transaction import Transaction
+
+LEDGER_COUNTER_KEY = "*"
+LEDGER_COUNTER_SHARDS = 16
+
+COUNTER_COLUMNS: dict[ReconciliationStatus, str] = {
+    ReconciliationStatus.UNCLEARED: "uncleared_count",
+    ReconciliationStatus.CLEARED: "cleared_count",
+    ReconciliationStatus.RECONCILED: "reconciled_count",
+}
+
+CounterDeltas = dict[str, dict[str, int]]
+
+
+class ReconciliationCounter(Base):
+    """Number of uncleared, cleared and reconciled transactions touching one account."""
+
+    __tablename__ = "reconciliation_counters"
+
+    account_id: Mapped[str] = mapped_column(String, primary_key=True)
+    uncleared_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    cleared_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    reconciled_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+def counter_column(status: Any) -> str | None:
+    """Return the counter column for a reconciliation status, or ``None`` if it is not counted."""
+    try:
+        return COUNTER_COLUMNS.get(ReconciliationStatus(status))
+    except ValueError:
+        return None
+
+
+def ledger_counter_keys() -> list[str]:
+    """Return the keys of the ledger-wide counter rows."""
+    return [f"{LEDGER_COUNTER_KEY}{shard}" for shard in range(LEDGER_COUNTER_SHARDS)]
+
+
+def counter_keys(debit_account_id: str | None, credit_account_id: str | None) -> set[str]:
+    """Return the counter rows a transaction between the two accounts contributes to."""
+    shard = zlib.crc32((debit_account_id or credit_account_id or "").encode()) % LEDGER_COUNTER_SHARDS
+    accounts = {account_id for account_id in (debit_account_id, credit_account_id) if account_id}
+    return {f"{LEDGER_COUNTER_KEY}{shard}"} | accounts
+
+
+def add_counter_delta(
+    deltas: CounterDeltas,
+    debit_account_id: str | None,
+    credit_account_id: str | None,
+    status: Any,
+    amount: int,
+) -> None:
+    column = counter_column(status)
+    if column is None or amount == 0:
+        return
+    for key in counter_keys(debit_account_id, credit_account_id):
+        deltas[key][column] += amount
+
+
+def new_counter_deltas() -> CounterDeltas:
+    return defaultdict(lambda: defaultdict(int))
+
+
+def apply_counter_deltas(connection: Connection, deltas: Mapping[str, Mapping[str, int]]) -> None:
+    """Add ``deltas`` to the counter rows, creating rows that do not exist yet."""
+    for account_id, columns in deltas.items():
+        changes = {column: delta for column, delta in columns.items() if delta}
+        if not changes:
+            continue
+        statement = upsert(connection.dialect, ReconciliationCounter).values(account_id=account_id, **changes)
+        connection.execute(
+            statement.on_conflict_do_update(
+                index_elements=[ReconciliationCounter.account_id],
+                set_={column: getattr(ReconciliationCounter, column) + delta for column, delta in changes.items()},
+            )
+        )
+
+
+def _values(transaction: Transaction, *, before: bool) -> tuple[Any, Any, Any] | None:
+    """Return ``(debit, credit, status)`` as loaded from the database or as about to be written."""
+    values = []
+    for key in ("debit_account_id", "credit_account_id", "reconciliation_status"):
+        history = inspect(transaction).attrs[key].history
+        if before:
+            current = history.deleted or history.unchanged
+        else:
+            current = history.added or history.unchanged
+        if not current:
+            return None
+        values.append(current[0])
+    return values[0], values[1], values[2]
+
+
+def _transactions(objects: Iterable[object]) -> Iterable[Transaction]:
+    return (obj for obj in objects if isinstance(obj, Transaction))
+
+
+@event.listens_for(Session, "after_flush")
+def _count_flushed_transactions(session: Session, _flush_context: Any) -> None:
+    deltas = new_counter_deltas()
+    for transaction in _transactions(session.new):
+        after = _values(transaction, before=False)
+        if after is not None:
+            add_counter_delta(deltas, *after, 1)
+    for transaction in _transactions(session.dirty):
+        if not session.is_modified(transaction, include_collections=False):
+            continue
+        before, after = _values(transaction, before=True), _values(transaction, before=False)
+        if before is None or after is None or before == after:
+            continue
+        add_counter_delta(deltas, *before, -1)
+        add_counter_delta(deltas, *after, 1)
+    for transaction in _transactions(session.deleted):
+        before = _values(transaction, before=True)
+        if before is not None:
+            add_counter_delta(deltas, *before, -1)
+    if deltas:
+        apply_counter_deltas(session.connection(), deltas)
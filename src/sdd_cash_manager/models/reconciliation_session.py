@@ -36,8 +36,12 @@ class ReconciliationSession(Base):
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     statement_date: Mapped[date] = mapped_column(Date, nullable=False)
+    # Account being reconciled; ``None`` reconciles against the whole ledger.
+    account_id: Mapped[str | None] = mapped_column(String, nullable=True)
     ending_balance: Mapped[Decimal] = mapped_column(SqlNumeric(18, 2), nullable=False)
     difference: Mapped[Decimal] = mapped_column(SqlNumeric(18, 2), nullable=False)
+    # Running sum of the selected transactions' amounts, maintained in SQL as rows are added.
+    selected_total: Mapped[Decimal] = mapped_column(SqlNumeric(18, 2), nullable=False, default=Decimal("0.00"))
     state: Mapped[ReconciliationSessionState] = mapped_column(String(32), default=ReconciliationSessionState.IN_PROGRESS.value)
     created_by: Mapped[str | None] = mapped_column(String(64), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
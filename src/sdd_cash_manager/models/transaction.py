@@ -5,7 +5,7 @@ from datetime import datetime, timezone
 from decimal import Decimal
 from typing import TYPE_CHECKING, Any, List
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from sdd_cash_manager.models.account import Account
@@ -41,6 +41,10 @@ def _coerce_decimal_value(value: Any, *, allow_none: bool = False) -> Decimal:
 class Entry(Base):
     """SQLAlchemy model for a double-entry ledger row used by transactions."""
     __tablename__ = "entries"
+    __table_args__ = (
+        Index("ix_entries_account_id_id", "account_id", "id"),
+        Index("ix_entries_transaction_id", "transaction_id"),
+    )
 
     id: Mapped[str] = mapped_column(
         String, primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -79,6 +83,11 @@ class Entry(Base):
 class Transaction(Base):
     """SQLAlchemy model for an account transaction."""
     __tablename__ = "transactions"
+    __table_args__ = (
+        Index("ix_transactions_debit_account_id_id", "debit_account_id", "id"),
+        Index("ix_transactions_credit_account_id_id", "credit_account_id", "id"),
+        Index("ix_transactions_effective_date_id", "effective_date", "id"),
+    )
 
     id: Mapped[str] = mapped_column(
         String, primary_key=True, default=lambda: str(uuid.uuid4()))
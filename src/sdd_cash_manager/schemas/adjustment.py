@@ -8,8 +8,19 @@ from pydantic import (  # Import field_validator
     ConfigDict,  # Import ConfigDict
     Field,
     field_validator,
+    model_validator,
 )
 
+MAX_BULK_ADJUSTMENTS = 1000
+
+
+def _check_effective_date_range(value: date) -> date:
+    today = date.today()
+    # Example: disallow dates more than 1 year in the past or future
+    if not (date(today.year - 1, today.month, today.day) <= value <= date(today.year + 1, today.month, today.day)):
+        raise ValueError("Effective date must be within a reasonable range (e.g., +/- 1 year from today).")
+    return value
+
 
 # --- ManualBalanceAdjustment Schemas ---
 class ManualBalanceAdjustmentBase(BaseModel):
@@ -30,11 +41,7 @@ class ManualBalanceAdjustmentBase(BaseModel):
         Note: Actual business logic for 'current statement range' might require
         external context or configuration and should be refined.
         """
-        today = date.today()
-        # Example: disallow dates more than 1 year in the past or future
-        if not (date(today.year - 1, today.month, today.day) <= value <= date(today.year + 1, today.month, today.day)):
-             raise ValueError("Effective date must be within a reasonable range (e.g., +/- 1 year from today).")
-        return value
+        return _check_effective_date_range(value)
 
 
 class ManualBalanceAdjustmentCreate(ManualBalanceAdjustmentBase):
@@ -69,6 +76,50 @@ class ManualBalanceAdjustment(ManualBalanceAdjustmentBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+# --- Bulk ManualBalanceAdjustment Schemas ---
+class BulkBalanceAdjustmentItem(BaseModel):
+    """One account's target balance inside a bulk adjustment request."""
+    account_id: UUID
+    target_balance: Decimal = Field(..., ge=0, description="The desired new balance for the account.")
+    effective_date: date = Field(..., description="The date on which this adjustment should take effect.")
+
+    @field_validator("effective_date")
+    def check_effective_date_validity(cls, value):
+        return _check_effective_date_range(value)
+
+
+class BulkBalanceAdjustmentCreate(BaseModel):
+    """
+    Pydantic schema for adjusting many accounts in one request.
+    Each account may appear at most once so its as-of balance is computed once.
+    """
+    submitted_by_user_id: str = Field(..., description="Identifier of the user who initiated the adjustments.")
+    adjustments: list[BulkBalanceAdjustmentItem] = Field(..., min_length=1, max_length=MAX_BULK_ADJUSTMENTS)
+
+    @model_validator(mode="after")
+    def check_unique_accounts(self) -> "BulkBalanceAdjustmentCreate":
+        account_ids = [item.account_id for item in self.adjustments]
+        if len(set(account_ids)) != len(account_ids):
+            raise ValueError("Each account may only be adjusted once per bulk request.")
+        return self
+
+
+class BulkBalanceAdjustmentResult(BaseModel):
+    """Per-account outcome of a bulk adjustment; ``NOT_FOUND`` marks unknown accounts."""
+    account_id: UUID
+    status: Literal["COMPLETED", "ZERO_DIFFERENCE", "NOT_FOUND"]
+    difference: Decimal
+    adjustment_id: Optional[int] = None
+    created_transaction_id: Optional[UUID] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BulkBalanceAdjustmentResponse(BaseModel):
+    """Results of a bulk adjustment in request order."""
+    results: list[BulkBalanceAdjustmentResult]
+
+
 # --- AdjustmentTransaction Schemas ---
 class AdjustmentTransactionBase(BaseModel):
     """
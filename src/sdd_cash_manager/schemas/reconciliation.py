@@ -1,6 +1,6 @@
 from datetime import date
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict
@@ -31,3 +31,16 @@ class ReconciliationViewEntry(ReconciliationViewEntryBase):
     original_transaction_id: Optional[UUID] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ReconciliationStatusTotal(BaseModel):
+    reconciled_status: str
+    count: int
+    total_amount: Decimal
+
+
+class ReconciliationSummary(BaseModel):
+    account_id: UUID
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    totals: List[ReconciliationStatusTotal]
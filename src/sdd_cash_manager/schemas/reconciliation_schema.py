@@ -4,12 +4,13 @@ from datetime import date, datetime
 from decimal import Decimal
 from typing import List
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ReconciliationSessionRequest(BaseModel):
     statement_date: date
     ending_balance: Decimal
+    account_id: str | None = None
 
     model_config = ConfigDict(extra="forbid")
 
@@ -17,6 +18,7 @@ class ReconciliationSessionRequest(BaseModel):
 class ReconciliationSessionResponse(BaseModel):
     id: str
     statement_date: date
+    account_id: str | None = None
     ending_balance: Decimal
     difference: Decimal
     state: str
@@ -48,5 +50,47 @@ class TransactionSummary(BaseModel):
 
 class UnreconciledTransactionsResponse(BaseModel):
     transactions: List[TransactionSummary]
+    next_cursor: str | None = None
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class StatementLineRequest(BaseModel):
+    line_id: str | None = None
+    amount: Decimal
+    date: date
+    description: str | None = None
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class StatementMatchRequest(BaseModel):
+    lines: List[StatementLineRequest]
+    date_tolerance_days: int = Field(default=3, ge=0, le=31)
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class StatementMatchResponse(BaseModel):
+    line_id: str
+    transaction_id: str
+    score: Decimal
+    strategy: str
+
+
+class StatementMatchProposalResponse(BaseModel):
+    matches: List[StatementMatchResponse]
+    unmatched_line_ids: List[str]
+    residual_difference: Decimal
+    difference_explanation: List[str] | None = None
+
+
+class AcceptedMatch(BaseModel):
+    line_id: str
+    transaction_id: str
+
+
+class AcceptMatchesRequest(BaseModel):
+    matches: List[AcceptedMatch]
 
     model_config = ConfigDict(extra="forbid")
@@ -128,6 +128,14 @@ class DuplicateCandidateResponse(BaseModel):
     status: str
 
 
+class DuplicateScanResponse(BaseModel):
+    """One time-budgeted duplicate scan pass plus the cursor needed to continue it."""
+
+    candidates: List[DuplicateCandidateResponse]
+    next_cursor: str | None = None
+    complete: bool
+
+
 class DuplicateMergeRequest(BaseModel):
     """Payload for consolidating duplicate transactions."""
 
@@ -165,6 +173,9 @@ class AccountMergePlanResponse(BaseModel):
     target_account_id: str
     reparenting_map: Dict[str, str]
     affected_entries_count: int
+    affected_transactions_count: int = 0
+    total_entries_count: int | None = None
+    progress_phase: str | None = None
     status: str
     depth_validation_error: str | None = None
     audit_notes: str | None = None
@@ -0,0 +1,112 @@
+"""Materialized-path maintenance and queries for the account hierarchy.
+
+Every account stores its path from the root (``/root-id/child-id/own-id/``) and its depth.
+A subtree is therefore the contiguous key range ``[path, path-with-last-separator-bumped)``
+of ``ix_accounts_hierarchy_path``, so descendant lookups, depth checks and cycle detection
+cost O(subtree) instead of a recursive walk over the whole accounts table. Paths are
+assigned on insert by the model; moves and deletions rewrite the affected subtree here.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import ColumnElement, and_, func, literal, select, update
+from sqlalchemy.orm import Session
+
+from sdd_cash_manager.models.account import HIERARCHY_PATH_SEPARATOR, Account, hierarchy_depth, hierarchy_path_for
+
+MAX_HIERARCHY_DEPTH = 5
+
+
+def subtree_clause(path: str) -> ColumnElement[bool]:
+    """Match the account at ``path`` and all of its descendants with an index range."""
+    upper_bound = path[:-1] + chr(ord(HIERARCHY_PATH_SEPARATOR) + 1)
+    return and_(Account.hierarchy_path >= path, Account.hierarchy_path < upper_bound)
+
+
+def ancestor_ids(account: Account) -> list[str]:
+    """Return the IDs of the account's ancestors, root first, without querying the database."""
+    return account.hierarchy_path.strip(HIERARCHY_PATH_SEPARATOR).split(HIERARCHY_PATH_SEPARATOR)[:-1]
+
+
+def is_in_subtree(path: str, root_path: str) -> bool:
+    return path.startswith(root_path)
+
+
+def descendant_ids(session: Session, account_id: str) -> set[str]:
+    """Return the IDs in the subtree rooted at ``account_id`` (including it), or an empty set."""
+    path = session.scalar(select(Account.hierarchy_path).where(Account.id == account_id))
+    if path is None:
+        return set()
+    return set(session.scalars(select(Account.id).where(subtree_clause(path))))
+
+
+def subtree_max_depth(session: Session, path: str) -> int:
+    return int(session.scalar(select(func.max(Account.depth)).where(subtree_clause(path))) or hierarchy_depth(path))
+
+
+def _rewrite_subtree(
+    session: Session,
+    old_path: str,
+    new_prefix: str,
+    depth_delta: int,
+    *,
+    include_root: bool = True,
+) -> None:
+    """Replace the ``old_path`` prefix with ``new_prefix`` for every account in the subtree."""
+    criteria = [subtree_clause(old_path)]
+    if not include_root:
+        criteria.append(Account.hierarchy_path != old_path)
+    session.execute(
+        update(Account)
+        .where(*criteria)
+        .values(
+            hierarchy_path=literal(new_prefix) + func.substr(Account.hierarchy_path, len(old_path) + 1),
+            depth=Account.depth + depth_delta,
+        )
+        .execution_options(synchronize_session="fetch")
+    )
+
+
+def move_account(session: Session, account: Account, parent_id: str | None) -> None:
+    """Reparent ``account`` and rewrite the paths of its subtree.
+
+    Raises:
+        ValueError: The parent does not exist, is the account itself or one of its descendants,
+            or would push the deepest descendant past ``MAX_HIERARCHY_DEPTH``.
+    """
+    if parent_id == account.parent_account_id:
+        return
+    session.flush()
+    parent_path: str | None = None
+    if parent_id is not None:
+        parent = session.get(Account, parent_id)
+        if parent is None:
+            raise ValueError(f"Parent account {parent_id} not found.")
+        if is_in_subtree(parent.hierarchy_path, account.hierarchy_path):
+            raise ValueError(f"Account {account.id} cannot be placed under itself or one of its descendants.")
+        new_depth = parent.depth + 1 + subtree_max_depth(session, account.hierarchy_path) - account.depth
+        if new_depth > MAX_HIERARCHY_DEPTH:
+            raise ValueError(
+                f"Moving account {account.id} would place its deepest descendant at depth {new_depth}, "
+                f"exceeding the allowed limit of {MAX_HIERARCHY_DEPTH}."
+            )
+        parent_path = parent.hierarchy_path
+
+    old_path = account.hierarchy_path
+    new_path = hierarchy_path_for(parent_path, account.id)
+    _rewrite_subtree(session, old_path, new_path, hierarchy_depth(new_path) - hierarchy_depth(old_path))
+    account.parent_account_id = parent_id
+
+
+def promote_children(session: Session, account: Account) -> None:
+    """Reattach the children of an account that is about to be deleted to its parent."""
+    session.flush()
+    old_path = account.hierarchy_path
+    parent_prefix = old_path[: old_path.rstrip(HIERARCHY_PATH_SEPARATOR).rfind(HIERARCHY_PATH_SEPARATOR) + 1]
+    session.execute(
+        update(Account)
+        .where(Account.parent_account_id == account.id)
+        .values(parent_account_id=account.parent_account_id)
+        .execution_options(synchronize_session="fetch")
+    )
+    _rewrite_subtree(session, old_path, parent_prefix, -1, include_root=False)
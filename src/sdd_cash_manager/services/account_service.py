@@ -3,26 +3,49 @@ from dataclasses import dataclass
 from datetime import date, datetime, time, timezone  # using timezone.utc for timezone-aware snapshots
 from decimal import Decimal
 from enum import Enum
-from typing import TYPE_CHECKING, Any, Callable, TypeAlias
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Mapping, TypeAlias, cast
 
-from sqlalchemy import Select, and_, delete, func, or_, select, update
-from sqlalchemy.orm import Session
+from sqlalchemy import CursorResult, Select, and_, case, delete, func, or_, select, update
+from sqlalchemy.orm import Session, object_session
 from sqlalchemy.sql import ColumnElement
 
+from sdd_cash_manager.core.config import settings
 from sdd_cash_manager.lib.encryption import SensitiveDataCipher
 from sdd_cash_manager.lib.security_events import log_account_merge, log_critical_application_error  # New import
+from sdd_cash_manager.lib.single_flight import SingleFlight
 from sdd_cash_manager.lib.utils import quantize_currency
 from sdd_cash_manager.models.account import Account
 from sdd_cash_manager.models.account_merge_plan import AccountMergePlan
 from sdd_cash_manager.models.adjustment import AdjustmentTransaction, ManualBalanceAdjustment
 from sdd_cash_manager.models.enums import AccountingCategory, BankingProductType, ReconciliationStatus
+from sdd_cash_manager.models.ledger_version import has_uncommitted_ledger_writes
 from sdd_cash_manager.models.reconciliation import ReconciliationViewEntry
+from sdd_cash_manager.models.reconciliation_counter import ReconciliationCounter
 from sdd_cash_manager.models.transaction import Entry, Transaction
 from sdd_cash_manager.schemas.transaction_schema import AccountMergePlanRequest
+from sdd_cash_manager.services.account_hierarchy import move_account, promote_children, subtree_clause
+from sdd_cash_manager.services.balance_updates import (
+    create_balance_shards,
+    include_sharded_balances,
+    remove_balance_shards,
+    reset_balance_shards,
+    retry_on_version_conflict,
+    sharded_balance_total,
+)
+from sdd_cash_manager.services.ledger_versions import account_version, ledger_version
+from sdd_cash_manager.services.reconciliation_counters import (
+    reconciliation_counters_moved,
+    release_reconciliation_counters,
+)
+from sdd_cash_manager.services.unit_of_work import in_unit_of_work
 
 if TYPE_CHECKING:
     from sdd_cash_manager.services.transaction_service import TransactionService
 
+MERGE_PHASES = ("entries", "debits", "credits")
+# Concurrent hierarchy balance queries for one account share a single query; see ``lib.single_flight``.
+_hierarchy_balance_flights: SingleFlight[Decimal] = SingleFlight("hierarchy_balance")
+
 AccountFieldValue: TypeAlias = str | Decimal | float | bool | None  # NOSONAR - TypeAlias needed for 3.10/3.11 compatibility
 
 
@@ -136,18 +159,19 @@ class AccountService:
     def _calculate_hierarchy_balance_from_db(self, account_id: str) -> Decimal:
         session, should_close = self._acquire_session()
         try:
-            hierarchy_cte = (
-                select(Account.id, Account.available_balance)
-                .where(Account.id == account_id)
-                .cte(name="account_hierarchy", recursive=True)
-            )
-            hierarchy_cte = hierarchy_cte.union_all(
-                select(Account.id, Account.available_balance)
-                .where(Account.parent_account_id == hierarchy_cte.c.id)
-            )
-            total_query = select(func.coalesce(func.sum(hierarchy_cte.c.available_balance), Decimal("0.0")))
-            total = session.scalar(total_query)
-            return total or Decimal("0.0")
+            def _sum_subtree() -> Decimal:
+                path = session.scalar(select(Account.hierarchy_path).where(Account.id == account_id))
+                if path is None:
+                    return Decimal("0.0")
+                total = session.scalar(
+                    select(func.coalesce(func.sum(Account.available_balance), Decimal("0.0"))).where(subtree_clause(path))
+                )
+                return (total or Decimal("0.0")) + sharded_balance_total(session, subtree_clause(path))
+
+            # Concurrent requests for the same subtree share one query unless this session has its own writes.
+            if has_uncommitted_ledger_writes(session):
+                return _sum_subtree()
+            return _hierarchy_balance_flights.do((id(session.get_bind()), account_id), _sum_subtree)
         except Exception as e:
             log_critical_application_error(f"Failed to calculate hierarchy balance for account {account_id}: {e}", account_id=account_id, metadata={"service": "AccountService"})
             raise RuntimeError(f"Failed to calculate hierarchy balance for account {account_id} due to unexpected error.") from e
@@ -289,6 +313,9 @@ class AccountService:
         if quantized is None:
             raise ValueError("available_balance cannot be null.")
         account.available_balance = quantized
+        session = object_session(account)
+        if account.balance_shards and session is not None:
+            reset_balance_shards(session, account.id)
         self._record_balance_snapshot(account)
 
     def _update_credit_limit(self, account: Account, value: AccountFieldValue) -> None:
@@ -303,7 +330,22 @@ class AccountService:
         account.account_number = self._validate_string_field(str(value), "account_number", max_length=50, allowed_chars_regex=r"^[a-zA-Z0-9\-]+$") if value is not None else None
 
     def _update_parent_account_id(self, account: Account, value: AccountFieldValue) -> None:
-        account.parent_account_id = str(value) if value is not None else None
+        parent_id = str(value) if value is not None else None
+        session = object_session(account) if self._use_db else None
+        if session is not None:
+            move_account(session, account, parent_id)
+            return
+        self._ensure_not_own_ancestor(account.id, parent_id)
+        account.parent_account_id = parent_id
+
+    def _ensure_not_own_ancestor(self, account_id: str, parent_id: str | None) -> None:
+        """Reject in-memory reparenting that would make an account its own ancestor."""
+        current = parent_id
+        while current is not None:
+            if current == account_id:
+                raise ValueError(f"Account {account_id} cannot be placed under itself or one of its descendants.")
+            parent = self.accounts.get(current)
+            current = parent.parent_account_id if parent is not None else None
 
     def _update_notes(self, account: Account, value: AccountFieldValue) -> None:
         account.notes = self._encrypt_notes(self._validate_string_field(str(value), "notes", max_length=500, forbidden_chars_regex=r"[<>;]")) if value is not None else None
@@ -331,9 +373,14 @@ class AccountService:
         parent_account_id: str | None = None,
         hidden: bool = False,
         placeholder: bool = False,
-        id: str | None = None # NEW OPTIONAL PARAMETER
+        id: str | None = None, # NEW OPTIONAL PARAMETER
+        balance_shards: int = 0,
     ) -> Account:
-        """Create and persist a new account with validated metadata and quantized balances."""
+        """Create and persist a new account with validated metadata and quantized balances.
+
+        ``balance_shards`` spreads the account's postings over that many shard rows; use it for
+        write-hot accounts such as the balancing accounts.
+        """
         if not name or not currency or not accounting_category:
             raise ValueError("Name, currency, and accounting category are required.")
 
@@ -378,10 +425,13 @@ class AccountService:
 
         session, should_close = self._acquire_session()
         try:
+            account.balance_shards = max(balance_shards, 0)
             session.add(account)
             session.flush()
-            session.commit()
-            session.refresh(account)
+            create_balance_shards(session, account.id, account.balance_shards)
+            if not in_unit_of_work(session):
+                session.commit()
+                session.refresh(account)
             self._invalidate_hierarchy_cache()
             return account
         except Exception as e:
@@ -398,14 +448,18 @@ class AccountService:
 
         if session is not None:
             try:
-                return session.get(Account, account_id)
+                account = session.get(Account, account_id)
+                include_sharded_balances(session, [account])
+                return account
             except Exception as e:
                 log_critical_application_error(f"Failed to retrieve account {account_id}: {e}", account_id=account_id, metadata={"service": "AccountService"})
                 raise RuntimeError(f"Failed to retrieve account {account_id} due to unexpected error.") from e
 
         active_session, should_close = self._acquire_session()
         try:
-            return active_session.get(Account, account_id)
+            account = active_session.get(Account, account_id)
+            include_sharded_balances(active_session, [account])
+            return account
         except Exception as e:
             log_critical_application_error(f"Failed to retrieve account {account_id}: {e}", account_id=account_id, metadata={"service": "AccountService"})
             raise RuntimeError(f"Failed to retrieve account {account_id} due to unexpected error.") from e
@@ -439,7 +493,9 @@ class AccountService:
         session, should_close = self._acquire_session()
         try:
             query = self._build_account_query(criteria)
-            return list(session.scalars(query).all())
+            accounts = list(session.scalars(query).all())
+            include_sharded_balances(session, accounts)
+            return accounts
         except Exception as e:
             log_critical_application_error(f"Failed to retrieve all accounts: {e}", metadata={"service": "AccountService"})
             raise RuntimeError("Failed to retrieve all accounts due to unexpected error.") from e
@@ -447,21 +503,57 @@ class AccountService:
             if should_close and session is not None:
                 session.close()
 
+    def stream_accounts(
+        self,
+        hidden: bool | None = None,
+        placeholder: bool | None = None,
+        search_term: str | None = None
+    ) -> Iterator[Account]:
+        """Yield accounts matching the filters from a server-side cursor, ``account_stream_batch_size`` at a time.
+
+        Sharded balances are folded in per batch, so no more than one batch of accounts is
+        held in memory at once.
+        """
+        if not self._use_db:
+            yield from self.get_all_accounts(hidden=hidden, placeholder=placeholder, search_term=search_term)
+            return
+
+        criteria = AccountQueryCriteria(hidden=hidden, placeholder=placeholder, search_term=search_term)
+        session, should_close = self._acquire_session()
+        try:
+            query = self._build_account_query(criteria).execution_options(
+                yield_per=max(settings.account_stream_batch_size, 1)
+            )
+            for batch in session.scalars(query).partitions():
+                include_sharded_balances(session, batch)
+                yield from batch
+        except Exception as e:
+            log_critical_application_error(f"Failed to stream accounts: {e}", metadata={"service": "AccountService"})
+            raise RuntimeError("Failed to stream accounts due to unexpected error.") from e
+        finally:
+            if should_close and session is not None:
+                session.close()
+
     def _build_account_query(self, criteria: AccountQueryCriteria) -> Select[Any]:
         """Compose an optimized query based on the supplied criteria."""
-        query = select(Account).order_by(Account.name)
+        query = select(Account).where(Account.pending_deletion.is_(False)).order_by(Account.name)
         filters = criteria.build_filters()
         if filters:
             query = query.where(and_(*filters))
         return query
 
     def update_account(self, account_id: str, **kwargs: AccountFieldValue) -> Account | None:
-        """Apply partial updates to persisted account attributes with validation."""
+        """Apply partial updates to persisted account attributes with validation.
+
+        The write is checked against the account's ``version``; when another writer got there
+        first the update is re-read and re-applied a bounded number of times.
+        """
         session = None
         should_close = False
         if self._use_db:
             session, should_close = self._acquire_session()
-        try:
+
+        def _update() -> Account | None:
             # Use with_for_update() to acquire a pessimistic lock on the account row
             if self._use_db and session is not None:
                 account = session.execute(
@@ -474,6 +566,8 @@ class AccountService:
 
             if account is None:
                 return None
+            if session is not None:
+                include_sharded_balances(session, [account])
 
             self._apply_updates(account, kwargs)
             self._invalidate_hierarchy_cache() # Invalidate cache after update
@@ -482,10 +576,17 @@ class AccountService:
                 # Changes to the 'account' object are already tracked by the session
                 # No need for session.add(account) if it was already retrieved from the session
                 session.flush() # Persist changes within the transaction
-                session.commit()
-                session.refresh(account) # Reload fresh state after flush
+                if not in_unit_of_work(session):
+                    session.commit()
+                    session.refresh(account) # Reload fresh state after commit
+                include_sharded_balances(session, [account])
             self._invalidate_hierarchy_cache() # Invalidate cache after update
             return account
+
+        try:
+            if session is None:
+                return _update()
+            return retry_on_version_conflict(session, _update, description=f"update of account {account_id}")
         except ValueError:
             raise
         except Exception as e:
@@ -519,22 +620,9 @@ class AccountService:
             if account is None:
                 return False
 
-            placeholder_children_count = int(
-                session.scalar(
-                    select(func.count())
-                    .where(
-                        and_(
-                            Account.parent_account_id == account_id,
-                            Account.placeholder.is_(True)
-                        )
-                    )
-                ) or 0
-            )
-
-            if placeholder_children_count:
-                raise ValueError("Cannot delete an account that still has placeholder child accounts.")
-
+            self._ensure_no_placeholder_children(session, account_id)
             self._remove_account_dependents(session, account_id)
+            promote_children(session, account)
             session.delete(account)
             session.flush()
             self._invalidate_hierarchy_cache()
@@ -546,8 +634,14 @@ class AccountService:
             if should_close:
                 session.close()
 
-    def _remove_account_dependents(self, session: Session, account_id: str) -> None:
-        """Remove records tied to the account before deleting the account itself."""
+    def _remove_account_dependents(self, session: Session, account_id: str, *, commit_chunks: bool = False) -> None:
+        """Remove records tied to the account before deleting the account itself.
+
+        Transactions and their entries are deleted in chunks of ``account_purge_chunk_size``
+        selected by a subquery, so no ID list is materialized in Python or bound as
+        parameters. ``commit_chunks`` commits after every chunk to keep background purges
+        to short transactions.
+        """
         session.execute(
             delete(ReconciliationViewEntry)
             .where(ReconciliationViewEntry.account_id == account_id)
@@ -560,27 +654,116 @@ class AccountService:
             delete(AdjustmentTransaction)
             .where(AdjustmentTransaction.account_id == account_id)
         )
-        transaction_ids = session.scalars(
-            select(Transaction.id).where(
-                or_(
-                    Transaction.debit_account_id == account_id,
-                    Transaction.credit_account_id == account_id
+        chunk_size = max(settings.account_purge_chunk_size, 1)
+        while True:
+            chunk = (
+                select(Transaction.id)
+                .where(
+                    or_(
+                        Transaction.debit_account_id == account_id,
+                        Transaction.credit_account_id == account_id
+                    )
                 )
+                .order_by(Transaction.id)
+                .limit(chunk_size)
+                .scalar_subquery()
             )
-        ).all()
-
-        if transaction_ids:
+            release_reconciliation_counters(session, Transaction.id.in_(chunk))
             session.execute(
                 delete(Entry)
-                .where(Entry.transaction_id.in_(transaction_ids))
+                .where(Entry.transaction_id.in_(chunk))
+                .execution_options(synchronize_session=False)
             )
-            session.execute(
+            removed = cast(CursorResult[Any], session.execute(
                 delete(Transaction)
-                .where(Transaction.id.in_(transaction_ids))
-            )
+                .where(Transaction.id.in_(chunk))
+                .execution_options(synchronize_session=False)
+            )).rowcount
+            if commit_chunks:
+                session.commit()
+            if removed < chunk_size:
+                break
+        session.execute(delete(ReconciliationCounter).where(ReconciliationCounter.account_id == account_id))
+        remove_balance_shards(session, account_id)
         session.flush()
 
-    def merge_accounts(  # noqa: C901
+    def mark_account_for_deletion(self, account_id: str) -> bool:
+        """Flag an account for background purging and return immediately.
+
+        The account disappears from listings and rejects new postings at once; the purge
+        worker (:meth:`purge_pending_accounts`) removes its dependents and the row itself.
+        In-memory services have no background worker and delete synchronously.
+        """
+        if not self._use_db:
+            return self.delete_account(account_id)
+
+        session, should_close = self._acquire_session()
+        try:
+            account = self.get_account(account_id, session=session)
+            if account is None:
+                return False
+            self._ensure_no_placeholder_children(session, account_id)
+            account.pending_deletion = True
+            session.commit()
+            self._invalidate_hierarchy_cache()
+            return True
+        except ValueError:
+            raise
+        except Exception as e:
+            log_critical_application_error(f"Failed to mark account {account_id} for deletion: {e}", account_id=account_id, metadata={"service": "AccountService"})
+            raise RuntimeError(f"Failed to mark account {account_id} for deletion due to unexpected error.") from e
+        finally:
+            if should_close:
+                session.close()
+
+    def purge_pending_accounts(self) -> int:
+        """Delete every account flagged for deletion, in short chunked transactions.
+
+        Failures are logged and leave the account flagged so the next run retries it.
+        Returns the number of accounts removed.
+        """
+        if not self._use_db:
+            return 0
+
+        session, should_close = self._acquire_session()
+        purged = 0
+        try:
+            pending_ids = session.scalars(select(Account.id).where(Account.pending_deletion.is_(True))).all()
+            for account_id in pending_ids:
+                try:
+                    self._remove_account_dependents(session, account_id, commit_chunks=True)
+                    account = session.get(Account, account_id)
+                    if account is not None:
+                        promote_children(session, account)
+                        session.delete(account)
+                    session.commit()
+                    purged += 1
+                except Exception as e:
+                    session.rollback()
+                    log_critical_application_error(f"Failed to purge account {account_id}: {e}", account_id=account_id, metadata={"service": "AccountService"})
+            if purged:
+                self._invalidate_hierarchy_cache()
+            return purged
+        finally:
+            if should_close:
+                session.close()
+
+    def _ensure_no_placeholder_children(self, session: Session, account_id: str) -> None:
+        placeholder_children_count = int(
+            session.scalar(
+                select(func.count())
+                .where(
+                    and_(
+                        Account.parent_account_id == account_id,
+                        Account.placeholder.is_(True)
+                    )
+                )
+            ) or 0
+        )
+        if placeholder_children_count:
+            raise ValueError("Cannot delete an account that still has placeholder child accounts.")
+
+    def merge_accounts(
         self,
         plan_request: AccountMergePlanRequest,
         transaction_service: "TransactionService",
@@ -588,7 +771,14 @@ class AccountService:
         executed_by: str | None = None,
         session: Session | None = None
     ) -> AccountMergePlan:
-        """Reparent accounts and reassign entries/transactions during a planned merge."""
+        """Reparent accounts and reassign entries/transactions during a planned merge.
+
+        The hierarchy changes are committed together with the plan, which freezes the source
+        account (hidden placeholder) so no new postings land on it. Entries and transactions
+        are then moved in chunks of ``account_merge_chunk_size`` rows, each in its own short
+        transaction that also records progress on the plan, so an interrupted merge can be
+        continued with :meth:`resume_account_merge`.
+        """
         if not self._use_db:
             raise RuntimeError("Account merges require database persistence.")
 
@@ -631,33 +821,17 @@ class AccountService:
                 target.id,
                 explicit_children,
             )
-            entry_count = self._transfer_entries_and_transactions(
-                active_session,
-                source.id,
-                target.id,
-            )
-
             source.hidden = True
             source.placeholder = True
-            source.parent_account_id = target.id
-
-            plan.affected_entries_count = entry_count
-            plan.status = "executed"
-            plan.executed_at = datetime.now(timezone.utc)
-            active_session.flush()
-
-            log_account_merge(
-                plan.plan_id,
-                source.id,
-                target.id,
-                executed_by=executed_by or plan_request.initiated_by,
-                reparenting_map=reparent_map,
-                affected_entries_count=plan.affected_entries_count,
-                status=plan.status,
+            plan.total_entries_count = int(
+                active_session.scalar(select(func.count()).where(Entry.account_id == source.id)) or 0
             )
-
+            plan.status = "running"
+            plan.progress_phase = MERGE_PHASES[0]
+            active_session.commit()
             self._invalidate_hierarchy_cache()
-            return plan
+
+            return self._run_merge(active_session, plan, executed_by=executed_by or plan_request.initiated_by)
         except (ValueError, RuntimeError):
             raise
         except Exception as exc:
@@ -670,6 +844,110 @@ class AccountService:
             if close_session and active_session is not None:
                 active_session.close()
 
+    def resume_account_merge(self, plan_id: str, *, executed_by: str | None = None) -> AccountMergePlan:
+        """Continue a merge that was interrupted while moving entries or transactions."""
+        if not self._use_db:
+            raise RuntimeError("Account merges require database persistence.")
+
+        session, should_close = self._acquire_session()
+        try:
+            plan = session.get(AccountMergePlan, plan_id)
+            if plan is None:
+                raise ValueError(f"Merge plan {plan_id} not found.")
+            if plan.status == "executed":
+                return plan
+            if plan.status != "running":
+                raise ValueError(f"Merge plan {plan_id} cannot be resumed from status '{plan.status}'.")
+            return self._run_merge(session, plan, executed_by=executed_by or plan.initiated_by)
+        except (ValueError, RuntimeError):
+            raise
+        except Exception as exc:
+            log_critical_application_error(
+                f"Failed to resume account merge {plan_id}: {exc}",
+                metadata={"service": "AccountService"},
+            )
+            raise RuntimeError("Account merge failed due to unexpected error.") from exc
+        finally:
+            if should_close and session is not None:
+                session.close()
+
+    def get_merge_plan(self, plan_id: str) -> AccountMergePlan | None:
+        """Return a merge plan, including its progress counters, when it exists."""
+        if not self._use_db:
+            raise RuntimeError("Account merges require database persistence.")
+
+        session, should_close = self._acquire_session()
+        try:
+            return session.get(AccountMergePlan, plan_id)
+        except Exception as exc:
+            log_critical_application_error(
+                f"Failed to retrieve merge plan {plan_id}: {exc}",
+                metadata={"service": "AccountService"},
+            )
+            raise RuntimeError("Failed to retrieve merge plan due to unexpected error.") from exc
+        finally:
+            if should_close and session is not None:
+                session.close()
+
+    def _run_merge(self, session: Session, plan: AccountMergePlan, *, executed_by: str | None) -> AccountMergePlan:
+        """Move the remaining rows chunk by chunk, then finalize the plan and emit the audit event."""
+        chunk_size = max(settings.account_merge_chunk_size, 1)
+        while plan.progress_phase in MERGE_PHASES:
+            moved = self._move_merge_chunk(session, plan, chunk_size)
+            if moved < chunk_size:
+                next_index = MERGE_PHASES.index(plan.progress_phase) + 1
+                plan.progress_phase = MERGE_PHASES[next_index] if next_index < len(MERGE_PHASES) else None
+            session.commit()
+
+        source = session.get(Account, plan.source_account_id)
+        if source is None:
+            raise ValueError("Source account not found.")
+        move_account(session, source, plan.target_account_id)
+        plan.status = "executed"
+        plan.executed_at = datetime.now(timezone.utc)
+        session.commit()
+        self._invalidate_hierarchy_cache()
+
+        log_account_merge(
+            plan.plan_id,
+            plan.source_account_id,
+            plan.target_account_id,
+            executed_by=executed_by,
+            reparenting_map=plan.reparenting_map,
+            affected_entries_count=plan.affected_entries_count,
+            status=plan.status,
+        )
+        return plan
+
+    @staticmethod
+    def _move_merge_chunk(session: Session, plan: AccountMergePlan, chunk_size: int) -> int:
+        """Repoint the next keyset-ordered chunk of rows for the plan's current phase.
+
+        Moved rows drop out of the ``(account_id, id)`` index range being read, so each chunk
+        starts at the head of the range and no cursor is needed to resume.
+        """
+        source_id, target_id = plan.source_account_id, plan.target_account_id
+        if plan.progress_phase == "entries":
+            id_column, account_column = Entry.id, Entry.account_id
+        elif plan.progress_phase == "debits":
+            id_column, account_column = Transaction.id, Transaction.debit_account_id
+        else:
+            id_column, account_column = Transaction.id, Transaction.credit_account_id
+
+        ids = session.scalars(
+            select(id_column).where(account_column == source_id).order_by(id_column).limit(chunk_size)
+        ).all()
+        if ids:
+            move = update(account_column.class_).where(id_column.in_(ids)).values({account_column.key: target_id})
+            if plan.progress_phase == "entries":
+                session.execute(move)
+                plan.affected_entries_count += len(ids)
+            else:
+                with reconciliation_counters_moved(session, Transaction.id.in_(ids)):
+                    session.execute(move)
+                plan.affected_transactions_count += len(ids)
+        return len(ids)
+
     def _reparent_explicit_children(
         self,
         session: Session,
@@ -686,7 +964,7 @@ class AccountService:
                 parent = session.get(Account, new_parent)
                 if parent is None:
                     raise ValueError(f"Reparent target {new_parent} not found.")
-            child.parent_account_id = new_parent
+            move_account(session, child, new_parent)
             explicit_children.add(child_id)
         return explicit_children
 
@@ -703,28 +981,7 @@ class AccountService:
         for child in direct_children:
             if child.id in excluded_children:
                 continue
-            child.parent_account_id = target_id
-
-    def _transfer_entries_and_transactions(
-        self,
-        session: Session,
-        source_id: str,
-        target_id: str,
-    ) -> int:
-        entry_count = session.scalar(
-            select(func.count()).where(Entry.account_id == source_id)
-        ) or 0
-
-        session.execute(
-            update(Entry).where(Entry.account_id == source_id).values(account_id=target_id)
-        )
-        session.execute(
-            update(Transaction).where(Transaction.debit_account_id == source_id).values(debit_account_id=target_id)
-        )
-        session.execute(
-            update(Transaction).where(Transaction.credit_account_id == source_id).values(credit_account_id=target_id)
-        )
-        return int(entry_count)
+            move_account(session, child, target_id)
 
     def search_accounts_by_name(
         self,
@@ -759,7 +1016,9 @@ class AccountService:
         session, should_close = self._acquire_session()
         try:
             query = select(Account).where(and_(*filters)).order_by(Account.name)
-            return list(session.scalars(query).all())
+            accounts = list(session.scalars(query).all())
+            include_sharded_balances(session, accounts)
+            return accounts
         except Exception as e:
             log_critical_application_error(f"Failed to search accounts by name '{term}': {e}", metadata={"service": "AccountService", "search_term": term})
             raise RuntimeError("Failed to search accounts due to unexpected error.") from e
@@ -817,6 +1076,46 @@ class AccountService:
         """Return the running balance as of the requested effective date."""
         return self._aggregate_balance(account_id, effective_date=effective_date, reconciled_only=False)
 
+    def calculate_running_balances_as_of(self, cutoffs: Mapping[str, datetime | date]) -> dict[str, Decimal]:
+        """Return the running balance of every account in ``cutoffs`` as of its own date, in one grouped query."""
+        if not cutoffs:
+            return {}
+        as_of = {
+            account_id: (
+                value if isinstance(value, datetime) else datetime.combine(value, time.max, tzinfo=timezone.utc)
+            )
+            for account_id, value in cutoffs.items()
+        }
+        distinct_cutoffs = set(as_of.values())
+        cutoff_clause: Any = (
+            next(iter(distinct_cutoffs)) if len(distinct_cutoffs) == 1 else case(as_of, value=Entry.account_id)
+        )
+        session, should_close = self._acquire_session()
+        try:
+            rows = session.execute(
+                select(
+                    Entry.account_id,
+                    func.coalesce(func.sum(Entry.debit_amount), Decimal("0.0")),
+                    func.coalesce(func.sum(Entry.credit_amount), Decimal("0.0")),
+                )
+                .join(Transaction, Entry.transaction)
+                .where(Entry.account_id.in_(list(as_of)), Transaction.effective_date <= cutoff_clause)
+                .group_by(Entry.account_id)
+            )
+            balances = dict.fromkeys(as_of, quantize_currency(Decimal("0.0")))
+            for account_id, debit_total, credit_total in rows:
+                balances[account_id] = quantize_currency((debit_total or Decimal("0.0")) - (credit_total or Decimal("0.0")))
+            return balances
+        except Exception as e:
+            log_critical_application_error(
+                f"Failed to aggregate balances for {len(as_of)} accounts: {e}",
+                metadata={"service": "AccountService"},
+            )
+            raise RuntimeError("Failed to calculate account balances") from e
+        finally:
+            if should_close and session is not None:
+                session.close()
+
     def calculate_cleared_balance_as_of(self, account_id: str, effective_date: datetime | date) -> Decimal:
         """Return the cleared (reconciled) balance as of the requested effective date."""
         return self._aggregate_balance(account_id, effective_date=effective_date, reconciled_only=True)
@@ -835,6 +1134,26 @@ class AccountService:
             return Decimal("0.0")
         return quantize_currency(account.available_balance)
 
+    def get_ledger_version(self, account_id: str | None = None) -> tuple[int, ...] | None:
+        """Return the version stamp of the ledger, or of one account, without loading any account.
+
+        The stamp changes whenever the matching list or account response can, so it can back an
+        ETag. Returns ``None`` for services without a database, which keep no stamps.
+        """
+        if not self._use_db:
+            return None
+        session, should_close = self._acquire_session()
+        try:
+            if account_id is None:
+                return (ledger_version(session),)
+            return account_version(session, account_id)
+        except Exception as e:
+            log_critical_application_error(f"Failed to read ledger version: {e}", metadata={"service": "AccountService"})
+            raise RuntimeError("Failed to read ledger version due to unexpected error.") from e
+        finally:
+            if should_close and session is not None:
+                session.close()
+
     def get_account_hierarchy_balance(self, account_id: str) -> Decimal:
         """Return the aggregated balance for an account and its descendants.
         Uses an in-memory cache for performance.
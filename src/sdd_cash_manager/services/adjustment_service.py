@@ -1,24 +1,43 @@
 import logging
+from dataclasses import dataclass, replace
 from datetime import datetime, time, timezone
 from decimal import Decimal
 from time import perf_counter
+from typing import Sequence
 from uuid import UUID
 
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from sdd_cash_manager.lib.security_events import SecurityEvent, log_security_event
 from sdd_cash_manager.lib.utils import quantize_currency
+from sdd_cash_manager.models.account import Account
 from sdd_cash_manager.models.adjustment import AdjustmentTransaction, ManualBalanceAdjustment
 from sdd_cash_manager.models.enums import BankingProductType
-from sdd_cash_manager.schemas.adjustment import ManualBalanceAdjustmentCreate
+from sdd_cash_manager.schemas.adjustment import BulkBalanceAdjustmentItem, ManualBalanceAdjustmentCreate
 from sdd_cash_manager.services.account_service import AccountService
+from sdd_cash_manager.services.balance_updates import reset_balance_shards
 from sdd_cash_manager.services.reconciliation_service import ReconciliationService
-from sdd_cash_manager.services.transaction_service import BALANCING_ACCOUNT_ID, TransactionService
+from sdd_cash_manager.services.transaction_service import TransactionDraft, TransactionService
+from sdd_cash_manager.services.unit_of_work import unit_of_work
 
 logger = logging.getLogger(__name__)
 
 MANUAL_ADJUSTMENT_ACTION = "MANUAL_BALANCE_ADJUSTMENT"
+BULK_NOT_FOUND_STATUS = "NOT_FOUND"
+
+
+@dataclass(frozen=True)
+class BulkAdjustmentOutcome:
+    """Result of adjusting one account inside a bulk request."""
+
+    account_id: str
+    status: str
+    difference: Decimal
+    adjustment_id: int | None = None
+    created_transaction_id: str | None = None
+
 
 class ManualBalanceAdjustmentService:
     """
@@ -83,11 +102,11 @@ class ManualBalanceAdjustmentService:
             adjustment.status = "ZERO_DIFFERENCE"
             adjustment.created_transaction_id = None
             logger.info("Zero-difference adjustment recorded for account %s", account_id_str)
-            self.reconciliation_service.create_reconciliation_entry_for_manual_adjustment(
-                manual_adjustment=adjustment,
-                auto_commit=False,
-            )
-            self.db.commit()
+            with unit_of_work(self.db):
+                self.reconciliation_service.create_reconciliation_entry_for_manual_adjustment(
+                    manual_adjustment=adjustment,
+                    auto_commit=False,
+                )
             operation_status = adjustment.status
             self._log_adjustment_event(
                 account_id_str,
@@ -99,57 +118,56 @@ class ManualBalanceAdjustmentService:
             return adjustment
 
         try:
-            currency = getattr(account, "currency", "USD")
-            self.transaction_service.ensure_balancing_account_exists(currency)
-            transaction_description = f"Manual adjustment to {adjustment_data.target_balance}"
-            effective_datetime = datetime.combine(
-                adjustment_data.effective_date,
-                time.min,
-                tzinfo=timezone.utc
-            )
+            with unit_of_work(self.db):
+                currency = getattr(account, "currency", "USD")
+                balancing_id = self.transaction_service.ensure_balancing_account_exists(currency)
+                transaction_description = f"Manual adjustment to {adjustment_data.target_balance}"
+                effective_datetime = datetime.combine(
+                    adjustment_data.effective_date,
+                    time.min,
+                    tzinfo=timezone.utc
+                )
 
-            debit_account_id, credit_account_id = self._determine_entry_sides(account_id_str, difference)
-            created_transaction = self.transaction_service.create_transaction(
-                effective_date=effective_datetime,
-                booking_date=datetime.now(timezone.utc),
-                description=transaction_description,
-                amount=difference.copy_abs(),
-                debit_account_id=debit_account_id,
-                credit_account_id=credit_account_id,
-                action_type=MANUAL_ADJUSTMENT_ACTION,
-            )
+                debit_account_id, credit_account_id = self._determine_entry_sides(account_id_str, difference, balancing_id)
+                created_transaction = self.transaction_service.create_transaction(
+                    effective_date=effective_datetime,
+                    booking_date=datetime.now(timezone.utc),
+                    description=transaction_description,
+                    amount=difference.copy_abs(),
+                    debit_account_id=debit_account_id,
+                    credit_account_id=credit_account_id,
+                    action_type=MANUAL_ADJUSTMENT_ACTION,
+                )
 
-            account.available_balance = quantize_currency(adjustment_data.target_balance)
-            self.db.add(account)
-
-            transaction_type = self._transaction_type_for_difference(difference)
-
-            adjustment_transaction = AdjustmentTransaction(
-                transaction_id=created_transaction.id,
-                account_id=account_id_str,
-                effective_date=adjustment_data.effective_date,
-                amount=created_transaction.amount,
-                transaction_type=transaction_type,
-                description=created_transaction.description,
-                reconciliation_metadata={
-                    "processing_status": created_transaction.processing_status,
-                    "reconciliation_status": created_transaction.reconciliation_status,
-                },
-                created_at=datetime.now(timezone.utc),
-            )
-            self.db.add(adjustment_transaction)
-            self.db.flush()
+                self._set_available_balance(account, adjustment_data.target_balance)
+                self.db.add(account)
 
-            adjustment.created_transaction_id = adjustment_transaction.transaction_id
-            adjustment.status = "COMPLETED"
+                transaction_type = self._transaction_type_for_difference(difference)
 
-            self.reconciliation_service.create_reconciliation_entry_from_transaction(
-                account_id=UUID(account_id_str),
-                transaction=adjustment_transaction,
-                auto_commit=False,
-            )
+                adjustment_transaction = AdjustmentTransaction(
+                    transaction_id=created_transaction.id,
+                    account_id=account_id_str,
+                    effective_date=adjustment_data.effective_date,
+                    amount=created_transaction.amount,
+                    transaction_type=transaction_type,
+                    description=created_transaction.description,
+                    reconciliation_metadata={
+                        "processing_status": created_transaction.processing_status,
+                        "reconciliation_status": created_transaction.reconciliation_status,
+                    },
+                    created_at=datetime.now(timezone.utc),
+                )
+                self.db.add(adjustment_transaction)
+                self.db.flush()
 
-            self.db.commit()
+                adjustment.created_transaction_id = adjustment_transaction.transaction_id
+                adjustment.status = "COMPLETED"
+
+                self.reconciliation_service.create_reconciliation_entry_from_transaction(
+                    account_id=UUID(account_id_str),
+                    transaction=adjustment_transaction,
+                    auto_commit=False,
+                )
             adjustment.status = "COMPLETED"
             operation_status = "COMPLETED"
             duration_ms = (perf_counter() - operation_start) * 1000
@@ -191,6 +209,161 @@ class ManualBalanceAdjustmentService:
             )
             raise RuntimeError("An unexpected error occurred during adjustment creation") from exc
 
+    def create_bulk_adjustments(
+        self,
+        items: Sequence[BulkBalanceAdjustmentItem],
+        submitted_by_user_id: str,
+    ) -> list[BulkAdjustmentOutcome]:
+        """Adjust many accounts to their target balances and commit once.
+
+        As-of balances come from one grouped query, and the balancing transactions,
+        ``AdjustmentTransaction`` rows and reconciliation entries are written in batch.
+        Unknown accounts are reported as ``NOT_FOUND`` without failing the rest.
+        """
+        operation_start = perf_counter()
+        account_ids = [str(item.account_id) for item in items]
+        try:
+            with unit_of_work(self.db):
+                accounts = {
+                    account.id: account
+                    for account in self.db.scalars(select(Account).where(Account.id.in_(account_ids)))
+                }
+                balances = self.account_service.calculate_running_balances_as_of(
+                    {str(item.account_id): item.effective_date for item in items if str(item.account_id) in accounts}
+                )
+                outcomes, adjustments = self._stage_bulk_adjustments(items, accounts, balances, submitted_by_user_id)
+                self._post_bulk_adjustments(outcomes, adjustments, accounts)
+                # Read the generated keys before the commit expires every loaded row.
+                outcomes = [
+                    replace(outcome, adjustment_id=adjustment.id, created_transaction_id=adjustment.created_transaction_id)
+                    if adjustment is not None else outcome
+                    for outcome, adjustment in zip(outcomes, adjustments, strict=True)
+                ]
+        except ValueError:
+            raise
+        except Exception as exc:
+            logger.error("Bulk adjustment of %d accounts failed: %s", len(items), exc, exc_info=True)
+            raise RuntimeError("Failed to apply bulk balance adjustments") from exc
+
+        duration_ms = (perf_counter() - operation_start) * 1000
+        for item, outcome in zip(items, outcomes, strict=True):
+            if outcome.status != BULK_NOT_FOUND_STATUS:
+                payload = ManualBalanceAdjustmentCreate(
+                    target_balance=item.target_balance,
+                    effective_date=item.effective_date,
+                    submitted_by_user_id=submitted_by_user_id,
+                )
+                self._log_adjustment_event(outcome.account_id, payload, outcome.difference, outcome.status, duration_ms)
+        logger.info("Bulk adjustment of %d accounts completed (duration=%0.2fms)", len(items), duration_ms)
+        return outcomes
+
+    def _stage_bulk_adjustments(
+        self,
+        items: Sequence[BulkBalanceAdjustmentItem],
+        accounts: dict[str, Account],
+        balances: dict[str, Decimal],
+        submitted_by_user_id: str,
+    ) -> tuple[list[BulkAdjustmentOutcome], list[ManualBalanceAdjustment | None]]:
+        """Record one ``ManualBalanceAdjustment`` per known account and classify its difference."""
+        attempted_at = datetime.now(timezone.utc)
+        outcomes: list[BulkAdjustmentOutcome] = []
+        adjustments: list[ManualBalanceAdjustment | None] = []
+        for item in items:
+            account_id = str(item.account_id)
+            if account_id not in accounts:
+                outcomes.append(BulkAdjustmentOutcome(account_id, BULK_NOT_FOUND_STATUS, Decimal("0.00")))
+                adjustments.append(None)
+                continue
+            difference = quantize_currency(item.target_balance - balances[account_id])
+            status = "ZERO_DIFFERENCE" if difference == Decimal("0") else "PENDING"
+            adjustments.append(
+                ManualBalanceAdjustment(
+                    account_id=account_id,
+                    target_balance=item.target_balance,
+                    effective_date=item.effective_date,
+                    submitted_by_user_id=submitted_by_user_id,
+                    adjustment_attempt_timestamp=attempted_at,
+                    status=status,
+                )
+            )
+            outcomes.append(BulkAdjustmentOutcome(account_id, status, difference))
+        self.db.add_all([adjustment for adjustment in adjustments if adjustment is not None])
+        self.db.flush()
+        return outcomes, adjustments
+
+    def _post_bulk_adjustments(
+        self,
+        outcomes: list[BulkAdjustmentOutcome],
+        adjustments: list[ManualBalanceAdjustment | None],
+        accounts: dict[str, Account],
+    ) -> None:
+        """Post the balancing transactions and reconciliation entries for every non-zero difference."""
+        pending = [
+            (index, adjustment)
+            for index, adjustment in enumerate(adjustments)
+            if adjustment is not None and adjustment.status == "PENDING"
+        ]
+        entries = [
+            self.reconciliation_service.build_entry_for_zero_difference(adjustment)
+            for adjustment in adjustments
+            if adjustment is not None and adjustment.status == "ZERO_DIFFERENCE"
+        ]
+        if pending:
+            balancing_ids: dict[str, str] = {}
+            for _, adjustment in pending:
+                currency = getattr(accounts[adjustment.account_id], "currency", "USD")
+                if currency not in balancing_ids:
+                    balancing_ids[currency] = self.transaction_service.ensure_balancing_account_exists(currency)
+            booking_date = datetime.now(timezone.utc)
+            drafts = []
+            for index, adjustment in pending:
+                debit_account_id, credit_account_id = self._determine_entry_sides(
+                    adjustment.account_id,
+                    outcomes[index].difference,
+                    balancing_ids[getattr(accounts[adjustment.account_id], "currency", "USD")],
+                )
+                drafts.append(
+                    TransactionDraft(
+                        effective_date=datetime.combine(adjustment.effective_date, time.min, tzinfo=timezone.utc),
+                        booking_date=booking_date,
+                        description=f"Manual adjustment to {adjustment.target_balance}",
+                        amount=outcomes[index].difference.copy_abs(),
+                        debit_account_id=debit_account_id,
+                        credit_account_id=credit_account_id,
+                        action_type=MANUAL_ADJUSTMENT_ACTION,
+                    )
+                )
+            created_transactions = self.transaction_service.create_transactions(drafts)
+
+            adjustment_transactions = []
+            for (index, adjustment), created_transaction in zip(pending, created_transactions, strict=True):
+                self._set_available_balance(accounts[adjustment.account_id], adjustment.target_balance)
+                adjustment_transactions.append(
+                    AdjustmentTransaction(
+                        transaction_id=created_transaction.id,
+                        account_id=adjustment.account_id,
+                        effective_date=adjustment.effective_date,
+                        amount=created_transaction.amount,
+                        transaction_type=self._transaction_type_for_difference(outcomes[index].difference),
+                        description=created_transaction.description,
+                        reconciliation_metadata={
+                            "processing_status": created_transaction.processing_status,
+                            "reconciliation_status": created_transaction.reconciliation_status,
+                        },
+                        created_at=booking_date,
+                    )
+                )
+                adjustment.created_transaction_id = created_transaction.id
+                adjustment.status = "COMPLETED"
+                outcomes[index] = replace(outcomes[index], status="COMPLETED")
+            self.db.add_all(adjustment_transactions)
+            entries.extend(
+                self.reconciliation_service.build_entry_for_adjustment_transaction(adjustment_transaction.account_id, adjustment_transaction)
+                for adjustment_transaction in adjustment_transactions
+            )
+        self.db.add_all(entries)
+        self.db.flush()
+
     def _log_adjustment_event(
         self,
         account_id: str,
@@ -233,8 +406,14 @@ class ManualBalanceAdjustmentService:
     def _transaction_type_for_difference(difference: Decimal) -> str:
         return BankingProductType.ADJUSTMENT_DEBIT.value if difference > 0 else BankingProductType.ADJUSTMENT_CREDIT.value
 
+    def _set_available_balance(self, account: Account, target_balance: Decimal) -> None:
+        """Overwrite the account's balance, zeroing its shards so they are not added on top."""
+        account.available_balance = quantize_currency(target_balance)
+        if getattr(account, "balance_shards", 0):
+            reset_balance_shards(self.db, account.id)
+
     @staticmethod
-    def _determine_entry_sides(account_id: str, difference: Decimal) -> tuple[str, str]:
+    def _determine_entry_sides(account_id: str, difference: Decimal, balancing_id: str) -> tuple[str, str]:
         if difference > 0:
-            return account_id, BALANCING_ACCOUNT_ID
-        return BALANCING_ACCOUNT_ID, account_id
+            return account_id, balancing_id
+        return balancing_id, account_id
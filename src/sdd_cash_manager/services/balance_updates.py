@@ -0,0 +1,190 @@
+"""Atomic account balance increments, sharded hot-account balances and bounded retry of
+optimistic version conflicts."""
+
+from __future__ import annotations
+
+import random
+from decimal import Decimal
+from typing import Any, Callable, Collection, Iterable, Mapping, TypeVar, cast
+
+from sqlalchemy import ColumnElement, CursorResult, delete, func, insert, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.orm.util import identity_key
+
+from sdd_cash_manager.core.config import settings
+from sdd_cash_manager.lib.logging_config import get_logger
+from sdd_cash_manager.lib.utils import quantize_currency
+from sdd_cash_manager.models.account import Account
+from sdd_cash_manager.models.balance_shard import AccountBalanceShard
+from sdd_cash_manager.models.base import upsert
+from sdd_cash_manager.models.ledger_journal import append_journal_entries
+from sdd_cash_manager.models.ledger_version import LEDGER_ACCOUNT_IDS_OPTION
+from sdd_cash_manager.services.unit_of_work import in_unit_of_work
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+def apply_balance_deltas(
+    session: Session,
+    deltas: Mapping[str, Decimal],
+    *,
+    transaction_id: str | None = None,
+) -> None:
+    """Add each delta to its account with ``UPDATE ... SET available_balance = available_balance + :delta``.
+
+    The database does the arithmetic, so concurrent postings cannot lose each other's updates,
+    and every statement bumps ``version`` so stale ORM writes are rejected. Accounts are
+    updated in ID order to keep lock acquisition consistent, and any instance already loaded
+    in ``session`` is refreshed with the new balance and version.
+
+    An account with ``balance_shards`` takes its delta on one randomly chosen shard row
+    instead, leaving the account row (and its version) untouched. The shard count is read
+    from the loaded instance when there is one and from the account row otherwise. Every delta is appended to the
+    ledger journal, tagged with ``transaction_id`` when the deltas come from one transaction.
+    """
+    returning = session.get_bind().dialect.update_returning
+    for account_id in sorted(deltas):
+        delta = deltas[account_id]
+        if delta == 0:
+            continue
+        loaded = session.identity_map.get(identity_key(Account, account_id))
+        if loaded is not None and loaded.balance_shards > 0:
+            _add_to_shard(session, account_id, random.randrange(loaded.balance_shards), delta)
+            include_sharded_balances(session, [loaded])
+            continue
+        statement = (
+            update(Account)
+            .where(Account.id == account_id, Account.balance_shards == 0)
+            .values(
+                available_balance=func.round(Account.available_balance + delta, 2),
+                version=Account.version + 1,
+            )
+            .execution_options(synchronize_session=False, **{LEDGER_ACCOUNT_IDS_OPTION: (account_id,)})
+        )
+        if returning:
+            row = session.execute(statement.returning(Account.available_balance, Account.version)).one_or_none()
+        elif cast(CursorResult[Any], session.execute(statement)).rowcount:
+            row = session.execute(
+                select(Account.available_balance, Account.version).where(Account.id == account_id)
+            ).one_or_none()
+        else:
+            row = None
+        if row is None:
+            # Either the account does not exist or it is sharded.
+            shards = session.scalar(select(Account.balance_shards).where(Account.id == account_id))
+            if not shards:
+                raise ValueError(f"Account with ID {account_id} not found.")
+            _add_to_shard(session, account_id, random.randrange(shards), delta)
+            include_sharded_balances(session, [loaded])
+            continue
+        if loaded is not None:
+            set_committed_value(loaded, "available_balance", row[0])
+            set_committed_value(loaded, "version", row[1])
+    append_journal_entries(session.connection(), deltas, transaction_id=transaction_id)
+
+
+def _add_to_shard(session: Session, account_id: str, shard: int, delta: Decimal) -> None:
+    statement = upsert(session.get_bind().dialect, AccountBalanceShard).values(
+        account_id=account_id, shard=shard, balance=delta
+    )
+    session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[AccountBalanceShard.account_id, AccountBalanceShard.shard],
+            set_={"balance": func.round(AccountBalanceShard.balance + statement.excluded.balance, 2)},
+        ).execution_options(**{LEDGER_ACCOUNT_IDS_OPTION: (account_id,)})
+    )
+
+
+def create_balance_shards(session: Session, account_id: str, shards: int) -> None:
+    """Insert ``shards`` zeroed shard rows for an account created with ``balance_shards=shards``."""
+    if shards <= 0:
+        return
+    session.execute(
+        insert(AccountBalanceShard).execution_options(**{LEDGER_ACCOUNT_IDS_OPTION: (account_id,)}),
+        [{"account_id": account_id, "shard": shard, "balance": Decimal("0.0")} for shard in range(shards)],
+    )
+
+
+def reset_balance_shards(session: Session, account_id: str) -> None:
+    """Zero an account's shards; call when its ``available_balance`` is being overwritten."""
+    session.execute(
+        update(AccountBalanceShard)
+        .where(AccountBalanceShard.account_id == account_id)
+        .values(balance=Decimal("0.0"))
+        .execution_options(synchronize_session=False, **{LEDGER_ACCOUNT_IDS_OPTION: (account_id,)})
+    )
+
+
+def remove_balance_shards(session: Session, account_id: str) -> None:
+    """Delete an account's shard rows ahead of deleting the account."""
+    session.execute(
+        delete(AccountBalanceShard)
+        .where(AccountBalanceShard.account_id == account_id)
+        .execution_options(**{LEDGER_ACCOUNT_IDS_OPTION: (account_id,)})
+    )
+
+
+def sharded_balance_total(session: Session, *criteria: ColumnElement[bool]) -> Decimal:
+    """Sum the shards of every account matching ``criteria``."""
+    total = session.scalar(
+        select(func.coalesce(func.sum(AccountBalanceShard.balance), Decimal("0.0")))
+        .join(Account, Account.id == AccountBalanceShard.account_id)
+        .where(*criteria)
+    )
+    return total or Decimal("0.0")
+
+
+def stored_balances(session: Session, account_ids: Collection[str] | None = None) -> dict[str, Decimal]:
+    """Return each account's row balance plus its shard total, for ``account_ids`` or every account."""
+    shard_totals = select(
+        AccountBalanceShard.account_id,
+        func.sum(AccountBalanceShard.balance).label("total"),
+    ).group_by(AccountBalanceShard.account_id)
+    statement = select(Account.id, Account.available_balance)
+    if account_ids is not None:
+        shard_totals = shard_totals.where(AccountBalanceShard.account_id.in_(list(account_ids)))
+        statement = statement.where(Account.id.in_(list(account_ids)))
+    totals = shard_totals.subquery()
+    rows = session.execute(
+        statement.add_columns(totals.c.total).outerjoin(totals, totals.c.account_id == Account.id)
+    )
+    return {
+        account_id: quantize_currency(Decimal(str(balance)) + Decimal(str(total or 0)))
+        for account_id, balance, total in rows
+    }
+
+
+def include_sharded_balances(session: Session, accounts: Iterable[Account | None]) -> None:
+    """Set each sharded account's loaded ``available_balance`` to its row value plus its shards.
+
+    Reads the row value back from the database, so calling it again on the same instances is
+    harmless. Unsharded accounts are left alone without a query.
+    """
+    sharded = {account.id: account for account in accounts if account is not None and account.balance_shards > 0}
+    if not sharded:
+        return
+    for account_id, balance in stored_balances(session, sharded).items():
+        set_committed_value(sharded[account_id], "available_balance", balance)
+
+
+def retry_on_version_conflict(session: Session, operation: Callable[[], T], *, description: str) -> T:
+    """Run ``operation``, rolling back and re-running it when an account's version changed underneath.
+
+    Gives up after ``settings.balance_update_max_attempts`` attempts. Inside a unit of work the
+    conflict propagates unchanged, because only the owner of the transaction can safely replay it.
+    """
+    attempts = max(settings.balance_update_max_attempts, 1)
+    attempt = 1
+    while True:
+        try:
+            return operation()
+        except StaleDataError:
+            if in_unit_of_work(session) or attempt >= attempts:
+                raise
+            attempt += 1
+            session.rollback()
+            logger.warning("Version conflict during %s; retrying (attempt %d of %d)", description, attempt, attempts)
@@ -0,0 +1,316 @@
+"""Incremental columnar export of the ledger to Parquet, plus local queries over the export.
+
+Transactions and entries are read in keyset order on their watermark column and written
+as Parquet files partitioned by the transaction's effective month
+(``<root>/<table>/month=YYYY-MM/part-*.parquet``). ``_watermarks.json`` in the export root
+records where the last run stopped, so each run only reads rows created (entries) or
+updated (transactions) since. Accounts carry no timestamps and are re-exported whole to
+``<root>/accounts/accounts.parquet`` on every run.
+
+Needs ``pyarrow``, installed with the ``export`` extra.
+"""
+
+from __future__ import annotations
+
+import json
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from decimal import Decimal
+from enum import Enum
+from pathlib import Path
+from typing import Any, Iterator, Sequence
+
+from sqlalchemy import ColumnElement, and_, or_, select
+from sqlalchemy.orm import Session
+
+from sdd_cash_manager.core.config import settings
+from sdd_cash_manager.lib.utils import quantize_currency
+from sdd_cash_manager.models.account import Account
+from sdd_cash_manager.models.transaction import Entry, Transaction
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as pds
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow is optional
+    pa = pc = pds = pq = None
+
+WATERMARK_FILE = "_watermarks.json"
+ACCOUNTS_FILE = "accounts.parquet"
+EXPORT_TABLES = ("transactions", "entries", "accounts")
+
+_TRANSACTION_COLUMNS = (
+    Transaction.id,
+    Transaction.effective_date,
+    Transaction.booking_date,
+    Transaction.description,
+    Transaction.amount,
+    Transaction.debit_account_id,
+    Transaction.credit_account_id,
+    Transaction.action_type,
+    Transaction.processing_status,
+    Transaction.reconciliation_status,
+    Transaction.created_at,
+    Transaction.updated_at,
+)
+_ENTRY_COLUMNS = (
+    Entry.id,
+    Entry.transaction_id,
+    Entry.account_id,
+    Entry.debit_amount,
+    Entry.credit_amount,
+    Entry.created_at,
+    Transaction.effective_date,
+)
+_ACCOUNT_COLUMNS = (
+    Account.id,
+    Account.name,
+    Account.currency,
+    Account.accounting_category,
+    Account.parent_account_id,
+    Account.hierarchy_path,
+    Account.hidden,
+    Account.placeholder,
+)
+_DECIMAL_COLUMNS = {"amount", "debit_amount", "credit_amount"}
+# Column each table's exported rows are deduplicated on when the same ID was exported twice.
+_LATEST_BY = {"transactions": "updated_at", "entries": "created_at"}
+
+
+@dataclass
+class LedgerExportResult:
+    """Rows and files written by one ``export_ledger`` run."""
+
+    transactions: int = 0
+    entries: int = 0
+    accounts: int = 0
+    files: list[Path] = field(default_factory=list)
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise RuntimeError("The ledger export needs pyarrow; install the `export` extra (`poetry install --extras export`).")
+
+
+def _schema(table: str) -> Any:
+    money = pa.decimal128(18, 2)
+    timestamp = pa.timestamp("us")
+    if table == "transactions":
+        return pa.schema(
+            [
+                ("id", pa.string()),
+                ("effective_date", timestamp),
+                ("booking_date", timestamp),
+                ("description", pa.string()),
+                ("amount", money),
+                ("debit_account_id", pa.string()),
+                ("credit_account_id", pa.string()),
+                ("action_type", pa.string()),
+                ("processing_status", pa.string()),
+                ("reconciliation_status", pa.string()),
+                ("created_at", timestamp),
+                ("updated_at", timestamp),
+            ]
+        )
+    if table == "entries":
+        return pa.schema(
+            [
+                ("id", pa.string()),
+                ("transaction_id", pa.string()),
+                ("account_id", pa.string()),
+                ("debit_amount", money),
+                ("credit_amount", money),
+                ("created_at", timestamp),
+                ("effective_date", timestamp),
+            ]
+        )
+    return pa.schema(
+        [
+            ("id", pa.string()),
+            ("name", pa.string()),
+            ("currency", pa.string()),
+            ("accounting_category", pa.string()),
+            ("parent_account_id", pa.string()),
+            ("hierarchy_path", pa.string()),
+            ("hidden", pa.bool_()),
+            ("placeholder", pa.bool_()),
+        ]
+    )
+
+
+def _naive(value: datetime | None) -> datetime | None:
+    """Return ``value`` as a naive UTC timestamp; SQLite hands timestamps back naive already."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _column_values(rows: Sequence[Any], name: str) -> list[Any]:
+    values = [getattr(row, name) for row in rows]
+    if name in _DECIMAL_COLUMNS:
+        return [quantize_currency(Decimal(str(value))) for value in values]
+    if values and any(isinstance(value, datetime) for value in values):
+        return [_naive(value) for value in values]
+    return [value.value if isinstance(value, Enum) else value for value in values]
+
+
+def _to_record_batch(table: str, rows: Sequence[Any]) -> Any:
+    schema = _schema(table)
+    return pa.record_batch([pa.array(_column_values(rows, name), type=schema.field(name).type) for name in schema.names], schema=schema)
+
+
+def _keyset_batches(
+    session: Session,
+    statement: Any,
+    order_column: Any,
+    id_column: Any,
+    watermark: dict[str, str] | None,
+    batch_size: int,
+) -> Iterator[Sequence[Any]]:
+    """Yield rows after ``watermark`` in ``(order_column, id)`` order, ``batch_size`` at a time."""
+    after: tuple[datetime, str] | None = None
+    if watermark is not None:
+        after = (datetime.fromisoformat(watermark["at"]).replace(tzinfo=timezone.utc), watermark["id"])
+    while True:
+        page = statement.order_by(order_column, id_column).limit(batch_size)
+        if after is not None:
+            position: ColumnElement[bool] = or_(
+                order_column > after[0], and_(order_column == after[0], id_column > after[1])
+            )
+            page = page.where(position)
+        rows = session.execute(page).all()
+        if not rows:
+            return
+        yield rows
+        last = rows[-1]
+        after = (getattr(last, order_column.key), getattr(last, id_column.key))
+        if len(rows) < batch_size:
+            return
+
+
+def _write_partitioned(root: Path, table: str, batch: Any, run_id: str, batch_number: int) -> list[Path]:
+    """Write one Parquet file per effective month present in ``batch``."""
+    months = pc.strftime(batch.column("effective_date"), format="%Y-%m")
+    written = []
+    for month in sorted(set(months.to_pylist())):
+        part = batch.filter(pc.equal(months, month))
+        directory = root / table / f"month={month}"
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"part-{run_id}-{batch_number:05d}.parquet"
+        pq.write_table(pa.Table.from_batches([part]), path)
+        written.append(path)
+    return written
+
+
+def _read_watermarks(root: Path) -> dict[str, dict[str, str]]:
+    path = root / WATERMARK_FILE
+    if not path.exists():
+        return {}
+    watermarks: dict[str, dict[str, str]] = json.loads(path.read_text())
+    return watermarks
+
+
+def _write_watermarks(root: Path, watermarks: dict[str, dict[str, str]]) -> None:
+    path = root / WATERMARK_FILE
+    temporary = path.with_suffix(".tmp")
+    temporary.write_text(json.dumps(watermarks, indent=2, sort_keys=True))
+    temporary.replace(path)
+
+
+def export_ledger(session: Session, output_dir: str | Path, *, batch_size: int | None = None) -> LedgerExportResult:
+    """Export transactions and entries changed since the last run, and every account, to ``output_dir``.
+
+    Rows are read in keyset batches of ``batch_size`` (default ``settings.export_batch_size``),
+    so neither the database nor this process holds the whole ledger at once. The watermark
+    file is only advanced after a table's files are written; a crashed run re-exports its
+    rows next time and ``read_export`` drops the duplicates.
+    """
+    _require_pyarrow()
+    root = Path(output_dir)
+    root.mkdir(parents=True, exist_ok=True)
+    size = max(batch_size or settings.export_batch_size, 1)
+    run_id = uuid.uuid4().hex[:12]
+    watermarks = _read_watermarks(root)
+    result = LedgerExportResult()
+
+    sources = (
+        ("transactions", select(*_TRANSACTION_COLUMNS), Transaction.updated_at, Transaction.id),
+        (
+            "entries",
+            select(*_ENTRY_COLUMNS).join(Transaction, Entry.transaction_id == Transaction.id),
+            Entry.created_at,
+            Entry.id,
+        ),
+    )
+    for table, statement, order_column, id_column in sources:
+        exported = 0
+        last_row = None
+        for batch_number, rows in enumerate(
+            _keyset_batches(session, statement, order_column, id_column, watermarks.get(table), size)
+        ):
+            result.files.extend(_write_partitioned(root, table, _to_record_batch(table, rows), run_id, batch_number))
+            exported += len(rows)
+            last_row = rows[-1]
+        setattr(result, table, exported)
+        if last_row is not None:
+            last_at = _naive(getattr(last_row, order_column.key)) or datetime.min
+            watermarks[table] = {"at": last_at.isoformat(), "id": getattr(last_row, id_column.key)}
+            _write_watermarks(root, watermarks)
+
+    accounts = session.execute(select(*_ACCOUNT_COLUMNS).order_by(Account.id)).all()
+    accounts_dir = root / "accounts"
+    accounts_dir.mkdir(parents=True, exist_ok=True)
+    accounts_path = accounts_dir / ACCOUNTS_FILE
+    temporary = accounts_path.with_suffix(".tmp")
+    pq.write_table(pa.Table.from_batches([_to_record_batch("accounts", accounts)], schema=_schema("accounts")), temporary)
+    temporary.replace(accounts_path)
+    result.accounts = len(accounts)
+    result.files.append(accounts_path)
+    return result
+
+
+def read_export(output_dir: str | Path, table: str, *, months: Sequence[str] | None = None) -> Any:
+    """Load one exported table as a ``pyarrow.Table``, keeping only the latest copy of each row.
+
+    ``months`` (``"YYYY-MM"`` strings) limits transactions and entries to those partitions,
+    which are the only files read. Partitioned tables gain a ``month`` column.
+    """
+    _require_pyarrow()
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"Unknown export table {table!r}; expected one of {', '.join(EXPORT_TABLES)}.")
+    directory = Path(output_dir) / table
+    if table == "accounts":
+        return pq.read_table(directory / ACCOUNTS_FILE)
+    if not directory.exists():
+        return _schema(table).append(pa.field("month", pa.string())).empty_table()
+
+    dataset = pds.dataset(
+        directory,
+        format="parquet",
+        partitioning=pds.partitioning(pa.schema([("month", pa.string())]), flavor="hive"),
+    )
+    data = dataset.to_table(filter=pc.field("month").isin(list(months)) if months else None)
+    if data.num_rows == 0:
+        return data
+    ordered = data.sort_by([(_LATEST_BY[table], "ascending")])
+    positions = ordered.append_column("_position", pa.array(range(ordered.num_rows), type=pa.int64()))
+    latest = positions.group_by("id", use_threads=False).aggregate([("_position", "max")])
+    return ordered.take(latest.column("_position_max")).sort_by([("id", "ascending")])
+
+
+def aggregate_export(
+    output_dir: str | Path,
+    table: str,
+    group_by: Sequence[str],
+    aggregations: Sequence[tuple[str, str]],
+    *,
+    months: Sequence[str] | None = None,
+) -> Any:
+    """Group an exported table and aggregate it locally, e.g. monthly debits per account::
+
+        aggregate_export(path, "entries", ["account_id", "month"], [("debit_amount", "sum")])
+    """
+    data = read_export(output_dir, table, months=months)
+    return data.group_by(list(group_by), use_threads=False).aggregate(list(aggregations))
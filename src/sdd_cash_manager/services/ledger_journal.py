@@ -0,0 +1,121 @@
+"""Snapshots, point-in-time replay and balance recovery from the ledger journal."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from sdd_cash_manager.lib.utils import quantize_currency
+from sdd_cash_manager.models.account import Account
+from sdd_cash_manager.models.ledger_journal import LedgerJournalEntry, LedgerSnapshot
+from sdd_cash_manager.models.ledger_version import LEDGER_ACCOUNT_IDS_OPTION
+from sdd_cash_manager.services.balance_updates import reset_balance_shards, stored_balances
+
+
+@dataclass(frozen=True)
+class LedgerState:
+    """Account balances after applying the journal up to ``sequence``."""
+
+    sequence: int
+    balances: dict[str, Decimal] = field(default_factory=dict)
+    snapshot_sequence: int | None = None
+
+    def balance_of(self, account_id: str) -> Decimal:
+        return self.balances.get(account_id, quantize_currency(Decimal("0.0")))
+
+
+def latest_sequence(session: Session) -> int:
+    """Return the sequence number of the newest journal entry, or 0 for an empty journal."""
+    return session.scalar(select(func.coalesce(func.max(LedgerJournalEntry.sequence), 0))) or 0
+
+
+def sequence_as_of(session: Session, moment: datetime) -> int:
+    """Return the last sequence number journaled at or before ``moment``."""
+    return (
+        session.scalar(
+            select(func.coalesce(func.max(LedgerJournalEntry.sequence), 0)).where(LedgerJournalEntry.recorded_at <= moment)
+        )
+        or 0
+    )
+
+
+def replay_ledger(session: Session, sequence: int | None = None) -> LedgerState:
+    """Rebuild every balance as of ``sequence`` (default: the newest entry).
+
+    Starts from the newest snapshot at or before ``sequence`` and adds the journal tail with
+    one grouped query, so the cost depends on the tail rather than on the ledger's age.
+    """
+    target = latest_sequence(session) if sequence is None else max(sequence, 0)
+    snapshot = session.scalars(
+        select(LedgerSnapshot)
+        .where(LedgerSnapshot.sequence <= target)
+        .order_by(LedgerSnapshot.sequence.desc(), LedgerSnapshot.id.desc())
+        .limit(1)
+    ).first()
+    balances = {account_id: Decimal(value) for account_id, value in snapshot.balances.items()} if snapshot else {}
+    start = snapshot.sequence if snapshot else 0
+    tail = session.execute(
+        select(LedgerJournalEntry.account_id, func.sum(LedgerJournalEntry.delta))
+        .where(LedgerJournalEntry.sequence > start, LedgerJournalEntry.sequence <= target)
+        .group_by(LedgerJournalEntry.account_id)
+    )
+    for account_id, total in tail:
+        balances[account_id] = balances.get(account_id, Decimal("0.0")) + Decimal(str(total))
+    return LedgerState(
+        sequence=target,
+        balances={account_id: quantize_currency(balance) for account_id, balance in balances.items() if balance != 0},
+        snapshot_sequence=snapshot.sequence if snapshot else None,
+    )
+
+
+def write_ledger_snapshot(session: Session) -> LedgerSnapshot:
+    """Store the balances as of the newest journal entry and commit.
+
+    The first snapshot is taken from the accounts table, which anchors replay for ledgers whose
+    balances predate the journal; later snapshots replay from the previous one. Returns the
+    newest existing snapshot unchanged when nothing was journaled since.
+    """
+    sequence = latest_sequence(session)
+    previous = session.scalars(
+        select(LedgerSnapshot).order_by(LedgerSnapshot.sequence.desc(), LedgerSnapshot.id.desc()).limit(1)
+    ).first()
+    if previous is not None and previous.sequence == sequence:
+        return previous
+    if previous is None:
+        balances = {account_id: balance for account_id, balance in stored_balances(session).items() if balance != 0}
+    else:
+        balances = replay_ledger(session, sequence).balances
+    snapshot = LedgerSnapshot(sequence=sequence, balances={account_id: str(balance) for account_id, balance in balances.items()})
+    session.add(snapshot)
+    session.commit()
+    return snapshot
+
+
+def restore_account_balances(session: Session) -> int:
+    """Overwrite every account's balance with the replayed journal and commit.
+
+    Recovers ``available_balance`` after a crash or a bad manual edit without scanning the
+    entries table. Sharded accounts get the whole balance on their row and zeroed shards.
+    Returns the number of accounts whose balance changed; the journal itself is not touched.
+    """
+    state = replay_ledger(session)
+    current = stored_balances(session)
+    changed = 0
+    for account_id, balance in current.items():
+        target = state.balance_of(account_id)
+        if balance == target:
+            continue
+        session.execute(
+            update(Account)
+            .where(Account.id == account_id)
+            .values(available_balance=target, version=Account.version + 1)
+            .execution_options(synchronize_session=False, **{LEDGER_ACCOUNT_IDS_OPTION: (account_id,)})
+        )
+        reset_balance_shards(session, account_id)
+        changed += 1
+    session.commit()
+    return changed
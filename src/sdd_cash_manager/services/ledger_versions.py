@@ -0,0 +1,33 @@
+"""Reads of the ledger version stamps that back the API's ETags."""
+
+from __future__ import annotations
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from sdd_cash_manager.models.ledger_version import (
+    ACCOUNTS_VERSION_KEY,
+    LEDGER_VERSION_KEY,
+    LedgerVersion,
+    ledger_version_keys,
+)
+
+
+def _stored_versions(session: Session, keys: list[str]) -> dict[str, int]:
+    statement = select(LedgerVersion.key, LedgerVersion.version).where(LedgerVersion.key.in_(keys))
+    stored: dict[str, int] = {}
+    for key, version in session.execute(statement):
+        stored[key] = version
+    return stored
+
+
+def ledger_version(session: Session) -> int:
+    """Return the ledger-wide version, which every write to the ledger bumps."""
+    return sum(_stored_versions(session, ledger_version_keys(LEDGER_VERSION_KEY)).values())
+
+
+def account_version(session: Session, account_id: str) -> tuple[int, int]:
+    """Return ``(accounts-wide, account)`` versions; either changes whenever the account's response can."""
+    stored = _stored_versions(session, [*ledger_version_keys(ACCOUNTS_VERSION_KEY), account_id])
+    account = stored.pop(account_id, 0)
+    return sum(stored.values()), account
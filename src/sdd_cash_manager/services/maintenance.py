@@ -0,0 +1,53 @@
+"""Background maintenance jobs started alongside the API."""
+
+from __future__ import annotations
+
+from sdd_cash_manager import database
+from sdd_cash_manager.core.config import settings
+from sdd_cash_manager.lib.scheduler import PeriodicTask
+from sdd_cash_manager.services.account_service import AccountService
+from sdd_cash_manager.services.ledger_journal import write_ledger_snapshot
+from sdd_cash_manager.services.quickfill_aggregator import (
+    QuickFillDecayResult,
+    flush_all_quickfill_aggregators,
+    recompute_quickfill_confidence,
+)
+
+
+def run_quickfill_decay() -> QuickFillDecayResult:
+    """Decay QuickFill confidence and prune stale templates in the application database."""
+    with database.SessionLocal() as session:
+        return recompute_quickfill_confidence(session)
+
+
+def run_account_purge() -> int:
+    """Remove accounts that were deleted in background mode, with their dependents."""
+    with database.SessionLocal() as session:
+        return AccountService(db_session=session).purge_pending_accounts()
+
+
+def run_ledger_snapshot() -> int:
+    """Snapshot every balance so journal replay only has to apply recent entries."""
+    with database.SessionLocal() as session:
+        return write_ledger_snapshot(session).sequence
+
+
+MAINTENANCE_TASKS: list[PeriodicTask] = [
+    PeriodicTask("quickfill-flush", settings.quickfill_flush_interval_seconds, flush_all_quickfill_aggregators),
+    PeriodicTask("quickfill-decay", settings.quickfill_decay_interval_seconds, run_quickfill_decay),
+    PeriodicTask("account-purge", settings.account_purge_interval_seconds, run_account_purge),
+    PeriodicTask("ledger-snapshot", settings.ledger_snapshot_interval_seconds, run_ledger_snapshot),
+]
+
+
+def start_maintenance() -> None:
+    """Start every periodic maintenance task."""
+    for task in MAINTENANCE_TASKS:
+        task.start()
+
+
+def stop_maintenance() -> None:
+    """Stop the periodic tasks and flush write-behind buffers so no buffered work is lost."""
+    for task in MAINTENANCE_TASKS:
+        task.stop()
+    flush_all_quickfill_aggregators()
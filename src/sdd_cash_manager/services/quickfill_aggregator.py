@@ -0,0 +1,383 @@
+"""Write-behind aggregation of QuickFill template usage.
+
+Posting a transaction only records a hit in memory, keyed by the template identity
+``(action, currency, transfer_from, transfer_to, amount, memo)``. Hits are merged per
+identity and flushed as batched upserts by the periodic flush task, on shutdown and when the
+buffer grows past ``quickfill_flush_max_pending``. QuickFill reads never flush, so they see
+usage up to one flush interval late. A failed
+flush puts its hits back into the buffer, so delivery is at-least-once within a process;
+hits lost with a crashed process are recovered by rebuilding the counters from the
+transactions table with :func:`rebuild_quickfill_templates`.
+
+Confidence is recomputed on every touch, so templates that stop being used would keep a
+stale score; :func:`recompute_quickfill_confidence` decays every template in set-based SQL
+on a schedule and prunes templates that fell out of the history window.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Iterable, Mapping, cast
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import and_, case, delete, false, or_, select, update
+from sqlalchemy.engine import CursorResult, Engine
+from sqlalchemy.orm import Session
+
+from sdd_cash_manager.core.config import settings
+from sdd_cash_manager.lib.logging_config import get_logger
+from sdd_cash_manager.lib.metrics import record_duration
+from sdd_cash_manager.lib.utils import quantize_currency
+from sdd_cash_manager.models.account import Account
+from sdd_cash_manager.models.quickfill_template import QuickFillTemplate
+from sdd_cash_manager.models.transaction import Transaction
+from sdd_cash_manager.services.quickfill_index import QuickFillIndexEntry, bound_engine, get_quickfill_index
+
+logger = get_logger(__name__)
+
+TemplateIdentity = tuple[str, str, str, str, Decimal, str | None]
+
+IDENTITY_LOOKUP_CHUNK_SIZE = 200
+REBUILD_FETCH_SIZE = 1000
+RECENCY_BONUS_DAYS = 7
+RECENCY_BONUS = Decimal("0.1")
+DECAY_METRIC = "quickfill.confidence_decay"
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+def calculate_quickfill_confidence(
+    history_count: int,
+    last_used_at: datetime | None,
+    *,
+    now: datetime | None = None,
+) -> Decimal:
+    """Estimate confidence using frequency within the configured QuickFill history window."""
+    window_days = max(settings.quickfill_history_days, 1)
+    base_hits = min(history_count, window_days)
+    base_score = Decimal(base_hits) / Decimal(window_days)
+    normalized_last_used = _as_utc(last_used_at)
+    if normalized_last_used is not None:
+        reference = now or datetime.now(timezone.utc)
+        recency_bonus = RECENCY_BONUS if reference - normalized_last_used <= timedelta(days=RECENCY_BONUS_DAYS) else Decimal("0")
+    else:
+        recency_bonus = Decimal("0")
+    return min(Decimal("1.0"), base_score + recency_bonus)
+
+
+def quickfill_memo(notes: str | None, description: str | None) -> str | None:
+    """Derive the template memo the same way for live postings and recovery."""
+    raw_memo = (notes or description or "").strip()
+    return raw_memo[:255] if raw_memo else None
+
+
+def template_identity(
+    action: str,
+    currency: str,
+    transfer_from: str,
+    transfer_to: str,
+    amount: Decimal,
+    memo: str | None,
+) -> TemplateIdentity:
+    return (action.strip(), currency.strip().upper(), transfer_from, transfer_to, quantize_currency(amount), memo)
+
+
+def _identity_of(template: QuickFillTemplate) -> TemplateIdentity:
+    return template_identity(
+        template.action,
+        template.currency,
+        template.transfer_from_account_id,
+        template.transfer_to_account_id,
+        template.amount,
+        template.memo,
+    )
+
+
+@dataclass(frozen=True)
+class QuickFillHit:
+    """Merged usage of one template identity: how often and when it was last used."""
+
+    count: int
+    last_used_at: datetime
+    source_transaction_id: str
+    description: str | None
+
+    def merge(self, other: QuickFillHit) -> QuickFillHit:
+        latest = other if other.last_used_at >= self.last_used_at else self
+        return QuickFillHit(
+            count=self.count + other.count,
+            last_used_at=latest.last_used_at,
+            source_transaction_id=latest.source_transaction_id,
+            description=latest.description,
+        )
+
+
+def _load_templates(session: Session, identities: Iterable[TemplateIdentity]) -> dict[TemplateIdentity, QuickFillTemplate]:
+    """Fetch existing templates for many identities with a handful of OR-of-AND queries."""
+    pending = list(identities)
+    found: dict[TemplateIdentity, QuickFillTemplate] = {}
+    for start in range(0, len(pending), IDENTITY_LOOKUP_CHUNK_SIZE):
+        clauses = [
+            and_(
+                QuickFillTemplate.action == action,
+                QuickFillTemplate.currency == currency,
+                QuickFillTemplate.transfer_from_account_id == transfer_from,
+                QuickFillTemplate.transfer_to_account_id == transfer_to,
+                QuickFillTemplate.amount == amount,
+                QuickFillTemplate.memo.is_(None) if memo is None else QuickFillTemplate.memo == memo,
+            )
+            for action, currency, transfer_from, transfer_to, amount, memo in pending[start:start + IDENTITY_LOOKUP_CHUNK_SIZE]
+        ]
+        for template in session.scalars(select(QuickFillTemplate).where(or_(*clauses))):
+            found[_identity_of(template)] = template
+    return found
+
+
+def apply_quickfill_hits(
+    session: Session,
+    hits: Mapping[TemplateIdentity, QuickFillHit],
+    *,
+    replace: bool = False,
+) -> list[QuickFillIndexEntry]:
+    """Upsert templates for the merged hits; ``replace`` overwrites counts instead of adding to them."""
+    existing = _load_templates(session, hits.keys())
+    new_templates: list[QuickFillTemplate] = []
+    touched: list[tuple[QuickFillTemplate, QuickFillHit]] = []
+    for identity, hit in hits.items():
+        template = existing.get(identity)
+        if template is None:
+            action, currency, transfer_from, transfer_to, amount, memo = identity
+            template = QuickFillTemplate(
+                action=action,
+                currency=currency,
+                transfer_from_account_id=transfer_from,
+                transfer_to_account_id=transfer_to,
+                amount=amount,
+                memo=memo,
+            )
+            template.history_count = 0
+            new_templates.append(template)
+
+        template.history_count = hit.count if replace else (template.history_count or 0) + hit.count
+        last_used_at = _as_utc(template.last_used_at)
+        if replace or last_used_at is None or hit.last_used_at >= last_used_at:
+            template.last_used_at = hit.last_used_at
+            template.source_transaction_id = hit.source_transaction_id
+        template.confidence_score = calculate_quickfill_confidence(template.history_count, template.last_used_at)
+        touched.append((template, hit))
+
+    session.add_all(new_templates)
+    session.flush()
+    return [QuickFillIndexEntry.from_template(template, hit.description) for template, hit in touched]
+
+
+class QuickFillAggregator:
+    """In-memory buffer of QuickFill hits for one database engine."""
+
+    def __init__(self) -> None:
+        self._pending: dict[TemplateIdentity, QuickFillHit] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    @property
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def record(self, identity: TemplateIdentity, hit: QuickFillHit) -> int:
+        """Merge a hit into the buffer and return the number of pending identities."""
+        with self._lock:
+            current = self._pending.get(identity)
+            self._pending[identity] = current.merge(hit) if current else hit
+            return len(self._pending)
+
+    def _take(self, key: tuple[str, str] | None) -> dict[TemplateIdentity, QuickFillHit]:
+        with self._lock:
+            if key is None:
+                taken, self._pending = self._pending, {}
+                return taken
+            taken = {identity: hit for identity, hit in self._pending.items() if identity[:2] == key}
+            for identity in taken:
+                del self._pending[identity]
+            return taken
+
+    def _restore(self, hits: Mapping[TemplateIdentity, QuickFillHit]) -> None:
+        with self._lock:
+            for identity, hit in hits.items():
+                current = self._pending.get(identity)
+                self._pending[identity] = current.merge(hit) if current else hit
+
+    def discard(self) -> None:
+        """Drop pending hits, e.g. before rebuilding counters from the transactions table."""
+        self._take(None)
+
+    def flush(self, session: Session, *, key: tuple[str, str] | None = None) -> int:
+        """Upsert pending hits (optionally only one action/currency pair) and commit the session."""
+        with self._flush_lock:
+            hits = self._take(key)
+            if not hits:
+                return 0
+            try:
+                entries = apply_quickfill_hits(session, hits)
+                session.commit()
+            except Exception:
+                session.rollback()
+                self._restore(hits)
+                raise
+        index = get_quickfill_index(session)
+        for entry in entries:
+            index.upsert(entry)
+        return len(hits)
+
+
+_AGGREGATORS: WeakKeyDictionary[Engine, QuickFillAggregator] = WeakKeyDictionary()
+_AGGREGATORS_LOCK = threading.Lock()
+
+
+def get_quickfill_aggregator(session: Session) -> QuickFillAggregator:
+    """Return the process-level aggregator for the engine the session is bound to."""
+    engine = bound_engine(session)
+    with _AGGREGATORS_LOCK:
+        aggregator = _AGGREGATORS.get(engine)
+        if aggregator is None:
+            aggregator = QuickFillAggregator()
+            _AGGREGATORS[engine] = aggregator
+        return aggregator
+
+
+def flush_all_quickfill_aggregators() -> int:
+    """Flush every engine's pending hits; used by the periodic task and on shutdown."""
+    with _AGGREGATORS_LOCK:
+        targets = list(_AGGREGATORS.items())
+    flushed = 0
+    for engine, aggregator in targets:
+        if not aggregator.pending_count:
+            continue
+        with Session(bind=engine, autoflush=False) as session:
+            try:
+                flushed += aggregator.flush(session)
+            except Exception:
+                logger.exception("Failed to flush QuickFill hits; they remain buffered for the next attempt")
+    return flushed
+
+
+def rebuild_quickfill_templates(session: Session) -> int:
+    """Recompute template counters from the transactions table and return the templates written.
+
+    Counts are replaced rather than incremented, so the rebuild is idempotent and can be run
+    after a crash that lost buffered hits. Identities whose last use falls outside the
+    QuickFill history window are skipped.
+
+    Run it with the API workers stopped. Only this process's buffer is discarded; hits still
+    buffered in a running worker belong to transactions the rebuild already counted, and
+    would be added again when that worker flushes. Stopping a worker flushes its buffer.
+    """
+    get_quickfill_aggregator(session).discard()
+    stmt = (
+        select(
+            Transaction.id,
+            Transaction.action_type,
+            Account.currency,
+            Transaction.debit_account_id,
+            Transaction.credit_account_id,
+            Transaction.amount,
+            Transaction.notes,
+            Transaction.description,
+            Transaction.created_at,
+        )
+        .join(Account, Account.id == Transaction.debit_account_id)
+        .execution_options(yield_per=REBUILD_FETCH_SIZE)
+    )
+    now = datetime.now(timezone.utc)
+    hits: dict[TemplateIdentity, QuickFillHit] = {}
+    for row in session.execute(stmt):
+        identity = template_identity(
+            row.action_type,
+            row.currency,
+            row.debit_account_id,
+            row.credit_account_id,
+            row.amount,
+            quickfill_memo(row.notes, row.description),
+        )
+        hit = QuickFillHit(1, _as_utc(row.created_at) or now, row.id, row.description)
+        current = hits.get(identity)
+        hits[identity] = current.merge(hit) if current else hit
+
+    cutoff = now - timedelta(days=max(settings.quickfill_history_days, 1))
+    recent = {identity: hit for identity, hit in hits.items() if hit.last_used_at >= cutoff}
+    entries = apply_quickfill_hits(session, recent, replace=True)
+    session.commit()
+    index = get_quickfill_index(session)
+    for entry in entries:
+        index.upsert(entry)
+    return len(entries)
+
+
+@dataclass(frozen=True)
+class QuickFillDecayResult:
+    """Outcome of one confidence decay run."""
+
+    updated: int
+    pruned: int
+    duration_seconds: float
+
+
+def recompute_quickfill_confidence(session: Session, *, now: datetime | None = None) -> QuickFillDecayResult:
+    """Decay every template's confidence in set-based SQL and prune stale templates.
+
+    Pending hits are flushed first so the counters are current. Unapproved templates whose
+    last use is outside the ``quickfill_history_days`` window are deleted; approved
+    templates are kept because approval is an explicit operator decision, but their
+    confidence decays like any other. The formula matches
+    :func:`calculate_quickfill_confidence` and only rows whose score changes are written.
+    """
+    started = time.perf_counter()
+    get_quickfill_aggregator(session).flush(session)
+    reference = now or datetime.now(timezone.utc)
+    window_days = max(settings.quickfill_history_days, 1)
+    cutoff = reference - timedelta(days=window_days)
+    recency_cutoff = reference - timedelta(days=RECENCY_BONUS_DAYS)
+
+    base_score = case(
+        (QuickFillTemplate.history_count >= window_days, 1.0),
+        else_=QuickFillTemplate.history_count / window_days,
+    )
+    recency_bonus = case((QuickFillTemplate.last_used_at >= recency_cutoff, float(RECENCY_BONUS)), else_=0.0)
+    confidence = case((base_score + recency_bonus > 1.0, 1.0), else_=base_score + recency_bonus)
+
+    try:
+        pruned = cast(CursorResult[Any], session.execute(
+            delete(QuickFillTemplate)
+            .where(
+                QuickFillTemplate.is_approved == false(),
+                or_(QuickFillTemplate.last_used_at.is_(None), QuickFillTemplate.last_used_at < cutoff),
+            )
+            .execution_options(synchronize_session=False)
+        )).rowcount
+        updated = cast(CursorResult[Any], session.execute(
+            update(QuickFillTemplate)
+            .where(QuickFillTemplate.confidence_score != confidence)
+            .values(confidence_score=confidence)
+            .execution_options(synchronize_session=False)
+        )).rowcount
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        duration = time.perf_counter() - started
+        record_duration(DECAY_METRIC, duration)
+
+    get_quickfill_index(session).clear()
+    logger.info(
+        "QuickFill confidence decay updated=%d pruned=%d duration=%.2fms", updated, pruned, duration * 1000
+    )
+    return QuickFillDecayResult(updated=updated, pruned=pruned, duration_seconds=duration)
@@ -0,0 +1,210 @@
+"""Process-level QuickFill index that serves type-ahead ranking without hitting the database.
+
+Templates are bucketed by ``(action, currency)``. Each bucket keeps a sorted array of
+``(token, template_id)`` pairs built from the normalised memo and source description, so a
+prefix lookup is a binary search, plus the template IDs in precomputed ranking order. Both
+arrays are maintained incrementally as templates are recorded or approved; buckets are
+loaded lazily from the database and reloaded after a TTL so changes made by other
+processes are eventually picked up.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Iterable
+from weakref import WeakKeyDictionary
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from sdd_cash_manager.core.config import settings
+from sdd_cash_manager.models.quickfill_template import QuickFillTemplate
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+IndexKey = tuple[str, str]
+RankKey = tuple[Decimal, int, float, str]
+
+
+def tokenize(*values: str | None) -> frozenset[str]:
+    """Return the normalised search tokens contained in the provided strings."""
+    return frozenset(token for value in values if value for token in _TOKEN_PATTERN.findall(value.casefold()))
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True)
+class QuickFillIndexEntry:
+    """Snapshot of the template fields needed to filter and rank suggestions."""
+
+    template_id: str
+    action: str
+    currency: str
+    confidence_score: Decimal
+    history_count: int
+    last_used_at: datetime | None
+    is_approved: bool
+    tokens: frozenset[str]
+
+    @property
+    def key(self) -> IndexKey:
+        return (self.action, self.currency)
+
+    @property
+    def rank_key(self) -> RankKey:
+        """Sort key matching ``confidence DESC, history DESC, last_used DESC``."""
+        last_used = self.last_used_at.timestamp() if self.last_used_at else float("-inf")
+        return (-self.confidence_score, -self.history_count, -last_used, self.template_id)
+
+    @classmethod
+    def from_template(cls, template: QuickFillTemplate, description: str | None) -> QuickFillIndexEntry:
+        return cls(
+            template_id=template.id,
+            action=template.action,
+            currency=template.currency,
+            confidence_score=Decimal(template.confidence_score or 0),
+            history_count=template.history_count or 0,
+            last_used_at=_as_utc(template.last_used_at),
+            is_approved=bool(template.is_approved),
+            tokens=tokenize(template.memo, description),
+        )
+
+
+@dataclass
+class _Bucket:
+    loaded_at: float
+    entries: dict[str, QuickFillIndexEntry] = field(default_factory=dict)
+    tokens: list[tuple[str, str]] = field(default_factory=list)
+    ranked: list[tuple[RankKey, str]] = field(default_factory=list)
+
+    def add(self, entry: QuickFillIndexEntry) -> None:
+        self.remove(entry.template_id)
+        self.entries[entry.template_id] = entry
+        for token in entry.tokens:
+            insort(self.tokens, (token, entry.template_id))
+        insort(self.ranked, (entry.rank_key, entry.template_id))
+
+    def remove(self, template_id: str) -> None:
+        entry = self.entries.pop(template_id, None)
+        if entry is None:
+            return
+        for token in entry.tokens:
+            position = bisect_left(self.tokens, (token, template_id))
+            if position < len(self.tokens) and self.tokens[position] == (token, template_id):
+                del self.tokens[position]
+        position = bisect_left(self.ranked, (entry.rank_key, template_id))
+        if position < len(self.ranked) and self.ranked[position][1] == template_id:
+            del self.ranked[position]
+
+    def prefix_matches(self, prefix: str) -> set[str]:
+        matches: set[str] = set()
+        position = bisect_left(self.tokens, (prefix, ""))
+        while position < len(self.tokens) and self.tokens[position][0].startswith(prefix):
+            matches.add(self.tokens[position][1])
+            position += 1
+        return matches
+
+
+class QuickFillIndex:
+    """Thread-safe QuickFill index for a single database engine."""
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._buckets: dict[IndexKey, _Bucket] = {}
+        self._lock = threading.RLock()
+
+    def is_loaded(self, key: IndexKey) -> bool:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            return bucket is not None and time.monotonic() - bucket.loaded_at < self._ttl_seconds
+
+    def load(self, key: IndexKey, entries: Iterable[QuickFillIndexEntry]) -> None:
+        """Replace the bucket for ``key`` with freshly loaded entries."""
+        ordered = sorted(entries, key=lambda entry: entry.rank_key)
+        bucket = _Bucket(
+            loaded_at=time.monotonic(),
+            entries={entry.template_id: entry for entry in ordered},
+            tokens=sorted((token, entry.template_id) for entry in ordered for token in entry.tokens),
+            ranked=[(entry.rank_key, entry.template_id) for entry in ordered],
+        )
+        with self._lock:
+            self._buckets[key] = bucket
+
+    def upsert(self, entry: QuickFillIndexEntry) -> None:
+        """Apply a template change; buckets that are not loaded yet pick it up when they load."""
+        with self._lock:
+            bucket = self._buckets.get(entry.key)
+            if bucket is not None:
+                bucket.add(entry)
+
+    def discard(self, key: IndexKey, template_id: str) -> None:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.remove(template_id)
+
+    def search(
+        self,
+        key: IndexKey,
+        query: str | None,
+        *,
+        include_unapproved: bool,
+        recent_cutoff: datetime,
+    ) -> list[str]:
+        """Return eligible template IDs in ranking order; every query token must prefix a template token."""
+        prefixes = sorted(tokenize(query))
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                return []
+            if prefixes:
+                matches = bucket.prefix_matches(prefixes[0])
+                for prefix in prefixes[1:]:
+                    if not matches:
+                        break
+                    matches &= bucket.prefix_matches(prefix)
+                candidates = sorted((bucket.entries[template_id] for template_id in matches), key=lambda e: e.rank_key)
+            else:
+                candidates = [bucket.entries[template_id] for _, template_id in bucket.ranked]
+        return [
+            entry.template_id
+            for entry in candidates
+            if (include_unapproved or entry.is_approved)
+            and entry.last_used_at is not None
+            and entry.last_used_at >= recent_cutoff
+        ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+_INDEXES: WeakKeyDictionary[Engine, QuickFillIndex] = WeakKeyDictionary()
+_INDEXES_LOCK = threading.Lock()
+
+
+def bound_engine(session: Session) -> Engine:
+    """Return the engine behind a session, whether it is bound to an engine or a connection."""
+    bind = session.get_bind()
+    return bind.engine
+
+
+def get_quickfill_index(session: Session) -> QuickFillIndex:
+    """Return the process-level index for the engine the session is bound to."""
+    engine = bound_engine(session)
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(engine)
+        if index is None:
+            index = QuickFillIndex(ttl_seconds=max(settings.quickfill_index_ttl_seconds, 0))
+            _INDEXES[engine] = index
+        return index
@@ -0,0 +1,91 @@
+"""Bulk maintenance and O(1) reads of the per-account reconciliation counters."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator
+
+from sqlalchemy import ColumnElement, delete, func, select
+from sqlalchemy.orm import Session
+
+from sdd_cash_manager.models.reconciliation_counter import (
+    COUNTER_COLUMNS,
+    CounterDeltas,
+    ReconciliationCounter,
+    add_counter_delta,
+    apply_counter_deltas,
+    ledger_counter_keys,
+    new_counter_deltas,
+)
+from sdd_cash_manager.models.transaction import Transaction
+
+
+@dataclass(frozen=True)
+class ReconciliationCounts:
+    """Snapshot of one account's (or the whole ledger's) reconciliation counters."""
+
+    account_id: str | None
+    uncleared: int = 0
+    cleared: int = 0
+    reconciled: int = 0
+
+
+def _grouped_deltas(session: Session, criteria: tuple[ColumnElement[bool], ...], sign: int) -> CounterDeltas:
+    rows = session.execute(
+        select(
+            Transaction.debit_account_id,
+            Transaction.credit_account_id,
+            Transaction.reconciliation_status,
+            func.count(),
+        )
+        .where(*criteria)
+        .group_by(Transaction.debit_account_id, Transaction.credit_account_id, Transaction.reconciliation_status)
+    )
+    deltas = new_counter_deltas()
+    for debit_account_id, credit_account_id, status, count in rows:
+        add_counter_delta(deltas, debit_account_id, credit_account_id, status, sign * count)
+    return deltas
+
+
+def release_reconciliation_counters(session: Session, *criteria: ColumnElement[bool]) -> None:
+    """Remove the matching transactions from the counters; call before bulk-deleting them."""
+    apply_counter_deltas(session.connection(), _grouped_deltas(session, criteria, -1))
+
+
+@contextmanager
+def reconciliation_counters_moved(session: Session, *criteria: ColumnElement[bool]) -> Iterator[None]:
+    """Re-count the matching transactions around a bulk UPDATE of their status or accounts.
+
+    ``criteria`` must select the same rows before and after the update, so identify rows by
+    ID rather than by the columns being changed.
+    """
+    release_reconciliation_counters(session, *criteria)
+    yield
+    apply_counter_deltas(session.connection(), _grouped_deltas(session, criteria, 1))
+
+
+def get_reconciliation_counts(session: Session, account_id: str | None = None) -> ReconciliationCounts:
+    """Read the counters for ``account_id`` with one primary-key lookup, or sum the ledger-wide rows."""
+    keys = [account_id] if account_id else ledger_counter_keys()
+    uncleared, cleared, reconciled = session.execute(
+        select(
+            func.coalesce(func.sum(ReconciliationCounter.uncleared_count), 0),
+            func.coalesce(func.sum(ReconciliationCounter.cleared_count), 0),
+            func.coalesce(func.sum(ReconciliationCounter.reconciled_count), 0),
+        ).where(ReconciliationCounter.account_id.in_(keys))
+    ).one()
+    return ReconciliationCounts(account_id, uncleared=uncleared, cleared=cleared, reconciled=reconciled)
+
+
+def rebuild_reconciliation_counters(session: Session) -> int:
+    """Recompute every counter from the transactions table and return the number of rows written.
+
+    Repairs drift left by writes that bypassed the ORM flush hook and the bulk helpers above.
+    """
+    session.flush()
+    session.execute(delete(ReconciliationCounter))
+    deltas = _grouped_deltas(session, (Transaction.reconciliation_status.in_(list(COUNTER_COLUMNS)),), 1)
+    apply_counter_deltas(session.connection(), deltas)
+    session.commit()
+    return len(deltas)
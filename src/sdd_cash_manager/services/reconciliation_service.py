@@ -1,12 +1,23 @@
-from datetime import date
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
 from decimal import Decimal
-from typing import Any
+from typing import Any, Iterator, NamedTuple
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import ColumnElement, and_, exists, func, insert, literal, or_, select, update
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, lazyload
 
+from sdd_cash_manager.core.config import settings
+from sdd_cash_manager.lib.pagination import decode_cursor, encode_cursor
+from sdd_cash_manager.lib.statement_matching import (
+    DEFAULT_DATE_TOLERANCE_DAYS,
+    LedgerCandidate,
+    StatementLine,
+    StatementMatch,
+    explain_difference,
+    match_statement_lines,
+)
 from sdd_cash_manager.lib.utils import quantize_currency
 from sdd_cash_manager.models.adjustment import AdjustmentTransaction, ManualBalanceAdjustment
 from sdd_cash_manager.models.enums import ProcessingStatus, ReconciliationStatus
@@ -15,14 +26,107 @@ from sdd_cash_manager.models.reconciliation_session import (
     BankStatementSnapshot,
     ReconciliationSession,
     ReconciliationSessionState,
+    reconciliation_session_transactions,
 )
 from sdd_cash_manager.models.transaction import Transaction
+from sdd_cash_manager.services.reconciliation_counters import get_reconciliation_counts, reconciliation_counters_moved
+from sdd_cash_manager.services.unit_of_work import commit_or_flush
+
+# Keeps each ``IN (...)`` list well below SQLite's bound-parameter limit.
+SELECTION_CHUNK_SIZE = 500
+MAX_UNRECONCILED_PAGE_SIZE = 1000
+MAX_RECONCILIATION_VIEW_PAGE_SIZE = 1000
+
+# Only the columns the unreconciled listing renders, so rows skip the ORM identity map.
+UNRECONCILED_COLUMNS = (
+    Transaction.id,
+    Transaction.amount,
+    Transaction.effective_date,
+    Transaction.description,
+    Transaction.processing_status,
+    Transaction.reconciliation_status,
+)
+
+
+class UnreconciledTransaction(NamedTuple):
+    """One open transaction, unpacked from a row of ``UNRECONCILED_COLUMNS``."""
+
+    id: str
+    amount: Decimal
+    effective_date: datetime
+    description: str
+    processing_status: ProcessingStatus
+    reconciliation_status: ReconciliationStatus
+
+
+@dataclass
+class UnreconciledPage:
+    """One keyset page of open transactions plus the cursor for the next page."""
+
+    transactions: list[UnreconciledTransaction]
+    next_cursor: str | None
+
+
+@dataclass
+class ReconciliationViewPage:
+    """One keyset page of reconciliation view entries plus the cursor for the next page."""
+
+    entries: list[ReconciliationViewEntry]
+    next_cursor: str | None
+
+
+@dataclass(frozen=True)
+class ReconciliationStatusTotal:
+    status: str
+    count: int
+    total_amount: Decimal
+
+
+@dataclass
+class StatementMatchProposal:
+    """Matches proposed for a statement import, plus what is left to explain."""
+
+    matches: list[StatementMatch]
+    unmatched_line_ids: list[str]
+    residual_difference: Decimal
+    difference_explanation: list[str] | None
 
 
 class ReconciliationService:
     def __init__(self, db: Session):
         self.db = db
 
+    @staticmethod
+    def build_entry_for_adjustment_transaction(
+        account_id: UUID | str,
+        transaction: AdjustmentTransaction,
+    ) -> ReconciliationViewEntry:
+        """Build (without persisting) the view entry that mirrors an adjustment transaction."""
+        # is_adjustment flag should be True for adjustment transactions
+        # reconciled_status could be defaulted or determined by business logic
+        return ReconciliationViewEntry(
+            account_id=str(account_id),
+            entry_date=transaction.effective_date,
+            amount=transaction.amount,
+            description=transaction.description,
+            is_adjustment=True, # Explicitly mark as adjustment
+            reconciled_status=ReconciliationStatus.PENDING_RECONCILIATION.value, # Default status
+            original_transaction_id=str(transaction.transaction_id),
+        )
+
+    @staticmethod
+    def build_entry_for_zero_difference(manual_adjustment: ManualBalanceAdjustment) -> ReconciliationViewEntry:
+        """Build (without persisting) the view entry recorded for a zero-difference adjustment."""
+        return ReconciliationViewEntry(
+            account_id=str(manual_adjustment.account_id),
+            entry_date=manual_adjustment.effective_date,
+            amount=Decimal("0.00"),
+            description="Manual balance adjustment (zero difference)",
+            is_adjustment=True,
+            reconciled_status=ReconciliationStatus.ZERO_DIFFERENCE.value,
+            original_transaction_id=None,
+        )
+
     def create_reconciliation_entry_from_transaction(
         self,
         account_id: UUID,
@@ -33,23 +137,11 @@ class ReconciliationService:
         Creates a ReconciliationViewEntry from an AdjustmentTransaction.
         """
         try:
-            account_id_value = str(account_id)
-            # Create the entry from transaction data
-            # is_adjustment flag should be True for adjustment transactions
-            # reconciled_status could be defaulted or determined by business logic
-            reconciliation_entry = ReconciliationViewEntry(
-                account_id=account_id_value,
-                entry_date=transaction.effective_date,
-                amount=transaction.amount,
-                description=transaction.description,
-                is_adjustment=True, # Explicitly mark as adjustment
-                reconciled_status=ReconciliationStatus.PENDING_RECONCILIATION.value, # Default status
-                original_transaction_id=str(transaction.transaction_id),
-            )
+            reconciliation_entry = self.build_entry_for_adjustment_transaction(account_id, transaction)
             self.db.add(reconciliation_entry)
             self.db.flush()
             if auto_commit:
-                self.db.commit()
+                commit_or_flush(self.db)
             return reconciliation_entry
 
         except SQLAlchemyError as e:
@@ -70,19 +162,11 @@ class ReconciliationService:
         Creates a reconciliation view entry for a zero-difference manual adjustment.
         """
         try:
-            reconciliation_entry = ReconciliationViewEntry(
-                account_id=str(manual_adjustment.account_id),
-                entry_date=manual_adjustment.effective_date,
-                amount=Decimal("0.00"),
-                description="Manual balance adjustment (zero difference)",
-                is_adjustment=True,
-                reconciled_status=ReconciliationStatus.ZERO_DIFFERENCE.value,
-                original_transaction_id=None,
-            )
+            reconciliation_entry = self.build_entry_for_zero_difference(manual_adjustment)
             self.db.add(reconciliation_entry)
             self.db.flush()
             if auto_commit:
-                self.db.commit()
+                commit_or_flush(self.db)
             return reconciliation_entry
         except SQLAlchemyError as e:
             self.db.rollback()
@@ -96,20 +180,126 @@ class ReconciliationService:
     def get_reconciliation_entries_for_account(
         self,
         account_id: UUID,
+        *,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        reconciled_status: ReconciliationStatus | None = None,
     ) -> list[ReconciliationViewEntry]:
         """
-        Retrieve reconciliation view entries for the given account.
+        Retrieve reconciliation view entries for the given account, ordered by (entry_date, entry_id).
+        """
+        stmt = (
+            select(ReconciliationViewEntry)
+            .where(*self._reconciliation_view_criteria(account_id, start_date, end_date, reconciled_status))
+            .order_by(ReconciliationViewEntry.entry_date, ReconciliationViewEntry.entry_id)
+        )
+        return list(self.db.scalars(stmt))
+
+    def get_reconciliation_view_page(
+        self,
+        account_id: UUID,
+        *,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        reconciled_status: ReconciliationStatus | None = None,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> ReconciliationViewPage:
+        """Return one keyset page of reconciliation view entries and the cursor for the next one.
+
+        Raises:
+            ValueError: The cursor is malformed or was issued for a different account.
         """
-        account_id_value = str(account_id)
-        return (
-            self.db.query(ReconciliationViewEntry)
-            .filter(ReconciliationViewEntry.account_id == account_id_value)
-            .all()
+        limit = min(max(limit, 1), MAX_RECONCILIATION_VIEW_PAGE_SIZE)
+        criteria = self._reconciliation_view_criteria(account_id, start_date, end_date, reconciled_status)
+        if cursor:
+            position = decode_cursor(cursor)
+            if position.get("account_id") != str(account_id):
+                raise ValueError("Cursor does not belong to this account.")
+            try:
+                after_date, after_id = date.fromisoformat(position["entry_date"]), str(position["entry_id"])
+            except (KeyError, TypeError, ValueError) as exc:
+                raise ValueError("Invalid cursor.") from exc
+            criteria.append(
+                or_(
+                    ReconciliationViewEntry.entry_date > after_date,
+                    and_(ReconciliationViewEntry.entry_date == after_date, ReconciliationViewEntry.entry_id > after_id),
+                )
+            )
+        stmt = (
+            select(ReconciliationViewEntry)
+            .where(*criteria)
+            .order_by(ReconciliationViewEntry.entry_date, ReconciliationViewEntry.entry_id)
+            .limit(limit + 1)
         )
+        entries = list(self.db.scalars(stmt))
+        next_cursor = None
+        if len(entries) > limit:
+            entries = entries[:limit]
+            last = entries[-1]
+            next_cursor = encode_cursor(
+                {"account_id": str(account_id), "entry_date": last.entry_date.isoformat(), "entry_id": last.entry_id}
+            )
+        return ReconciliationViewPage(entries=entries, next_cursor=next_cursor)
+
+    def stream_reconciliation_view(
+        self,
+        account_id: UUID,
+        *,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        reconciled_status: ReconciliationStatus | None = None,
+    ) -> Iterator[ReconciliationViewEntry]:
+        """Yield every matching view entry from a server-side cursor, ``reconciliation_stream_batch_size`` rows at a time."""
+        stmt = (
+            select(ReconciliationViewEntry)
+            .where(*self._reconciliation_view_criteria(account_id, start_date, end_date, reconciled_status))
+            .order_by(ReconciliationViewEntry.entry_date, ReconciliationViewEntry.entry_id)
+            .execution_options(yield_per=max(settings.reconciliation_stream_batch_size, 1))
+        )
+        yield from self.db.scalars(stmt)
+
+    def summarize_reconciliation_view(
+        self,
+        account_id: UUID,
+        *,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> list[ReconciliationStatusTotal]:
+        """Count and total the account's reconciliation entries per status with one grouped query."""
+        stmt = (
+            select(
+                ReconciliationViewEntry.reconciled_status,
+                func.count(),
+                func.coalesce(func.sum(ReconciliationViewEntry.amount), 0),
+            )
+            .where(*self._reconciliation_view_criteria(account_id, start_date, end_date, None))
+            .group_by(ReconciliationViewEntry.reconciled_status)
+            .order_by(ReconciliationViewEntry.reconciled_status)
+        )
+        return [
+            ReconciliationStatusTotal(status=status, count=int(count), total_amount=quantize_currency(Decimal(total)))
+            for status, count, total in self.db.execute(stmt)
+        ]
+
+    @staticmethod
+    def _reconciliation_view_criteria(
+        account_id: UUID,
+        start_date: date | None,
+        end_date: date | None,
+        reconciled_status: ReconciliationStatus | None,
+    ) -> list[ColumnElement[bool]]:
+        criteria: list[ColumnElement[bool]] = [ReconciliationViewEntry.account_id == str(account_id)]
+        if start_date:
+            criteria.append(ReconciliationViewEntry.entry_date >= start_date)
+        if end_date:
+            criteria.append(ReconciliationViewEntry.entry_date <= end_date)
+        if reconciled_status:
+            criteria.append(ReconciliationViewEntry.reconciled_status == ReconciliationStatus(reconciled_status).value)
+        return criteria
 
     def _recalculate_difference(self, session_obj: ReconciliationSession) -> Decimal:
-        total = sum((transaction.amount for transaction in session_obj.transactions), Decimal("0"))
-        new_difference = quantize_currency(session_obj.ending_balance - total)
+        new_difference = quantize_currency(session_obj.ending_balance - (session_obj.selected_total or Decimal("0")))
         session_obj.difference = new_difference
         return new_difference
 
@@ -119,10 +309,12 @@ class ReconciliationService:
         statement_date: date,
         ending_balance: Decimal,
         created_by: str | None = None,
+        account_id: str | None = None,
     ) -> ReconciliationSession:
         quantized_balance = quantize_currency(ending_balance)
         session_obj = ReconciliationSession(
             statement_date=statement_date,
+            account_id=account_id,
             ending_balance=quantized_balance,
             difference=quantized_balance,
             created_by=created_by,
@@ -139,31 +331,43 @@ class ReconciliationService:
         reconciliation_session_id: str,
         transaction_ids: list[str],
     ) -> tuple[ReconciliationSession, dict[str, Any]]:
-        session_obj = session.get(ReconciliationSession, reconciliation_session_id)
+        """Select transactions for a reconciliation session and refresh its difference.
+
+        Membership rows are inserted set-based, skipping transactions that are already
+        selected, and ``selected_total`` is advanced by the SQL sum of the newly selected
+        amounts, so the cost depends on the batch size rather than on the session size.
+        """
+        session_obj = session.get(
+            ReconciliationSession,
+            reconciliation_session_id,
+            options=[lazyload(ReconciliationSession.transactions)],
+        )
         if session_obj is None:
             raise ValueError(f"ReconciliationSession {reconciliation_session_id} not found")
 
-        transactions = (
-            session.query(Transaction)
-            .filter(Transaction.id.in_(transaction_ids))
-            .all()
-        )
-        for transaction in transactions:
-            if transaction not in session_obj.transactions:
-                session_obj.transactions.append(transaction)
-            if transaction.reconciliation_status == ReconciliationStatus.UNCLEARED:
-                transaction.reconciliation_status = ReconciliationStatus.CLEARED
-            session.add(transaction)
+        requested_ids = sorted(set(transaction_ids))
+        chunks = [
+            requested_ids[start : start + SELECTION_CHUNK_SIZE]
+            for start in range(0, len(requested_ids), SELECTION_CHUNK_SIZE)
+        ]
+        for chunk in chunks:
+            self._select_transaction_chunk(session, session_obj.id, chunk)
 
+        session.refresh(session_obj, attribute_names=["selected_total"])
         new_difference = self._recalculate_difference(session_obj)
         if new_difference == Decimal("0"):
             session_obj.state = ReconciliationSessionState.COMPLETED
-            for txn in transactions:
-                txn.reconciliation_status = ReconciliationStatus.RECONCILED
-                session.add(txn)
+            for chunk in chunks:
+                with reconciliation_counters_moved(session, Transaction.id.in_(chunk)):
+                    session.execute(
+                        update(Transaction)
+                        .where(Transaction.id.in_(chunk))
+                        .values(reconciliation_status=ReconciliationStatus.RECONCILED)
+                    )
 
         session.flush()
-        remaining = self._count_remaining_uncleared(session)
+        session.expire(session_obj, ["transactions"])
+        remaining = self._count_remaining_uncleared(session, session_obj.account_id)
         payload = {
             "difference": new_difference,
             "difference_status": self._difference_status(new_difference),
@@ -173,12 +377,173 @@ class ReconciliationService:
         session.commit()
         return session_obj, payload
 
+    def propose_statement_matches(
+        self,
+        session: Session,
+        reconciliation_session_id: str,
+        lines: list[StatementLine],
+        *,
+        date_tolerance_days: int = DEFAULT_DATE_TOLERANCE_DAYS,
+    ) -> StatementMatchProposal:
+        """Match statement lines to open transactions not yet selected for the session.
+
+        Nothing is written: accepted matches are applied with :meth:`add_transactions_to_session`.
+        ``residual_difference`` is the session difference left after applying every proposed
+        match, and ``difference_explanation`` lists unmatched transactions that would close it.
+        """
+        session_obj = session.get(
+            ReconciliationSession,
+            reconciliation_session_id,
+            options=[lazyload(ReconciliationSession.transactions)],
+        )
+        if session_obj is None:
+            raise ValueError(f"ReconciliationSession {reconciliation_session_id} not found")
+
+        candidates = self._match_candidates(session, session_obj, lines, date_tolerance_days)
+        result = match_statement_lines(lines, candidates, date_tolerance_days=date_tolerance_days)
+        matched_amounts = {candidate.transaction_id: candidate.amount for candidate in candidates}
+        matched_total = sum((matched_amounts[match.transaction_id] for match in result.matches), Decimal("0"))
+        residual = quantize_currency(session_obj.difference - matched_total)
+        return StatementMatchProposal(
+            matches=result.matches,
+            unmatched_line_ids=[line.line_id for line in result.unmatched_lines],
+            residual_difference=residual,
+            difference_explanation=explain_difference(result.unmatched_candidates, residual),
+        )
+
+    def _match_candidates(
+        self,
+        session: Session,
+        session_obj: ReconciliationSession,
+        lines: list[StatementLine],
+        date_tolerance_days: int,
+    ) -> list[LedgerCandidate]:
+        """Load open, unselected transactions whose dates could match one of the lines."""
+        if not lines:
+            return []
+        membership = reconciliation_session_transactions
+        criteria = self._unreconciled_criteria(None, session_obj.account_id)
+        tolerance = timedelta(days=max(date_tolerance_days, 0) + 1)
+        criteria += [
+            Transaction.effective_date >= min(line.date for line in lines) - tolerance,
+            Transaction.effective_date < max(line.date for line in lines) + tolerance,
+            ~exists().where(
+                membership.c.session_id == session_obj.id,
+                membership.c.transaction_id == Transaction.id,
+            ),
+        ]
+        rows = session.execute(select(Transaction.id, Transaction.amount, Transaction.effective_date).where(*criteria))
+        return [
+            LedgerCandidate(transaction_id=row.id, amount=Decimal(row.amount), date=row.effective_date.date())
+            for row in rows
+        ]
+
+    @staticmethod
+    def _select_transaction_chunk(session: Session, reconciliation_session_id: str, chunk: list[str]) -> None:
+        """Add one chunk of transactions to the session, ignoring ones already selected."""
+        membership = reconciliation_session_transactions
+        not_yet_selected = [
+            Transaction.id.in_(chunk),
+            ~exists().where(
+                membership.c.session_id == reconciliation_session_id,
+                membership.c.transaction_id == Transaction.id,
+            ),
+        ]
+        added_total = select(func.coalesce(func.sum(Transaction.amount), 0)).where(*not_yet_selected).scalar_subquery()
+        session.execute(
+            update(ReconciliationSession)
+            .where(ReconciliationSession.id == reconciliation_session_id)
+            .values(selected_total=ReconciliationSession.selected_total + added_total)
+            .execution_options(synchronize_session=False)
+        )
+        session.execute(
+            insert(membership).from_select(
+                ["session_id", "transaction_id"],
+                select(literal(reconciliation_session_id), Transaction.id).where(*not_yet_selected),
+            )
+        )
+        with reconciliation_counters_moved(session, Transaction.id.in_(chunk)):
+            session.execute(
+                update(Transaction)
+                .where(
+                    Transaction.id.in_(chunk),
+                    Transaction.reconciliation_status == ReconciliationStatus.UNCLEARED,
+                )
+                .values(reconciliation_status=ReconciliationStatus.CLEARED)
+            )
+
     def get_unreconciled_transactions(
         self,
         session: Session,
         cutoff_date: date | None = None,
     ) -> list[Transaction]:
-        stmt = select(Transaction).where(
+        stmt = (
+            select(Transaction)
+            .where(*self._unreconciled_criteria(cutoff_date, None))
+            .order_by(Transaction.effective_date)
+        )
+        return list(session.scalars(stmt))
+
+    def get_unreconciled_page(
+        self,
+        session: Session,
+        cutoff_date: date | None = None,
+        *,
+        account_id: str | None = None,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> UnreconciledPage:
+        """Return up to ``limit`` open transactions after ``cursor``, keyset-ordered by (effective_date, id).
+
+        Raises:
+            ValueError: The cursor is malformed or was issued for a different account.
+        """
+        limit = min(max(limit, 1), MAX_UNRECONCILED_PAGE_SIZE)
+        criteria = self._unreconciled_criteria(cutoff_date, account_id)
+        if cursor:
+            after_date, after_id = self._decode_unreconciled_cursor(cursor, account_id)
+            criteria.append(
+                or_(
+                    Transaction.effective_date > after_date,
+                    and_(Transaction.effective_date == after_date, Transaction.id > after_id),
+                )
+            )
+        stmt = (
+            select(*UNRECONCILED_COLUMNS)
+            .where(*criteria)
+            .order_by(Transaction.effective_date, Transaction.id)
+            .limit(limit + 1)
+        )
+        rows = [UnreconciledTransaction._make(row) for row in session.execute(stmt)]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(
+                {"account_id": account_id, "effective_date": last.effective_date.isoformat(), "id": last.id}
+            )
+        return UnreconciledPage(transactions=rows, next_cursor=next_cursor)
+
+    def stream_unreconciled_transactions(
+        self,
+        session: Session,
+        cutoff_date: date | None = None,
+        *,
+        account_id: str | None = None,
+    ) -> Iterator[UnreconciledTransaction]:
+        """Yield every open transaction from a server-side cursor, ``reconciliation_stream_batch_size`` rows at a time."""
+        stmt = (
+            select(*UNRECONCILED_COLUMNS)
+            .where(*self._unreconciled_criteria(cutoff_date, account_id))
+            .order_by(Transaction.effective_date, Transaction.id)
+            .execution_options(yield_per=max(settings.reconciliation_stream_batch_size, 1))
+        )
+        for row in session.execute(stmt):
+            yield UnreconciledTransaction._make(row)
+
+    @staticmethod
+    def _unreconciled_criteria(cutoff_date: date | None, account_id: str | None) -> list[ColumnElement[bool]]:
+        criteria: list[ColumnElement[bool]] = [
             Transaction.processing_status.in_(
                 [
                     ProcessingStatus.PENDING,
@@ -192,11 +557,22 @@ class ReconciliationService:
                     ReconciliationStatus.CLEARED,
                 ]
             ),
-        )
+        ]
         if cutoff_date:
-            stmt = stmt.where(Transaction.effective_date >= cutoff_date)
-        stmt = stmt.order_by(Transaction.effective_date)
-        return list(session.scalars(stmt))
+            criteria.append(Transaction.effective_date >= cutoff_date)
+        if account_id:
+            criteria.append(or_(Transaction.debit_account_id == account_id, Transaction.credit_account_id == account_id))
+        return criteria
+
+    @staticmethod
+    def _decode_unreconciled_cursor(cursor: str, account_id: str | None) -> tuple[datetime, str]:
+        position = decode_cursor(cursor)
+        if position.get("account_id") != account_id:
+            raise ValueError("Cursor does not belong to this account.")
+        try:
+            return datetime.fromisoformat(position["effective_date"]), str(position["id"])
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError("Invalid cursor.") from exc
 
     def create_bank_statement_snapshot(
         self,
@@ -235,9 +611,6 @@ class ReconciliationService:
             return "Review missing transactions or adjust the ending balance downward."
         return "Verify you have not overselected transactions or adjust the statement balance upward."
 
-    def _count_remaining_uncleared(self, session: Session) -> int:
-        stmt = select(func.count()).select_from(Transaction).where(
-            Transaction.reconciliation_status == ReconciliationStatus.UNCLEARED
-        )
-        result = session.scalar(stmt)
-        return int(result or 0)
+    def _count_remaining_uncleared(self, session: Session, account_id: str | None = None) -> int:
+        """Read the uncleared counter of the reconciled account (or the ledger) in O(1)."""
+        return get_reconciliation_counts(session, account_id).uncleared
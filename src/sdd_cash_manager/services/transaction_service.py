@@ -1,32 +1,147 @@
-from datetime import date, datetime, timedelta, timezone
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Callable
+from functools import partial
+from typing import Any, Callable, Sequence
 
-from sqlalchemy import delete, literal, or_, select
+from sqlalchemy import ColumnElement, and_, delete, or_, select
 from sqlalchemy.orm import Session, selectinload
 
 from sdd_cash_manager.core.config import settings
+from sdd_cash_manager.lib.duplicate_matching import (
+    DEFAULT_DATE_WINDOW_DAYS,
+    DuplicateGroup,
+    MatchRecord,
+    find_duplicate_groups,
+    merge_overlapping_groups,
+)
 from sdd_cash_manager.lib.logging_config import get_logger
+from sdd_cash_manager.lib.pagination import decode_cursor, encode_cursor
 from sdd_cash_manager.lib.security_events import (
     log_critical_application_error,
     log_duplicate_merge,
     log_quickfill_template_approved,
 )
+from sdd_cash_manager.lib.single_flight import SingleFlight
 from sdd_cash_manager.lib.utils import quantize_currency
 from sdd_cash_manager.models.account import Account
 from sdd_cash_manager.models.duplicate_candidate import DuplicateCandidate
 from sdd_cash_manager.models.enums import AccountingCategory, ProcessingStatus, ReconciliationStatus
+from sdd_cash_manager.models.ledger_version import has_uncommitted_ledger_writes
 from sdd_cash_manager.models.quickfill_template import QuickFillTemplate
 from sdd_cash_manager.models.transaction import Entry, Transaction
+from sdd_cash_manager.services.account_hierarchy import (
+    MAX_HIERARCHY_DEPTH,
+    descendant_ids,
+    is_in_subtree,
+    subtree_max_depth,
+)
 from sdd_cash_manager.services.account_service import AccountService
+from sdd_cash_manager.services.balance_updates import apply_balance_deltas, retry_on_version_conflict
+from sdd_cash_manager.services.ledger_versions import ledger_version
+from sdd_cash_manager.services.quickfill_aggregator import (
+    QuickFillHit,
+    TemplateIdentity,
+    calculate_quickfill_confidence,
+    get_quickfill_aggregator,
+    quickfill_memo,
+    template_identity,
+)
+from sdd_cash_manager.services.quickfill_index import QuickFillIndexEntry, get_quickfill_index
+from sdd_cash_manager.services.reconciliation_counters import release_reconciliation_counters
+from sdd_cash_manager.services.unit_of_work import commit_or_flush, in_unit_of_work, on_commit, unit_of_work
 
 logger = get_logger(__name__)
 
-MAX_HIERARCHY_DEPTH = 5
-DUPLICATE_SCAN_LIMIT = 1000
-
 BALANCING_ACCOUNT_ID = "00000000-0000-0000-0000-000000000099"
+# Currency code -> ID of that currency's balancing account, filled as balancing accounts are resolved.
+_balancing_account_ids: dict[str, str] = {}
 FORBIDDEN_CHAR_PATTERN = r"[<>;]"
+# Concurrent identical calls share one computation; keys start with the database bind's identity.
+_quickfill_ranking_flights: SingleFlight[list[str]] = SingleFlight("quickfill_ranking")
+_merge_depth_flights: SingleFlight[tuple[bool, str | None]] = SingleFlight("merge_depth")
+
+_SCAN_COLUMNS = (
+    Transaction.id,
+    Transaction.amount,
+    Transaction.effective_date,
+    Transaction.description,
+    Transaction.notes,
+    Transaction.debit_account_id,
+    Transaction.credit_account_id,
+)
+
+
+@dataclass(frozen=True)
+class _ScanRow:
+    """A transaction loaded for duplicate matching plus the accounts it touches."""
+
+    record: MatchRecord
+    debit_account_id: str
+    credit_account_id: str
+
+    @property
+    def transaction_id(self) -> str:
+        return self.record.transaction_id
+
+    @property
+    def effective_date(self) -> datetime:
+        return self.record.effective_date
+
+    @classmethod
+    def from_columns(
+        cls,
+        transaction_id: str,
+        amount: Decimal,
+        effective_date: datetime,
+        description: str | None,
+        notes: str | None,
+        debit_account_id: str,
+        credit_account_id: str,
+    ) -> "_ScanRow":
+        """Build a row from the values of ``_SCAN_COLUMNS``, in that order."""
+        return cls(
+            record=MatchRecord(
+                transaction_id=transaction_id,
+                amount=amount,
+                effective_date=effective_date,
+                description=(description or notes or "").strip(),
+            ),
+            debit_account_id=debit_account_id,
+            credit_account_id=credit_account_id,
+        )
+
+
+@dataclass
+class DuplicateScanResult:
+    """Outcome of one time-budgeted duplicate scan pass."""
+
+    candidates: list[DuplicateCandidate]
+    next_cursor: str | None
+    complete: bool
+
+
+def balancing_account_id(currency: str) -> str:
+    """Return the deterministic ID a new balancing account for ``currency`` is created with."""
+    return str(uuid.uuid5(uuid.UUID(BALANCING_ACCOUNT_ID), currency.strip().upper()))
+
+
+@dataclass(frozen=True)
+class TransactionDraft:
+    """A two-leg transaction to post through ``TransactionService.create_transactions``."""
+
+    effective_date: datetime
+    booking_date: datetime
+    description: str
+    amount: Decimal
+    debit_account_id: str
+    credit_account_id: str
+    action_type: str
+    notes: str | None = None
 
 
 class TransactionService:
@@ -51,6 +166,12 @@ class TransactionService:
             log_critical_application_error(f"Failed to acquire database session for transaction service: {e}", metadata={"service": "TransactionService"})
             raise RuntimeError("Failed to acquire database session for transaction service due to unexpected error.") from e
 
+    def _unit_of_work(self) -> AbstractContextManager[Any]:
+        """Join the shared session's unit of work; factory-built sessions keep committing per call."""
+        if self.session_factory or self.db_session is None:
+            return nullcontext()
+        return unit_of_work(self.db_session)
+
     def _ensure_account_service(self) -> None:
         """Ensure an AccountService has been attached before touching balances."""
         if self.account_service is None:
@@ -58,22 +179,14 @@ class TransactionService:
 
     @staticmethod
     def _ensure_account_active(account: Account) -> None:
-        """Reject accounts that are flagged as hidden or placeholder."""
-        if getattr(account, "hidden", False) or getattr(account, "placeholder", False):
+        """Reject accounts that are flagged as hidden, placeholder or pending deletion."""
+        if (
+            getattr(account, "hidden", False)
+            or getattr(account, "placeholder", False)
+            or getattr(account, "pending_deletion", False)
+        ):
             raise ValueError(f"Account {account.id} is not available for transactions.")
 
-    def _apply_account_balance_delta(
-        self,
-        debit_account: Account,
-        credit_account: Account,
-        amount: Decimal
-    ) -> None:
-        """Adjust the source and destination account balances atomically."""
-        debit_balance = quantize_currency(debit_account.available_balance - amount)
-        credit_balance = quantize_currency(credit_account.available_balance + amount)
-        debit_account.available_balance = debit_balance
-        credit_account.available_balance = credit_balance
-
     def set_account_service(self, account_service: AccountService) -> None:
         """Attach an AccountService to enable account interactions."""
         self.account_service = account_service
@@ -185,15 +298,23 @@ class TransactionService:
         """Persist the transaction plus snapshots and balance adjustments."""
         session.add(transaction)
         session.flush()
-        self._apply_account_balance_delta(debit_account, credit_account, amount)
+        apply_balance_deltas(
+            session, {debit_account.id: -amount, credit_account.id: amount}, transaction_id=transaction.id
+        )
         snapshot_reason = f"Transaction {transaction.id} posted"
         account_service = self.account_service
         assert account_service is not None
         account_service.record_balance_snapshot(debit_account.id, reason=snapshot_reason)
         account_service.record_balance_snapshot(credit_account.id, reason=snapshot_reason)
         session.flush()
-        self._record_quickfill_candidate(session, transaction, currency)
+        identity, hit = self._quickfill_hit_for(transaction, currency)
+        if in_unit_of_work(session):
+            session.flush()
+            on_commit(session, lambda: self._record_quickfill_hit(session, identity, hit))
+            on_commit(session, lambda: session.refresh(transaction))
+            return transaction
         session.commit()
+        self._record_quickfill_hit(session, identity, hit)
         session.refresh(transaction)
         return transaction
 
@@ -264,6 +385,80 @@ class TransactionService:
             if should_close and session is not None:
                 session.close()
 
+    def create_transactions(self, drafts: Sequence[TransactionDraft]) -> list[Transaction]:
+        """Validate and persist many two-leg transactions with one account lookup and one flush.
+
+        Balances accumulate across the batch, so an account touched by several drafts (such as
+        the balancing account) ends with the sum of every delta. Commits unless a unit of work
+        is open on the session.
+        """
+        if not self._use_db:
+            raise RuntimeError("TransactionService must be used with a database session to create transactions.")
+        if not drafts:
+            return []
+        self._ensure_account_service()
+        account_service = self.account_service
+        assert account_service is not None
+
+        session, should_close = self._acquire_session()
+        try:
+            account_ids = {draft.debit_account_id for draft in drafts} | {draft.credit_account_id for draft in drafts}
+            accounts = {account.id: account for account in session.scalars(select(Account).where(Account.id.in_(account_ids)))}
+            deltas: dict[str, Decimal] = {}
+            transactions: list[Transaction] = []
+            for draft in drafts:
+                transactions.append(self._transaction_from_draft(draft, accounts))
+                deltas[draft.debit_account_id] = deltas.get(draft.debit_account_id, Decimal(0)) - draft.amount
+                deltas[draft.credit_account_id] = deltas.get(draft.credit_account_id, Decimal(0)) + draft.amount
+            session.add_all(transactions)
+            session.flush()
+            apply_balance_deltas(session, deltas)
+
+            snapshot_reason = f"Batch of {len(transactions)} transactions posted"
+            for account_id in sorted(account_ids):
+                account_service.record_balance_snapshot(account_id, reason=snapshot_reason)
+            hits = [
+                self._quickfill_hit_for(transaction, accounts[transaction.debit_account_id].currency.strip().upper())
+                for transaction in transactions
+            ]
+            commit_or_flush(session)
+            for identity, hit in hits:
+                on_commit(session, partial(self._record_quickfill_hit, session, identity, hit))
+            return transactions
+        except ValueError:
+            raise
+        except Exception as e:
+            log_critical_application_error(f"Failed to create {len(drafts)} transactions: {e}", metadata={"service": "TransactionService"})
+            raise RuntimeError(f"Failed to create {len(drafts)} transactions due to unexpected error.") from e
+        finally:
+            if should_close and session is not None:
+                session.close()
+
+    def _transaction_from_draft(self, draft: TransactionDraft, accounts: dict[str, Account]) -> Transaction:
+        """Apply the single-transaction validations to one draft and build its transaction."""
+        description, notes = self._validate_transaction_metadata(draft.description, draft.notes)
+        self._verify_account_ids(draft.debit_account_id, draft.credit_account_id, draft.action_type)
+        self._ensure_positive_amount(draft.amount)
+        debit_account = accounts.get(draft.debit_account_id)
+        credit_account = accounts.get(draft.credit_account_id)
+        if debit_account is None or credit_account is None:
+            raise ValueError("Debit or credit account could not be found.")
+        self._ensure_account_active(debit_account)
+        self._ensure_account_active(credit_account)
+        return Transaction(
+            effective_date=draft.effective_date,
+            booking_date=draft.booking_date,
+            description=description,
+            amount=draft.amount,
+            debit_account_id=draft.debit_account_id,
+            credit_account_id=draft.credit_account_id,
+            action_type=draft.action_type,
+            entries=self._build_default_entries(draft.debit_account_id, draft.credit_account_id, draft.amount, notes),
+            notes=notes,
+            processing_status=ProcessingStatus.POSTED,
+            reconciliation_status=ReconciliationStatus.PENDING_RECONCILIATION,
+        )
+
     def _validate_transaction_metadata(self, description: str, notes: str | None) -> tuple[str, str | None]:
         validated_description = self._validate_string_field(description, "description", max_length=255, forbidden_chars_regex=FORBIDDEN_CHAR_PATTERN)
         validated_notes = None
@@ -364,47 +559,21 @@ class TransactionService:
         action_type: str,
         notes: str | None = None
     ) -> Transaction | None:
-        """Adjust an account balance by creating a balancing transaction."""
-        try:
-            self._ensure_account_service()
-            account_service = self.account_service
-            assert account_service is not None
-            account = account_service.get_account(account_id)
-            if not account:
-                raise ValueError(f"Account with ID {account_id} not found.")
-            self._ensure_balancing_account(account_service, account.currency)
-
-            current_balance = Decimal(account.available_balance)
-            amount_difference = target_balance - current_balance
-
-            if amount_difference.copy_abs() < Decimal("0.001"):
-                return None
-
-            debit_id, credit_id = self._determine_adjustment_accounts(amount_difference, account_id)
-            transaction_amount = amount_difference.copy_abs()
-
-            created_transaction = self._create_adjustment_transaction(
-                adjustment_date,
-                description,
-                action_type,
-                transaction_amount,
-                account,
-                debit_id,
-                credit_id,
-                notes,
-            )
-
-            account_service = self.account_service
-            assert account_service is not None
-            self._finalize_balance_adjustment(
-                account_id,
-                target_balance,
-                adjustment_date,
-                created_transaction,
-                account_service,
-            )
+        """Adjust an account balance by creating a balancing transaction.
+
+        When the services share one session the whole adjustment commits once, and is
+        replayed a bounded number of times if the account's version changed underneath it.
+        """
+        def _adjust() -> Transaction | None:
+            with self._unit_of_work():
+                return self._perform_balance_adjustment(
+                    account_id, target_balance, adjustment_date, description, action_type, notes
+                )
 
-            return created_transaction
+        try:
+            if self.session_factory or self.db_session is None:
+                return _adjust()
+            return retry_on_version_conflict(self.db_session, _adjust, description=f"balance adjustment of {account_id}")
         except ValueError:
             raise
         except RuntimeError as exc:
@@ -416,10 +585,61 @@ class TransactionService:
             log_critical_application_error(f"Failed to perform balance adjustment for account {account_id}: {exc}", account_id=account_id, metadata={"service": "TransactionService"})
             raise RuntimeError(f"Failed to perform balance adjustment for account {account_id} due to unexpected error.") from exc
 
-    def _determine_adjustment_accounts(self, amount_difference: Decimal, account_id: str) -> tuple[str, str]:
+    def _perform_balance_adjustment(
+        self,
+        account_id: str,
+        target_balance: Decimal,
+        adjustment_date: datetime,
+        description: str,
+        action_type: str,
+        notes: str | None,
+    ) -> Transaction | None:
+        self._ensure_account_service()
+        account_service = self.account_service
+        assert account_service is not None
+        account = account_service.get_account(account_id)
+        if not account:
+            raise ValueError(f"Account with ID {account_id} not found.")
+        balancing_id = self._ensure_balancing_account(account_service, account.currency)
+
+        current_balance = Decimal(account.available_balance)
+        amount_difference = target_balance - current_balance
+
+        if amount_difference.copy_abs() < Decimal("0.001"):
+            return None
+
+        debit_id, credit_id = self._determine_adjustment_accounts(amount_difference, account_id, balancing_id)
+        transaction_amount = amount_difference.copy_abs()
+
+        created_transaction = self._create_adjustment_transaction(
+            adjustment_date,
+            description,
+            action_type,
+            transaction_amount,
+            account,
+            debit_id,
+            credit_id,
+            notes,
+        )
+
+        account_service = self.account_service
+        assert account_service is not None
+        self._finalize_balance_adjustment(
+            account_id,
+            target_balance,
+            adjustment_date,
+            created_transaction,
+            account_service,
+        )
+
+        return created_transaction
+
+    def _determine_adjustment_accounts(
+        self, amount_difference: Decimal, account_id: str, balancing_id: str
+    ) -> tuple[str, str]:
         if amount_difference < 0:
-            return account_id, BALANCING_ACCOUNT_ID
-        return BALANCING_ACCOUNT_ID, account_id
+            return account_id, balancing_id
+        return balancing_id, account_id
 
     def _create_adjustment_transaction(
         self,
@@ -472,27 +692,61 @@ class TransactionService:
             reconciliation_status=ReconciliationStatus.PENDING_RECONCILIATION
         )
 
-    def _ensure_balancing_account(self, account_service: AccountService, currency: str) -> None:
-        logger.debug("Checking if balancing account %s exists", BALANCING_ACCOUNT_ID)
-        balancing_account = account_service.get_account(BALANCING_ACCOUNT_ID)
-        if balancing_account is None:
-            logger.info("Balancing account %s not found, creating it.", BALANCING_ACCOUNT_ID)
-            account_service.create_account(
-                name="Balancing Account",
-                currency=currency,
-                accounting_category=AccountingCategory.EQUITY,
-                available_balance=Decimal("0.0"),
-                id=BALANCING_ACCOUNT_ID
-            )
+    def _ensure_balancing_account(self, account_service: AccountService, currency: str) -> str:
+        """Return the ID of the balancing account for ``currency``, creating it when missing.
+
+        An existing ``BALANCING_ACCOUNT_ID`` account keeps serving its own currency; every other
+        currency gets an account of its own, created with sharded balances. Resolved IDs are
+        cached per currency, so the usual path is a single primary-key lookup.
+        """
+        code = currency.strip().upper()
+        cached_id = _balancing_account_ids.get(code)
+        if cached_id is not None and account_service.get_account(cached_id) is not None:
+            return cached_id
+
+        legacy_account = account_service.get_account(BALANCING_ACCOUNT_ID)
+        if legacy_account is not None and legacy_account.currency.upper() == code:
+            account_id = BALANCING_ACCOUNT_ID
         else:
-            logger.debug("Balancing account %s already exists.", BALANCING_ACCOUNT_ID)
+            account_id = balancing_account_id(code)
+            logger.debug("Checking if balancing account %s exists for %s", account_id, code)
+            if account_service.get_account(account_id) is None:
+                logger.info("Balancing account %s for %s not found, creating it.", account_id, code)
+                account_service.create_account(
+                    name=f"Balancing Account ({code})",
+                    currency=code,
+                    accounting_category=AccountingCategory.EQUITY,
+                    available_balance=Decimal("0.0"),
+                    id=account_id,
+                    balance_shards=max(settings.balance_shard_count, 0),
+                )
+        _balancing_account_ids[code] = account_id
+        return account_id
 
-    def ensure_balancing_account_exists(self, currency: str) -> None:
-        """Create the balancing account when it does not already exist."""
+    def ensure_balancing_account_exists(self, currency: str) -> str:
+        """Create the balancing account for ``currency`` when it does not already exist and return its ID."""
         self._ensure_account_service()
         account_service = self.account_service
         assert account_service is not None
-        self._ensure_balancing_account(account_service, currency)
+        return self._ensure_balancing_account(account_service, currency)
+
+    def get_quickfill_ledger_version(self, action_type: str, currency: str) -> int | None:
+        """Return the ledger version QuickFill results for the action/currency pair were computed from.
+
+        Buffered usage is not flushed here; the flush that writes it bumps the version.
+        Returns ``None`` without a database.
+        """
+        if not self._use_db:
+            return None
+        session, should_close = self._acquire_session()
+        try:
+            return ledger_version(session)
+        except Exception as e:
+            log_critical_application_error(f"Failed to read QuickFill ledger version: {e}", metadata={"service": "TransactionService"})
+            raise RuntimeError("Failed to read QuickFill ledger version due to unexpected error.") from e
+        finally:
+            if should_close and session is not None:
+                session.close()
 
     def rank_quickfill_candidates(
         self,
@@ -513,31 +767,56 @@ class TransactionService:
 
         session, should_close = self._acquire_session()
         try:
-            stmt = select(QuickFillTemplate).options(selectinload(QuickFillTemplate.source_transaction)).where(
-                QuickFillTemplate.action == normalized_action,
-                QuickFillTemplate.currency == normalized_currency,
-                QuickFillTemplate.last_used_at >= recent_cutoff,
-            )
-            if not include_unapproved:
-                stmt = stmt.where(QuickFillTemplate.is_approved.is_(True))
-
-            if query:
-                term = f"%{query.strip()}%"
-                stmt = stmt.outerjoin(QuickFillTemplate.source_transaction).where(
-                    or_(
-                        QuickFillTemplate.memo.ilike(term),
-                        Transaction.description.ilike(term),
-                    )
+            key = (normalized_action, normalized_currency)
+            index = get_quickfill_index(session)
+
+            # Reads never flush buffered usage: that would commit the caller's session on a GET.
+            def _search() -> list[str]:
+                if not index.is_loaded(key):
+                    index.load(key, self._load_quickfill_index_entries(session, normalized_action, normalized_currency))
+                return index.search(key, query, include_unapproved=include_unapproved, recent_cutoff=recent_cutoff)
+
+            # Only the ranked IDs are shared; every caller loads its own templates below.
+            if has_uncommitted_ledger_writes(session):
+                ranked_ids = _search()
+            else:
+                ranked_ids = _quickfill_ranking_flights.do(
+                    (id(session.get_bind()), normalized_action, normalized_currency, query, include_unapproved),
+                    _search,
                 )
 
-            stmt = stmt.order_by(
-                QuickFillTemplate.confidence_score.desc(),
-                QuickFillTemplate.history_count.desc(),
-                QuickFillTemplate.last_used_at.desc()
-            )
-
-            stmt = stmt.limit(limit)
-            return list(session.scalars(stmt).all())
+            # The index may lag other processes, so the filters are re-checked on the loaded rows.
+            results: list[QuickFillTemplate] = []
+            for start in range(0, len(ranked_ids), limit):
+                chunk = ranked_ids[start:start + limit]
+                templates = {
+                    template.id: template
+                    for template in session.scalars(
+                        select(QuickFillTemplate)
+                        .options(selectinload(QuickFillTemplate.source_transaction))
+                        .where(QuickFillTemplate.id.in_(chunk))
+                    )
+                }
+                for template_id in chunk:
+                    template = templates.get(template_id)
+                    if template is None:
+                        index.discard(key, template_id)
+                        continue
+                    last_used_at = template.last_used_at
+                    if last_used_at is not None and last_used_at.tzinfo is None:
+                        last_used_at = last_used_at.replace(tzinfo=timezone.utc)
+                    if (
+                        template.action != normalized_action
+                        or template.currency != normalized_currency
+                        or (not include_unapproved and not template.is_approved)
+                        or last_used_at is None
+                        or last_used_at < recent_cutoff
+                    ):
+                        continue
+                    results.append(template)
+                    if len(results) == limit:
+                        return results
+            return results
         except Exception as exc:
             log_critical_application_error(
                 f"Failed to rank QuickFill templates for {action_type}/{currency}: {exc}",
@@ -572,7 +851,13 @@ class TransactionService:
                 template.last_used_at,
             )
             session.flush()
+            source_transaction = template.source_transaction
+            index_entry = QuickFillIndexEntry.from_template(
+                template,
+                source_transaction.description if source_transaction is not None else None,
+            )
             session.commit()
+            get_quickfill_index(session).upsert(index_entry)
             session.refresh(template)
             log_quickfill_template_approved(
                 template_id=template.id,
@@ -596,71 +881,50 @@ class TransactionService:
             if should_close and session is not None:
                 session.close()
 
-    def _record_quickfill_candidate(
-        self,
-        session: Session,
-        transaction: Transaction,
-        currency: str,
-    ) -> None:
-        """Capture transaction metadata as a QuickFill template candidate."""
-        raw_memo = (transaction.notes or transaction.description or "").strip()
-        memo_value: str | None = raw_memo[:255] if raw_memo else None
-        action = transaction.action_type.strip()
-        normalized_currency = currency.strip().upper()
-        stmt = select(QuickFillTemplate).where(
-            QuickFillTemplate.action == action,
-            QuickFillTemplate.currency == normalized_currency,
-            QuickFillTemplate.transfer_from_account_id == transaction.debit_account_id,
-            QuickFillTemplate.transfer_to_account_id == transaction.credit_account_id,
-            QuickFillTemplate.amount == transaction.amount,
-            QuickFillTemplate.memo == memo_value,
+    @staticmethod
+    def _quickfill_hit_for(transaction: Transaction, currency: str) -> tuple[TemplateIdentity, QuickFillHit]:
+        """Describe the QuickFill template usage implied by a posted transaction."""
+        identity = template_identity(
+            transaction.action_type,
+            currency,
+            transaction.debit_account_id,
+            transaction.credit_account_id,
+            transaction.amount,
+            quickfill_memo(transaction.notes, transaction.description),
         )
+        used_at = transaction.created_at or datetime.now(timezone.utc)
+        if used_at.tzinfo is None:
+            used_at = used_at.replace(tzinfo=timezone.utc)
+        return identity, QuickFillHit(1, used_at, transaction.id, transaction.description)
 
-        existing = session.scalars(stmt).one_or_none()
-
-        if existing:
-            existing.history_count += 1
-            existing.source_transaction_id = transaction.id
-            existing.mark_used()
-            existing.confidence_score = self._calculate_quickfill_confidence(
-                existing.history_count,
-                existing.last_used_at,
-            )
+    @staticmethod
+    def _record_quickfill_hit(session: Session, identity: TemplateIdentity, hit: QuickFillHit) -> None:
+        """Buffer the hit for write-behind aggregation, flushing early when the buffer is large."""
+        aggregator = get_quickfill_aggregator(session)
+        if aggregator.record(identity, hit) < max(settings.quickfill_flush_max_pending, 1):
             return
+        try:
+            aggregator.flush(session)
+        except Exception:
+            logger.exception("QuickFill flush failed; hits stay buffered for the next flush")
 
-        template = QuickFillTemplate(
-            action=action,
-            currency=normalized_currency,
-            transfer_from_account_id=transaction.debit_account_id,
-            transfer_to_account_id=transaction.credit_account_id,
-            amount=transaction.amount,
-            memo=memo_value,
-            source_transaction_id=transaction.id,
-        )
-        template.history_count = 1
-        template.mark_used()
-        template.confidence_score = self._calculate_quickfill_confidence(
-            template.history_count,
-            template.last_used_at,
+    @staticmethod
+    def _load_quickfill_index_entries(session: Session, action: str, currency: str) -> list[QuickFillIndexEntry]:
+        """Read every template for the action/currency pair together with its source description."""
+        rows = session.execute(
+            select(QuickFillTemplate, Transaction.description)
+            .outerjoin(Transaction, QuickFillTemplate.source_transaction_id == Transaction.id)
+            .where(
+                QuickFillTemplate.action == action,
+                QuickFillTemplate.currency == currency,
+            )
         )
-        session.add(template)
+        return [QuickFillIndexEntry.from_template(template, description) for template, description in rows]
 
     @staticmethod
     def _calculate_quickfill_confidence(history_count: int, last_used_at: datetime | None) -> Decimal:
         """Estimate confidence using frequency within the configured QuickFill history window."""
-        window_days = max(settings.quickfill_history_days, 1)
-        base_hits = min(history_count, window_days)
-        base_score = Decimal(base_hits) / Decimal(window_days)
-        if last_used_at:
-            normalized_last_used = (
-                last_used_at
-                if last_used_at.tzinfo is not None
-                else last_used_at.replace(tzinfo=timezone.utc)
-            )
-            recency_bonus = Decimal("0.1") if datetime.now(timezone.utc) - normalized_last_used <= timedelta(days=7) else Decimal("0")
-        else:
-            recency_bonus = Decimal("0")
-        return min(Decimal("1.0"), base_score + recency_bonus)
+        return calculate_quickfill_confidence(history_count, last_used_at)
 
     def scan_duplicate_candidates(
         self,
@@ -669,26 +933,57 @@ class TransactionService:
         scope: str = "account",
         limit: int = 25
     ) -> list[DuplicateCandidate]:
-        """Scan recent transactions and persist candidates for manual review (account scope only)."""
+        """Scan recent transactions within the time budget and return candidates for manual review."""
+        return self.run_duplicate_scan(account_id=account_id, scope=scope, limit=limit).candidates
+
+    def run_duplicate_scan(
+        self,
+        *,
+        account_id: str,
+        scope: str = "account",
+        limit: int = 25,
+        cursor: str | None = None,
+    ) -> DuplicateScanResult:
+        """Scan transactions newest-first in keyset batches until the time budget is spent.
+
+        Each call processes at least one batch of ``duplicate_scan_batch_size`` rows and stops
+        once ``duplicate_scan_timeout_seconds`` has elapsed, persisting what it found so far.
+        When rows remain, the result carries a cursor that a follow-up call passes back to
+        continue where this one stopped. Account-group scans treat ``account_id`` as the root
+        of the subtree, match each account in parallel and merge duplicates spanning accounts.
+        """
         if scope not in {"account", "account_group"}:
             raise ValueError("scope must be either 'account' or 'account_group'.")
 
-        if scope == "account_group":
-            raise NotImplementedError("Account group duplicate scanning is not supported yet.")
-
         if scope == "account" and not account_id:
             raise ValueError("account_id is required for account-scoped duplicate scans.")
 
+        if scope == "account_group" and not account_id:
+            raise ValueError("account_id is required to identify the account group root.")
+
         if not self._use_db:
             raise RuntimeError("Duplicate scanning requires an active database session.")
 
         if limit <= 0:
             limit = 25
 
+        position = self._decode_scan_cursor(cursor, account_id, scope) if cursor else None
+
         session, should_close = self._acquire_session()
         try:
-            transactions = self._fetch_recent_transactions(session, account_id)
-            groups = self._group_transactions(transactions)
+            if scope == "account_group":
+                member_ids = sorted(self._collect_descendant_ids(session, account_id))
+                if not member_ids:
+                    raise ValueError(f"Account with ID {account_id} not found.")
+            else:
+                member_ids = [account_id]
+
+            groups, next_position = self._scan_in_batches(
+                session,
+                member_ids,
+                position,
+                cross_account=scope == "account_group",
+            )
             self._persist_duplicate_candidates(session, groups, account_id, scope)
 
             session.flush()
@@ -703,7 +998,24 @@ class TransactionService:
                 .order_by(DuplicateCandidate.confidence.desc(), DuplicateCandidate.updated_at.desc())
                 .limit(limit)
             )
-            return list(session.scalars(result_stmt).all())
+            next_cursor = None
+            if next_position is not None:
+                next_cursor = encode_cursor(
+                    {
+                        "account_id": account_id,
+                        "scope": scope,
+                        "effective_date": next_position[0].isoformat(),
+                        "id": next_position[1],
+                    }
+                )
+            return DuplicateScanResult(
+                candidates=list(session.scalars(result_stmt).all()),
+                next_cursor=next_cursor,
+                complete=next_cursor is None,
+            )
+        except ValueError:
+            session.rollback()
+            raise
         except Exception as exc:
             session.rollback()
             log_critical_application_error(
@@ -715,77 +1027,182 @@ class TransactionService:
             if should_close and session is not None:
                 session.close()
 
-    def _fetch_recent_transactions(self, session: Session, account_id: str) -> list[Transaction]:
-        txn_query = (
-            select(Transaction)
+    @staticmethod
+    def _decode_scan_cursor(cursor: str, account_id: str, scope: str) -> tuple[datetime, str]:
+        position = decode_cursor(cursor)
+        if position.get("account_id") != account_id or position.get("scope") != scope:
+            raise ValueError("Cursor does not belong to this duplicate scan.")
+        try:
+            return datetime.fromisoformat(position["effective_date"]), str(position["id"])
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError("Invalid cursor.") from exc
+
+    def _scan_in_batches(
+        self,
+        session: Session,
+        member_ids: list[str],
+        position: tuple[datetime, str] | None,
+        *,
+        cross_account: bool,
+    ) -> tuple[list[DuplicateGroup], tuple[datetime, str] | None]:
+        """Match keyset batches until the rows or the time budget run out; return groups and resume position."""
+        batch_size = max(1, settings.duplicate_scan_batch_size)
+        deadline = time.monotonic() + max(0, settings.duplicate_scan_timeout_seconds)
+
+        # Rows just before the boundary are rescanned so duplicates straddling two batches still meet.
+        carry = self._fetch_scan_overlap(session, member_ids, position) if position else []
+        matched: dict[str, MatchRecord] = {}
+        groups: list[DuplicateGroup] = []
+        while True:
+            rows = self._fetch_scan_batch(session, member_ids, position, batch_size)
+            if not rows:
+                position = None
+                break
+
+            window = carry + rows
+            batch_groups = self._match_scan_rows(window, member_ids, cross_account=cross_account)
+            records = {row.transaction_id: row.record for row in window}
+            for group in batch_groups:
+                for transaction_id in group.transaction_ids:
+                    matched[transaction_id] = records[transaction_id]
+            groups.extend(batch_groups)
+
+            oldest = rows[-1]
+            position = (oldest.effective_date, oldest.transaction_id)
+            carry = [
+                row for row in window
+                if (row.effective_date.date() - oldest.effective_date.date()).days <= DEFAULT_DATE_WINDOW_DAYS
+            ]
+            if len(rows) < batch_size:
+                position = None
+                break
+            if time.monotonic() >= deadline:
+                break
+
+        return merge_overlapping_groups(groups, matched), position
+
+    @staticmethod
+    def _member_filter(member_ids: list[str]) -> ColumnElement[bool]:
+        return or_(Transaction.debit_account_id.in_(member_ids), Transaction.credit_account_id.in_(member_ids))
+
+    def _fetch_scan_batch(
+        self,
+        session: Session,
+        member_ids: list[str],
+        position: tuple[datetime, str] | None,
+        batch_size: int,
+    ) -> list[_ScanRow]:
+        stmt = select(*_SCAN_COLUMNS).where(self._member_filter(member_ids))
+        if position is not None:
+            boundary_date, boundary_id = position
+            stmt = stmt.where(
+                or_(
+                    Transaction.effective_date < boundary_date,
+                    and_(Transaction.effective_date == boundary_date, Transaction.id < boundary_id),
+                )
+            )
+        stmt = stmt.order_by(Transaction.effective_date.desc(), Transaction.id.desc()).limit(batch_size)
+        return [_ScanRow.from_columns(*row) for row in session.execute(stmt)]
+
+    def _fetch_scan_overlap(
+        self,
+        session: Session,
+        member_ids: list[str],
+        position: tuple[datetime, str],
+    ) -> list[_ScanRow]:
+        boundary_date, boundary_id = position
+        stmt = (
+            select(*_SCAN_COLUMNS)
             .where(
-                (Transaction.debit_account_id == account_id) |
-                (Transaction.credit_account_id == account_id)
+                self._member_filter(member_ids),
+                Transaction.effective_date < boundary_date + timedelta(days=DEFAULT_DATE_WINDOW_DAYS + 1),
+                or_(
+                    Transaction.effective_date > boundary_date,
+                    and_(Transaction.effective_date == boundary_date, Transaction.id >= boundary_id),
+                ),
             )
-            .order_by(Transaction.effective_date.desc())
-            .limit(DUPLICATE_SCAN_LIMIT)
+            .order_by(Transaction.effective_date.desc(), Transaction.id.desc())
+        )
+        return [_ScanRow.from_columns(*row) for row in session.execute(stmt)]
+
+    def _match_scan_rows(
+        self,
+        rows: list[_ScanRow],
+        member_ids: list[str],
+        *,
+        cross_account: bool,
+    ) -> list[DuplicateGroup]:
+        """Match rows per account on the worker pool and, for groups, across accounts sharing an amount."""
+        if not cross_account:
+            return self._group_transactions([row.record for row in rows])
+
+        members = set(member_ids)
+        partitions: dict[str, list[MatchRecord]] = {}
+        owners: dict[Decimal, set[str]] = {}
+        for row in rows:
+            for owner_id in {row.debit_account_id, row.credit_account_id} & members:
+                partitions.setdefault(owner_id, []).append(row.record)
+                owners.setdefault(row.record.amount, set()).add(owner_id)
+
+        workers = max(1, min(settings.duplicate_scan_workers, len(partitions)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="duplicate-scan") as executor:
+            per_account_groups = list(executor.map(self._group_transactions, partitions.values()))
+
+        # Only amounts seen in more than one account can produce duplicates that span accounts.
+        shared_amounts = {amount for amount, owner_ids in owners.items() if len(owner_ids) > 1}
+        cross_account_groups = self._group_transactions(
+            [row.record for row in rows if row.record.amount in shared_amounts]
         )
-        return list(session.scalars(txn_query).all())
+        groups = [group for account_groups in per_account_groups for group in account_groups]
+        return [*groups, *cross_account_groups]
 
     @staticmethod
-    def _group_transactions(transactions: list[Transaction]) -> dict[tuple[Decimal, date, str], list[Transaction]]:
-        groups: dict[tuple[Decimal, date, str], list[Transaction]] = {}
-        for txn in transactions:
-            txn_date = txn.effective_date.date()
-            description = (txn.description or txn.notes or "").strip()
-            normalized_description = description[:255]
-            key = (txn.amount, txn_date, normalized_description)
-            groups.setdefault(key, []).append(txn)
-        return groups
+    def _group_transactions(records: list[MatchRecord]) -> list[DuplicateGroup]:
+        return find_duplicate_groups(records)
 
     def _persist_duplicate_candidates(
         self,
         session: Session,
-        groups: dict[tuple[Decimal, date, str], list[Transaction]],
+        groups: list[DuplicateGroup],
         account_id: str,
         scope: str,
     ) -> list[DuplicateCandidate]:
-        candidates: list[DuplicateCandidate] = []
-        for (amount, txn_date, normalized_description), matches in groups.items():
-            if len(matches) < 2:
-                continue
-
-            matches.sort(key=lambda t: t.effective_date, reverse=True)
-            txn_ids = [t.id for t in matches]
-            confidence = min(Decimal("1.0"), Decimal(len(matches)) / Decimal("5.0"))
-
-            existing = session.scalars(
-                select(DuplicateCandidate)
-                .where(
+        existing_by_key = {
+            (quantize_currency(candidate.amount), candidate.date, candidate.description or ""): candidate
+            for candidate in session.scalars(
+                select(DuplicateCandidate).where(
                     DuplicateCandidate.account_id == account_id,
-                    DuplicateCandidate.scope == scope,
-                    DuplicateCandidate.amount == amount,
-                    DuplicateCandidate.date == txn_date,
-                    DuplicateCandidate.description == normalized_description
+                    DuplicateCandidate.scope == scope
                 )
-            ).one_or_none()
+            )
+        }
 
+        candidates: list[DuplicateCandidate] = []
+        new_candidates: list[DuplicateCandidate] = []
+        for group in groups:
+            existing = existing_by_key.get((quantize_currency(group.amount), group.date, group.description))
             if existing:
-                existing.matching_transaction_ids = txn_ids
-                existing.confidence = confidence
+                existing.matching_transaction_ids = group.transaction_ids
+                existing.confidence = group.confidence
                 existing.touch()
                 candidate = existing
             else:
                 candidate = DuplicateCandidate(
                     account_id=account_id,
                     scope=scope,
-                    matching_transaction_ids=txn_ids,
-                    amount=amount,
-                    date=txn_date,
-                    description=normalized_description or None,
-                    confidence=confidence,
+                    matching_transaction_ids=group.transaction_ids,
+                    amount=group.amount,
+                    date=group.date,
+                    description=group.description or None,
+                    confidence=group.confidence,
                     recommended_action="merge",
                     status="review"
                 )
-                session.add(candidate)
+                new_candidates.append(candidate)
 
             candidates.append(candidate)
 
+        session.add_all(new_candidates)
         return candidates
 
     def list_duplicate_candidates(
@@ -827,6 +1244,7 @@ class TransactionService:
 
             before_balance = account_service.calculate_running_balance(candidate.account_id)
 
+            release_reconciliation_counters(session, Transaction.id.in_(removals))
             session.execute(delete(Transaction).where(Transaction.id.in_(removals)))
             session.flush()
 
@@ -870,26 +1288,30 @@ class TransactionService:
 
         session, should_close = self._acquire_session()
         try:
-            depth_map = self._account_depth_map(session)
-            source_depth = depth_map.get(source_account_id)
-            target_depth = depth_map.get(target_account_id)
-
-            if source_depth is None or target_depth is None:
-                raise ValueError("Source or target account not found.")
-
-            descendant_ids = self._collect_descendant_ids(session, source_account_id)
-            max_descendant_depth = max((depth_map.get(acc_id, source_depth) for acc_id in descendant_ids), default=source_depth)
-            delta = max_descendant_depth - source_depth
-            new_depth = target_depth + 1 + delta
-
-            if new_depth > MAX_HIERARCHY_DEPTH:
-                message = (
-                    f"Merge would place the deepest descendant at depth {new_depth}, "
-                    f"exceeding the allowed limit of {MAX_HIERARCHY_DEPTH}."
-                )
-                return False, message
+            def _validate() -> tuple[bool, str | None]:
+                source = session.get(Account, source_account_id)
+                target = session.get(Account, target_account_id)
+                if source is None or target is None:
+                    raise ValueError("Source or target account not found.")
+
+                if is_in_subtree(target.hierarchy_path, source.hierarchy_path):
+                    return False, "Target account cannot be the source account or one of its descendants."
+
+                delta = subtree_max_depth(session, source.hierarchy_path) - source.depth
+                new_depth = target.depth + 1 + delta
+
+                if new_depth > MAX_HIERARCHY_DEPTH:
+                    message = (
+                        f"Merge would place the deepest descendant at depth {new_depth}, "
+                        f"exceeding the allowed limit of {MAX_HIERARCHY_DEPTH}."
+                    )
+                    return False, message
+
+                return True, None
 
-            return True, None
+            if has_uncommitted_ledger_writes(session):
+                return _validate()
+            return _merge_depth_flights.do((id(session.get_bind()), source_account_id, target_account_id), _validate)
         except (ValueError, RuntimeError):
             raise
         except Exception as exc:
@@ -902,40 +1324,7 @@ class TransactionService:
             if should_close and session is not None:
                 session.close()
 
-    @staticmethod
-    def _account_depth_map(session: Session) -> dict[str, int]:
-        """Return a mapping of account IDs to their depth within the hierarchy."""
-        hierarchy_cte = (
-            select(
-                Account.id.label("account_id"),
-                literal(1).label("depth")
-            )
-            .where(Account.parent_account_id.is_(None))
-            .cte(name="account_depth", recursive=True)
-        )
-        hierarchy_cte = hierarchy_cte.union_all(
-            select(
-                Account.id,
-                (hierarchy_cte.c.depth + 1).label("depth")
-            )
-            .where(Account.parent_account_id == hierarchy_cte.c.account_id)
-        )
-        rows = session.execute(
-            select(hierarchy_cte.c.account_id, hierarchy_cte.c.depth)
-        ).all()
-        return {row.account_id: row.depth for row in rows}
-
     @staticmethod
     def _collect_descendant_ids(session: Session, root_account_id: str) -> set[str]:
         """Return all account IDs in the subtree rooted at the provided account."""
-        descendant_cte = (
-            select(Account.id)
-            .where(Account.id == root_account_id)
-            .cte(name="merge_descendants", recursive=True)
-        )
-        descendant_cte = descendant_cte.union_all(
-            select(Account.id)
-            .where(Account.parent_account_id == descendant_cte.c.id)
-        )
-        rows = session.scalars(select(descendant_cte.c.id)).all()
-        return set(rows)
+        return descendant_ids(session, root_account_id)
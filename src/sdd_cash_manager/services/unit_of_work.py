@@ -0,0 +1,63 @@
+"""Session-scoped unit of work so one API operation ends in exactly one commit.
+
+Services normally commit their own writes. When a caller opens ``unit_of_work(session)``
+the services that share that session join it instead: ``commit_or_flush`` only flushes,
+and work that must wait for durable state (``on_commit``) is deferred until the outermost
+unit of work commits. Nesting is counted in ``session.info``, so inner units are free.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from sqlalchemy.orm import Session
+
+_DEPTH_KEY = "unit_of_work_depth"
+_CALLBACKS_KEY = "unit_of_work_callbacks"
+
+
+def in_unit_of_work(session: Session) -> bool:
+    """Return True while ``session`` is inside an open unit of work."""
+    return int(session.info.get(_DEPTH_KEY, 0)) > 0
+
+
+@contextmanager
+def unit_of_work(session: Session) -> Iterator[Session]:
+    """Collect every write made through ``session`` and commit once when the outermost unit exits.
+
+    An exception escaping the outermost unit rolls the session back and drops deferred callbacks.
+    """
+    depth = session.info.get(_DEPTH_KEY, 0)
+    session.info[_DEPTH_KEY] = depth + 1
+    if depth == 0:
+        session.info[_CALLBACKS_KEY] = []
+    try:
+        yield session
+        if depth == 0:
+            session.commit()
+    except BaseException:
+        if depth == 0:
+            session.rollback()
+        raise
+    finally:
+        session.info[_DEPTH_KEY] = depth
+        callbacks: list[Callable[[], None]] = session.info.pop(_CALLBACKS_KEY, []) if depth == 0 else []
+    for callback in callbacks:
+        callback()
+
+
+def commit_or_flush(session: Session) -> None:
+    """Commit outside a unit of work; inside one, flush and leave the commit to its owner."""
+    if in_unit_of_work(session):
+        session.flush()
+    else:
+        session.commit()
+
+
+def on_commit(session: Session, callback: Callable[[], None]) -> None:
+    """Run ``callback`` after the enclosing unit of work commits, or immediately outside one."""
+    if in_unit_of_work(session):
+        session.info[_CALLBACKS_KEY].append(callback)
+    else:
+        callback()
@@ -1,5 +1,6 @@
 """HTTP tests covering account creation and listing flows (User Story 1)."""
 
+import json
 import logging
 from decimal import Decimal
 
@@ -76,6 +77,58 @@ async def test_list_accounts_filters(
     assert any(entry["id"] == placeholder["id"] for entry in placeholder_entries)
 
 
+@pytest.mark.asyncio
+async def test_conditional_gets_answer_304_until_the_account_changes(
+    api_client: AsyncClient,
+    authenticated_headers: dict[str, str],
+    seeded_accounts: dict[str, dict[str, object]],
+) -> None:
+    """Unchanged polls of an account and of the list get 304s; a write changes both ETags."""
+    account_id = seeded_accounts["visible"]["id"]
+    first = await api_client.get(f"/accounts/{account_id}", headers=authenticated_headers)
+    assert_status(first, 200)
+    etag = first.headers["etag"]
+    listed = await api_client.get("/accounts", headers=authenticated_headers)
+    list_etag = listed.headers["etag"]
+
+    unchanged = await api_client.get(f"/accounts/{account_id}", headers={**authenticated_headers, "If-None-Match": etag})
+    assert_status(unchanged, 304)
+    assert unchanged.headers["etag"] == etag
+    unchanged_list = await api_client.get("/accounts", headers={**authenticated_headers, "If-None-Match": list_etag})
+    assert_status(unchanged_list, 304)
+
+    updated = await api_client.put(f"/accounts/{account_id}", json={"notes": "Polled"}, headers=authenticated_headers)
+    assert_status(updated, 200)
+
+    changed = await api_client.get(f"/accounts/{account_id}", headers={**authenticated_headers, "If-None-Match": etag})
+    assert_status(changed, 200)
+    assert changed.headers["etag"] != etag
+    changed_list = await api_client.get("/accounts", headers={**authenticated_headers, "If-None-Match": list_etag})
+    assert_status(changed_list, 200)
+
+
+@pytest.mark.asyncio
+async def test_stream_accounts_matches_the_list_endpoint(
+    api_client: AsyncClient,
+    authenticated_headers: dict[str, str],
+    seeded_accounts: dict[str, dict[str, object]],
+) -> None:
+    """Stream the filtered account list as NDJSON and as a JSON array."""
+    params = {"search_term": "visible-account", "include_hidden": "true", "include_placeholder": "true"}
+    listed = await api_client.get("/accounts", params=params, headers=authenticated_headers)
+    assert_status(listed, 200)
+
+    ndjson = await api_client.get("/accounts/stream", params=params, headers=authenticated_headers)
+    assert_status(ndjson, 200)
+    assert ndjson.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line) for line in ndjson.text.splitlines()] == listed.json()
+
+    array = await api_client.get("/accounts/stream", params={**params, "format": "json"}, headers=authenticated_headers)
+    assert_status(array, 200)
+    assert array.headers["content-type"].startswith("application/json")
+    assert array.json() == listed.json()
+
+
 @pytest.mark.asyncio
 async def test_account_merge_reparents_entries(
     api_client: AsyncClient,
@@ -124,5 +177,42 @@ async def test_account_merge_reparents_entries(
     assert body["affected_entries_count"] >= 1
     assert body["target_account_id"] == target["id"]
 
+    progress_response = await api_client.get(f"/accounts/merge/{body['plan_id']}", headers=authenticated_headers)
+    assert_status(progress_response, 200)
+    progress = progress_response.json()
+    assert progress["status"] == "executed"
+    assert progress["affected_entries_count"] == progress["total_entries_count"] == body["affected_entries_count"]
+    assert progress["progress_phase"] is None
+
+    missing_response = await api_client.get("/accounts/merge/unknown-plan", headers=authenticated_headers)
+    assert_status(missing_response, 404)
+
     # Cleanup the placeholder child after merging
     await api_client.delete(f"/accounts/{child['id']}", headers=authenticated_headers)
+
+
+@pytest.mark.asyncio
+async def test_background_delete_hides_account_until_purged(
+    api_client: AsyncClient,
+    authenticated_headers: dict[str, str],
+) -> None:
+    """Background deletion returns 202 and drops the account from listings immediately."""
+    payload = {
+        "name": "Background Delete",
+        "currency": "USD",
+        "accounting_category": "ASSET",
+        "banking_product_type": "CHECKING",
+        "available_balance": "0.00",
+    }
+    created = await api_client.post("/accounts", json=payload, headers=authenticated_headers)
+    assert_status(created, 201)
+    account_id = created.json()["id"]
+
+    delete_response = await api_client.delete(
+        f"/accounts/{account_id}", params={"background": "true"}, headers=authenticated_headers
+    )
+    assert_status(delete_response, 202)
+
+    listing = await api_client.get("/accounts", params={"search_term": "Background"}, headers=authenticated_headers)
+    assert_status(listing, 200)
+    assert account_id not in {entry["id"] for entry in listing.json()}
@@ -52,3 +52,32 @@ async def test_duplicate_candidate_merge(api_client: AsyncClient, authenticated_
     assert merge_payload["status"] == "merged"
     assert Decimal(str(merge_payload["before_balance"])) == Decimal(str(merge_payload["after_balance"]))
     assert merge_payload["removed_transaction_ids"], "Duplicate merge should report removed IDs"
+
+
+@pytest.mark.asyncio
+async def test_duplicate_scan_reports_completion(api_client: AsyncClient, authenticated_headers: dict[str, str], seeded_accounts: dict[str, dict[str, object]]) -> None:
+    """A scan that fits in the time budget returns candidates without a resume cursor."""
+    visible = seeded_accounts["visible"]
+    balancing = seeded_accounts["balancing"]
+
+    payload = _transaction_payload(str(visible["id"]), str(balancing["id"]))
+    for _ in range(2):
+        assert_status(await api_client.post("/transactions/", json=payload, headers=authenticated_headers), 201)
+
+    scan_response = await api_client.get(
+        "/accounts/duplicates/scan",
+        params={"account_id": str(visible["id"])},
+        headers=authenticated_headers,
+    )
+    assert_status(scan_response, 200)
+    body = scan_response.json()
+    assert body["complete"] is True
+    assert body["next_cursor"] is None
+    assert len(body["candidates"]) == 1
+
+    invalid_response = await api_client.get(
+        "/accounts/duplicates/scan",
+        params={"account_id": str(visible["id"]), "cursor": "garbage"},
+        headers=authenticated_headers,
+    )
+    assert_status(invalid_response, 400)
@@ -6,6 +6,7 @@ from decimal import Decimal
 import pytest
 from httpx import AsyncClient
 
+from sdd_cash_manager.services.quickfill_aggregator import flush_all_quickfill_aggregators
 from tests.api.helpers import assert_status
 
 
@@ -33,6 +34,8 @@ async def test_quickfill_suggestion_and_approval_workflow(
 
     txn_response = await api_client.post("/transactions/", json=payload, headers=authenticated_headers)
     assert_status(txn_response, 201)
+    # Lookups never flush buffered usage; stand in for the periodic flush task.
+    flush_all_quickfill_aggregators()
 
     note_before = await api_client.get(f"/accounts/{source_account['id']}", headers=authenticated_headers)
     assert_status(note_before, 200)
@@ -105,6 +108,7 @@ async def test_quickfill_submission_updates_balances(
     }
     seed_txn_response = await api_client.post("/transactions/", json=seed_payload, headers=authenticated_headers)
     assert_status(seed_txn_response, 201)
+    flush_all_quickfill_aggregators()
 
     # 2. Retrieve and approve the template
     suggestion_response = await api_client.get(
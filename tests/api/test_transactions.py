@@ -1,5 +1,6 @@
 """HTTP tests covering transaction and hierarchy behaviors (User Story 2)."""
 
+import json
 import logging
 from datetime import date, timedelta
 from decimal import Decimal
@@ -10,6 +11,7 @@ from httpx import AsyncClient
 from sdd_cash_manager.database import SessionLocal
 from sdd_cash_manager.models.enums import ProcessingStatus, ReconciliationStatus
 from sdd_cash_manager.models.transaction import Transaction
+from tests.api.fixtures import _create_account
 from tests.api.helpers import assert_payload_keys, assert_status
 
 logger = logging.getLogger(__name__)  # Initialize logger
@@ -339,3 +341,179 @@ async def test_reconcile_window_difference_insight(
     assert Decimal(str(diff_body["difference"])) == Decimal("45.00")
     assert diff_body["remaining_uncleared"] >= 1
     assert diff_body["guidance"] == "Review missing transactions or adjust the ending balance downward."
+
+
+@pytest.mark.asyncio
+async def test_unreconciled_transactions_paginate_and_stream(
+    api_client: AsyncClient,
+    authenticated_headers: dict[str, str],
+    seeded_accounts: dict[str, dict[str, object]],
+) -> None:
+    """Page through open transactions with cursors and stream the same rows as NDJSON and JSON."""
+    source = seeded_accounts["visible"]
+    target = seeded_accounts["balancing"]
+    created: list[str] = []
+    for index in range(3):
+        payload = {
+            "transfer_from": source["id"],
+            "transfer_to": target["id"],
+            "action": "Recon Paging",
+            "amount": f"{index + 1}.00",
+            "currency": "USD",
+            "description": f"Paged transaction {index}",
+            "date": date.today().isoformat(),
+        }
+        response = await api_client.post("/transactions/", json=payload, headers=authenticated_headers)
+        assert_status(response, 201)
+        created.append(str(response.json()["transaction_id"]))
+
+    with SessionLocal() as session:
+        for txn_id in created:
+            txn = session.get(Transaction, txn_id)
+            assert txn is not None
+            txn.processing_status = ProcessingStatus.COMPLETED
+            txn.reconciliation_status = ReconciliationStatus.UNCLEARED
+        session.commit()
+
+    params = {"account_id": str(source["id"]), "limit": "2"}
+    first = await api_client.get("/reconciliation/sessions/unreconciled", params=params, headers=authenticated_headers)
+    assert_status(first, 200)
+    first_body = first.json()
+    assert len(first_body["transactions"]) == 2 and first_body["next_cursor"]
+
+    second = await api_client.get(
+        "/reconciliation/sessions/unreconciled",
+        params={**params, "cursor": first_body["next_cursor"]},
+        headers=authenticated_headers,
+    )
+    assert_status(second, 200)
+    paged = [tx["id"] for tx in first_body["transactions"] + second.json()["transactions"]]
+    assert sorted(paged) == sorted(created)
+
+    bad_cursor = await api_client.get(
+        "/reconciliation/sessions/unreconciled", params={"cursor": "garbage"}, headers=authenticated_headers
+    )
+    assert_status(bad_cursor, 400)
+
+    streamed = await api_client.get(
+        "/reconciliation/sessions/unreconciled/stream",
+        params={"account_id": str(source["id"])},
+        headers=authenticated_headers,
+    )
+    assert_status(streamed, 200)
+    assert streamed.headers["content-type"].startswith("application/x-ndjson")
+    assert sorted(json.loads(line)["id"] for line in streamed.text.splitlines()) == sorted(created)
+
+    as_array = await api_client.get(
+        "/reconciliation/sessions/unreconciled/stream",
+        params={"account_id": str(source["id"]), "format": "json"},
+        headers=authenticated_headers,
+    )
+    assert_status(as_array, 200)
+    assert sorted(tx["id"] for tx in as_array.json()) == sorted(created)
+
+
+@pytest.mark.asyncio
+async def test_statement_matching_proposes_and_accepts_matches(
+    api_client: AsyncClient,
+    authenticated_headers: dict[str, str],
+    seeded_accounts: dict[str, dict[str, object]],
+) -> None:
+    """Match imported statement lines to open transactions and accept the proposals in one call."""
+    today = date.today()
+    payload = {
+        "transfer_from": seeded_accounts["visible"]["id"],
+        "transfer_to": seeded_accounts["balancing"]["id"],
+        "action": "Recon Matching",
+        "amount": "42.00",
+        "currency": "USD",
+        "description": "Statement matched",
+        "date": today.isoformat(),
+    }
+    response = await api_client.post("/transactions/", json=payload, headers=authenticated_headers)
+    assert_status(response, 201)
+    transaction_id = str(response.json()["transaction_id"])
+    with SessionLocal() as session:
+        txn = session.get(Transaction, transaction_id)
+        assert txn is not None
+        txn.processing_status = ProcessingStatus.COMPLETED
+        txn.reconciliation_status = ReconciliationStatus.UNCLEARED
+        session.commit()
+
+    session_resp = await api_client.post(
+        "/reconciliation/sessions",
+        json={"statement_date": today.isoformat(), "ending_balance": "42.00"},
+        headers=authenticated_headers,
+    )
+    session_id = session_resp.json()["id"]
+    proposal_resp = await api_client.post(
+        f"/reconciliation/sessions/{session_id}/matches",
+        json={"lines": [{"line_id": "fitid-1", "amount": "42.00", "date": (today + timedelta(days=1)).isoformat()}]},
+        headers=authenticated_headers,
+    )
+    assert_status(proposal_resp, 200)
+    proposal = proposal_resp.json()
+    assert [(m["line_id"], m["transaction_id"], m["strategy"]) for m in proposal["matches"]] == [
+        ("fitid-1", transaction_id, "date_tolerance")
+    ]
+    assert Decimal(proposal["residual_difference"]) == Decimal("0")
+
+    duplicate = await api_client.post(
+        f"/reconciliation/sessions/{session_id}/matches/accept",
+        json={"matches": proposal["matches"][:1] * 2},
+        headers=authenticated_headers,
+    )
+    assert_status(duplicate, 400)
+
+    accepted = [{"line_id": m["line_id"], "transaction_id": m["transaction_id"]} for m in proposal["matches"]]
+    accept_resp = await api_client.post(
+        f"/reconciliation/sessions/{session_id}/matches/accept",
+        json={"matches": accepted},
+        headers=authenticated_headers,
+    )
+    assert_status(accept_resp, 200)
+    assert accept_resp.json()["difference_status"] == "balanced"
+
+
+@pytest.mark.asyncio
+async def test_bulk_balance_adjustment_reports_each_account(
+    api_client: AsyncClient,
+    authenticated_headers: dict[str, str],
+    seeded_accounts: dict[str, dict[str, object]],
+) -> None:
+    """Adjust several accounts in one request and get a result per account, in order."""
+    visible = seeded_accounts["visible"]
+    unchanged = await _create_account(api_client, authenticated_headers, name="bulk-unchanged")
+    missing_id = "11111111-2222-3333-4444-555555555555"
+    today = date.today().isoformat()
+    payload = {
+        "submitted_by_user_id": "bulk-operator",
+        "adjustments": [
+            {"account_id": visible["id"], "target_balance": "75.00", "effective_date": today},
+            {"account_id": unchanged["id"], "target_balance": "0.00", "effective_date": today},
+            {"account_id": missing_id, "target_balance": "10.00", "effective_date": today},
+        ],
+    }
+
+    response = await api_client.post("/accounts/adjust-balance/bulk", json=payload, headers=authenticated_headers)
+    assert_status(response, 200)
+    results = response.json()["results"]
+    assert [(r["account_id"], r["status"]) for r in results] == [
+        (visible["id"], "COMPLETED"),
+        (unchanged["id"], "ZERO_DIFFERENCE"),
+        (missing_id, "NOT_FOUND"),
+    ]
+    assert Decimal(results[0]["difference"]) == Decimal("75.00")
+    assert results[0]["created_transaction_id"] is not None
+    assert results[1]["adjustment_id"] is not None and results[1]["created_transaction_id"] is None
+
+    with SessionLocal() as session:
+        transaction = session.get(Transaction, results[0]["created_transaction_id"])
+        assert transaction is not None
+        assert transaction.amount == Decimal("75.00")
+
+    duplicate = {"submitted_by_user_id": "bulk-operator", "adjustments": payload["adjustments"][:1] * 2}
+    duplicate_response = await api_client.post(
+        "/accounts/adjust-balance/bulk", json=duplicate, headers=authenticated_headers
+    )
+    assert_status(duplicate_response, 422)
@@ -13,9 +13,11 @@ from sdd_cash_manager.database import get_db
 from sdd_cash_manager.main import app
 from sdd_cash_manager.models.enums import ReconciliationStatus
 from sdd_cash_manager.models.reconciliation import ReconciliationViewEntry  # Import model for mocking return
+from sdd_cash_manager.services.reconciliation_service import ReconciliationStatusTotal, ReconciliationViewPage
 
 # Mock data
 TEST_ACCOUNT_ID = "a1b2c3d4-e5f6-7890-1234-567890abcdef"
+DEFAULT_VIEW_FILTERS = {"start_date": None, "end_date": None, "reconciled_status": None, "limit": 100, "cursor": None}
 
 def build_mock_db_session() -> Session:
     mock_session = MagicMock(spec=Session)
@@ -67,7 +69,7 @@ def test_get_reconciliation_view_success(mock_db_session):
         "sdd_cash_manager.api.v1.endpoints.reconciliation.ReconciliationService"
     ) as MockReconciliationService:
         mock_service = MagicMock()
-        mock_service.get_reconciliation_entries_for_account.return_value = mock_entries
+        mock_service.get_reconciliation_view_page.return_value = ReconciliationViewPage(mock_entries, None)
         MockReconciliationService.return_value = mock_service
 
         response = client.get(f"/accounts/{TEST_ACCOUNT_ID}/reconciliation")
@@ -89,14 +91,14 @@ def test_get_reconciliation_view_success(mock_db_session):
         assert data[1]["reconciled_status"] == ReconciliationStatus.RECONCILED.value
 
         MockReconciliationService.assert_called_once_with(mock_db_session)
-        mock_service.get_reconciliation_entries_for_account.assert_called_once_with(UUID(TEST_ACCOUNT_ID))
+        mock_service.get_reconciliation_view_page.assert_called_once_with(UUID(TEST_ACCOUNT_ID), **DEFAULT_VIEW_FILTERS)
 
 def test_get_reconciliation_view_no_entries(mock_db_session):
     with patch(
         "sdd_cash_manager.api.v1.endpoints.reconciliation.ReconciliationService"
     ) as MockReconciliationService:
         mock_service = MagicMock()
-        mock_service.get_reconciliation_entries_for_account.return_value = []
+        mock_service.get_reconciliation_view_page.return_value = ReconciliationViewPage([], None)
         MockReconciliationService.return_value = mock_service
 
         response = client.get(f"/accounts/{TEST_ACCOUNT_ID}/reconciliation")
@@ -104,14 +106,14 @@ def test_get_reconciliation_view_no_entries(mock_db_session):
         assert response.json() == []
 
         MockReconciliationService.assert_called_once_with(mock_db_session)
-        mock_service.get_reconciliation_entries_for_account.assert_called_once_with(UUID(TEST_ACCOUNT_ID))
+        mock_service.get_reconciliation_view_page.assert_called_once_with(UUID(TEST_ACCOUNT_ID), **DEFAULT_VIEW_FILTERS)
 
 def test_get_reconciliation_view_server_error(mock_db_session):
     with patch(
         "sdd_cash_manager.api.v1.endpoints.reconciliation.ReconciliationService"
     ) as MockReconciliationService:
         mock_service = MagicMock()
-        mock_service.get_reconciliation_entries_for_account.side_effect = Exception("Database connection error")
+        mock_service.get_reconciliation_view_page.side_effect = Exception("Database connection error")
         MockReconciliationService.return_value = mock_service
 
         response = client.get(f"/accounts/{TEST_ACCOUNT_ID}/reconciliation")
@@ -120,4 +122,79 @@ def test_get_reconciliation_view_server_error(mock_db_session):
         assert response.json() == {"detail": "An internal error occurred while fetching reconciliation data."}
 
         MockReconciliationService.assert_called_once_with(mock_db_session)
-        mock_service.get_reconciliation_entries_for_account.assert_called_once_with(UUID(TEST_ACCOUNT_ID))
+        mock_service.get_reconciliation_view_page.assert_called_once_with(UUID(TEST_ACCOUNT_ID), **DEFAULT_VIEW_FILTERS)
+
+def test_get_reconciliation_view_passes_filters_and_sets_next_cursor(mock_db_session):
+    with patch(
+        "sdd_cash_manager.api.v1.endpoints.reconciliation.ReconciliationService"
+    ) as MockReconciliationService:
+        mock_service = MagicMock()
+        mock_service.get_reconciliation_view_page.return_value = ReconciliationViewPage([], "next-page")
+        MockReconciliationService.return_value = mock_service
+
+        response = client.get(
+            f"/accounts/{TEST_ACCOUNT_ID}/reconciliation",
+            params={"start_date": "2026-03-01", "reconciled_status": ReconciliationStatus.RECONCILED.value, "limit": 10},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["X-Next-Cursor"] == "next-page"
+        mock_service.get_reconciliation_view_page.assert_called_once_with(
+            UUID(TEST_ACCOUNT_ID),
+            **{
+                **DEFAULT_VIEW_FILTERS,
+                "start_date": date(2026, 3, 1),
+                "reconciled_status": ReconciliationStatus.RECONCILED,
+                "limit": 10,
+            },
+        )
+
+        mock_service.get_reconciliation_view_page.side_effect = ValueError("Invalid cursor.")
+        assert client.get(f"/accounts/{TEST_ACCOUNT_ID}/reconciliation?cursor=bad").status_code == 400
+
+def test_stream_reconciliation_view_in_both_formats(mock_db_session):
+    entry = ReconciliationViewEntry(
+        entry_id=uuid.uuid4(),
+        account_id=UUID(TEST_ACCOUNT_ID),
+        entry_date=date(2026, 3, 31),
+        amount=Decimal("500.00"),
+        description="Streamed entry",
+        is_adjustment=False,
+        reconciled_status=ReconciliationStatus.RECONCILED.value,
+        original_transaction_id=uuid.uuid4(),
+    )
+    with patch(
+        "sdd_cash_manager.api.v1.endpoints.reconciliation.ReconciliationService"
+    ) as MockReconciliationService:
+        mock_service = MagicMock()
+        mock_service.stream_reconciliation_view.side_effect = lambda *args, **kwargs: iter([entry, entry])
+        MockReconciliationService.return_value = mock_service
+
+        ndjson = client.get(f"/accounts/{TEST_ACCOUNT_ID}/reconciliation/stream", params={"start_date": "2026-03-01"})
+        assert ndjson.status_code == status.HTTP_200_OK
+        assert ndjson.headers["content-type"].startswith("application/x-ndjson")
+        assert len(ndjson.text.splitlines()) == 2
+        mock_service.stream_reconciliation_view.assert_called_once_with(
+            UUID(TEST_ACCOUNT_ID), start_date=date(2026, 3, 1), end_date=None, reconciled_status=None
+        )
+
+        array = client.get(f"/accounts/{TEST_ACCOUNT_ID}/reconciliation/stream?format=json")
+        assert array.status_code == status.HTTP_200_OK
+        assert [item["description"] for item in array.json()] == ["Streamed entry", "Streamed entry"]
+
+def test_get_reconciliation_summary(mock_db_session):
+    with patch(
+        "sdd_cash_manager.api.v1.endpoints.reconciliation.ReconciliationService"
+    ) as MockReconciliationService:
+        mock_service = MagicMock()
+        mock_service.summarize_reconciliation_view.return_value = [
+            ReconciliationStatusTotal(ReconciliationStatus.RECONCILED.value, 3, Decimal("12.50"))
+        ]
+        MockReconciliationService.return_value = mock_service
+
+        response = client.get(f"/accounts/{TEST_ACCOUNT_ID}/reconciliation/summary")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["totals"] == [
+            {"reconciled_status": ReconciliationStatus.RECONCILED.value, "count": 3, "total_amount": "12.50"}
+        ]
@@ -0,0 +1,217 @@
+from dataclasses import replace
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from sdd_cash_manager.core.config import settings
+from sdd_cash_manager.models.account import Account
+from sdd_cash_manager.models.account_merge_plan import AccountMergePlan
+from sdd_cash_manager.models.base import Base
+from sdd_cash_manager.models.enums import AccountingCategory
+from sdd_cash_manager.models.transaction import Entry, Transaction
+from sdd_cash_manager.schemas.transaction_schema import AccountMergePlanRequest
+from sdd_cash_manager.services import account_service as account_service_module
+from sdd_cash_manager.services.account_hierarchy import ancestor_ids, descendant_ids
+from sdd_cash_manager.services.account_service import AccountService
+from sdd_cash_manager.services.transaction_service import TransactionService
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db_session = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        yield db_session
+    finally:
+        db_session.close()
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+
+def _create(service: AccountService, account_id: str, parent_id: str | None = None) -> Account:
+    return service.create_account(
+        account_id.title(), "USD", AccountingCategory.ASSET, id=account_id, parent_account_id=parent_id
+    )
+
+
+def _paths(session: Session) -> dict[str, tuple[str, int, str | None]]:
+    session.expire_all()
+    return {
+        account.id: (account.hierarchy_path, account.depth, account.parent_account_id)
+        for account in session.scalars(select(Account))
+    }
+
+
+@pytest.fixture
+def tree(session):
+    service = AccountService(db_session=session)
+    for account_id, parent_id in [("root", None), ("a", "root"), ("b", "a"), ("c", "b"), ("other", None)]:
+        _create(service, account_id, parent_id)
+    return service
+
+
+def test_paths_are_assigned_on_create(session, tree) -> None:
+    paths = _paths(session)
+
+    assert paths["c"] == ("/root/a/b/c/", 4, "b")
+    assert paths["other"] == ("/other/", 1, None)
+    assert ancestor_ids(session.get(Account, "c")) == ["root", "a", "b"]
+    assert descendant_ids(session, "a") == {"a", "b", "c"}
+    assert descendant_ids(session, "missing") == set()
+
+
+def test_paths_resolve_parents_inserted_in_the_same_flush(session) -> None:
+    child = Account(name="Child", currency="USD", accounting_category=AccountingCategory.ASSET, id="kid", parent_account_id="mum")
+    parent = Account(name="Parent", currency="USD", accounting_category=AccountingCategory.ASSET, id="mum")
+    session.add_all([child, parent])
+    session.commit()
+
+    assert _paths(session)["kid"] == ("/mum/kid/", 2, "mum")
+
+
+def test_reparent_rewrites_the_subtree(session, tree) -> None:
+    tree.update_account("b", parent_account_id="other")
+
+    paths = _paths(session)
+    assert paths["b"] == ("/other/b/", 2, "other")
+    assert paths["c"] == ("/other/b/c/", 3, "b")
+    assert descendant_ids(session, "a") == {"a"}
+    assert tree.get_account_hierarchy_balance("other") == Decimal("0.00")
+
+    tree.update_account("b", parent_account_id=None)
+    assert _paths(session)["c"] == ("/b/c/", 2, "b")
+
+
+def test_reparent_rejects_cycles_and_unknown_parents(session, tree) -> None:
+    with pytest.raises(ValueError, match="cannot be placed under itself or one of its descendants"):
+        tree.update_account("a", parent_account_id="c")
+    with pytest.raises(ValueError, match="cannot be placed under itself"):
+        tree.update_account("a", parent_account_id="a")
+    with pytest.raises(ValueError, match="Parent account missing not found"):
+        tree.update_account("a", parent_account_id="missing")
+
+    assert _paths(session)["c"] == ("/root/a/b/c/", 4, "b")
+
+
+def test_reparent_rejects_moves_past_the_depth_limit(session, tree) -> None:
+    for account_id, parent_id in [("x", "other"), ("y", "x"), ("z", "y")]:
+        _create(tree, account_id, parent_id)
+
+    with pytest.raises(ValueError, match="deepest descendant at depth 6, exceeding the allowed limit of 5"):
+        tree.update_account("b", parent_account_id="z")
+
+    assert _paths(session)["c"] == ("/root/a/b/c/", 4, "b")
+    tree.update_account("c", parent_account_id="z")
+    assert _paths(session)["c"] == ("/other/x/y/z/c/", 5, "z")
+
+
+def test_in_memory_reparent_rejects_cycles() -> None:
+    service = AccountService()
+    parent = service.create_account("Parent", "USD", AccountingCategory.ASSET, id="p")
+    service.create_account("Child", "USD", AccountingCategory.ASSET, id="k", parent_account_id=parent.id)
+
+    with pytest.raises(ValueError, match="cannot be placed under itself"):
+        service.update_account("p", parent_account_id="k")
+
+
+def test_delete_promotes_children_to_the_grandparent(session, tree) -> None:
+    assert tree.delete_account("a") is True
+
+    paths = _paths(session)
+    assert "a" not in paths
+    assert paths["b"] == ("/root/b/", 2, "root")
+    assert paths["c"] == ("/root/b/c/", 3, "b")
+
+
+def test_merge_validation_uses_stored_depths(session, tree) -> None:
+    transaction_service = TransactionService(db_session=session)
+    transaction_service.set_account_service(tree)
+    for account_id, parent_id in [("d", "c"), ("deep", None), ("deeper", "deep")]:
+        _create(tree, account_id, parent_id)
+
+    assert transaction_service.validate_merge_depth("deep", "other") == (True, None)
+    valid, message = transaction_service.validate_merge_depth("deep", "d")
+    assert valid is False and "exceeding the allowed limit" in (message or "")
+    valid, message = transaction_service.validate_merge_depth("a", "c")
+    assert valid is False and "descendants" in (message or "")
+    with pytest.raises(ValueError, match="Source or target account not found"):
+        transaction_service.validate_merge_depth("missing", "a")
+
+
+def test_merge_moves_children_and_source_under_target(session, tree) -> None:
+    transaction_service = TransactionService(db_session=session)
+    transaction_service.set_account_service(tree)
+
+    plan = tree.merge_accounts(
+        AccountMergePlanRequest(source_account_id="a", target_account_id="other", reparenting_map={}),
+        transaction_service,
+    )
+
+    assert plan.status == "executed"
+    paths = _paths(session)
+    assert paths["a"] == ("/other/a/", 2, "other")
+    assert paths["b"] == ("/other/b/", 2, "other")
+    assert paths["c"] == ("/other/b/c/", 3, "b")
+
+
+def _post_transfers(service: TransactionService, count: int) -> None:
+    now = datetime.now(timezone.utc)
+    for index in range(count):
+        service.create_transaction(
+            effective_date=now,
+            booking_date=now,
+            description=f"Transfer {index}",
+            amount=Decimal("5.00"),
+            debit_account_id="a" if index % 2 else "other",
+            credit_account_id="other" if index % 2 else "a",
+            action_type="Transfer",
+            currency="USD",
+        )
+
+
+def test_merge_moves_rows_in_chunks_and_resumes_after_a_crash(session, tree, monkeypatch) -> None:
+    transaction_service = TransactionService(db_session=session)
+    transaction_service.set_account_service(tree)
+    _post_transfers(transaction_service, 5)
+    monkeypatch.setattr(account_service_module, "settings", replace(settings, account_merge_chunk_size=2))
+
+    original_chunk = AccountService._move_merge_chunk
+    calls = {"count": 0}
+
+    def crash_after_two_chunks(*args, **kwargs):
+        calls["count"] += 1
+        if calls["count"] > 2:
+            raise RuntimeError("worker crashed")
+        return original_chunk(*args, **kwargs)
+
+    monkeypatch.setattr(AccountService, "_move_merge_chunk", staticmethod(crash_after_two_chunks))
+    with pytest.raises(RuntimeError):
+        tree.merge_accounts(
+            AccountMergePlanRequest(source_account_id="a", target_account_id="root", reparenting_map={}),
+            transaction_service,
+        )
+    session.rollback()
+
+    plan = session.scalars(select(AccountMergePlan)).one()
+    assert (plan.status, plan.progress_phase) == ("running", "entries")
+    assert (plan.affected_entries_count, plan.total_entries_count) == (4, 5)
+    assert session.get(Account, "a").hidden is True
+
+    monkeypatch.setattr(AccountService, "_move_merge_chunk", staticmethod(original_chunk))
+    resumed = tree.resume_account_merge(plan.plan_id)
+
+    assert (resumed.status, resumed.progress_phase) == ("executed", None)
+    assert (resumed.affected_entries_count, resumed.affected_transactions_count) == (5, 5)
+    assert session.scalar(select(Entry).where(Entry.account_id == "a")) is None
+    assert session.scalar(
+        select(Transaction).where((Transaction.debit_account_id == "a") | (Transaction.credit_account_id == "a"))
+    ) is None
+    assert _paths(session)["a"] == ("/root/a/", 2, "root")
+    assert tree.resume_account_merge(plan.plan_id).status == "executed"
+    with pytest.raises(ValueError, match="not found"):
+        tree.resume_account_merge("missing")
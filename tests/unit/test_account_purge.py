@@ -0,0 +1,118 @@
+from dataclasses import replace
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from sdd_cash_manager.core.config import settings
+from sdd_cash_manager.models.account import Account
+from sdd_cash_manager.models.base import Base
+from sdd_cash_manager.models.enums import AccountingCategory
+from sdd_cash_manager.models.transaction import Entry, Transaction
+from sdd_cash_manager.services import account_service as account_service_module
+from sdd_cash_manager.services.account_service import AccountService
+from sdd_cash_manager.services.transaction_service import TransactionService
+
+
+@pytest.fixture
+def session(monkeypatch):
+    monkeypatch.setattr(account_service_module, "settings", replace(settings, account_purge_chunk_size=2))
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db_session = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        yield db_session
+    finally:
+        db_session.close()
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+
+@pytest.fixture
+def services(session):
+    account_service = AccountService(db_session=session)
+    transaction_service = TransactionService(db_session=session)
+    transaction_service.set_account_service(account_service)
+    for account_id, parent_id in [("doomed", None), ("child", "doomed"), ("kept", None), ("spare", None)]:
+        account_service.create_account(
+            account_id.title(), "USD", AccountingCategory.ASSET, id=account_id, parent_account_id=parent_id
+        )
+    now = datetime.now(timezone.utc)
+
+    def post(debit: str, credit: str, count: int) -> None:
+        for index in range(count):
+            transaction_service.create_transaction(
+                effective_date=now,
+                booking_date=now,
+                description=f"Transfer {index}",
+                amount=Decimal("1.00"),
+                debit_account_id=debit,
+                credit_account_id=credit,
+                action_type="Transfer",
+                currency="USD",
+            )
+
+    post("doomed", "kept", 3)
+    post("kept", "doomed", 2)
+    post("kept", "spare", 2)
+    return account_service, transaction_service
+
+
+def _count(session, model, *criteria) -> int:
+    return int(session.scalar(select(func.count()).select_from(model).where(*criteria)) or 0)
+
+
+def test_delete_removes_dependents_in_chunks(session, services) -> None:
+    account_service, _ = services
+
+    assert account_service.delete_account("doomed") is True
+    session.commit()
+
+    assert session.get(Account, "doomed") is None
+    assert _count(session, Transaction) == 2
+    assert _count(session, Entry) == 4
+    assert _count(session, Entry, Entry.account_id == "doomed") == 0
+
+
+def test_background_deletion_hides_the_account_until_purged(session, services) -> None:
+    account_service, transaction_service = services
+
+    assert account_service.mark_account_for_deletion("doomed") is True
+    assert account_service.mark_account_for_deletion("missing") is False
+
+    assert "doomed" not in {account.id for account in account_service.get_all_accounts()}
+    assert session.get(Account, "doomed").pending_deletion is True
+    with pytest.raises(RuntimeError) as rejected:
+        transaction_service.create_transaction(
+            effective_date=datetime.now(timezone.utc),
+            booking_date=datetime.now(timezone.utc),
+            description="Late posting",
+            amount=Decimal("1.00"),
+            debit_account_id="kept",
+            credit_account_id="doomed",
+            action_type="Transfer",
+            currency="USD",
+        )
+    assert "not available for transactions" in str(rejected.value.__cause__)
+
+    assert account_service.purge_pending_accounts() == 1
+    session.expire_all()
+    assert session.get(Account, "doomed") is None
+    assert session.get(Account, "child").hierarchy_path == "/child/"
+    assert _count(session, Transaction) == 2
+    assert account_service.purge_pending_accounts() == 0
+
+
+def test_failed_purge_keeps_the_account_flagged(session, services, monkeypatch) -> None:
+    account_service, _ = services
+    account_service.mark_account_for_deletion("doomed")
+
+    def fail(*_args, **_kwargs):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(account_service, "_remove_account_dependents", fail)
+    assert account_service.purge_pending_accounts() == 0
+    assert session.get(Account, "doomed").pending_deletion is True
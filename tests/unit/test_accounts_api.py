@@ -5,7 +5,7 @@ from typing import Any, cast
 from uuid import uuid4
 
 import pytest
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
 
 from sdd_cash_manager.api import accounts
 from sdd_cash_manager.api.accounts import (
@@ -26,6 +26,7 @@ from sdd_cash_manager.api.accounts import (
     get_accounts,
     update_account,
 )
+from sdd_cash_manager.models.account import Account
 from sdd_cash_manager.services.account_service import AccountService
 from sdd_cash_manager.services.transaction_service import TransactionService
 
@@ -128,7 +129,7 @@ def test_create_account_runtime_error():
     assert excinfo.value.status_code == 500
 
 def test_get_accounts_filters_by_search_term(monkeypatch):
-    monkeypatch.setattr(accounts, "AccountResponse", lambda **kwargs: kwargs)
+    monkeypatch.setattr(accounts, "_account_response_from_model", accounts._account_response_payload)
 
     class StubAccountService:
         def get_all_accounts(self):
@@ -143,6 +144,7 @@ def test_get_accounts_filters_by_search_term(monkeypatch):
     results = cast(
         list[dict[str, Any]],
         get_accounts(
+            Response(),
             search_term="matching",
             account_service=cast(AccountService, StubAccountService()),
         ),
@@ -151,7 +153,7 @@ def test_get_accounts_filters_by_search_term(monkeypatch):
     assert results[0]["name"] == "Matching Account"
 
 def test_get_accounts_filters_hidden_placeholder(monkeypatch):
-    monkeypatch.setattr(accounts, "AccountResponse", lambda **kwargs: kwargs)
+    monkeypatch.setattr(accounts, "_account_response_from_model", accounts._account_response_payload)
 
     class StubAccountService:
         def get_all_accounts(self):
@@ -166,6 +168,7 @@ def test_get_accounts_filters_hidden_placeholder(monkeypatch):
     results = cast(
         list[dict[str, Any]],
         get_accounts(
+            Response(),
             search_term=None,
             hidden=True,
             placeholder=False,
@@ -176,7 +179,7 @@ def test_get_accounts_filters_hidden_placeholder(monkeypatch):
     assert all(acc["placeholder"] is False for acc in results)
 
 def test_update_account_quantization(monkeypatch):
-    monkeypatch.setattr(accounts, "AccountResponse", lambda **kwargs: kwargs)
+    monkeypatch.setattr(accounts, "_account_response_from_model", accounts._account_response_payload)
     captured = {}
 
     class StubAccountService:
@@ -211,6 +214,27 @@ def test_update_account_quantization(monkeypatch):
     assert response["available_balance"] == float(Decimal("123.46"))
     assert response["credit_limit"] == float(Decimal("456.79"))
 
+def test_account_response_maps_columns_without_float_round_trip():
+    account = Account(
+        id="acct-1",
+        name="Savings",
+        currency="USD",
+        accounting_category=AccountingCategory.ASSET,
+        available_balance=Decimal("12345678901234.57"),
+        notes="plain",
+    )
+
+    class StubAccountService:
+        def get_account_hierarchy_balance(self, account_id):
+            return Decimal("0.10")
+
+    response = accounts._account_response_from_model(account, cast(AccountService, StubAccountService()))
+
+    assert response.available_balance == Decimal("12345678901234.57")
+    assert response.hierarchy_balance == Decimal("0.10")
+    assert response.accounting_category == AccountingCategory.ASSET.value
+    assert response.notes == "plain"
+
 def test_update_account_returns_error_for_unsupported_field():
     payload = _UnsupportedFieldPayload(
         parent_account_id=uuid4(),
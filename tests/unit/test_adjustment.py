@@ -38,6 +38,7 @@ def mock_db_session() -> Session:
     mock_session.commit.return_value = None
     mock_session.flush.return_value = None
     mock_session.refresh.return_value = None
+    mock_session.info = {}
     return mock_session
 
 # --- Tests for AdjustmentTransaction SQLAlchemy Model ---
@@ -234,6 +235,7 @@ def test_manual_balance_adjustment_service_posts_transaction_and_reconciliation(
         transaction_args = mock_transaction_service.create_transaction.call_args.kwargs
         assert transaction_args["action_type"] == MANUAL_ADJUSTMENT_ACTION
         mock_reconciliation_service.create_reconciliation_entry_from_transaction.assert_called_once()
+        mock_db_session.commit.assert_called_once()
         assert adjustment.status == "COMPLETED"
         assert adjustment.created_transaction_id is not None
         account = mock_account_service.get_account(TEST_ACCOUNT_ID)
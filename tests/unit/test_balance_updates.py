@@ -0,0 +1,236 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from unittest.mock import MagicMock
+from uuid import UUID
+
+import pytest
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.pool import StaticPool
+
+from sdd_cash_manager.core.config import settings
+from sdd_cash_manager.models.account import Account
+from sdd_cash_manager.models.balance_shard import AccountBalanceShard
+from sdd_cash_manager.models.base import Base
+from sdd_cash_manager.models.enums import AccountingCategory
+from sdd_cash_manager.schemas.adjustment import ManualBalanceAdjustmentCreate
+from sdd_cash_manager.services import account_service, balance_updates, transaction_service
+from sdd_cash_manager.services.account_service import AccountService
+from sdd_cash_manager.services.adjustment_service import ManualBalanceAdjustmentService
+from sdd_cash_manager.services.balance_updates import apply_balance_deltas, stored_balances
+from sdd_cash_manager.services.transaction_service import (
+    BALANCING_ACCOUNT_ID,
+    TransactionService,
+    balancing_account_id,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_balancing_cache(monkeypatch) -> None:
+    monkeypatch.setattr(transaction_service, "_balancing_account_ids", {})
+
+
+def _seed(factory) -> None:
+    with factory() as session:
+        session.add_all(
+            [
+                Account(name="Checking", currency="USD", accounting_category=AccountingCategory.ASSET, id="checking"),
+                Account(name="Income", currency="USD", accounting_category=AccountingCategory.INCOME, id="income"),
+            ]
+        )
+        session.commit()
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, autoflush=False)
+    _seed(factory)
+    yield factory
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+def _bump_version_elsewhere(factory, account_id: str) -> None:
+    with factory() as other:
+        other.execute(update(Account).where(Account.id == account_id).values(version=Account.version + 1))
+        other.commit()
+
+
+def test_apply_balance_deltas_updates_rows_and_loaded_instances(session_factory) -> None:
+    with session_factory() as session:
+        checking = session.get(Account, "checking")
+        for _ in range(10):
+            apply_balance_deltas(session, {"checking": Decimal("0.10"), "income": Decimal("-0.10")})
+
+        assert checking.available_balance == Decimal("1.00")
+        assert checking.version == 11
+        assert session.get(Account, "income").available_balance == Decimal("-1.00")
+
+
+def test_stale_orm_write_is_rejected(session_factory) -> None:
+    with session_factory() as session:
+        checking = session.get(Account, "checking")
+        _bump_version_elsewhere(session_factory, "checking")
+
+        checking.available_balance = Decimal("5.00")
+        with pytest.raises(StaleDataError):
+            session.flush()
+
+
+def test_update_account_retries_after_a_version_conflict(session_factory) -> None:
+    with session_factory() as session:
+        service = AccountService(db_session=session)
+        stale = session.get(Account, "checking")
+        _bump_version_elsewhere(session_factory, "checking")
+
+        updated = service.update_account("checking", name="Everyday")
+
+        assert updated is stale and updated.name == "Everyday"
+        assert updated.version == 3
+
+
+def test_update_account_gives_up_after_the_configured_attempts(session_factory, monkeypatch) -> None:
+    monkeypatch.setattr(balance_updates, "settings", replace(settings, balance_update_max_attempts=1))
+    with session_factory() as session:
+        service = AccountService(db_session=session)
+        stale = session.get(Account, "checking")
+        _bump_version_elsewhere(session_factory, "checking")
+
+        with pytest.raises(RuntimeError) as exc:
+            service.update_account("checking", name="Everyday")
+        assert isinstance(exc.value.__cause__, StaleDataError)
+        session.rollback()
+        assert stale.name == "Checking" and stale.version == 2
+
+
+def test_concurrent_postings_do_not_lose_updates(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'contention.db'}", connect_args={"timeout": 30})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, autoflush=False)
+    _seed(factory)
+
+    def _post(worker: int) -> None:
+        service = TransactionService(session_factory=factory)
+        service.set_account_service(AccountService(session_factory=factory))
+        for index in range(10):
+            service.create_transaction(
+                effective_date=datetime.now(timezone.utc),
+                booking_date=datetime.now(timezone.utc),
+                description=f"Deposit {worker}-{index}",
+                amount=Decimal("1.25"),
+                debit_account_id="checking",
+                credit_account_id="income",
+                action_type="Deposit",
+            )
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(_post, range(4)))
+
+    with factory() as session:
+        assert session.get(Account, "checking").available_balance == Decimal("-50.00")
+        assert session.get(Account, "income").available_balance == Decimal("50.00")
+    engine.dispose()
+
+
+def test_sharded_account_postings_skip_the_account_row(session_factory) -> None:
+    with session_factory() as session:
+        service = AccountService(db_session=session)
+        hot = service.create_account(
+            name="Hot", currency="USD", accounting_category=AccountingCategory.EQUITY, id="hot", balance_shards=4
+        )
+        for _ in range(12):
+            apply_balance_deltas(session, {"hot": Decimal("2.50"), "checking": Decimal("-2.50")})
+
+        assert hot.available_balance == Decimal("30.00")
+        assert hot.version == 1
+        assert session.query(AccountBalanceShard).filter_by(account_id="hot").count() == 4
+        session.expire_all()
+        assert session.scalar(select(Account.available_balance).where(Account.id == "hot")) == Decimal("0.00")
+        assert service.get_account("hot").available_balance == Decimal("30.00")
+        assert service.get_account_hierarchy_balance("hot") == Decimal("30.00")
+
+        service.update_account("hot", available_balance=Decimal("5.00"))
+        session.expire_all()
+        assert service.get_account("hot").available_balance == Decimal("5.00")
+
+
+def test_sharded_accounts_take_postings_on_shards_without_being_loaded(session_factory) -> None:
+    with session_factory() as session:
+        AccountService(db_session=session).create_account(
+            name="Hot", currency="USD", accounting_category=AccountingCategory.EQUITY, id="hot", balance_shards=2
+        )
+        session.commit()
+
+    with session_factory() as session:
+        apply_balance_deltas(session, {"hot": Decimal("4.00"), "checking": Decimal("-4.00")})
+        session.commit()
+
+        assert session.scalar(select(Account.available_balance).where(Account.id == "hot")) == Decimal("0.00")
+        assert session.scalar(select(Account.version).where(Account.id == "hot")) == 1
+        assert stored_balances(session, ["hot", "checking"]) == {"hot": Decimal("4.00"), "checking": Decimal("-4.00")}
+        with pytest.raises(ValueError, match="Account with ID missing not found"):
+            apply_balance_deltas(session, {"missing": Decimal("1.00")})
+
+
+def test_manual_adjustment_of_a_sharded_account_clears_its_shards(session_factory, monkeypatch) -> None:
+    monkeypatch.setattr("sdd_cash_manager.services.adjustment_service.log_security_event", MagicMock())
+    hot_id = str(UUID(int=9))
+    with session_factory() as session:
+        AccountService(db_session=session).create_account(
+            name="Hot", currency="USD", accounting_category=AccountingCategory.EQUITY, id=hot_id, balance_shards=2
+        )
+        apply_balance_deltas(session, {hot_id: Decimal("7.25"), "checking": Decimal("-7.25")})
+        session.commit()
+
+        ManualBalanceAdjustmentService(session).create_adjustment(
+            UUID(hot_id),
+            ManualBalanceAdjustmentCreate(
+                target_balance=Decimal("100.00"), effective_date=date(2026, 3, 31), submitted_by_user_id="operator"
+            ),
+        )
+
+        assert stored_balances(session, [hot_id]) == {hot_id: Decimal("100.00")}
+
+
+def test_streamed_accounts_include_sharded_balances_per_batch(session_factory, monkeypatch) -> None:
+    monkeypatch.setattr(account_service, "settings", replace(settings, account_stream_batch_size=1))
+    with session_factory() as session:
+        service = AccountService(db_session=session)
+        service.create_account(
+            name="Hot", currency="USD", accounting_category=AccountingCategory.EQUITY, id="hot", balance_shards=2
+        )
+        apply_balance_deltas(session, {"hot": Decimal("7.25"), "checking": Decimal("-7.25")})
+        session.commit()
+        session.expire_all()
+
+        streamed = {account.id: account.available_balance for account in service.stream_accounts()}
+
+        assert streamed == {"checking": Decimal("-7.25"), "hot": Decimal("7.25"), "income": Decimal("0.00")}
+
+
+def test_each_currency_gets_its_own_sharded_balancing_account(session_factory) -> None:
+    with session_factory() as session:
+        account_service = AccountService(db_session=session)
+        account_service.create_account(name="Euro", currency="EUR", accounting_category=AccountingCategory.ASSET, id="euro")
+        account_service.create_account(
+            name="Legacy", currency="USD", accounting_category=AccountingCategory.EQUITY, id=BALANCING_ACCOUNT_ID
+        )
+        service = TransactionService(db_session=session)
+        service.set_account_service(account_service)
+        when = datetime.now(timezone.utc)
+
+        usd = service.perform_balance_adjustment("checking", Decimal("10.00"), when, "Fix", "Adjustment")
+        eur = service.perform_balance_adjustment("euro", Decimal("20.00"), when, "Fix", "Adjustment")
+
+        assert usd.debit_account_id == BALANCING_ACCOUNT_ID
+        assert eur.debit_account_id == balancing_account_id("EUR")
+        euro_balancing = account_service.get_account(balancing_account_id("EUR"))
+        assert euro_balancing.currency == "EUR"
+        assert euro_balancing.balance_shards == settings.balance_shard_count
+        assert euro_balancing.available_balance == Decimal("-20.00")
+        assert transaction_service._balancing_account_ids == {"USD": BALANCING_ACCOUNT_ID, "EUR": balancing_account_id("EUR")}
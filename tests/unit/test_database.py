@@ -133,3 +133,28 @@ def test_create_tables_calls_metadata_create_all(patch_database_globals):
     # The `bind` argument should be the patched `database.engine` that points
     # to the in-memory SQLite database.
     mock_metadata.create_all.assert_called_once_with(bind=database.engine)
+
+
+def test_get_engine_is_created_once_and_binds_sessions(patch_database_globals, monkeypatch):
+    """The engine is built on first use and shared by every session from `SessionLocal`."""
+    monkeypatch.setattr(database, "engine", None)
+    monkeypatch.setattr(database, "SessionLocal", database._LazySessionMaker(autocommit=False, autoflush=False))
+
+    engine = database.get_engine()
+
+    assert database.get_engine() is engine
+    with database.SessionLocal() as session:
+        assert session.get_bind() is engine
+    engine.dispose()
+
+
+def test_create_schema_command_creates_tables(patch_database_globals, capsys):
+    """`create-schema` is the step that replaced creating tables when the app is imported."""
+    from sdd_cash_manager import cli
+
+    _, mock_metadata, _ = patch_database_globals
+
+    assert cli.main(["create-schema"]) == 0
+
+    mock_metadata.create_all.assert_called_once_with(bind=database.engine)
+    assert "sqlite:///:memory:" in capsys.readouterr().out
@@ -0,0 +1,253 @@
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from sdd_cash_manager.core.config import settings
+from sdd_cash_manager.lib import duplicate_matching
+from sdd_cash_manager.lib.duplicate_matching import (
+    DuplicateGroup,
+    MatchRecord,
+    find_duplicate_groups,
+    merge_overlapping_groups,
+    normalize_description,
+    score_description_pairs,
+)
+from sdd_cash_manager.lib.pagination import encode_cursor
+from sdd_cash_manager.models.account import Account
+from sdd_cash_manager.models.base import Base
+from sdd_cash_manager.models.enums import AccountingCategory
+from sdd_cash_manager.models.transaction import Transaction
+from sdd_cash_manager.services import transaction_service as transaction_service_module
+from sdd_cash_manager.services.transaction_service import TransactionService
+
+BASE_DATE = datetime(2026, 3, 10, 12, 0, tzinfo=timezone.utc)
+
+
+def _record(txn_id: str, amount: str, days: int, description: str) -> MatchRecord:
+    return MatchRecord(
+        transaction_id=txn_id,
+        amount=Decimal(amount),
+        effective_date=BASE_DATE + timedelta(days=days),
+        description=description,
+    )
+
+
+def test_normalize_description_strips_trailing_reference_numbers() -> None:
+    assert normalize_description("COFFEE HOUSE #48213") == "coffee house"
+    assert normalize_description("Coffee-House  ref 99A1") == "coffee house ref"
+    assert normalize_description("  ") == ""
+
+
+def test_find_duplicate_groups_matches_fuzzy_descriptions_within_window() -> None:
+    records = [
+        _record("a", "12.50", 0, "COFFEE HOUSE #48213"),
+        _record("b", "12.50", 1, "Coffee House 48214"),
+        _record("c", "12.50", 0, "Hardware Store"),
+        _record("d", "12.50", 9, "Coffee House"),
+        _record("e", "99.00", 0, "Coffee House"),
+    ]
+
+    groups = find_duplicate_groups(records)
+
+    assert len(groups) == 1
+    group = groups[0]
+    assert group.transaction_ids == ["b", "a"]
+    assert group.amount == Decimal("12.50")
+    assert group.description == "Coffee House 48214"
+    assert group.confidence == Decimal("0.9000")
+
+
+def test_find_duplicate_groups_grades_confidence_by_similarity_and_distance() -> None:
+    exact = find_duplicate_groups([_record("a", "5.00", 0, "Grocer"), _record("b", "5.00", 0, "Grocer")])
+    fuzzy = find_duplicate_groups([_record("a", "5.00", 0, "Grocer Market"), _record("b", "5.00", 2, "Grocers Market")])
+
+    assert exact[0].confidence == Decimal("1.0000")
+    assert Decimal("0") < fuzzy[0].confidence < exact[0].confidence
+
+
+def test_score_description_pairs_scores_dice_similarity() -> None:
+    scores = score_description_pairs(["Rent payment", "RENT PAYMENT 0042", "Utilities", ""], [0, 0, 3], [1, 2, 3])
+
+    assert scores[0] == pytest.approx(1.0)
+    assert scores[1] < 0.3
+    assert scores[2] == 0.0
+
+
+def test_all_numeric_references_are_not_matched_as_empty_descriptions() -> None:
+    different = find_duplicate_groups([_record("a", "50.00", 0, "000123"), _record("b", "50.00", 0, "998877")])
+    same = find_duplicate_groups([_record("a", "50.00", 0, "000123"), _record("b", "50.00", 0, "000123")])
+
+    assert different == []
+    assert [(group.transaction_ids, group.confidence) for group in same] == [(["b", "a"], Decimal("1.0000"))]
+
+
+def test_vectorized_scores_match_set_dice_across_batches(monkeypatch) -> None:
+    monkeypatch.setattr(duplicate_matching, "SCORING_BATCH_SIZE", 2)
+    descriptions = ["Grocer Market", "Grocers Market", "Fuel 12", "Fuel station 12", "Payroll"]
+    left, right = [0, 0, 2, 1, 4], [1, 2, 3, 3, 4]
+    features = [duplicate_matching.description_features(value) for value in descriptions]
+
+    scores = score_description_pairs(descriptions, left, right)
+
+    expected = [
+        2 * len(features[a] & features[b]) / (len(features[a]) + len(features[b]))
+        for a, b in zip(left, right, strict=True)
+    ]
+    assert scores == pytest.approx(expected)
+
+
+def test_merge_overlapping_groups_combines_shared_transactions() -> None:
+    records = {item.transaction_id: item for item in [
+        _record("a", "8.00", 0, "Bakery"),
+        _record("b", "8.00", 1, "Bakery"),
+        _record("c", "8.00", 2, "Bakery"),
+    ]}
+    groups = [
+        DuplicateGroup(["b", "a"], Decimal("8.00"), BASE_DATE.date(), "Bakery", Decimal("0.9000")),
+        DuplicateGroup(["c", "b"], Decimal("8.00"), BASE_DATE.date(), "Bakery", Decimal("0.8000")),
+    ]
+
+    merged = merge_overlapping_groups(groups, records)
+
+    assert len(merged) == 1
+    assert merged[0].transaction_ids == ["c", "b", "a"]
+    assert merged[0].confidence == Decimal("0.8000")
+
+
+@pytest.fixture
+def scan_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def _add_transaction(session, *, debit: Account, credit: Account, days: int, description: str, amount: str) -> None:
+    session.add(
+        Transaction(
+            effective_date=BASE_DATE + timedelta(days=days),
+            booking_date=BASE_DATE + timedelta(days=days),
+            description=description,
+            amount=Decimal(amount),
+            debit_account_id=debit.id,
+            credit_account_id=credit.id,
+            action_type="Expense",
+        )
+    )
+
+
+def test_scan_duplicate_candidates_persists_fuzzy_groups(scan_session) -> None:
+    checking = Account(name="Checking", currency="USD", accounting_category=AccountingCategory.ASSET)
+    expenses = Account(name="Expenses", currency="USD", accounting_category=AccountingCategory.EXPENSE)
+    scan_session.add_all([checking, expenses])
+    scan_session.flush()
+    for offset, description in enumerate(["ACME SUBSCRIPTION 1001", "Acme Subscription #1002"]):
+        _add_transaction(scan_session, debit=expenses, credit=checking, days=offset, description=description, amount="15.00")
+    scan_session.commit()
+
+    service = TransactionService(db_session=scan_session)
+    candidates = service.scan_duplicate_candidates(account_id=checking.id)
+    rescanned = service.scan_duplicate_candidates(account_id=checking.id)
+
+    assert len(candidates) == 1
+    assert len(candidates[0].matching_transaction_ids) == 2
+    assert candidates[0].confidence == Decimal("0.9000")
+    assert [candidate.id for candidate in rescanned] == [candidates[0].id]
+
+
+def test_scan_account_group_merges_duplicates_across_child_accounts(scan_session) -> None:
+    cards = Account(name="Cards", currency="USD", accounting_category=AccountingCategory.LIABILITY)
+    scan_session.add(cards)
+    scan_session.flush()
+    visa = Account(name="Visa", currency="USD", accounting_category=AccountingCategory.LIABILITY, parent_account_id=cards.id)
+    amex = Account(name="Amex", currency="USD", accounting_category=AccountingCategory.LIABILITY, parent_account_id=cards.id)
+    other = Account(name="Other", currency="USD", accounting_category=AccountingCategory.LIABILITY)
+    expenses = Account(name="Expenses", currency="USD", accounting_category=AccountingCategory.EXPENSE)
+    scan_session.add_all([visa, amex, other, expenses])
+    scan_session.flush()
+    _add_transaction(scan_session, debit=expenses, credit=visa, days=0, description="AIRLINE TICKET 5501", amount="420.00")
+    _add_transaction(scan_session, debit=expenses, credit=amex, days=1, description="Airline Ticket 5502", amount="420.00")
+    _add_transaction(scan_session, debit=expenses, credit=other, days=0, description="Airline Ticket", amount="420.00")
+    _add_transaction(scan_session, debit=expenses, credit=visa, days=0, description="Groceries", amount="55.10")
+    _add_transaction(scan_session, debit=expenses, credit=visa, days=0, description="Groceries", amount="55.10")
+    scan_session.commit()
+
+    service = TransactionService(db_session=scan_session)
+    candidates = service.scan_duplicate_candidates(account_id=cards.id, scope="account_group")
+
+    assert len(candidates) == 2
+    assert {candidate.scope for candidate in candidates} == {"account_group"}
+    assert {candidate.account_id for candidate in candidates} == {cards.id}
+    assert sorted(len(candidate.matching_transaction_ids) for candidate in candidates) == [2, 2]
+    assert {candidate.description for candidate in candidates} == {"Airline Ticket 5502", "Groceries"}
+
+
+def test_scan_account_group_rejects_unknown_root(scan_session) -> None:
+    with pytest.raises(ValueError, match="not found"):
+        TransactionService(db_session=scan_session).scan_duplicate_candidates(
+            account_id="missing", scope="account_group"
+        )
+
+
+def test_run_duplicate_scan_resumes_from_cursor_across_batches(scan_session, monkeypatch) -> None:
+    monkeypatch.setattr(
+        transaction_service_module,
+        "settings",
+        replace(settings, duplicate_scan_batch_size=2, duplicate_scan_timeout_seconds=0),
+    )
+    checking = Account(name="Checking", currency="USD", accounting_category=AccountingCategory.ASSET)
+    expenses = Account(name="Expenses", currency="USD", accounting_category=AccountingCategory.EXPENSE)
+    scan_session.add_all([checking, expenses])
+    scan_session.flush()
+    for days, description, amount in [
+        (0, "Gym Membership 001", "30.00"),
+        (1, "Gym Membership 002", "30.00"),
+        (5, "Book Store", "12.00"),
+        (6, "Book Store", "12.00"),
+        (10, "Florist", "45.00"),
+    ]:
+        _add_transaction(scan_session, debit=expenses, credit=checking, days=days, description=description, amount=amount)
+    scan_session.commit()
+
+    service = TransactionService(db_session=scan_session)
+    passes = [service.run_duplicate_scan(account_id=checking.id)]
+    while not passes[-1].complete:
+        passes.append(service.run_duplicate_scan(account_id=checking.id, cursor=passes[-1].next_cursor))
+
+    assert len(passes) == 3
+    assert passes[0].next_cursor is not None
+    assert passes[-1].next_cursor is None
+    assert {candidate.description for candidate in passes[-1].candidates} == {"Book Store", "Gym Membership 002"}
+
+
+def test_run_duplicate_scan_rejects_cursor_from_another_scan(scan_session) -> None:
+    cursor = encode_cursor({"account_id": "other", "scope": "account", "effective_date": BASE_DATE.isoformat(), "id": "x"})
+
+    with pytest.raises(ValueError, match="Cursor does not belong"):
+        TransactionService(db_session=scan_session).run_duplicate_scan(account_id="acct", cursor=cursor)
+
+
+def test_run_duplicate_scan_merges_groups_spanning_batches(scan_session, monkeypatch) -> None:
+    monkeypatch.setattr(transaction_service_module, "settings", replace(settings, duplicate_scan_batch_size=2))
+    checking = Account(name="Checking", currency="USD", accounting_category=AccountingCategory.ASSET)
+    expenses = Account(name="Expenses", currency="USD", accounting_category=AccountingCategory.EXPENSE)
+    scan_session.add_all([checking, expenses])
+    scan_session.flush()
+    for days in (4, 5, 6):
+        _add_transaction(scan_session, debit=expenses, credit=checking, days=days, description="Book Store", amount="12.00")
+    _add_transaction(scan_session, debit=expenses, credit=checking, days=0, description="Florist", amount="45.00")
+    scan_session.commit()
+
+    result = TransactionService(db_session=scan_session).run_duplicate_scan(account_id=checking.id)
+
+    assert result.complete
+    assert len(result.candidates) == 1
+    assert len(result.candidates[0].matching_transaction_ids) == 3
@@ -0,0 +1,97 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from sdd_cash_manager.models.base import Base
+from sdd_cash_manager.models.enums import AccountingCategory, ReconciliationStatus
+from sdd_cash_manager.services.account_service import AccountService
+from sdd_cash_manager.services.transaction_service import TransactionService
+
+pytest.importorskip("pyarrow")
+
+from sdd_cash_manager.services.ledger_export import aggregate_export, export_ledger, read_export  # noqa: E402
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db_session = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        yield db_session
+    finally:
+        db_session.close()
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+
+@pytest.fixture
+def transaction_service(session):
+    account_service = AccountService(db_session=session)
+    account_service.create_account(name="Checking", currency="USD", accounting_category=AccountingCategory.ASSET, id="checking")
+    account_service.create_account(name="Income", currency="USD", accounting_category=AccountingCategory.INCOME, id="income")
+    service = TransactionService(db_session=session)
+    service.set_account_service(account_service)
+    return service
+
+
+def _post(service: TransactionService, month: int, amount: str) -> str:
+    effective = datetime(2026, month, 15, tzinfo=timezone.utc)
+    return service.create_transaction(
+        effective_date=effective,
+        booking_date=effective,
+        description=f"Salary {month}",
+        amount=Decimal(amount),
+        debit_account_id="checking",
+        credit_account_id="income",
+        action_type="Deposit",
+    ).id
+
+
+def test_export_is_partitioned_by_month_and_incremental(session, transaction_service, tmp_path) -> None:
+    for month, amount in ((1, "100.00"), (1, "50.00"), (2, "25.00")):
+        _post(transaction_service, month, amount)
+
+    first = export_ledger(session, tmp_path, batch_size=2)
+
+    assert (first.transactions, first.entries, first.accounts) == (3, 6, 2)
+    assert sorted(path.name for path in (tmp_path / "transactions").iterdir()) == ["month=2026-01", "month=2026-02"]
+    assert read_export(tmp_path, "transactions", months=["2026-02"]).column("amount").to_pylist() == [Decimal("25.00")]
+
+    latest = _post(transaction_service, 3, "10.00")
+    transaction_service.update_transaction_status(latest, reconciliation_status=ReconciliationStatus.RECONCILED)
+    second = export_ledger(session, tmp_path, batch_size=2)
+    assert (second.transactions, second.entries) == (1, 2)
+    assert export_ledger(session, tmp_path).transactions == 0
+
+    transactions = read_export(tmp_path, "transactions")
+    assert transactions.num_rows == 4
+    assert read_export(tmp_path, "accounts").column("id").to_pylist() == ["checking", "income"]
+
+
+def test_read_export_keeps_the_latest_copy_of_a_re_exported_row(session, transaction_service, tmp_path) -> None:
+    transaction_id = _post(transaction_service, 4, "12.00")
+    export_ledger(session, tmp_path)
+    transaction_service.update_transaction_status(transaction_id, reconciliation_status=ReconciliationStatus.RECONCILED)
+
+    assert export_ledger(session, tmp_path).transactions == 1
+
+    transactions = read_export(tmp_path, "transactions")
+    assert transactions.column("reconciliation_status").to_pylist() == [ReconciliationStatus.RECONCILED.value]
+
+
+def test_aggregate_export_groups_entries_by_account_and_month(session, transaction_service, tmp_path) -> None:
+    for month, amount in ((1, "100.00"), (1, "50.00"), (2, "25.00")):
+        _post(transaction_service, month, amount)
+    export_ledger(session, tmp_path)
+
+    totals = aggregate_export(tmp_path, "entries", ["account_id", "month"], [("debit_amount", "sum")]).to_pylist()
+
+    debits = {(row["account_id"], row["month"]): row["debit_amount_sum"] for row in totals}
+    assert debits[("checking", "2026-01")] == Decimal("150.00")
+    assert debits[("checking", "2026-02")] == Decimal("25.00")
+    assert debits[("income", "2026-01")] == Decimal("0.00")
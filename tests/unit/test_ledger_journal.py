@@ -0,0 +1,133 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, func, select, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from sdd_cash_manager.models.account import Account
+from sdd_cash_manager.models.balance_shard import AccountBalanceShard
+from sdd_cash_manager.models.base import Base
+from sdd_cash_manager.models.enums import AccountingCategory
+from sdd_cash_manager.models.ledger_journal import LedgerJournalEntry, LedgerSnapshot
+from sdd_cash_manager.services.account_service import AccountService
+from sdd_cash_manager.services.ledger_journal import (
+    latest_sequence,
+    replay_ledger,
+    restore_account_balances,
+    sequence_as_of,
+    write_ledger_snapshot,
+)
+from sdd_cash_manager.services.transaction_service import TransactionService
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db_session = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        yield db_session
+    finally:
+        db_session.close()
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+
+@pytest.fixture
+def services(session):
+    account_service = AccountService(db_session=session)
+    account_service.create_account(
+        name="Checking", currency="USD", accounting_category=AccountingCategory.ASSET, id="checking",
+        available_balance=Decimal("100.00"),
+    )
+    account_service.create_account(
+        name="Income", currency="USD", accounting_category=AccountingCategory.INCOME, id="income", balance_shards=2
+    )
+    transaction_service = TransactionService(db_session=session)
+    transaction_service.set_account_service(account_service)
+    return account_service, transaction_service
+
+
+def _post(transaction_service: TransactionService, amount: str) -> str:
+    transaction = transaction_service.create_transaction(
+        effective_date=datetime.now(timezone.utc),
+        booking_date=datetime.now(timezone.utc),
+        description="Salary",
+        amount=Decimal(amount),
+        debit_account_id="checking",
+        credit_account_id="income",
+        action_type="Deposit",
+    )
+    return transaction.id
+
+
+def test_postings_and_overwrites_are_journaled_in_sequence(session, services) -> None:
+    account_service, transaction_service = services
+    transaction_id = _post(transaction_service, "40.00")
+    account_service.update_account("checking", available_balance=Decimal("75.00"))
+
+    journal = session.execute(
+        select(LedgerJournalEntry.account_id, LedgerJournalEntry.delta, LedgerJournalEntry.transaction_id)
+        .order_by(LedgerJournalEntry.sequence)
+    ).all()
+    assert journal == [
+        ("checking", Decimal("100.00"), None),
+        ("checking", Decimal("-40.00"), transaction_id),
+        ("income", Decimal("40.00"), transaction_id),
+        ("checking", Decimal("15.00"), None),
+    ]
+    assert replay_ledger(session).balances == {"checking": Decimal("75.00"), "income": Decimal("40.00")}
+    assert replay_ledger(session, 2).balances == {"checking": Decimal("60.00")}
+
+
+def test_replay_starts_from_the_nearest_snapshot(session, services) -> None:
+    _, transaction_service = services
+    _post(transaction_service, "10.00")
+    first = write_ledger_snapshot(session)
+    assert write_ledger_snapshot(session) is first
+    _post(transaction_service, "5.00")
+    second = write_ledger_snapshot(session)
+    _post(transaction_service, "1.25")
+
+    state = replay_ledger(session)
+    assert state.snapshot_sequence == second.sequence
+    assert state.balances == {"checking": Decimal("83.75"), "income": Decimal("16.25")}
+    earlier = replay_ledger(session, first.sequence + 1)
+    assert earlier.snapshot_sequence == first.sequence
+    assert earlier.balance_of("checking") == Decimal("85.00")
+    assert session.scalar(select(func.count()).select_from(LedgerSnapshot)) == 2
+
+
+def test_first_snapshot_anchors_balances_that_predate_the_journal(session, services) -> None:
+    session.execute(update(Account).where(Account.id == "checking").values(available_balance=Decimal("500.00")))
+    session.commit()
+
+    snapshot = write_ledger_snapshot(session)
+
+    assert snapshot.balances == {"checking": "500.00"}
+    assert replay_ledger(session).balance_of("checking") == Decimal("500.00")
+
+
+def test_restore_rewrites_balances_from_the_journal(session, services) -> None:
+    account_service, transaction_service = services
+    _post(transaction_service, "30.00")
+    session.execute(update(Account).values(available_balance=Decimal("0.00")))
+    session.execute(update(AccountBalanceShard).values(balance=Decimal("0.00")))
+    session.commit()
+
+    assert restore_account_balances(session) == 2
+    session.expire_all()
+    assert account_service.get_account("checking").available_balance == Decimal("70.00")
+    assert account_service.get_account("income").available_balance == Decimal("30.00")
+    assert restore_account_balances(session) == 0
+
+
+def test_sequence_as_of_finds_the_last_entry_before_a_moment(session, services) -> None:
+    _, transaction_service = services
+    before = datetime.now(timezone.utc)
+    _post(transaction_service, "20.00")
+
+    assert sequence_as_of(session, before) == 1
+    assert sequence_as_of(session, datetime.now(timezone.utc)) == latest_sequence(session) == 3
@@ -0,0 +1,101 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from sdd_cash_manager.models.account import Account
+from sdd_cash_manager.models.base import Base
+from sdd_cash_manager.models.enums import AccountingCategory
+from sdd_cash_manager.models.ledger_version import (
+    LEDGER_VERSION_KEY,
+    LedgerVersion,
+    ledger_version_keys,
+    stamp_ledger_versions,
+)
+from sdd_cash_manager.services.account_service import AccountService
+from sdd_cash_manager.services.ledger_versions import account_version, ledger_version
+from sdd_cash_manager.services.transaction_service import TransactionService
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db_session = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        yield db_session
+    finally:
+        db_session.close()
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+
+@pytest.fixture
+def services(session):
+    account_service = AccountService(db_session=session)
+    account_service.create_account(name="Assets", currency="USD", accounting_category=AccountingCategory.ASSET, id="assets")
+    account_service.create_account(
+        name="Checking", currency="USD", accounting_category=AccountingCategory.ASSET, id="checking",
+        parent_account_id="assets",
+    )
+    account_service.create_account(name="Income", currency="USD", accounting_category=AccountingCategory.INCOME, id="income")
+    account_service.create_account(name="Savings", currency="USD", accounting_category=AccountingCategory.ASSET, id="savings")
+    transaction_service = TransactionService(db_session=session)
+    transaction_service.set_account_service(account_service)
+    return account_service, transaction_service
+
+
+def test_postings_bump_the_ledger_the_accounts_and_their_ancestors(session, services) -> None:
+    _, transaction_service = services
+    before = {account_id: account_version(session, account_id) for account_id in ("assets", "checking", "income", "savings")}
+    ledger_before = ledger_version(session)
+
+    transaction_service.create_transaction(
+        effective_date=datetime.now(timezone.utc),
+        booking_date=datetime.now(timezone.utc),
+        description="Salary",
+        amount=Decimal("10.00"),
+        debit_account_id="checking",
+        credit_account_id="income",
+        action_type="Deposit",
+    )
+
+    assert ledger_version(session) > ledger_before
+    for account_id in ("assets", "checking", "income"):
+        assert account_version(session, account_id) != before[account_id]
+    assert account_version(session, "savings") == before["savings"]
+
+
+def test_orm_updates_are_stamped_and_untagged_bulk_writes_touch_every_account(session, services) -> None:
+    account_service, _ = services
+    savings = account_version(session, "savings")
+    account_service.update_account("savings", name="Rainy Day")
+    assert account_version(session, "savings")[1] > savings[1]
+
+    accounts_wide, checking = account_version(session, "checking")
+    session.execute(update(Account).where(Account.id == "income").values(hidden=True))
+    session.commit()
+    assert account_version(session, "checking") == (accounts_wide + 1, checking)
+
+
+def test_ledger_wide_version_is_the_sum_of_its_shard_rows(session) -> None:
+    for _ in range(40):
+        stamp_ledger_versions(session.connection())
+    session.commit()
+
+    keys = session.scalars(select(LedgerVersion.key).where(LedgerVersion.key.in_(ledger_version_keys(LEDGER_VERSION_KEY))))
+    assert len(keys.all()) > 1
+    assert ledger_version(session) == 40
+    assert session.get(LedgerVersion, LEDGER_VERSION_KEY) is None
+
+
+def test_rolled_back_statements_are_not_stamped(session, services) -> None:
+    ledger_before = ledger_version(session)
+    session.execute(update(Account).values(hidden=True))
+    session.rollback()
+    session.commit()
+
+    assert ledger_version(session) == ledger_before
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import os
 import runpy
+import subprocess
 import sys
+from pathlib import Path
 
 import sdd_cash_manager.database as database
 
@@ -24,3 +27,23 @@ def test_main_startup_invokes_uvicorn_and_create_tables(monkeypatch):
     assert uvicorn_calls[0] == ("create_tables",)
     _, host, port, reload = uvicorn_calls[-1]
     assert (host, port, reload) == ("127.0.0.1", 8000, True)
+
+
+def test_importing_the_app_module_has_no_side_effects(tmp_path):
+    """Importing builds no app, engine or log file; `create_app` does the work when asked."""
+    code = (
+        "import sys\n"
+        "import sdd_cash_manager.main\n"
+        "from sdd_cash_manager import database\n"
+        "assert database.engine is None\n"
+        "assert 'sdd_cash_manager.api.accounts' not in sys.modules\n"
+        "assert 'sdd_cash_manager.models' not in sys.modules\n"
+        "app = sdd_cash_manager.main.create_app()\n"
+        "assert any(route.path == '/health' for route in app.routes)\n"
+        "assert sdd_cash_manager.main.app is sdd_cash_manager.main.app\n"
+        "assert database.engine is None\n"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(Path(__file__).resolve().parents[2] / "src"), *sys.path]))
+    subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env, check=True)
+
+    assert list(tmp_path.iterdir()) == []
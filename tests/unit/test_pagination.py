@@ -0,0 +1,18 @@
+import pytest
+
+from sdd_cash_manager.lib.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip() -> None:
+    position = {"effective_date": "2026-03-10T12:00:00", "id": "abc"}
+
+    token = encode_cursor(position)
+
+    assert "=" not in token
+    assert decode_cursor(token) == position
+
+
+@pytest.mark.parametrize("token", ["not-a-cursor!", encode_cursor({"id": 1})[:-3] + "@@@", "WzEsMl0"])
+def test_decode_cursor_rejects_malformed_tokens(token: str) -> None:
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(token)
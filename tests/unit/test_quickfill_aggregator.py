@@ -0,0 +1,227 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import sdd_cash_manager.database as database
+from sdd_cash_manager import cli
+from sdd_cash_manager.lib.metrics import get_timing
+from sdd_cash_manager.lib.scheduler import PeriodicTask
+from sdd_cash_manager.models.account import Account
+from sdd_cash_manager.models.base import Base
+from sdd_cash_manager.models.enums import AccountingCategory
+from sdd_cash_manager.models.quickfill_template import QuickFillTemplate
+from sdd_cash_manager.services import quickfill_aggregator as aggregator_module
+from sdd_cash_manager.services.account_service import AccountService
+from sdd_cash_manager.services.quickfill_aggregator import (
+    DECAY_METRIC,
+    QuickFillHit,
+    calculate_quickfill_confidence,
+    flush_all_quickfill_aggregators,
+    get_quickfill_aggregator,
+    rebuild_quickfill_templates,
+    recompute_quickfill_confidence,
+    template_identity,
+)
+from sdd_cash_manager.services.transaction_service import TransactionService
+
+NOW = datetime.now(timezone.utc)
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, autoflush=False)
+    yield factory
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def ledger(session_factory):
+    session = session_factory()
+    checking = Account(name="Checking", currency="USD", accounting_category=AccountingCategory.ASSET, available_balance=Decimal("900"))
+    savings = Account(name="Savings", currency="USD", accounting_category=AccountingCategory.ASSET, available_balance=Decimal("100"))
+    session.add_all([checking, savings])
+    session.commit()
+    service = TransactionService(db_session=session)
+    service.set_account_service(AccountService(db_session=session))
+    try:
+        yield session, service, checking, savings
+    finally:
+        session.close()
+
+
+def _post(service: TransactionService, checking: Account, savings: Account, memo: str = "Monthly savings") -> None:
+    service.create_transaction(
+        effective_date=NOW,
+        booking_date=NOW,
+        description=memo,
+        amount=Decimal("25.00"),
+        debit_account_id=checking.id,
+        credit_account_id=savings.id,
+        action_type="Transfer",
+        currency="usd",
+    )
+
+
+def test_hits_are_buffered_and_merged_until_flush(ledger) -> None:
+    session, service, checking, savings = ledger
+    for _ in range(3):
+        _post(service, checking, savings)
+    _post(service, checking, savings, memo="Holiday fund")
+
+    aggregator = get_quickfill_aggregator(session)
+    assert aggregator.pending_count == 2
+    assert session.scalars(select(QuickFillTemplate)).first() is None
+
+    assert aggregator.flush(session) == 2
+    templates = {template.memo: template for template in session.scalars(select(QuickFillTemplate))}
+    assert templates["Monthly savings"].history_count == 3
+    assert templates["Holiday fund"].history_count == 1
+    assert templates["Monthly savings"].currency == "USD"
+
+    _post(service, checking, savings)
+    aggregator.flush(session)
+    session.refresh(templates["Monthly savings"])
+    assert templates["Monthly savings"].history_count == 4
+
+
+def test_failed_flush_keeps_hits_buffered(ledger, monkeypatch) -> None:
+    session, service, checking, savings = ledger
+    _post(service, checking, savings)
+    aggregator = get_quickfill_aggregator(session)
+
+    def fail(*_args, **_kwargs):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(aggregator_module, "apply_quickfill_hits", fail)
+    with pytest.raises(RuntimeError):
+        aggregator.flush(session)
+    assert aggregator.pending_count == 1
+
+    monkeypatch.undo()
+    _post(service, checking, savings)
+    aggregator.flush(session)
+    assert session.scalars(select(QuickFillTemplate)).one().history_count == 2
+
+
+def test_flush_all_uses_its_own_session(ledger) -> None:
+    session, service, checking, savings = ledger
+    _post(service, checking, savings)
+
+    assert flush_all_quickfill_aggregators() >= 1
+    assert get_quickfill_aggregator(session).pending_count == 0
+    assert session.scalars(select(QuickFillTemplate)).one().history_count == 1
+
+
+def test_rebuild_recovers_lost_hits_idempotently(ledger) -> None:
+    session, service, checking, savings = ledger
+    for _ in range(2):
+        _post(service, checking, savings)
+    get_quickfill_aggregator(session).flush(session)
+    _post(service, checking, savings)
+    lost = get_quickfill_aggregator(session)
+    lost.discard()
+
+    assert rebuild_quickfill_templates(session) == 1
+    assert rebuild_quickfill_templates(session) == 1
+    template = session.scalars(select(QuickFillTemplate)).one()
+    assert template.history_count == 3
+
+
+def _template(checking: Account, savings: Account, memo: str, history: int, days_ago: int, **extra) -> QuickFillTemplate:
+    return QuickFillTemplate(
+        action="Transfer",
+        currency="USD",
+        transfer_from_account_id=checking.id,
+        transfer_to_account_id=savings.id,
+        amount=Decimal("10.00"),
+        memo=memo,
+        history_count=history,
+        last_used_at=NOW - timedelta(days=days_ago),
+        confidence_score=Decimal("1.0"),
+        **extra,
+    )
+
+
+def test_decay_recomputes_confidence_and_prunes_stale_templates(ledger) -> None:
+    session, _, checking, savings = ledger
+    session.add_all(
+        [
+            _template(checking, savings, "fresh", 3, 1),
+            _template(checking, savings, "cooling", 12, 20),
+            _template(checking, savings, "busy", 90, 2),
+            _template(checking, savings, "stale", 5, 45),
+            _template(checking, savings, "kept", 5, 45, is_approved=True),
+        ]
+    )
+    session.commit()
+
+    result = recompute_quickfill_confidence(session, now=NOW)
+
+    templates = {template.memo: template for template in session.scalars(select(QuickFillTemplate))}
+    assert result.pruned == 1
+    assert "stale" not in templates
+    for template in templates.values():
+        expected = calculate_quickfill_confidence(template.history_count, template.last_used_at, now=NOW)
+        assert template.confidence_score == expected.quantize(Decimal("0.0001"))
+    assert templates["busy"].confidence_score == Decimal("1.0000")
+    assert get_timing(DECAY_METRIC) is not None
+
+    assert recompute_quickfill_confidence(session, now=NOW).updated == 0
+
+
+def test_merge_keeps_latest_source() -> None:
+    earlier = QuickFillHit(2, NOW - timedelta(days=1), "old", "Old description")
+    later = QuickFillHit(1, NOW, "new", "New description")
+
+    merged = earlier.merge(later)
+
+    assert (merged.count, merged.source_transaction_id, merged.last_used_at) == (3, "new", NOW)
+    assert template_identity(" Transfer ", "usd", "a", "b", Decimal("1.5"), None) == (
+        "Transfer", "USD", "a", "b", Decimal("1.50"), None
+    )
+
+
+def test_cli_recover_quickfill(ledger, session_factory, monkeypatch, capsys) -> None:
+    _, service, checking, savings = ledger
+    _post(service, checking, savings)
+    monkeypatch.setattr(database, "SessionLocal", session_factory)
+
+    assert cli.main(["recover-quickfill"]) == 0
+    assert "Rebuilt 1 QuickFill templates" in capsys.readouterr().out
+
+
+def test_cli_decay_quickfill(ledger, session_factory, monkeypatch, capsys) -> None:
+    session, _, checking, savings = ledger
+    session.add(_template(checking, savings, "stale", 1, 90))
+    session.commit()
+    monkeypatch.setattr(database, "SessionLocal", session_factory)
+
+    assert cli.main(["decay-quickfill"]) == 0
+    assert "pruned 1 QuickFill templates" in capsys.readouterr().out
+
+
+def test_periodic_task_runs_until_stopped() -> None:
+    ran = threading.Event()
+    task = PeriodicTask("test", 0.01, ran.set)
+
+    task.start()
+    assert ran.wait(1.0)
+    task.stop()
+    assert not task.running
+
+
+def test_periodic_task_survives_failures(caplog) -> None:
+    def explode() -> None:
+        raise ValueError("boom")
+
+    PeriodicTask("failing", 1, explode).run_once()
+
+    assert "Periodic task failing failed" in caplog.text
@@ -0,0 +1,144 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+
+from sdd_cash_manager.models.account import Account
+from sdd_cash_manager.models.base import Base
+from sdd_cash_manager.models.enums import AccountingCategory
+from sdd_cash_manager.models.quickfill_template import QuickFillTemplate
+from sdd_cash_manager.services.account_service import AccountService
+from sdd_cash_manager.services.quickfill_aggregator import get_quickfill_aggregator
+from sdd_cash_manager.services.quickfill_index import QuickFillIndex, QuickFillIndexEntry, get_quickfill_index, tokenize
+from sdd_cash_manager.services.transaction_service import TransactionService
+
+NOW = datetime.now(timezone.utc)
+CUTOFF = NOW - timedelta(days=30)
+KEY = ("Transfer", "USD")
+
+
+def _entry(template_id: str, tokens: str, confidence: str = "0.5", *, approved: bool = True, days_ago: int = 0) -> QuickFillIndexEntry:
+    return QuickFillIndexEntry(
+        template_id=template_id,
+        action="Transfer",
+        currency="USD",
+        confidence_score=Decimal(confidence),
+        history_count=1,
+        last_used_at=NOW - timedelta(days=days_ago),
+        is_approved=approved,
+        tokens=tokenize(tokens),
+    )
+
+
+def _search(index: QuickFillIndex, query: str | None, *, include_unapproved: bool = False) -> list[str]:
+    return index.search(KEY, query, include_unapproved=include_unapproved, recent_cutoff=CUTOFF)
+
+
+def test_tokenize_normalises_memo_and_description() -> None:
+    assert tokenize("Rent-Payment #12", None, "rent") == frozenset({"rent", "payment", "12"})
+
+
+def test_search_matches_token_prefixes_in_rank_order() -> None:
+    index = QuickFillIndex(ttl_seconds=60)
+    index.load(KEY, [
+        _entry("low", "Grocery Market", "0.2"),
+        _entry("high", "Grocer weekly", "0.9"),
+        _entry("other", "Rent payment", "0.7"),
+    ])
+
+    assert _search(index, "groc") == ["high", "low"]
+    assert _search(index, "GROC mark") == ["low"]
+    assert _search(index, None) == ["high", "other", "low"]
+    assert _search(index, "arket") == []
+
+
+def test_search_filters_unapproved_and_stale_templates() -> None:
+    index = QuickFillIndex(ttl_seconds=60)
+    index.load(KEY, [
+        _entry("pending", "coffee", approved=False),
+        _entry("expired", "coffee", days_ago=90),
+        _entry("approved", "coffee"),
+    ])
+
+    assert _search(index, "coffee") == ["approved"]
+    assert _search(index, "coffee", include_unapproved=True) == ["approved", "pending"]
+
+
+def test_upsert_and_discard_update_index_incrementally() -> None:
+    index = QuickFillIndex(ttl_seconds=60)
+    index.load(KEY, [_entry("a", "fuel", "0.5"), _entry("b", "fuel station", "0.4")])
+
+    index.upsert(_entry("b", "fuel station", "0.8"))
+    index.upsert(_entry("c", "parking", "0.9"))
+    assert _search(index, "fu") == ["b", "a"]
+    assert _search(index, None) == ["c", "b", "a"]
+
+    index.upsert(_entry("a", "gym", "0.5"))
+    assert _search(index, "fuel") == ["b"]
+
+    index.discard(KEY, "b")
+    assert _search(index, "fuel") == []
+
+
+def test_buckets_expire_after_ttl() -> None:
+    index = QuickFillIndex(ttl_seconds=0)
+    index.load(KEY, [])
+
+    assert not index.is_loaded(KEY)
+
+
+@pytest.fixture
+def service_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def test_rank_quickfill_candidates_uses_index_and_skips_deleted_templates(service_session) -> None:
+    account_service = AccountService(db_session=service_session)
+    service = TransactionService(db_session=service_session)
+    service.set_account_service(account_service)
+    checking = Account(name="Checking", currency="USD", accounting_category=AccountingCategory.ASSET, available_balance=Decimal("500"))
+    savings = Account(name="Savings", currency="USD", accounting_category=AccountingCategory.ASSET, available_balance=Decimal("500"))
+    service_session.add_all([checking, savings])
+    service_session.commit()
+
+    for amount, memo in [("10.00", "Weekly savings"), ("20.00", "Weekend trip"), ("30.00", "Rent share")]:
+        service.create_transaction(
+            effective_date=NOW,
+            booking_date=NOW,
+            description=memo,
+            amount=Decimal(amount),
+            debit_account_id=checking.id,
+            credit_account_id=savings.id,
+            action_type="Transfer",
+            currency="USD",
+        )
+    # Reads leave buffered usage to the flush task instead of committing the caller's session.
+    aggregator = get_quickfill_aggregator(service_session)
+    assert service.rank_quickfill_candidates("Transfer", "USD", include_unapproved=True) == []
+    assert aggregator.pending_count == 3
+    aggregator.flush(service_session)
+
+    ranked = service.rank_quickfill_candidates("Transfer", "usd", query="wee", limit=5, include_unapproved=True)
+    assert sorted(template.memo for template in ranked) == ["Weekend trip", "Weekly savings"]
+
+    removed = next(template for template in ranked if template.memo == "Weekend trip")
+    service_session.execute(delete(QuickFillTemplate).where(QuickFillTemplate.id == removed.id))
+    service_session.commit()
+
+    ranked = service.rank_quickfill_candidates("Transfer", "USD", query="wee", limit=5, include_unapproved=True)
+    assert [template.memo for template in ranked] == ["Weekly savings"]
+    assert get_quickfill_index(service_session).search(
+        KEY, "wee", include_unapproved=True, recent_cutoff=CUTOFF
+    ) == [ranked[0].id]
+
+    approved = service.approve_quickfill_template(ranked[0].id)
+    assert [template.id for template in service.rank_quickfill_candidates("Transfer", "USD", query="week")] == [approved.id]
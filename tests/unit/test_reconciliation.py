@@ -22,6 +22,7 @@ def mock_db_session():
     mock_session.commit.return_value = None
     mock_session.flush.return_value = None
     mock_session.refresh.return_value = None
+    mock_session.info = {}
     mock_session.query.return_value.filter.return_value.all.return_value = [] # Default for fetching
     return mock_session
 
@@ -151,13 +152,10 @@ def test_get_reconciliation_entries_for_account(mock_db_session):
         reconciled_status=ReconciliationStatus.PENDING_RECONCILIATION.value,
         original_transaction_id=None,
     )
-    query_mock = mock_db_session.query.return_value
-    filter_mock = query_mock.filter.return_value
-    filter_mock.all.return_value = [mock_entry]
+    mock_db_session.scalars.return_value = iter([mock_entry])
 
     reconciliation_service = ReconciliationService(mock_db_session)
     entries = reconciliation_service.get_reconciliation_entries_for_account(TEST_ACCOUNT_ID)
 
     assert entries == [mock_entry]
-    mock_db_session.query.assert_called_once_with(ReconciliationViewEntry)
-    filter_mock.all.assert_called_once()
+    mock_db_session.scalars.assert_called_once()
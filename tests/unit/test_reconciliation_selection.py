@@ -0,0 +1,326 @@
+import json
+from dataclasses import replace
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import sdd_cash_manager.database as database
+from sdd_cash_manager import cli
+from sdd_cash_manager.core.config import settings
+from sdd_cash_manager.lib.statement_matching import StatementLine
+from sdd_cash_manager.lib.streaming import json_array_chunks, ndjson_lines
+from sdd_cash_manager.models.account import Account
+from sdd_cash_manager.models.base import Base
+from sdd_cash_manager.models.enums import AccountingCategory, ProcessingStatus, ReconciliationStatus
+from sdd_cash_manager.models.reconciliation import ReconciliationViewEntry
+from sdd_cash_manager.models.reconciliation_counter import (
+    ReconciliationCounter,
+    add_counter_delta,
+    apply_counter_deltas,
+    ledger_counter_keys,
+    new_counter_deltas,
+)
+from sdd_cash_manager.models.reconciliation_session import (
+    ReconciliationSessionState,
+    reconciliation_session_transactions,
+)
+from sdd_cash_manager.models.transaction import Transaction
+from sdd_cash_manager.schemas.reconciliation_schema import TransactionSummary
+from sdd_cash_manager.services import reconciliation_service as reconciliation_module
+from sdd_cash_manager.services.reconciliation_counters import (
+    get_reconciliation_counts,
+    rebuild_reconciliation_counters,
+)
+from sdd_cash_manager.services.reconciliation_service import ReconciliationService
+
+NOW = datetime.now(timezone.utc)
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine, autoflush=False)
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def session(session_factory):
+    db_session = session_factory()
+    checking = Account(name="Checking", currency="USD", accounting_category=AccountingCategory.ASSET, id="checking")
+    income = Account(name="Income", currency="USD", accounting_category=AccountingCategory.INCOME, id="income")
+    db_session.add_all([checking, income])
+    db_session.commit()
+    try:
+        yield db_session
+    finally:
+        db_session.close()
+
+
+def _transactions(session, amounts: list[str], credit_account_id: str = "income") -> list[str]:
+    transactions = [
+        Transaction(
+            effective_date=NOW,
+            booking_date=NOW,
+            description=f"Deposit {index}",
+            amount=Decimal(amount),
+            debit_account_id="checking",
+            credit_account_id=credit_account_id,
+            action_type="Deposit",
+            processing_status=ProcessingStatus.COMPLETED,
+            reconciliation_status=ReconciliationStatus.UNCLEARED,
+        )
+        for index, amount in enumerate(amounts)
+    ]
+    session.add_all(transactions)
+    session.commit()
+    return [transaction.id for transaction in transactions]
+
+
+def _member_count(session, session_id: str) -> int:
+    membership = reconciliation_session_transactions
+    return session.scalar(select(func.count()).select_from(membership).where(membership.c.session_id == session_id))
+
+
+def test_selection_keeps_a_running_total_and_ignores_duplicates(session) -> None:
+    service = ReconciliationService(session)
+    ids = _transactions(session, ["10.00", "15.50", "4.50"])
+    recon = service.create_reconciliation_session(session, date.today(), Decimal("30.00"))
+
+    _, payload = service.add_transactions_to_session(session, recon.id, [ids[0], ids[1], ids[0]])
+    assert payload["difference"] == Decimal("4.50")
+    assert payload["difference_status"] == "positive"
+    assert payload["remaining_uncleared"] == 1
+
+    _, payload = service.add_transactions_to_session(session, recon.id, [ids[1], "missing"])
+    assert payload["difference"] == Decimal("4.50")
+    assert recon.selected_total == Decimal("25.50")
+    assert _member_count(session, recon.id) == 2
+    assert {transaction.id for transaction in recon.transactions} == {ids[0], ids[1]}
+    assert session.get(Transaction, ids[0]).reconciliation_status == ReconciliationStatus.CLEARED
+
+
+def test_selection_completes_the_session_when_balanced(session, monkeypatch) -> None:
+    monkeypatch.setattr(reconciliation_module, "SELECTION_CHUNK_SIZE", 2)
+    service = ReconciliationService(session)
+    ids = _transactions(session, ["1.00"] * 5)
+    recon = service.create_reconciliation_session(session, date.today(), Decimal("5.00"))
+
+    _, payload = service.add_transactions_to_session(session, recon.id, ids)
+
+    assert payload["difference"] == Decimal("0.00")
+    assert payload["difference_status"] == "balanced"
+    assert recon.state == ReconciliationSessionState.COMPLETED
+    assert _member_count(session, recon.id) == 5
+    statuses = set(session.scalars(select(Transaction.reconciliation_status)))
+    assert statuses == {ReconciliationStatus.RECONCILED.value}
+
+
+def test_selection_rejects_unknown_sessions(session) -> None:
+    with pytest.raises(ValueError, match="not found"):
+        ReconciliationService(session).add_transactions_to_session(session, "missing", [])
+
+
+def _counts(session, account_id: str | None = None) -> tuple[int, int, int]:
+    counts = get_reconciliation_counts(session, account_id)
+    return counts.uncleared, counts.cleared, counts.reconciled
+
+
+def test_counters_follow_postings_and_status_transitions(session) -> None:
+    session.add(Account(name="Savings", currency="USD", accounting_category=AccountingCategory.ASSET, id="savings"))
+    ids = _transactions(session, ["10.00", "20.00"]) + _transactions(session, ["5.00"], credit_account_id="savings")
+
+    assert _counts(session) == (3, 0, 0)
+    assert _counts(session, "checking") == (3, 0, 0)
+    assert _counts(session, "income") == (2, 0, 0)
+    assert _counts(session, "savings") == (1, 0, 0)
+
+    session.get(Transaction, ids[2]).reconciliation_status = ReconciliationStatus.CLEARED
+    session.get(Transaction, ids[1]).reconciliation_status = ReconciliationStatus.RECONCILED
+    session.commit()
+    assert _counts(session) == (1, 1, 1)
+    assert _counts(session, "income") == (1, 0, 1)
+    assert _counts(session, "savings") == (0, 1, 0)
+
+
+def test_ledger_counts_are_summed_over_shard_rows(session) -> None:
+    deltas = new_counter_deltas()
+    for debit_account_id in ("a", "b", "c", "d", "e", "f"):
+        add_counter_delta(deltas, debit_account_id, "income", ReconciliationStatus.UNCLEARED, 1)
+    apply_counter_deltas(session.connection(), deltas)
+    # The second application lands on the existing rows.
+    apply_counter_deltas(session.connection(), deltas)
+    session.commit()
+
+    ledger_rows = session.scalars(
+        select(ReconciliationCounter).where(ReconciliationCounter.account_id.in_(ledger_counter_keys()))
+    ).all()
+    assert len(ledger_rows) > 1
+    assert _counts(session) == (12, 0, 0)
+    assert _counts(session, "income") == (12, 0, 0)
+    assert _counts(session, "a") == (2, 0, 0)
+
+
+def test_account_scoped_sessions_report_that_accounts_uncleared_count(session) -> None:
+    session.add(Account(name="Savings", currency="USD", accounting_category=AccountingCategory.ASSET, id="savings"))
+    service = ReconciliationService(session)
+    ids = _transactions(session, ["5.00", "7.00"], credit_account_id="savings")
+    _transactions(session, ["100.00", "200.00"])
+    recon = service.create_reconciliation_session(session, date.today(), Decimal("12.00"), account_id="savings")
+
+    _, payload = service.add_transactions_to_session(session, recon.id, ids[:1])
+    assert payload["remaining_uncleared"] == 1
+    assert _counts(session, "savings") == (1, 1, 0)
+
+    _, payload = service.add_transactions_to_session(session, recon.id, ids[1:])
+    assert payload["remaining_uncleared"] == 0
+    assert _counts(session, "savings") == (0, 1, 1)
+    assert _counts(session) == (2, 1, 1)
+
+
+def test_rebuild_repairs_drifted_counters(session, session_factory, monkeypatch, capsys) -> None:
+    _transactions(session, ["1.00", "2.00"])
+    session.get(ReconciliationCounter, "checking").uncleared_count = 99
+    session.add(ReconciliationCounter(account_id="gone", cleared_count=4))
+    session.commit()
+
+    assert rebuild_reconciliation_counters(session) == 3
+    assert _counts(session, "checking") == (2, 0, 0)
+    assert session.get(ReconciliationCounter, "gone") is None
+
+    monkeypatch.setattr(database, "SessionLocal", session_factory)
+    assert cli.main(["rebuild-reconciliation-counters"]) == 0
+    assert "for 3 accounts" in capsys.readouterr().out
+
+
+def test_unreconciled_pages_follow_the_keyset_and_account_scope(session) -> None:
+    session.add(Account(name="Savings", currency="USD", accounting_category=AccountingCategory.ASSET, id="savings"))
+    checking_only = _transactions(session, ["1.00", "2.00", "3.00"])
+    savings = _transactions(session, ["4.00"], credit_account_id="savings")
+    service = ReconciliationService(session)
+
+    first = service.get_unreconciled_page(session, account_id="income", limit=2)
+    second = service.get_unreconciled_page(session, account_id="income", limit=2, cursor=first.next_cursor)
+
+    listed = [row.id for row in first.transactions + second.transactions]
+    assert sorted(listed) == sorted(checking_only)
+    assert second.next_cursor is None
+    assert [row.id for row in service.get_unreconciled_page(session, account_id="savings").transactions] == savings
+    with pytest.raises(ValueError, match="does not belong"):
+        service.get_unreconciled_page(session, account_id="savings", cursor=first.next_cursor)
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        service.get_unreconciled_page(session, cursor="not-a-cursor")
+
+
+def test_unreconciled_stream_yields_every_open_row(session, monkeypatch) -> None:
+    monkeypatch.setattr(reconciliation_module, "settings", replace(settings, reconciliation_stream_batch_size=2))
+    ids = _transactions(session, ["1.00"] * 5)
+    session.get(Transaction, ids[0]).reconciliation_status = ReconciliationStatus.RECONCILED
+    session.commit()
+
+    streamed = list(ReconciliationService(session).stream_unreconciled_transactions(session, account_id="checking"))
+
+    assert sorted(row.id for row in streamed) == sorted(ids[1:])
+
+
+def test_ndjson_lines_emits_one_line_per_model() -> None:
+    rows = [TransactionSummary(id=str(index), amount=Decimal("1.00"), date=date.today(), processing_status="POSTED",
+                               reconciliation_status="UNCLEARED") for index in range(5)]
+
+    chunks = list(ndjson_lines(rows, lines_per_chunk=2))
+
+    assert len(chunks) == 3
+    lines = b"".join(chunks).decode().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == ["0", "1", "2", "3", "4"]
+
+
+@pytest.mark.parametrize("count", [0, 1, 5])
+def test_json_array_chunks_form_one_array(count: int) -> None:
+    rows = [TransactionSummary(id=str(index), amount=Decimal("1.00"), date=date.today(), processing_status="POSTED",
+                               reconciliation_status="UNCLEARED") for index in range(count)]
+
+    chunks = list(json_array_chunks(rows, items_per_chunk=2))
+
+    assert [row["id"] for row in json.loads(b"".join(chunks))] == [str(index) for index in range(count)]
+
+
+def test_statement_matches_are_proposed_then_applied_in_bulk(session) -> None:
+    service = ReconciliationService(session)
+    ids = _transactions(session, ["10.00", "20.00", "5.00", "2.50"])
+    recon = service.create_reconciliation_session(session, date.today(), Decimal("37.50"))
+    service.add_transactions_to_session(session, recon.id, [ids[3]])
+    lines = [
+        StatementLine("s1", Decimal("10.00"), NOW.date()),
+        StatementLine("s2", Decimal("20.00"), NOW.date() + timedelta(days=2)),
+        StatementLine("s3", Decimal("2.50"), NOW.date()),
+        StatementLine("s4", Decimal("77.00"), NOW.date()),
+    ]
+
+    proposal = service.propose_statement_matches(session, recon.id, lines)
+
+    assert {(match.line_id, match.transaction_id) for match in proposal.matches} == {("s1", ids[0]), ("s2", ids[1])}
+    assert proposal.unmatched_line_ids == ["s3", "s4"]
+    assert proposal.residual_difference == Decimal("5.00")
+    assert proposal.difference_explanation == [ids[2]]
+
+    accepted = [match.transaction_id for match in proposal.matches] + proposal.difference_explanation
+    _, payload = service.add_transactions_to_session(session, recon.id, accepted)
+    assert payload["difference"] == Decimal("0.00")
+    with pytest.raises(ValueError, match="not found"):
+        service.propose_statement_matches(session, "missing", lines)
+
+
+def _view_entries(session, statuses_by_day: list[tuple[int, ReconciliationStatus, str]]) -> None:
+    session.add_all(
+        [
+            ReconciliationViewEntry(
+                account_id="checking",
+                entry_date=date(2026, 3, day),
+                amount=Decimal(amount),
+                description=f"Entry {index}",
+                reconciled_status=status.value,
+            )
+            for index, (day, status, amount) in enumerate(statuses_by_day)
+        ]
+    )
+    session.commit()
+
+
+def test_reconciliation_view_pages_filters_and_summarizes(session) -> None:
+    _view_entries(
+        session,
+        [
+            (1, ReconciliationStatus.RECONCILED, "10.00"),
+            (2, ReconciliationStatus.PENDING_RECONCILIATION, "5.00"),
+            (2, ReconciliationStatus.PENDING_RECONCILIATION, "-2.50"),
+            (9, ReconciliationStatus.RECONCILED, "1.25"),
+        ],
+    )
+    service = ReconciliationService(session)
+
+    first = service.get_reconciliation_view_page("checking", limit=3)
+    second = service.get_reconciliation_view_page("checking", limit=3, cursor=first.next_cursor)
+    assert [entry.entry_date.day for entry in first.entries + second.entries] == [1, 2, 2, 9]
+    assert second.next_cursor is None
+    with pytest.raises(ValueError, match="does not belong"):
+        service.get_reconciliation_view_page("income", cursor=first.next_cursor)
+
+    window = service.get_reconciliation_view_page(
+        "checking",
+        start_date=date(2026, 3, 2),
+        end_date=date(2026, 3, 8),
+        reconciled_status=ReconciliationStatus.PENDING_RECONCILIATION,
+    )
+    assert sorted(entry.amount for entry in window.entries) == [Decimal("-2.50"), Decimal("5.00")]
+
+    totals = {total.status: (total.count, total.total_amount) for total in service.summarize_reconciliation_view("checking")}
+    assert totals == {
+        ReconciliationStatus.PENDING_RECONCILIATION.value: (2, Decimal("2.50")),
+        ReconciliationStatus.RECONCILED.value: (2, Decimal("11.25")),
+    }
+    assert service.summarize_reconciliation_view("checking", end_date=date(2026, 3, 1))[0].count == 1
@@ -175,6 +175,9 @@ def test_security_logger_configuration(monkeypatch):
 
     from sdd_cash_manager.lib import security_events
     reload(security_events)
+    # Importing the module no longer opens the log; the first event does.
+    assert security_events.security_logger.handlers == []
+    security_events.configure_security_logger()
 
     assert security_events.security_logger.level == logging.DEBUG
     assert len(security_events.security_logger.handlers) == 2 # File and console
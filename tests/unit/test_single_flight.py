@@ -0,0 +1,165 @@
+import asyncio
+import threading
+import time
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from sdd_cash_manager.lib.metrics import get_counter, reset_metrics
+from sdd_cash_manager.lib.single_flight import SingleFlight
+from sdd_cash_manager.models.account import Account
+from sdd_cash_manager.models.base import Base
+from sdd_cash_manager.models.enums import AccountingCategory
+from sdd_cash_manager.services import account_service as account_service_module
+from sdd_cash_manager.services.account_service import AccountService
+
+
+@pytest.fixture(autouse=True)
+def _clean_metrics():
+    reset_metrics()
+    yield
+    reset_metrics()
+
+
+def _wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for condition"
+        time.sleep(0.001)
+
+
+def test_concurrent_threads_share_one_call_and_count_the_followers() -> None:
+    flights: SingleFlight[int] = SingleFlight("test")
+    release = threading.Event()
+    calls = []
+
+    def compute() -> int:
+        calls.append(1)
+        release.wait(5)
+        return 42
+
+    results: list[int] = []
+    threads = [threading.Thread(target=lambda: results.append(flights.do("key", compute))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    _wait_for(lambda: get_counter(flights.calls_metric) == 4)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == [42, 42, 42, 42]
+    assert len(calls) == 1
+    assert get_counter(flights.coalesced_metric) == 3
+    assert flights.in_flight() == 0
+
+    # Nothing is cached once the flight lands.
+    assert flights.do("key", lambda: 7) == 7
+
+
+def test_followers_receive_the_leaders_exception() -> None:
+    flights: SingleFlight[int] = SingleFlight("test")
+    release = threading.Event()
+
+    def fail() -> int:
+        release.wait(5)
+        raise ValueError("boom")
+
+    errors: list[Exception] = []
+
+    def call() -> None:
+        try:
+            flights.do("key", fail)
+        except ValueError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=call) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    _wait_for(lambda: get_counter(flights.coalesced_metric) == 1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert [str(error) for error in errors] == ["boom", "boom"]
+
+
+def test_coroutines_and_threads_join_the_same_flight() -> None:
+    flights: SingleFlight[str] = SingleFlight("test")
+    release = threading.Event()
+    calls = []
+
+    def compute() -> str:
+        calls.append(1)
+        release.wait(5)
+        return "done"
+
+    thread_result: list[str] = []
+
+    async def scenario() -> list[str]:
+        leader = asyncio.create_task(flights.do_async("key", compute))
+        follower = asyncio.create_task(flights.do_async("key", compute))
+        await asyncio.to_thread(_wait_for, lambda: flights.in_flight() == 1)
+        thread = threading.Thread(target=lambda: thread_result.append(flights.do("key", compute)))
+        thread.start()
+        await asyncio.to_thread(_wait_for, lambda: get_counter(flights.coalesced_metric) == 2)
+        release.set()
+        results = await asyncio.gather(leader, follower)
+        await asyncio.to_thread(thread.join, 5)
+        return results
+
+    assert asyncio.run(scenario()) == ["done", "done"]
+    assert thread_result == ["done"]
+    assert len(calls) == 1
+
+
+def test_concurrent_hierarchy_balances_share_one_query(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, autoflush=False)
+    first_session, second_session = factory(), factory()
+    try:
+        AccountService(db_session=first_session).create_account(
+            name="Checking", currency="USD", accounting_category=AccountingCategory.ASSET, id="checking",
+            available_balance=Decimal("10.00"),
+        )
+        release = threading.Event()
+        shard_totals = []
+        original = account_service_module.sharded_balance_total
+
+        def slow_shard_total(session, clause):
+            shard_totals.append(1)
+            release.wait(5)
+            return original(session, clause)
+
+        monkeypatch.setattr(account_service_module, "sharded_balance_total", slow_shard_total)
+        flights = account_service_module._hierarchy_balance_flights
+        results: list[Decimal] = []
+        threads = [
+            threading.Thread(target=lambda s=s: results.append(AccountService(db_session=s).get_account_hierarchy_balance("checking")))
+            for s in (first_session, second_session)
+        ]
+        for thread in threads:
+            thread.start()
+        _wait_for(lambda: get_counter(flights.coalesced_metric) == 1)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert results == [Decimal("10.00"), Decimal("10.00")]
+        assert len(shard_totals) == 1
+
+        # A session with its own uncommitted writes computes alone.
+        reset_metrics()
+        second_session.add(
+            Account(id="pending", name="Pending", currency="USD", accounting_category=AccountingCategory.ASSET)
+        )
+        assert AccountService(db_session=second_session).get_account_hierarchy_balance("checking") == Decimal("10.00")
+        assert get_counter(flights.calls_metric) == 0
+    finally:
+        first_session.close()
+        second_session.close()
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
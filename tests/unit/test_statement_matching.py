@@ -0,0 +1,63 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sdd_cash_manager.lib.statement_matching import (
+    DATE_TOLERANCE_STRATEGY,
+    EXACT_STRATEGY,
+    LedgerCandidate,
+    StatementLine,
+    explain_difference,
+    match_statement_lines,
+)
+
+BASE_DATE = date(2026, 3, 10)
+
+
+def _line(line_id: str, amount: str, days: int = 0) -> StatementLine:
+    return StatementLine(line_id=line_id, amount=Decimal(amount), date=BASE_DATE + timedelta(days=days))
+
+
+def _candidate(txn_id: str, amount: str, days: int = 0) -> LedgerCandidate:
+    return LedgerCandidate(transaction_id=txn_id, amount=Decimal(amount), date=BASE_DATE + timedelta(days=days))
+
+
+def test_exact_matches_win_before_the_tolerance_pass() -> None:
+    lines = [_line("L1", "10.00"), _line("L2", "10.00", 2), _line("L3", "99.99")]
+    candidates = [_candidate("t-late", "10.00", 3), _candidate("t-exact", "10.00"), _candidate("t-other", "5.00")]
+
+    result = match_statement_lines(lines, candidates, date_tolerance_days=3)
+
+    pairs = {match.line_id: (match.transaction_id, match.strategy) for match in result.matches}
+    assert pairs == {"L1": ("t-exact", EXACT_STRATEGY), "L2": ("t-late", DATE_TOLERANCE_STRATEGY)}
+    assert [line.line_id for line in result.unmatched_lines] == ["L3"]
+    assert [candidate.transaction_id for candidate in result.unmatched_candidates] == ["t-other"]
+
+
+def test_tolerance_scores_fall_with_the_date_gap_and_respect_the_limit() -> None:
+    lines = [_line("near", "20.00", 1), _line("far", "30.00", 5)]
+    candidates = [_candidate("a", "20.00"), _candidate("b", "30.00")]
+
+    result = match_statement_lines(lines, candidates, date_tolerance_days=3)
+
+    assert [(match.line_id, match.score) for match in result.matches] == [("near", Decimal("0.8750"))]
+    assert [line.line_id for line in result.unmatched_lines] == ["far"]
+
+
+def test_each_transaction_is_matched_at_most_once() -> None:
+    lines = [_line("L1", "7.00"), _line("L2", "7.00"), _line("L3", "7.00", 1)]
+    candidates = [_candidate("a", "7.00"), _candidate("b", "7.00", 1)]
+
+    result = match_statement_lines(lines, candidates)
+
+    assert sorted(match.transaction_id for match in result.matches) == ["a", "b"]
+    assert len(result.unmatched_lines) == 1
+
+
+def test_explain_difference_finds_a_bounded_subset() -> None:
+    candidates = [_candidate("a", "12.50"), _candidate("b", "7.25"), _candidate("c", "3.10"), _candidate("d", "40.00")]
+
+    assert explain_difference(candidates, Decimal("15.60")) == ["a", "c"]
+    assert explain_difference(candidates, Decimal("0")) == []
+    assert explain_difference(candidates, Decimal("1.00")) is None
+    assert explain_difference(candidates, Decimal("-3.10")) is None
+    assert explain_difference(candidates, Decimal("62.85"), max_states=4) is None
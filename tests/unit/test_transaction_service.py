@@ -15,6 +15,7 @@ from sdd_cash_manager.models.enums import AccountingCategory, ProcessingStatus,
 from sdd_cash_manager.models.quickfill_template import QuickFillTemplate
 from sdd_cash_manager.models.transaction import Entry, Transaction
 from sdd_cash_manager.services.account_service import AccountService
+from sdd_cash_manager.services.quickfill_aggregator import get_quickfill_aggregator
 from sdd_cash_manager.services.transaction_service import BALANCING_ACCOUNT_ID, TransactionService
 
 
@@ -662,7 +663,9 @@ def test_quickfill_candidate_created_after_transaction(transaction_service, db_s
         notes="memo quickfill",
     )
     db_session.commit()
+    assert db_session.scalars(select(QuickFillTemplate)).first() is None
 
+    assert get_quickfill_aggregator(db_session).flush(db_session) == 1
     template = db_session.scalars(select(QuickFillTemplate)).one()
     assert template.action == "Repeat"
     assert template.history_count == 1
@@ -688,6 +691,7 @@ def test_quickfill_history_increments_and_can_be_approved(transaction_service, d
         )
     db_session.commit()
 
+    get_quickfill_aggregator(db_session).flush(db_session)
     template = db_session.scalars(select(QuickFillTemplate)).one()
     assert template.history_count == 2
     approved_template = transaction_service.approve_quickfill_template(template.id, approved_by="tester")
@@ -0,0 +1,153 @@
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import MagicMock
+from uuid import UUID
+
+import pytest
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from sdd_cash_manager.models.account import Account
+from sdd_cash_manager.models.adjustment import ManualBalanceAdjustment
+from sdd_cash_manager.models.base import Base
+from sdd_cash_manager.models.enums import AccountingCategory
+from sdd_cash_manager.models.reconciliation import ReconciliationViewEntry
+from sdd_cash_manager.models.transaction import Transaction
+from sdd_cash_manager.schemas.adjustment import BulkBalanceAdjustmentItem, ManualBalanceAdjustmentCreate
+from sdd_cash_manager.services.account_service import AccountService
+from sdd_cash_manager.services.adjustment_service import ManualBalanceAdjustmentService
+from sdd_cash_manager.services.transaction_service import TransactionService
+from sdd_cash_manager.services.unit_of_work import commit_or_flush, in_unit_of_work, on_commit, unit_of_work
+
+ACCOUNT_ID = str(UUID(int=7))
+
+
+@pytest.fixture(autouse=True)
+def mock_security_log(monkeypatch):
+    monkeypatch.setattr("sdd_cash_manager.services.adjustment_service.log_security_event", MagicMock())
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    db_session = sessionmaker(bind=engine, autoflush=False)()
+    db_session.add(
+        Account(name="Checking", currency="USD", accounting_category=AccountingCategory.ASSET, id=ACCOUNT_ID)
+    )
+    db_session.commit()
+    try:
+        yield db_session
+    finally:
+        db_session.close()
+
+
+@pytest.fixture
+def commits(engine):
+    counted: list[int] = []
+    event.listen(engine, "commit", lambda _conn: counted.append(1))
+    return counted
+
+
+def test_nested_units_commit_once_and_defer_callbacks(session, commits) -> None:
+    ran: list[str] = []
+    with unit_of_work(session):
+        with unit_of_work(session):
+            session.add(Account(name="Savings", currency="USD", accounting_category=AccountingCategory.ASSET))
+            commit_or_flush(session)
+            on_commit(session, lambda: ran.append("after"))
+        assert in_unit_of_work(session)
+        assert commits == [] and ran == []
+
+    assert not in_unit_of_work(session)
+    assert len(commits) == 1
+    assert ran == ["after"]
+
+
+def test_failed_unit_rolls_back_and_drops_callbacks(session, commits) -> None:
+    ran: list[str] = []
+    with pytest.raises(RuntimeError):
+        with unit_of_work(session):
+            session.add(Account(name="Savings", currency="USD", accounting_category=AccountingCategory.ASSET))
+            on_commit(session, lambda: ran.append("after"))
+            raise RuntimeError("boom")
+
+    assert commits == [] and ran == []
+    assert not in_unit_of_work(session)
+    assert session.scalar(select(func.count()).select_from(Account)) == 1
+
+
+def test_manual_adjustment_commits_once(session, commits) -> None:
+    service = ManualBalanceAdjustmentService(session)
+    payload = ManualBalanceAdjustmentCreate(
+        target_balance=Decimal("250.00"), effective_date=date(2026, 3, 31), submitted_by_user_id="operator"
+    )
+
+    adjustment = service.create_adjustment(UUID(ACCOUNT_ID), payload)
+
+    assert len(commits) == 1
+    assert adjustment.status == "COMPLETED"
+    assert session.scalar(select(func.count()).select_from(Transaction)) == 1
+    assert session.scalar(select(func.count()).select_from(ReconciliationViewEntry)) == 1
+    assert session.scalar(select(func.count()).select_from(ManualBalanceAdjustment)) == 1
+
+
+def test_perform_balance_adjustment_commits_once(session, commits) -> None:
+    account_service = AccountService(session)
+    transaction_service = TransactionService(db_session=session)
+    transaction_service.set_account_service(account_service)
+
+    transaction = transaction_service.perform_balance_adjustment(
+        ACCOUNT_ID,
+        Decimal("80.00"),
+        datetime.now(timezone.utc),
+        "Statement correction",
+        "Adjustment",
+    )
+
+    assert transaction is not None
+    assert len(commits) == 1
+    assert transaction.amount == Decimal("80.00")
+    assert session.get(Account, ACCOUNT_ID).available_balance == Decimal("80.00")
+
+
+def test_bulk_adjustments_commit_once_with_per_account_cutoffs(session, commits) -> None:
+    savings_id = str(UUID(int=8))
+    session.add(Account(name="Savings", currency="USD", accounting_category=AccountingCategory.ASSET, id=savings_id))
+    session.commit()
+    commits.clear()
+    service = ManualBalanceAdjustmentService(session)
+    service.create_adjustment(
+        UUID(ACCOUNT_ID),
+        ManualBalanceAdjustmentCreate(
+            target_balance=Decimal("40.00"), effective_date=date.today(), submitted_by_user_id="operator"
+        ),
+    )
+    commits.clear()
+
+    earlier = date.today() - timedelta(days=1)
+    outcomes = service.create_bulk_adjustments(
+        [
+            BulkBalanceAdjustmentItem(account_id=UUID(ACCOUNT_ID), target_balance=Decimal("40.00"), effective_date=date.today()),
+            BulkBalanceAdjustmentItem(account_id=UUID(savings_id), target_balance=Decimal("15.00"), effective_date=earlier),
+        ],
+        "operator",
+    )
+
+    assert len(commits) == 1
+    assert [(outcome.status, outcome.difference) for outcome in outcomes] == [
+        ("ZERO_DIFFERENCE", Decimal("0.00")),
+        ("COMPLETED", Decimal("15.00")),
+    ]
+    assert AccountService(session).calculate_running_balances_as_of({ACCOUNT_ID: earlier, savings_id: earlier}) == {
+        ACCOUNT_ID: Decimal("0.00"),
+        savings_id: Decimal("15.00"),
+    }